@@ -16,7 +16,28 @@
 
 __version__ = "1.1.0"
 
+import importlib
+import typing
 
-from meridian import analysis
-from meridian import data
-from meridian import model
+if typing.TYPE_CHECKING:
+  from meridian import analysis
+  from meridian import data
+  from meridian import model
+
+# The subpackages are imported on first access (PEP 562), so that
+# `meridian.constants` and `meridian.data` load without TensorFlow.
+_SUBMODULES = frozenset([
+    "analysis",
+    "data",
+    "model",
+])
+
+
+def __getattr__(name: str):
+  if name in _SUBMODULES:
+    return importlib.import_module(f"{__name__}.{name}")
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+  return sorted(set(globals()) | _SUBMODULES)
@@ -14,8 +14,41 @@
 
 """Meridian analysis API for trained models."""
 
-from meridian.analysis import analyzer
-from meridian.analysis import formatter
-from meridian.analysis import optimizer
-from meridian.analysis import summarizer
-from meridian.analysis import visualizer
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+  from meridian.analysis import analyzer
+  from meridian.analysis import chart_data
+  from meridian.analysis import contribution_cube
+  from meridian.analysis import diagnostics
+  from meridian.analysis import formatter
+  from meridian.analysis import optimizer
+  from meridian.analysis import summarizer
+  from meridian.analysis import time_resolved
+  from meridian.analysis import visualizer
+
+# The submodules are imported on first access (PEP 562). The NumPy modules,
+# such as `diagnostics` or `contribution_cube`, load without TensorFlow and
+# Altair.
+_SUBMODULES = frozenset([
+    "analyzer",
+    "chart_data",
+    "contribution_cube",
+    "diagnostics",
+    "formatter",
+    "optimizer",
+    "summarizer",
+    "time_resolved",
+    "visualizer",
+])
+
+
+def __getattr__(name: str):
+  if name in _SUBMODULES:
+    return importlib.import_module(f"{__name__}.{name}")
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+  return sorted(set(globals()) | _SUBMODULES)
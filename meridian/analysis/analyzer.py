@@ -14,20 +14,29 @@
 
 """Methods to compute analysis metrics of the model and the data."""
 
-from collections.abc import Mapping, Sequence
+from collections.abc import Callable, Hashable, Mapping, Sequence
+import contextlib
+import enum
+import functools
+import inspect
 import itertools
 import numbers
+import threading
 from typing import Any, Optional
 import warnings
 
 from meridian import constants
+from meridian.analysis import contribution_cube
+from meridian.analysis import diagnostics
+from meridian.analysis import time_resolved
 from meridian.model import adstock_hill
+from meridian.model import compilation
 from meridian.model import model
+from meridian.model import result_cache
 from meridian.model import transformers
 import numpy as np
 import pandas as pd
 import tensorflow as tf
-import tensorflow_probability as tfp
 from typing_extensions import Self
 import xarray as xr
 
@@ -579,6 +588,89 @@ def _is_str_list(l: Sequence[Any]) -> bool:
   return all(isinstance(item, str) for item in l)
 
 
+def _has_new_data(new_data: DataTensors | None) -> bool:
+  """Returns whether `new_data` overrides any of the historical data."""
+  if new_data is None:
+    return False
+  fields = new_data._tf_extension_type_fields()  # pylint: disable=protected-access
+  return any(getattr(new_data, field.name) is not None for field in fields)
+
+
+def _to_hashable(values: Sequence[Any] | None) -> tuple[Any, ...] | None:
+  return None if values is None else tuple(values)
+
+
+class _UncacheableArgumentError(Exception):
+  """Raised when an argument cannot be part of a result cache key."""
+
+
+def _canonicalize(value: Any) -> Hashable:
+  """Returns a hashable value equal for equivalent call arguments."""
+  if value is None or isinstance(
+      value, (str, bytes, bool, numbers.Number, enum.Enum)
+  ):
+    return value
+  if isinstance(value, DataTensors):
+    if _has_new_data(value):
+      raise _UncacheableArgumentError()
+    return None
+  if isinstance(value, np.ndarray):
+    return (value.dtype.str, value.shape, value.tobytes())
+  if isinstance(value, (list, tuple)):
+    return tuple(_canonicalize(v) for v in value)
+  if isinstance(value, (set, frozenset)):
+    return frozenset(_canonicalize(v) for v in value)
+  if isinstance(value, Mapping):
+    return frozenset((k, _canonicalize(v)) for k, v in value.items())
+  raise _UncacheableArgumentError()
+
+
+def _cached_result(method: Callable[..., Any]) -> Callable[..., Any]:
+  """Caches the results of an `Analyzer` method in the model's result cache.
+
+  The results are keyed on the method name and its canonicalized arguments.
+  Calls with `new_data` or with arguments that cannot be canonicalized, such
+  as tensors, are not cached. The results are deep-copied on return, so that
+  callers can modify them.
+
+  Args:
+    method: Public `Analyzer` method returning an `xr.Dataset` or a
+      `pd.DataFrame`.
+
+  Returns:
+    The method using `Meridian.result_cache`.
+  """
+  signature = inspect.signature(method)
+
+  @functools.wraps(method)
+  def wrapper(self, *args, **kwargs):
+    # pylint: disable=protected-access
+    # Stand-ins for `Meridian` without a `ResultCache` are not cached.
+    cache = getattr(self._meridian, "result_cache", None)
+    if (
+        not isinstance(cache, result_cache.ResultCache)
+        or not cache.maxsize
+    ):
+      return method(self, *args, **kwargs)
+    bound = signature.bind(self, *args, **kwargs)
+    bound.apply_defaults()
+    try:
+      key = (method.__name__,) + tuple(
+          (name, _canonicalize(value))
+          for name, value in bound.arguments.items()
+          if name != "self"
+      )
+    except _UncacheableArgumentError:
+      return method(self, *args, **kwargs)
+    # The copy is deep, since a shallow copy of a Dataset shares the arrays of
+    # the cached result.
+    return cache.get_or_compute(
+        key, functools.partial(method, self, *args, **kwargs)
+    ).copy(deep=True)
+
+  return wrapper
+
+
 def _validate_selected_times(
     selected_times: Sequence[str] | Sequence[bool],
     input_times: xr.DataArray,
@@ -610,7 +702,7 @@ def _validate_selected_times(
           f"there are time period coordinates in {comparison_arg_name}."
       )
   elif _is_str_list(selected_times):
-    if any(time not in input_times for time in selected_times):
+    if not np.all(np.isin(selected_times, input_times.values)):
       raise ValueError(
           f"`{arg_name}` must match the time dimension names from "
           "meridian.InputData."
@@ -766,10 +858,169 @@ class Analyzer:
     self._meridian = meridian
     # Make the meridian object ready for methods in this analyzer that create
     # tf.function computation graphs: it should be frozen for no more internal
-    # states mutation before those graphs execute.
-    self._meridian.populate_cached_properties()
+    # states mutation before those graphs execute. The cached properties of a
+    # lazy model are instead built outside of the graphs on first use.
+    if not self._meridian.is_lazy:
+      self._meridian.populate_cached_properties()
+    # Draw sweeps shared within `shared_sweeps()`, by sweep key.
+    self._shared_sweeps: dict[tuple[Any, ...], tf.Tensor] | None = None
+    self._shared_sweep_locks: dict[tuple[Any, ...], threading.Lock] = {}
+    self._shared_sweeps_lock = threading.Lock()
+
+  @contextlib.contextmanager
+  def shared_sweeps(self):
+    """Shares the draw sweeps of the analyses run within this context.
+
+    `expected_outcome()` and `incremental_outcome()` loop over batches of the
+    prior or posterior draws. Within this context, each sweep of the historical
+    data is run once and reused by every call that only differs in its time
+    selection and aggregation, and for `expected_outcome()`, also in its geo
+    selection and aggregation. For example, `expected_vs_actual_data()`,
+    `predictive_accuracy()` and `summary_metrics()` with and without
+    `aggregate_times` then share the sweeps of their expected and incremental
+    outcomes. Sweeps with `new_data` are not shared.
+
+    The shared sweeps are kept in memory until the context exits. The model
+    must not be sampled again within the context.
+
+    Yields:
+      None.
+    """
+    if self._shared_sweeps is not None:
+      yield
+      return
+    self._shared_sweeps = {}
+    try:
+      yield
+    finally:
+      self._shared_sweeps = None
+      self._shared_sweep_locks = {}
+
+  def _get_sweep_key(
+      self, new_data: DataTensors | None, *args: Any
+  ) -> tuple[Any, ...] | None:
+    """Returns the key of a shareable sweep, or `None` if it is not shared."""
+    if self._shared_sweeps is None or _has_new_data(new_data):
+      return None
+    return args
+
+  def _run_shared_sweep(
+      self,
+      sweep_key: tuple[Any, ...] | None,
+      sweep: Callable[[], tf.Tensor],
+  ) -> tf.Tensor:
+    """Runs `sweep`, or returns its shared result if it already ran.
+
+    Concurrent calls with the same key, for example from the report cards built
+    on a thread pool, wait for the first one instead of repeating the sweep.
+
+    Args:
+      sweep_key: Key returned by `_get_sweep_key()`. If `None`, `sweep` runs
+        and its result is not shared.
+      sweep: Function computing the sweep.
+
+    Returns:
+      The result of `sweep`.
+    """
+    if sweep_key is None:
+      return sweep()
+    with self._shared_sweeps_lock:
+      key_lock = self._shared_sweep_locks.setdefault(
+          sweep_key, threading.Lock()
+      )
+    with key_lock:
+      if sweep_key not in self._shared_sweeps:
+        self._shared_sweeps[sweep_key] = sweep()
+      return self._shared_sweeps[sweep_key]
+
+  def _get_inference_group(
+      self, use_posterior: bool, n_draws: int | None = None
+  ) -> xr.Dataset:
+    """Returns the posterior or prior draws used by batched computations.
+
+    Args:
+      use_posterior: Boolean. If `True`, the posterior draws are returned.
+        Otherwise, the prior draws.
+      n_draws: Optional number of leading draws of each chain to return. By
+        default, all draws are returned.
+
+    Returns:
+      The draws of the inference data group.
+    """
+    params = (
+        self._meridian.inference_data.posterior
+        if use_posterior
+        else self._meridian.inference_data.prior
+    )
+    if n_draws is not None:
+      params = params.isel(draw=slice(0, n_draws))
+    return params
+
+  def warmup(
+      self,
+      use_posterior: bool = True,
+      use_kpi: bool = False,
+      batch_size: int = constants.DEFAULT_BATCH_SIZE,
+  ):
+    """Traces and compiles the batched computations of this analyzer.
+
+    `expected_outcome()` and `incremental_outcome()` compile their XLA programs
+    for each distinct shape of a batch of draws. This runs the draw batches of
+    both methods once for a full batch of `batch_size` draws and once for the
+    last, smaller batch, so that later analyses with the same `batch_size` and
+    `use_kpi` arguments do not compile on their first call. The incremental
+    outcome is compiled both with and without the non-paid channels.
+
+    Combined with `compilation.set_compilation_cache_dir()`, this can be called
+    once to populate the persistent compilation cache for new processes.
+
+    Args:
+      use_posterior: Boolean. If `True`, the computations are compiled for the
+        posterior draws. Otherwise, for the prior draws.
+      use_kpi: Boolean. If `True`, the computations are compiled for the KPI
+        analysis. Otherwise, for the revenue analysis.
+      batch_size: Integer representing the maximum draws per chain in each
+        batch of the analyses to compile.
+
+    Raises:
+      NotFittedModelError: If `sample_posterior()` (for `use_posterior=True`)
+        or `sample_prior()` (for `use_posterior=False`) has not been called.
+    """
+    dist_type = constants.POSTERIOR if use_posterior else constants.PRIOR
+    if dist_type not in self._meridian.inference_data.groups():
+      raise model.NotFittedModelError(
+          f"sample_{dist_type}() must be called prior to calling `warmup()`."
+      )
+    self._check_revenue_data_exists(use_kpi)
+    params = self._get_inference_group(use_posterior)
+    n_chains, n_draws = params.chain.size, params.draw.size
+    # Batch sizes in the order of the batches: the full batches first.
+    batch_draws = sorted(
+        {min(batch_size, n_draws), n_draws % batch_size} - {0}, reverse=True
+    )
+    # The sweeps are run on the leading draws with the default arguments of
+    # `expected_outcome()` and `incremental_outcome()`.
+    for n in batch_draws:
+      self._expected_outcome_sweep(
+          use_posterior=use_posterior,
+          new_data=None,
+          inverse_transform_outcome=True,
+          use_kpi=use_kpi,
+          batch_size=batch_size,
+          n_draws=n,
+      )
+      for include_non_paid_channels in (False, True):
+        self._historical_incremental_outcome_sweep(
+            use_posterior=use_posterior,
+            use_kpi=use_kpi,
+            include_non_paid_channels=include_non_paid_channels,
+            batch_size=batch_size,
+            n_draws=n,
+        )
+    self._meridian.warmup(shapes=[(n_chains, n_draws)])
 
   @tf.function(jit_compile=True)
+  @compilation.count_traces
   def _get_kpi_means(
       self,
       data_tensors: DataTensors,
@@ -1315,7 +1566,9 @@ class Analyzer:
           comparison_arg_name="`tensor`",
       )
       if _is_str_list(selected_times):
-        time_mask = [x in selected_times for x in mmm.input_data.time]
+        time_mask = mmm.input_data.time_coordinates.get_selected_mask(
+            selected_times
+        )
         tensor = tf.boolean_mask(tensor, time_mask, axis=time_dim)
       elif _is_bool_list(selected_times):
         tensor = tf.boolean_mask(tensor, selected_times, axis=time_dim)
@@ -1434,6 +1687,49 @@ class Analyzer:
           f"sample_{dist_type}() must be called prior to calling"
           " `expected_outcome()`."
       )
+    sweep_key = self._get_sweep_key(
+        new_data,
+        "expected_outcome",
+        use_posterior,
+        inverse_transform_outcome,
+        use_kpi,
+    )
+    outcome_means = self._run_shared_sweep(
+        sweep_key,
+        functools.partial(
+            self._expected_outcome_sweep,
+            use_posterior=use_posterior,
+            new_data=new_data,
+            inverse_transform_outcome=inverse_transform_outcome,
+            use_kpi=use_kpi,
+            batch_size=batch_size,
+        ),
+    )
+
+    return self.filter_and_aggregate_geos_and_times(
+        outcome_means,
+        selected_geos=selected_geos,
+        selected_times=selected_times,
+        aggregate_geos=aggregate_geos,
+        aggregate_times=aggregate_times,
+    )
+
+  def _expected_outcome_sweep(
+      self,
+      use_posterior: bool,
+      new_data: DataTensors | None,
+      inverse_transform_outcome: bool,
+      use_kpi: bool,
+      batch_size: int,
+      n_draws: int | None = None,
+      mean_draws: bool = False,
+  ) -> tf.Tensor:
+    """Computes the expected outcome of all geos and times in draw batches.
+
+    With `mean_draws=True`, only the running sum of the batches is kept and the
+    mean over the draws of each chain is returned, with a draw dimension of
+    size one.
+    """
     if new_data is None:
       new_data = DataTensors()
 
@@ -1444,11 +1740,7 @@ class Analyzer:
         allow_modified_times=False,
     )
 
-    params = (
-        self._meridian.inference_data.posterior
-        if use_posterior
-        else self._meridian.inference_data.prior
-    )
+    params = self._get_inference_group(use_posterior, n_draws)
     # We always compute the expected outcome of all channels, including non-paid
     # channels.
     data_tensors = self._get_scaled_data_tensors(
@@ -1471,6 +1763,7 @@ class Analyzer:
         + self._get_causal_param_names(include_non_paid_channels=True)
     )
     outcome_means_temps = []
+    outcome_sum = None
     for start_index in batch_starting_indices:
       stop_index = np.min([n_draws, start_index + batch_size])
       batch_dists = {
@@ -1479,25 +1772,27 @@ class Analyzer:
       }
       dist_tensors = DistributionTensors(**batch_dists)
 
-      outcome_means_temps.append(
-          self._get_kpi_means(
-              data_tensors=data_tensors,
-              dist_tensors=dist_tensors,
-          )
+      batch_means = self._get_kpi_means(
+          data_tensors=data_tensors,
+          dist_tensors=dist_tensors,
       )
-    outcome_means = tf.concat([outcome_means, *outcome_means_temps], axis=1)
+      if mean_draws:
+        batch_sum = tf.reduce_sum(batch_means, axis=1, keepdims=True)
+        outcome_sum = (
+            batch_sum if outcome_sum is None else outcome_sum + batch_sum
+        )
+      else:
+        outcome_means_temps.append(batch_means)
+    if mean_draws:
+      # The inverse transformation is affine, so it can be applied to the mean.
+      outcome_means = outcome_sum / n_draws
+    else:
+      outcome_means = tf.concat([outcome_means, *outcome_means_temps], axis=1)
     if inverse_transform_outcome:
       outcome_means = self._meridian.kpi_transformer.inverse(outcome_means)
       if not use_kpi:
         outcome_means *= self._meridian.revenue_per_kpi
-
-    return self.filter_and_aggregate_geos_and_times(
-        outcome_means,
-        selected_geos=selected_geos,
-        selected_times=selected_times,
-        aggregate_geos=aggregate_geos,
-        aggregate_times=aggregate_times,
-    )
+    return outcome_means
 
   def _check_kpi_transformation(
       self, inverse_transform_outcome: bool, use_kpi: bool
@@ -1632,6 +1927,7 @@ class Analyzer:
     return tf.einsum("gt,...gtm->...gtm", revenue_per_kpi, kpi)
 
   @tf.function(jit_compile=True)
+  @compilation.count_traces
   def _incremental_outcome_impl(
       self,
       data_tensors: DataTensors,
@@ -1961,10 +2257,83 @@ class Analyzer:
       media_selected_times = [True] * new_n_media_times
     else:
       if all(isinstance(time, str) for time in media_selected_times):
-        media_selected_times = [
-            x in media_selected_times for x in mmm.input_data.media_time
-        ]
+        media_selected_times = (
+            mmm.input_data.media_time_coordinates.get_selected_mask(
+                media_selected_times
+            )
+        )
+
+    # The shared sweep keeps the time dimension, so that it can be reused with
+    # any time selection and aggregation.
+    sweep_key = self._get_sweep_key(
+        new_data,
+        "incremental_outcome",
+        use_posterior,
+        _to_hashable(non_media_baseline_values),
+        scaling_factor0,
+        scaling_factor1,
+        tuple(bool(t) for t in media_selected_times),
+        _to_hashable(selected_geos),
+        aggregate_geos,
+        inverse_transform_outcome,
+        use_kpi,
+        by_reach,
+        include_non_paid_channels,
+    )
+    sweep = functools.partial(
+        self._incremental_outcome_sweep,
+        data_tensors=data_tensors,
+        use_posterior=use_posterior,
+        non_media_baseline_values=non_media_baseline_values,
+        scaling_factor0=scaling_factor0,
+        scaling_factor1=scaling_factor1,
+        media_selected_times=media_selected_times,
+        selected_geos=selected_geos,
+        aggregate_geos=aggregate_geos,
+        inverse_transform_outcome=inverse_transform_outcome,
+        use_kpi=use_kpi,
+        by_reach=by_reach,
+        include_non_paid_channels=include_non_paid_channels,
+        batch_size=batch_size,
+    )
+    if sweep_key is None:
+      return sweep(
+          selected_times=selected_times, aggregate_times=aggregate_times
+      )
+    incremental_outcome = self._run_shared_sweep(
+        sweep_key,
+        functools.partial(sweep, selected_times=None, aggregate_times=False),
+    )
+    return self._filter_and_aggregate_times(
+        incremental_outcome, selected_times, aggregate_times
+    )
 
+  def _incremental_outcome_sweep(
+      self,
+      data_tensors: DataTensors,
+      use_posterior: bool,
+      non_media_baseline_values: Sequence[float] | None,
+      scaling_factor0: float,
+      scaling_factor1: float,
+      media_selected_times: Sequence[bool],
+      selected_geos: Sequence[str] | None,
+      selected_times: Sequence[str] | Sequence[bool] | None,
+      aggregate_geos: bool,
+      aggregate_times: bool,
+      inverse_transform_outcome: bool,
+      use_kpi: bool,
+      by_reach: bool,
+      include_non_paid_channels: bool,
+      batch_size: int,
+      n_draws: int | None = None,
+      mean_draws: bool = False,
+  ) -> tf.Tensor:
+    """Computes the incremental outcome of validated inputs in draw batches.
+
+    With `mean_draws=True`, only the running sum of the batches is kept and the
+    mean over the draws of each chain is returned, with a draw dimension of
+    size one.
+    """
     # Set counterfactual tensors based on the scaling factors and the media
     # selected times.
     counterfactual0 = (
@@ -2027,17 +2396,14 @@ class Analyzer:
     )
 
     # Calculate incremental outcome in batches.
-    params = (
-        self._meridian.inference_data.posterior
-        if use_posterior
-        else self._meridian.inference_data.prior
-    )
+    params = self._get_inference_group(use_posterior, n_draws)
     n_draws = params.draw.size
     batch_starting_indices = np.arange(n_draws, step=batch_size)
     param_list = self._get_causal_param_names(
         include_non_paid_channels=include_non_paid_channels
     )
-    incremental_outcome_temps = [None] * len(batch_starting_indices)
+    incremental_outcome_temps = []
+    incremental_outcome_sum = None
     dim_kwargs = {
         "selected_geos": selected_geos,
         "selected_times": selected_times,
@@ -2051,14 +2417,14 @@ class Analyzer:
             non_media_treatments_baseline_normalized
         ),
     }
-    for i, start_index in enumerate(batch_starting_indices):
+    for start_index in batch_starting_indices:
       stop_index = np.min([n_draws, start_index + batch_size])
       batch_dists = {
           k: tf.convert_to_tensor(params[k][:, start_index:stop_index, ...])
           for k in param_list
       }
       dist_tensors = DistributionTensors(**batch_dists)
-      incremental_outcome_temps[i] = self._incremental_outcome_impl(
+      batch_outcome = self._incremental_outcome_impl(
           data_tensors=data_tensors1,
           dist_tensors=dist_tensors,
           **dim_kwargs,
@@ -2066,14 +2432,120 @@ class Analyzer:
       )
       # Calculate incremental outcome under counterfactual scenario "Media_0".
       if scaling_factor0 != 0 or not all(media_selected_times):
-        incremental_outcome_temps[i] -= self._incremental_outcome_impl(
+        batch_outcome -= self._incremental_outcome_impl(
             data_tensors=data_tensors0,
             dist_tensors=dist_tensors,
             **dim_kwargs,
             **incremental_outcome_kwargs,
         )
+      if mean_draws:
+        batch_sum = tf.reduce_sum(batch_outcome, axis=1, keepdims=True)
+        incremental_outcome_sum = (
+            batch_sum
+            if incremental_outcome_sum is None
+            else incremental_outcome_sum + batch_sum
+        )
+      else:
+        incremental_outcome_temps.append(batch_outcome)
+    if mean_draws:
+      return incremental_outcome_sum / n_draws
     return tf.concat(incremental_outcome_temps, axis=1)
 
+  def _historical_incremental_outcome_sweep(
+      self,
+      use_posterior: bool,
+      use_kpi: bool,
+      include_non_paid_channels: bool,
+      batch_size: int,
+      non_media_baseline_values: Sequence[float] | None = None,
+      aggregate_geos: bool = True,
+      aggregate_times: bool = True,
+      n_draws: int | None = None,
+      mean_draws: bool = False,
+  ) -> tf.Tensor:
+    """Runs the incremental outcome sweep of the historical media execution.
+
+    The sweep has the default arguments of `incremental_outcome()`, without its
+    validation and without sharing the sweep.
+
+    Args:
+      use_posterior: Boolean. If `True`, the posterior draws are used.
+        Otherwise, the prior draws.
+      use_kpi: Boolean. If `True`, the incremental KPI is computed. Otherwise,
+        the incremental revenue.
+      include_non_paid_channels: Boolean. If `True`, the non-paid channels are
+        included.
+      batch_size: Integer representing the maximum draws per chain in each
+        batch.
+      non_media_baseline_values: Optional list of shape
+        `(n_non_media_channels,)` of the baseline values of the non-media
+        treatments.
+      aggregate_geos: Boolean. If `True`, the outcome is summed over the geos.
+      aggregate_times: Boolean. If `True`, the outcome is summed over the time
+        periods.
+      n_draws: Optional number of leading draws of each chain to use. By
+        default, all draws are used.
+      mean_draws: Boolean. If `True`, the mean over the draws of each chain is
+        returned, with a draw dimension of size one.
+
+    Returns:
+      The incremental outcome tensor of `incremental_outcome()`.
+    """
+    required_tensors_names = constants.PAID_DATA
+    if include_non_paid_channels:
+      required_tensors_names += constants.NON_PAID_DATA
+    return self._incremental_outcome_sweep(
+        data_tensors=DataTensors().validate_and_fill_missing_data(
+            required_tensors_names=required_tensors_names,
+            meridian=self._meridian,
+        ),
+        use_posterior=use_posterior,
+        non_media_baseline_values=non_media_baseline_values,
+        scaling_factor0=0.0,
+        scaling_factor1=1.0,
+        media_selected_times=[True] * self._meridian.n_media_times,
+        selected_geos=None,
+        selected_times=None,
+        aggregate_geos=aggregate_geos,
+        aggregate_times=aggregate_times,
+        inverse_transform_outcome=True,
+        use_kpi=use_kpi,
+        by_reach=True,
+        include_non_paid_channels=include_non_paid_channels,
+        batch_size=batch_size,
+        n_draws=n_draws,
+        mean_draws=mean_draws,
+    )
+
+  def _filter_and_aggregate_times(
+      self,
+      tensor: tf.Tensor,
+      selected_times: Sequence[str] | Sequence[bool] | None,
+      aggregate_times: bool,
+  ) -> tf.Tensor:
+    """Filters and aggregates the time dimension of a shared sweep.
+
+    Args:
+      tensor: Tensor with dimensions `[..., n_times, n_channels]`.
+      selected_times: Optional list of times to include, either a string list
+        of `InputData.time` coordinates or a boolean list of length `n_times`.
+      aggregate_times: If `True`, the tensor is summed over the selected times.
+
+    Returns:
+      A tensor with filtered and/or aggregated time dimension.
+    """
+    if selected_times is not None:
+      if _is_str_list(selected_times):
+        selected_times = (
+            self._meridian.input_data.time_coordinates.get_selected_mask(
+                selected_times
+            )
+        )
+      tensor = tf.boolean_mask(tensor, selected_times, axis=tensor.ndim - 2)
+    if aggregate_times:
+      tensor = tf.reduce_sum(tensor, axis=-2)
+    return tensor
+
   def _validate_geo_and_time_granularity(
       self,
       selected_geos: Sequence[str] | None = None,
@@ -2520,6 +2992,7 @@ class Analyzer:
         split_by_holdout_id and self._meridian.model_spec.holdout_id is not None
     )
 
+  @_cached_result
   def expected_vs_actual_data(
       self,
       aggregate_geos: bool = False,
@@ -2655,6 +3128,25 @@ class Analyzer:
       n_draws, n_geos, n_times)`. The `n_geos` and `n_times` dimensions is
       dropped if `aggregate_geos=True` or `aggregate_time=True`, respectively.
     """
+    return self.expected_outcome(
+        new_data=self._get_baseline_data(non_media_baseline_values),
+        **expected_outcome_kwargs,
+    )
+
+  def _get_baseline_data(
+      self, non_media_baseline_values: Sequence[float] | None
+  ) -> DataTensors:
+    """Returns the data of the baseline expected outcome.
+
+    Args:
+      non_media_baseline_values: Optional list of shape
+        `(n_non_media_channels,)` of the baseline values of the non-media
+        treatments, see `_calculate_baseline_expected_outcome()`.
+
+    Returns:
+      A `DataTensors` with zero media and reach, the baseline non-media
+      treatments and the historical controls.
+    """
     new_media = (
         tf.zeros_like(self._meridian.media_tensors.media)
         if self._meridian.media_tensors.media is not None
@@ -2702,7 +3194,7 @@ class Analyzer:
       new_non_media_treatments = None
     new_controls = self._meridian.controls
 
-    new_data = DataTensors(
+    return DataTensors(
         media=new_media,
         reach=new_reach,
         organic_media=new_organic_media,
@@ -2710,7 +3202,6 @@ class Analyzer:
         non_media_treatments=new_non_media_treatments,
         controls=new_controls,
     )
-    return self.expected_outcome(new_data=new_data, **expected_outcome_kwargs)
 
   def compute_incremental_outcome_aggregate(
       self,
@@ -2781,6 +3272,7 @@ class Analyzer:
         axis=-1,
     )
 
+  @_cached_result
   def summary_metrics(
       self,
       new_data: DataTensors | None = None,
@@ -2935,32 +3427,6 @@ class Analyzer:
         **dim_kwargs,
         **batched_kwargs,
     )
-    incremental_outcome_mroi_prior = self.compute_incremental_outcome_aggregate(
-        use_posterior=False,
-        new_data=new_data.filter_fields(incremental_outcome_fields),
-        use_kpi=use_kpi,
-        by_reach=marginal_roi_by_reach,
-        scaling_factor0=1,
-        scaling_factor1=1 + marginal_roi_incremental_increase,
-        include_non_paid_channels=include_non_paid_channels,
-        non_media_baseline_values=non_media_baseline_values,
-        **dim_kwargs,
-        **batched_kwargs,
-    )
-    incremental_outcome_mroi_posterior = (
-        self.compute_incremental_outcome_aggregate(
-            use_posterior=True,
-            new_data=new_data.filter_fields(incremental_outcome_fields),
-            use_kpi=use_kpi,
-            by_reach=marginal_roi_by_reach,
-            scaling_factor0=1,
-            scaling_factor1=1 + marginal_roi_incremental_increase,
-            include_non_paid_channels=include_non_paid_channels,
-            non_media_baseline_values=non_media_baseline_values,
-            **dim_kwargs,
-            **batched_kwargs,
-        )
-    )
 
     xr_dims = (
         ((constants.GEO,) if not aggregate_geos else ())
@@ -3122,6 +3588,56 @@ class Analyzer:
           pct_of_contribution,
       ])
     else:
+      # The marginal and KPI sweeps are only run for the metrics reported.
+      incremental_outcome_mroi_prior = (
+          self.compute_incremental_outcome_aggregate(
+              use_posterior=False,
+              new_data=new_data.filter_fields(incremental_outcome_fields),
+              use_kpi=use_kpi,
+              by_reach=marginal_roi_by_reach,
+              scaling_factor0=1,
+              scaling_factor1=1 + marginal_roi_incremental_increase,
+              include_non_paid_channels=include_non_paid_channels,
+              non_media_baseline_values=non_media_baseline_values,
+              **dim_kwargs,
+              **batched_kwargs,
+          )
+      )
+      incremental_outcome_mroi_posterior = (
+          self.compute_incremental_outcome_aggregate(
+              use_posterior=True,
+              new_data=new_data.filter_fields(incremental_outcome_fields),
+              use_kpi=use_kpi,
+              by_reach=marginal_roi_by_reach,
+              scaling_factor0=1,
+              scaling_factor1=1 + marginal_roi_incremental_increase,
+              include_non_paid_channels=include_non_paid_channels,
+              non_media_baseline_values=non_media_baseline_values,
+              **dim_kwargs,
+              **batched_kwargs,
+          )
+      )
+      if use_kpi or self._meridian.input_data.revenue_per_kpi is None:
+        # The incremental outcome is already the incremental KPI.
+        incremental_kpi_prior = incremental_outcome_prior
+        incremental_kpi_posterior = incremental_outcome_posterior
+      else:
+        incremental_kpi_prior = self.compute_incremental_outcome_aggregate(
+            use_posterior=False,
+            new_data=new_data.filter_fields(incremental_outcome_fields),
+            use_kpi=True,
+            include_non_paid_channels=False,
+            **dim_kwargs,
+            **batched_kwargs,
+        )
+        incremental_kpi_posterior = self.compute_incremental_outcome_aggregate(
+            use_posterior=True,
+            new_data=new_data.filter_fields(incremental_outcome_fields),
+            use_kpi=True,
+            include_non_paid_channels=False,
+            **dim_kwargs,
+            **batched_kwargs,
+        )
       roi = self._compute_roi_aggregate(
           incremental_outcome_prior=incremental_outcome_prior,
           incremental_outcome_posterior=incremental_outcome_posterior,
@@ -3146,22 +3662,8 @@ class Analyzer:
           # have much practical usefulness, anyway.
       ).where(lambda ds: ds.channel != constants.ALL_CHANNELS)
       cpik = self._compute_cpik_aggregate(
-          incremental_kpi_prior=self.compute_incremental_outcome_aggregate(
-              use_posterior=False,
-              new_data=new_data.filter_fields(incremental_outcome_fields),
-              use_kpi=True,
-              include_non_paid_channels=False,
-              **dim_kwargs,
-              **batched_kwargs,
-          ),
-          incremental_kpi_posterior=self.compute_incremental_outcome_aggregate(
-              use_posterior=True,
-              new_data=new_data.filter_fields(incremental_outcome_fields),
-              use_kpi=True,
-              include_non_paid_channels=False,
-              **dim_kwargs,
-              **batched_kwargs,
-          ),
+          incremental_kpi_prior=incremental_kpi_prior,
+          incremental_kpi_posterior=incremental_kpi_posterior,
           spend_with_total=spend_with_total,
           xr_dims=xr_dims_with_ci_and_distribution,
           xr_coords=xr_coords_with_ci_and_distribution,
@@ -3177,6 +3679,184 @@ class Analyzer:
           cpik,
       ])
 
+  def time_resolved_outcome(
+      self,
+      use_kpi: bool = False,
+      include_non_paid_channels: bool = True,
+      non_media_baseline_values: Sequence[float] | None = None,
+      confidence_level: float = constants.DEFAULT_CONFIDENCE_LEVEL,
+      batch_size: int = constants.DEFAULT_BATCH_SIZE,
+  ) -> time_resolved.TimeResolvedOutcome:
+    """Computes the incremental outcome of each channel by time period.
+
+    The prior and posterior incremental outcome and expected outcome are
+    computed once for every time period, in draw batches. The summaries of any
+    date range or calendar period are then derived from them without running
+    the model again, see `TimeResolvedOutcome`.
+
+    Args:
+      use_kpi: If `True`, the outcome is the KPI. If `False`, the outcome is
+        the revenue.
+      include_non_paid_channels: If `True`, the organic media, organic RF and
+        non-media treatment channels are included.
+      non_media_baseline_values: Optional list of shape
+        `(n_non_media_channels,)` of the baseline values of the non-media
+        treatments, see `summary_metrics()`.
+      confidence_level: Confidence level of the credible intervals, between
+        zero and one.
+      batch_size: Maximum draws per chain in each batch. The calculation is run
+        in batches to avoid memory exhaustion.
+
+    Returns:
+      A `TimeResolvedOutcome` of the channels and their total, `All Channels`,
+      aggregated over the geos.
+    """
+    incremental_outcome = {}
+    expected_outcome = {}
+    for distribution, use_posterior in (
+        (constants.PRIOR, False),
+        (constants.POSTERIOR, True),
+    ):
+      incremental_outcome[distribution] = np.asarray(
+          self.compute_incremental_outcome_aggregate(
+              use_posterior=use_posterior,
+              use_kpi=use_kpi,
+              include_non_paid_channels=include_non_paid_channels,
+              non_media_baseline_values=non_media_baseline_values,
+              aggregate_times=False,
+              batch_size=batch_size,
+          )
+      )
+      expected_outcome[distribution] = np.asarray(
+          self.expected_outcome(
+              use_posterior=use_posterior,
+              use_kpi=use_kpi,
+              aggregate_times=False,
+              batch_size=batch_size,
+          )
+      )
+    channels = (
+        self._meridian.input_data.get_all_channels()
+        if include_non_paid_channels
+        else self._meridian.input_data.get_all_paid_channels()
+    )
+    return time_resolved.TimeResolvedOutcome(
+        times=self._meridian.input_data.time.values,
+        channels=list(channels) + [constants.ALL_CHANNELS],
+        incremental_outcome=incremental_outcome,
+        expected_outcome=expected_outcome,
+        confidence_level=confidence_level,
+    )
+
+  def compute_contribution_cube(
+      self,
+      use_kpi: bool = False,
+      non_media_baseline_values: Sequence[float] | None = None,
+      batch_size: int = constants.DEFAULT_BATCH_SIZE,
+  ) -> contribution_cube.ContributionCube:
+    """Computes the posterior mean contributions by geo and time period.
+
+    The posterior mean incremental outcome of all the channels and the expected
+    and baseline outcome are computed once for every geo and time period. The
+    totals and ROI of any date range and subset of geos are then derived from
+    them with NumPy, see `ContributionCube`. The cube can be saved next to the
+    model with `contribution_cube.save_cube()`.
+
+    Args:
+      use_kpi: If `True`, the outcome is the KPI. If `False`, the outcome is
+        the revenue. The KPI is used if the model has no `revenue_per_kpi`.
+      non_media_baseline_values: Optional list of shape
+        `(n_non_media_channels,)` of the baseline values of the non-media
+        treatments, see `summary_metrics()`.
+      batch_size: Maximum draws per chain in each batch. The calculation is run
+        in batches to avoid memory exhaustion.
+
+    Returns:
+      A `ContributionCube` of the paid and non-paid channels.
+
+    Raises:
+      NotFittedModelError: If `sample_posterior()` has not been called.
+    """
+    mmm = self._meridian
+    if constants.POSTERIOR not in mmm.inference_data.groups():
+      raise model.NotFittedModelError(
+          "sample_posterior() must be called prior to calling"
+          " `compute_contribution_cube()`."
+      )
+    _validate_non_media_baseline_values_numbers(non_media_baseline_values)
+    use_kpi = use_kpi or mmm.input_data.revenue_per_kpi is None
+    # The sweeps keep the running sums of the draw batches, so that the memory
+    # does not grow with the number of draws.
+    incremental_outcome = self._historical_incremental_outcome_sweep(
+        use_posterior=True,
+        use_kpi=use_kpi,
+        include_non_paid_channels=True,
+        batch_size=batch_size,
+        non_media_baseline_values=non_media_baseline_values,
+        aggregate_geos=False,
+        aggregate_times=False,
+        mean_draws=True,
+    )
+    expected_outcome_kwargs = {
+        "use_posterior": True,
+        "inverse_transform_outcome": True,
+        "use_kpi": use_kpi,
+        "batch_size": batch_size,
+        "mean_draws": True,
+    }
+    expected = self._expected_outcome_sweep(
+        new_data=None, **expected_outcome_kwargs
+    )
+    baseline = self._expected_outcome_sweep(
+        new_data=self._get_baseline_data(non_media_baseline_values),
+        **expected_outcome_kwargs,
+    )
+    actual = mmm.kpi if use_kpi else mmm.kpi * mmm.revenue_per_kpi
+
+    channels = mmm.input_data.get_all_channels()
+    spend = np.full(
+        (mmm.n_geos, mmm.n_times, len(channels)), np.nan, dtype=np.float64
+    )
+    paid_spend = [
+        np.asarray(allocated_spend)
+        for allocated_spend in (
+            mmm.input_data.allocated_media_spend,
+            mmm.input_data.allocated_rf_spend,
+        )
+        if allocated_spend is not None
+    ]
+    if paid_spend:
+      paid_spend = np.concatenate(paid_spend, axis=-1)
+      spend[..., : paid_spend.shape[-1]] = paid_spend
+
+    geo_time_dims = [constants.GEO, constants.TIME]
+    channel_dims = geo_time_dims + [constants.CHANNEL]
+    return contribution_cube.ContributionCube(
+        xr.Dataset(
+            data_vars={
+                constants.INCREMENTAL_OUTCOME: (
+                    channel_dims,
+                    np.mean(incremental_outcome, axis=(0, 1)),
+                ),
+                constants.SPEND: (channel_dims, spend),
+                constants.EXPECTED: (
+                    geo_time_dims,
+                    np.mean(expected, axis=(0, 1)),
+                ),
+                constants.BASELINE: (
+                    geo_time_dims,
+                    np.mean(baseline, axis=(0, 1)),
+                ),
+                constants.ACTUAL: (geo_time_dims, np.asarray(actual)),
+            },
+            coords={
+                constants.GEO: mmm.input_data.geo.values,
+                constants.TIME: mmm.input_data.time.values,
+                constants.CHANNEL: channels,
+            },
+        )
+    )
+
   def get_aggregated_impressions(
       self,
       new_data: DataTensors | None = None,
@@ -3274,6 +3954,7 @@ class Analyzer:
         flexible_time_dim=True,
     )
 
+  @_cached_result
   def baseline_summary_metrics(
       self,
       selected_geos: Sequence[str] | None = None,
@@ -3412,6 +4093,7 @@ class Analyzer:
         baseline_pct_of_contribution,
     ])
 
+  @_cached_result
   def optimal_freq(
       self,
       new_data: DataTensors | None = None,
@@ -3663,6 +4345,7 @@ class Analyzer:
         },
     )
 
+  @_cached_result
   def predictive_accuracy(
       self,
       selected_geos: Sequence[str] | None = None,
@@ -3836,7 +4519,9 @@ class Analyzer:
       holdout_id = holdout_id[geo_mask]
 
     if selected_times is not None:
-      time_mask = [x in selected_times for x in self._meridian.input_data.time]
+      time_mask = self._meridian.input_data.time_coordinates.get_selected_mask(
+          selected_times
+      )
       # If model is national, holdout_id will have only 1 dimension.
       if self._meridian.is_national:
         holdout_id = holdout_id[time_mask]
@@ -3848,6 +4533,9 @@ class Analyzer:
   def get_rhat(self) -> Mapping[str, tf.Tensor]:
     """Computes the R-hat values for each parameter in the model.
 
+    The R-hat values are computed on chunks of the elements of each parameter,
+    see `diagnostics.potential_scale_reduction()`.
+
     Returns:
       A dictionary of r-hat values where each parameter is a key and values are
       r-hats corresponding to the parameter.
@@ -3860,18 +4548,57 @@ class Analyzer:
       raise model.NotFittedModelError(
           "sample_posterior() must be called prior to calling this method."
       )
+    return {
+        k: tf.convert_to_tensor(
+            diagnostics.potential_scale_reduction(v.values), dtype=v.dtype
+        )
+        for k, v in self._meridian.inference_data.posterior.data_vars.items()
+    }
 
-    def _transpose_first_two_dims(x: tf.Tensor) -> tf.Tensor:
-      n_dim = len(x.shape)
-      perm = [1, 0] + list(range(2, n_dim))
-      return tf.transpose(x, perm)
+  @_cached_result
+  def convergence_diagnostics(
+      self,
+      var_names: Sequence[str] | None = None,
+      max_chunk_elements: int = diagnostics.DEFAULT_MAX_CHUNK_ELEMENTS,
+  ) -> xr.Dataset:
+    """Computes the R-hat, bulk and tail ESS and MCSE of the posterior draws.
 
-    rhat = tfp.mcmc.potential_scale_reduction({
-        k: _transpose_first_two_dims(v)
-        for k, v in self._meridian.inference_data.posterior.data_vars.items()
-    })
-    return rhat
+    The R-hat values are those of `get_rhat()`. The bulk and tail effective
+    sample sizes (ESS) and the Monte Carlo standard error (MCSE) of the mean
+    follow Vehtari et al. (2021). The diagnostics are computed on chunks of the
+    elements of each parameter, see `diagnostics.convergence_diagnostics()`.
+
+    References:
+      Aki Vehtari, Andrew Gelman, Daniel Simpson, Bob Carpenter and
+        Paul-Christian Bürkner. Rank-Normalization, Folding, and Localization:
+        An Improved R-hat for Assessing Convergence of MCMC. Bayesian Analysis,
+        16(2):667-718, 2021.
+
+    Args:
+      var_names: Posterior variables to diagnose. If `None`, all the posterior
+        variables are diagnosed.
+      max_chunk_elements: Maximum number of draws processed at once.
+
+    Returns:
+      A Dataset with a data variable per diagnosed parameter, with a `metric`
+      dimension of `rhat`, `ess_bulk`, `ess_tail` and `mcse_mean` followed by
+      the dimensions of the parameter.
 
+    Raises:
+      NotFittedModelError: If `self.sample_posterior()` is not called before
+        calling this method.
+    """
+    if constants.POSTERIOR not in self._meridian.inference_data.groups():
+      raise model.NotFittedModelError(
+          "sample_posterior() must be called prior to calling this method."
+      )
+    return diagnostics.convergence_diagnostics(
+        self._meridian.inference_data.posterior,
+        var_names=var_names,
+        max_chunk_elements=max_chunk_elements,
+    )
+
+  @_cached_result
   def rhat_summary(self, bad_rhat_threshold: float = 1.2) -> pd.DataFrame:
     """Computes a summary of the R-hat values for each parameter in the model.
 
@@ -3947,6 +4674,7 @@ class Analyzer:
       )
     return pd.DataFrame(rhat_summary)
 
+  @_cached_result
   def response_curves(
       self,
       spend_multipliers: list[float] | None = None,
@@ -4100,6 +4828,7 @@ class Analyzer:
     attrs = {constants.CONFIDENCE_LEVEL: confidence_level}
     return xr.Dataset(data_vars=xr_data_vars, coords=xr_coords, attrs=attrs)
 
+  @_cached_result
   def adstock_decay(
       self, confidence_level: float = constants.DEFAULT_CONFIDENCE_LEVEL
   ) -> pd.DataFrame:
@@ -4288,84 +5017,52 @@ class Analyzer:
         linspace_max_values,
         constants.HILL_NUM_STEPS,
     )
-    linspace_filler = np.linspace(0, 1, constants.HILL_NUM_STEPS)
-    xr_dims = [
-        constants.MEDIA_UNITS,
-        constants.CHANNEL,
-        constants.METRIC,
-        constants.DISTRIBUTION,
-    ]
-    xr_coords = {
-        constants.MEDIA_UNITS: linspace_filler,
-        constants.CHANNEL: list(channels),
-        constants.DISTRIBUTION: [constants.PRIOR, constants.POSTERIOR],
-        constants.METRIC: [constants.MEAN, constants.CI_LO, constants.CI_HI],
-    }
-    # Expanding the linspace by one dimension since the HillTransformer requires
-    # 3-dimensional input as (geo, time, channel).
-    expanded_linspace = tf.expand_dims(linspace, axis=0)
-    # Including [:, :, 0, :, :] in the output of the Hill Function to reduce the
-    # tensors by the geo dimension. Original Hill dimension shape is (n_chains,
-    # n_draws, n_geos, n_times, n_channels), and we want to plot the
-    # dependency on time only.
-    hill_vals_prior = adstock_hill.HillTransformer(
-        self._meridian.inference_data.prior[ec].values,
-        self._meridian.inference_data.prior[slope].values,
-    ).forward(expanded_linspace)[:, :, 0, :, :]
-    hill_vals_posterior = adstock_hill.HillTransformer(
-        self._meridian.inference_data.posterior[ec].values,
-        self._meridian.inference_data.posterior[slope].values,
-    ).forward(expanded_linspace)[:, :, 0, :, :]
-
-    hill_dataset = _central_tendency_and_ci_by_prior_and_posterior(
-        hill_vals_prior,
-        hill_vals_posterior,
-        constants.HILL_SATURATION_LEVEL,
-        xr_dims,
-        xr_coords,
-        confidence_level,
-    )
-    df = (
-        hill_dataset[constants.HILL_SATURATION_LEVEL]
-        .to_dataframe()
-        .reset_index()
-        .pivot(
-            index=[
-                constants.CHANNEL,
-                constants.MEDIA_UNITS,
-                constants.DISTRIBUTION,
-            ],
-            columns=constants.METRIC,
-            values=constants.HILL_SATURATION_LEVEL,
-        )
-        .reset_index()
-    )
-
-    # Fill media_units or frequency x-axis with the correct range.
-    media_units_arr = []
     if transformer is not None:
-      population_scaled_median = transformer.population_scaled_median_m
-      x_range_full_shape = linspace * tf.transpose(
-          population_scaled_median[:, np.newaxis]
+      media_units = linspace * np.asarray(
+          transformer.population_scaled_median_m
       )
     else:
-      x_range_full_shape = linspace
-
-    # Flatten this into a list.
-    x_range_list = (
-        tf.reshape(tf.transpose(x_range_full_shape), [-1]).numpy().tolist()
-    )
-
-    # Doubles each value in the list to account for alternating prior
-    # and posterior.
-    x_range_doubled = list(
-        itertools.chain.from_iterable(zip(x_range_list, x_range_list))
-    )
-    media_units_arr.extend(x_range_doubled)
+      media_units = linspace
+
+    # The rows are ordered by channel name, media units and distribution, with
+    # the posterior before the prior.
+    channel_order = np.argsort(channels, kind="stable")
+    n_channels = len(channels)
+    n_steps = constants.HILL_NUM_STEPS
+    # Metrics of shape (n_channels, n_steps, 2, 3) by channel, media units,
+    # distribution and metric (`mean`, `ci_lo`, `ci_hi`).
+    metrics = np.empty((n_channels, n_steps, 2, 3))
+    inference_data = self._meridian.inference_data
+    for i, draws in enumerate([inference_data.posterior, inference_data.prior]):
+      n_samples = draws.chain.size * draws.draw.size
+      ec_values = draws[ec].values.reshape(n_samples, n_channels)
+      slope_values = draws[slope].values.reshape(n_samples, n_channels)
+      # The Hill curves are computed one channel at a time, as an array of
+      # shape (n_samples, n_steps), to bound the memory with many draws.
+      for row, channel in enumerate(channel_order):
+        hill_values = adstock_hill.HillTransformer(
+            ec_values[:, channel : channel + 1],
+            slope_values[:, channel : channel + 1],
+        ).forward(tf.constant(linspace[np.newaxis, :, channel : channel + 1]))
+        metrics[row, :, i, :] = get_central_tendency_and_ci(
+            np.asarray(hill_values)[:, 0, :, 0],
+            confidence_level,
+            axis=(0,),
+        )
 
-    df[constants.CHANNEL_TYPE] = channel_type
-    df[constants.MEDIA_UNITS] = media_units_arr
-    return df
+    return pd.DataFrame({
+        constants.CHANNEL: np.repeat(
+            np.asarray(channels)[channel_order], n_steps * 2
+        ),
+        constants.MEDIA_UNITS: np.repeat(media_units.T[channel_order], 2),
+        constants.DISTRIBUTION: np.tile(
+            [constants.POSTERIOR, constants.PRIOR], n_channels * n_steps
+        ),
+        constants.CI_HI: metrics[..., 2].ravel(),
+        constants.CI_LO: metrics[..., 1].ravel(),
+        constants.MEAN: metrics[..., 0].ravel(),
+        constants.CHANNEL_TYPE: channel_type,
+    })
 
   def _get_channel_hill_histogram_dataframe(
       self,
@@ -4389,39 +5086,47 @@ class Analyzer:
       channels of the given type. Returns an empty DataFrame if no valid
       data is found for any channel.
     """
-    channels_data = {
-        constants.CHANNEL: [],
-        constants.CHANNEL_TYPE: [],
-        constants.SCALED_COUNT_HISTOGRAM: [],
-        constants.COUNT_HISTOGRAM: [],
-        constants.START_INTERVAL_HISTOGRAM: [],
-        constants.END_INTERVAL_HISTOGRAM: [],
-    }
-
-    for i, channel_name in enumerate(channel_names):
-      channel_data_np = data_to_histogram[:, i].numpy()
-      channel_data_np = channel_data_np[~np.isnan(channel_data_np)]
-      if channel_data_np.size == 0:
-        continue
-
-      counts_per_bucket, buckets = np.histogram(
-          channel_data_np, bins=n_bins, density=True
-      )
-      max_counts = (
-          np.max(counts_per_bucket) if np.max(counts_per_bucket) > 0 else 1.0
-      )
-
-      num_buckets = len(counts_per_bucket)
-      channels_data[constants.CHANNEL].extend([channel_name] * num_buckets)
-      channels_data[constants.CHANNEL_TYPE].extend([channel_type] * num_buckets)
-      channels_data[constants.SCALED_COUNT_HISTOGRAM].extend(
-          counts_per_bucket / max_counts
-      )
-      channels_data[constants.COUNT_HISTOGRAM].extend(counts_per_bucket)
-      channels_data[constants.START_INTERVAL_HISTOGRAM].extend(buckets[:-1])
-      channels_data[constants.END_INTERVAL_HISTOGRAM].extend(buckets[1:])
-
-    return pd.DataFrame(channels_data)
+    data = np.asarray(data_to_histogram)
+    valid = ~np.isnan(data)
+    has_data = valid.any(axis=0)
+    data, valid = data[:, has_data], valid[:, has_data]
+    channel_names = np.asarray(channel_names)[has_data]
+    n_channels = data.shape[1]
+
+    # The equal-width bins of each channel, computed as `np.histogram` does.
+    first_edge = np.where(valid, data, np.inf).min(axis=0)
+    last_edge = np.where(valid, data, -np.inf).max(axis=0)
+    constant = first_edge == last_edge
+    first_edge = np.where(constant, first_edge - 0.5, first_edge)
+    last_edge = np.where(constant, last_edge + 0.5, last_edge)
+    edges = np.linspace(first_edge, last_edge, n_bins + 1, dtype=data.dtype)
+    x = np.where(valid, data, first_edge)
+    indices = ((x - first_edge) / (last_edge - first_edge) * n_bins).astype(
+        np.intp
+    )
+    indices[indices == n_bins] -= 1
+    columns = np.arange(n_channels)
+    indices[x < edges[indices, columns]] -= 1
+    indices[(x >= edges[indices + 1, columns]) & (indices != n_bins - 1)] += 1
+    counts = np.bincount(
+        (indices + columns * n_bins)[valid], minlength=n_channels * n_bins
+    ).reshape(n_channels, n_bins)
+
+    counts_per_bucket = (
+        counts / np.diff(edges, axis=0).T / counts.sum(axis=1, keepdims=True)
+    )
+    max_counts = counts_per_bucket.max(axis=1, keepdims=True)
+    max_counts[max_counts <= 0] = 1.0
+    return pd.DataFrame({
+        constants.CHANNEL: np.repeat(channel_names, n_bins),
+        constants.CHANNEL_TYPE: channel_type,
+        constants.SCALED_COUNT_HISTOGRAM: (
+            counts_per_bucket / max_counts
+        ).ravel(),
+        constants.COUNT_HISTOGRAM: counts_per_bucket.ravel(),
+        constants.START_INTERVAL_HISTOGRAM: edges[:-1].T.ravel(),
+        constants.END_INTERVAL_HISTOGRAM: edges[1:].T.ravel(),
+    })
 
   def _get_hill_histogram_dataframe(self, n_bins: int) -> pd.DataFrame:
     """Calculates histogram data for a given channel type's values.
@@ -4513,6 +5218,7 @@ class Analyzer:
 
     return pd.concat(df_list, ignore_index=True)
 
+  @_cached_result
   def hill_curves(
       self,
       confidence_level: float = constants.DEFAULT_CONFIDENCE_LEVEL,
@@ -4778,6 +5484,11 @@ class Analyzer:
       )
     new_data = new_data or DataTensors()
     required_tensors_names = constants.PAID_CHANNELS + constants.SPEND_DATA
+    # Without new data the spend only depends on `InputData`, whose allocated
+    # and aggregated spend is computed once and memoized.
+    use_input_data_spend = all(
+        getattr(new_data, name) is None for name in required_tensors_names
+    )
     filled_data = new_data.validate_and_fill_missing_data(
         required_tensors_names, self._meridian
     )
@@ -4798,6 +5509,12 @@ class Analyzer:
           " data, but the channels are not available."
       )
       aggregated_media_spend = empty_da
+    elif use_input_data_spend:
+      aggregated_media_spend = self._aggregate_input_data_spend(
+          selected_times,
+          self._meridian.input_data.aggregate_media_spend,
+          list(self._meridian.input_data.media_channel.values),
+      )
     else:
       aggregated_media_spend = self._impute_and_aggregate_spend(
           selected_times,
@@ -4819,6 +5536,12 @@ class Analyzer:
           " channels are not available.",
       )
       aggregated_rf_spend = empty_da
+    elif use_input_data_spend:
+      aggregated_rf_spend = self._aggregate_input_data_spend(
+          selected_times,
+          self._meridian.input_data.aggregate_rf_spend,
+          list(self._meridian.input_data.rf_channel.values),
+      )
     else:
       rf_execution_values = filled_data.reach * filled_data.frequency
       aggregated_rf_spend = self._impute_and_aggregate_spend(
@@ -4832,6 +5555,58 @@ class Analyzer:
         [aggregated_media_spend, aggregated_rf_spend], dim=constants.CHANNEL
     )
 
+  def _aggregate_input_data_spend(
+      self,
+      selected_times: Sequence[str] | Sequence[bool] | None,
+      aggregate_spend: Callable[[np.ndarray | None], np.ndarray],
+      channel_names: Sequence[str],
+  ) -> xr.DataArray:
+    """Aggregates the `InputData` spend over the selected time period.
+
+    This is equivalent to `_impute_and_aggregate_spend` applied to the original
+    input data, but it reuses the spend allocation and aggregation memoized on
+    the `InputData` object instead of recomputing them. The memoized allocation
+    gives `NaN` spend to channels whose media units sum to zero, which is
+    replaced by zero here to match the `tf.math.divide_no_nan` allocation there.
+
+    Args:
+      selected_times: The time period to get the aggregated spend.
+      aggregate_spend: Either `InputData.aggregate_media_spend` or
+        `InputData.aggregate_rf_spend`.
+      channel_names: The channel names.
+
+    Returns:
+      An `xr.DataArray` with the coordinate `channel` and contains the data
+      variable `spend`.
+    """
+    calibration_period = None
+    if selected_times is not None:
+      mmm = self._meridian
+      _validate_selected_times(
+          selected_times=selected_times,
+          input_times=mmm.input_data.time,
+          n_times=mmm.n_times,
+          arg_name="selected_times",
+          comparison_arg_name="`tensor`",
+      )
+      if _is_str_list(selected_times):
+        time_mask = mmm.input_data.time_coordinates.get_selected_mask(
+            selected_times
+        )
+      else:
+        time_mask = np.asarray(selected_times, dtype=bool)
+      calibration_period = np.broadcast_to(
+          time_mask[:, np.newaxis], (mmm.n_times, len(channel_names))
+      )
+
+    return xr.DataArray(
+        data=np.nan_to_num(
+            np.asarray(aggregate_spend(calibration_period), dtype=np.float32)
+        ),
+        dims=[constants.CHANNEL],
+        coords={constants.CHANNEL: channel_names},
+    )
+
   def _impute_and_aggregate_spend(
       self,
       selected_times: Sequence[str] | Sequence[bool] | None,
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from collections.abc import Sequence
+from concurrent import futures
 import os
 from unittest import mock
 import warnings
@@ -24,10 +25,12 @@ from meridian import constants
 from meridian.analysis import analyzer
 from meridian.analysis import test_utils
 from meridian.data import test_utils as data_test_utils
+from meridian.model import compilation
 from meridian.model import model
 from meridian.model import prior_distribution
 from meridian.model import spec
 import numpy as np
+import pandas as pd
 import tensorflow as tf
 import tensorflow_probability as tfp
 import xarray as xr
@@ -200,6 +203,145 @@ class AnalyzerTest(tf.test.TestCase, parameterized.TestCase):
         atol=0.1,
     )
 
+  def test_warmup_compiles_batched_computations(self):
+    meridian_analyzer = analyzer.Analyzer(self.meridian_media_and_rf)
+    meridian_analyzer.warmup(batch_size=4)
+    compilation.reset_trace_counts()
+
+    meridian_analyzer.expected_outcome(batch_size=4)
+    meridian_analyzer.incremental_outcome(batch_size=4)
+    meridian_analyzer.incremental_outcome(
+        batch_size=4, include_non_paid_channels=False
+    )
+
+    self.assertEmpty(compilation.get_trace_counts())
+
+  def test_warmup_restores_all_draws(self):
+    meridian_analyzer = analyzer.Analyzer(self.meridian_media_and_rf)
+    meridian_analyzer.warmup(batch_size=4)
+    outcome = meridian_analyzer.expected_outcome(batch_size=4)
+    self.assertEqual(outcome.shape, (_N_CHAINS, _N_KEEP))
+
+  def test_warmup_does_not_share_partial_sweeps(self):
+    meridian_analyzer = analyzer.Analyzer(self.meridian_media_and_rf)
+    with meridian_analyzer.shared_sweeps():
+      meridian_analyzer.warmup(batch_size=4)
+      outcome = meridian_analyzer.expected_outcome(batch_size=4)
+    self.assertEqual(outcome.shape, (_N_CHAINS, _N_KEEP))
+
+  def test_shared_sweeps_matches_unshared_results(self):
+    expected = [
+        self.analyzer_media_and_rf.summary_metrics(aggregate_times=True),
+        self.analyzer_media_and_rf.summary_metrics(aggregate_times=False),
+    ]
+
+    meridian_analyzer = analyzer.Analyzer(self.meridian_media_and_rf)
+    with meridian_analyzer.shared_sweeps():
+      actual = [
+          meridian_analyzer.summary_metrics(aggregate_times=True),
+          meridian_analyzer.summary_metrics(aggregate_times=False),
+      ]
+
+    for expected_metrics, actual_metrics in zip(expected, actual):
+      xr.testing.assert_allclose(actual_metrics, expected_metrics, rtol=1e-4)
+
+  def test_shared_sweeps_runs_each_sweep_once(self):
+    meridian_analyzer = analyzer.Analyzer(self.meridian_media_and_rf)
+    with mock.patch.object(
+        meridian_analyzer,
+        "_expected_outcome_sweep",
+        wraps=meridian_analyzer._expected_outcome_sweep,
+    ) as sweep:
+      with meridian_analyzer.shared_sweeps():
+        meridian_analyzer.expected_outcome(aggregate_times=False)
+        meridian_analyzer.expected_outcome(aggregate_geos=False)
+        self.assertEqual(sweep.call_count, 1)
+      meridian_analyzer.expected_outcome()
+      self.assertEqual(sweep.call_count, 2)
+
+  def test_shared_sweeps_runs_concurrent_sweeps_once(self):
+    meridian_analyzer = analyzer.Analyzer(self.meridian_media_and_rf)
+    with mock.patch.object(
+        meridian_analyzer,
+        "_incremental_outcome_sweep",
+        wraps=meridian_analyzer._incremental_outcome_sweep,
+    ) as sweep:
+      with meridian_analyzer.shared_sweeps():
+        with futures.ThreadPoolExecutor(max_workers=4) as executor:
+          outcomes = list(
+              executor.map(
+                  lambda aggregate_times: meridian_analyzer.incremental_outcome(
+                      aggregate_times=aggregate_times
+                  ),
+                  [True, False, True, False],
+              )
+          )
+
+    self.assertEqual(sweep.call_count, 1)
+    self.assertAllClose(outcomes[0], tf.reduce_sum(outcomes[1], axis=-2))
+
+  def test_result_cache_is_shared_across_analyzers(self):
+    mmm = model.Meridian(
+        input_data=self.input_data_media_and_rf,
+        model_spec=spec.ModelSpec(max_lag=15),
+    )
+    mmm.result_cache.resize(8)
+    expected = analyzer.Analyzer(mmm).hill_curves()
+
+    with mock.patch.object(
+        analyzer.Analyzer, "_get_hill_curves_dataframe"
+    ) as compute:
+      actual = analyzer.Analyzer(mmm).hill_curves()
+      compute.assert_not_called()
+
+    pd.testing.assert_frame_equal(actual, expected)
+    self.assertEqual(mmm.result_cache.info().hits, 1)
+    self.assertEqual(mmm.result_cache.info().misses, 1)
+
+  def test_result_cache_returns_independent_copies(self):
+    cache = self.meridian_media_and_rf.result_cache
+    cache.clear()
+    cache.resize(8)
+    self.addCleanup(cache.clear)
+    self.addCleanup(cache.resize, 0)
+    first = self.analyzer_media_and_rf.expected_vs_actual_data()
+    expected = first.copy(deep=True)
+    first[constants.EXPECTED].values[...] = 0.0
+
+    second = self.analyzer_media_and_rf.expected_vs_actual_data()
+
+    xr.testing.assert_identical(second, expected)
+    self.assertEqual(cache.info().hits, 1)
+
+  def test_result_cache_is_disabled_by_default(self):
+    with mock.patch.object(
+        analyzer.Analyzer,
+        "_get_hill_curves_dataframe",
+        wraps=self.analyzer_media_and_rf._get_hill_curves_dataframe,
+    ) as compute:
+      self.analyzer_media_and_rf.hill_curves()
+      first_call_count = compute.call_count
+      self.analyzer_media_and_rf.hill_curves()
+
+    self.assertGreater(first_call_count, 0)
+    self.assertEqual(compute.call_count, 2 * first_call_count)
+
+  def test_lazy_model_matches_eager_model(self):
+    meridian_lazy = model.Meridian(
+        input_data=self.input_data_media_and_rf,
+        model_spec=spec.ModelSpec(max_lag=15),
+        lazy=True,
+    )
+    lazy_analyzer = analyzer.Analyzer(meridian_lazy)
+    self.assertNotIn("media_tensors", meridian_lazy.__dict__)
+
+    self.assertAllClose(
+        lazy_analyzer.roi(),
+        self.analyzer_media_and_rf.roi(),
+        rtol=1e-3,
+        atol=1e-3,
+    )
+
   def test_expected_outcome_new_revenue_per_kpi_raises_warning(self):
     with warnings.catch_warnings(record=True) as w:
       self.analyzer_media_and_rf.expected_outcome(
@@ -1047,6 +1189,41 @@ class AnalyzerTest(tf.test.TestCase, parameterized.TestCase):
         ],
     )
 
+  def test_channel_hill_histogram_matches_np_histogram(self):
+    data = np.random.default_rng(0).lognormal(size=(60, 4)).astype(np.float32)
+    data[:10, 0] = np.nan
+    data[:, 1] = np.nan
+    data[:, 2] = 3.0
+
+    meridian_analyzer = self.analyzer_media_and_rf
+    histogram = meridian_analyzer._get_channel_hill_histogram_dataframe(
+        channel_type=constants.MEDIA,
+        data_to_histogram=tf.constant(data),
+        channel_names=["a", "b", "c", "d"],
+        n_bins=5,
+    )
+
+    self.assertEqual(
+        histogram[constants.CHANNEL].tolist(), ["a"] * 5 + ["c"] * 5 + ["d"] * 5
+    )
+    for channel, column in [("a", 0), ("c", 2), ("d", 3)]:
+      channel_data = data[:, column]
+      counts, buckets = np.histogram(
+          channel_data[~np.isnan(channel_data)], bins=5, density=True
+      )
+      channel_histogram = histogram[histogram[constants.CHANNEL] == channel]
+      self.assertAllClose(channel_histogram[constants.COUNT_HISTOGRAM], counts)
+      self.assertAllClose(
+          channel_histogram[constants.SCALED_COUNT_HISTOGRAM],
+          counts / counts.max(),
+      )
+      self.assertAllClose(
+          channel_histogram[constants.START_INTERVAL_HISTOGRAM], buckets[:-1]
+      )
+      self.assertAllClose(
+          channel_histogram[constants.END_INTERVAL_HISTOGRAM], buckets[1:]
+      )
+
   def test_hill_calculation_dataframe_properties(self):
     hill_table = self.analyzer_media_and_rf.hill_curves()
 
@@ -1439,6 +1616,107 @@ class AnalyzerTest(tf.test.TestCase, parameterized.TestCase):
       self.assertNotIn(constants.MROI, media_summary.data_vars)
       self.assertNotIn(constants.CPIK, media_summary.data_vars)
 
+  def test_time_resolved_outcome_matches_summary_metrics(self):
+    times = self.input_data_media_and_rf.time.values[10:20]
+    expected = self.analyzer_media_and_rf.summary_metrics(
+        selected_times=list(times),
+        include_non_paid_channels=True,
+        confidence_level=0.8,
+    )
+
+    actual = self.analyzer_media_and_rf.time_resolved_outcome(
+        confidence_level=0.8
+    ).summary(start_date=times[0], end_date=times[-1])
+
+    for metric in [
+        constants.INCREMENTAL_OUTCOME,
+        constants.PCT_OF_CONTRIBUTION,
+    ]:
+      self.assertAllClose(
+          actual[metric].values,
+          expected[metric].transpose(*actual[metric].dims).values,
+          rtol=1e-3,
+          atol=1e-3,
+      )
+
+  def test_contribution_cube_matches_summary_metrics(self):
+    times = self.input_data_media_and_rf.time.values[10:20]
+    geos = list(self.input_data_media_and_rf.geo.values[:2])
+    expected = self.analyzer_media_and_rf.summary_metrics(
+        selected_geos=geos,
+        selected_times=list(times),
+        include_non_paid_channels=True,
+    ).sel(distribution=constants.POSTERIOR, metric=constants.MEAN)
+    expected_paid = self.analyzer_media_and_rf.summary_metrics(
+        selected_geos=geos,
+        selected_times=list(times),
+        include_non_paid_channels=False,
+    ).sel(distribution=constants.POSTERIOR, metric=constants.MEAN)
+
+    actual = self.analyzer_media_and_rf.compute_contribution_cube().summary(
+        start_date=times[0], end_date=times[-1], selected_geos=geos
+    )
+
+    channels = list(actual.index)
+    for metric in [
+        constants.INCREMENTAL_OUTCOME,
+        constants.PCT_OF_CONTRIBUTION,
+    ]:
+      self.assertAllClose(
+          actual[metric].values,
+          expected[metric].sel(channel=channels).values,
+          rtol=1e-3,
+          atol=1e-3,
+      )
+    self.assertAllClose(
+        actual[constants.ROI].values,
+        expected_paid[constants.ROI].sel(channel=channels).values,
+        rtol=1e-3,
+        atol=1e-3,
+    )
+    self.assertAllClose(
+        actual[constants.SPEND].values,
+        expected_paid[constants.SPEND].sel(channel=channels).values,
+        rtol=1e-5,
+    )
+
+  def test_contribution_cube_matches_expected_vs_actual_data(self):
+    expected = self.analyzer_media_and_rf.expected_vs_actual_data(
+        aggregate_geos=True
+    )
+
+    cube = self.analyzer_media_and_rf.compute_contribution_cube()
+    actual = cube.expected_vs_actual()
+
+    for name in [constants.EXPECTED, constants.BASELINE]:
+      self.assertAllClose(
+          actual[name].values,
+          expected[name].sel(metric=constants.MEAN).values,
+          rtol=1e-4,
+      )
+    self.assertAllClose(
+        actual[constants.ACTUAL].values,
+        expected[constants.ACTUAL].values,
+        rtol=1e-5,
+    )
+
+  def test_contribution_cube_is_independent_of_batch_size(self):
+    expected = self.analyzer_media_and_rf.compute_contribution_cube()
+
+    actual = self.analyzer_media_and_rf.compute_contribution_cube(batch_size=3)
+
+    xr.testing.assert_allclose(actual.data, expected.data, rtol=1e-4)
+
+  def test_summary_metrics_skips_marginal_roi_by_time(self):
+    with mock.patch.object(
+        self.analyzer_media_and_rf,
+        "compute_incremental_outcome_aggregate",
+        wraps=self.analyzer_media_and_rf.compute_incremental_outcome_aggregate,
+    ) as compute:
+      self.analyzer_media_and_rf.summary_metrics(aggregate_times=False)
+
+    self.assertEqual(compute.call_count, 2)
+
   def test_summary_metrics_new_times_data_returns_correct_variables(self):
     summary_metrics = self.analyzer_media_and_rf.summary_metrics(
         new_data=analyzer.DataTensors(
@@ -1716,6 +1994,34 @@ class AnalyzerTest(tf.test.TestCase, parameterized.TestCase):
         - set([constants.SLOPE_M]),
     )
 
+  def test_get_rhat_matches_tfp(self):
+    rhat = self.analyzer_media_and_rf.get_rhat()
+    posterior = self.inference_data_media_and_rf.posterior
+    for param in [constants.BETA_GM, constants.ALPHA_M]:
+      self.assertAllClose(
+          rhat[param],
+          tfp.mcmc.potential_scale_reduction(
+              np.swapaxes(posterior[param].values, 0, 1)
+          ),
+          rtol=1e-4,
+      )
+
+  def test_convergence_diagnostics_media_and_rf_correct(self):
+    result = self.analyzer_media_and_rf.convergence_diagnostics(
+        var_names=[constants.BETA_GM, constants.ALPHA_M]
+    )
+    rhat = self.analyzer_media_and_rf.get_rhat()
+
+    self.assertEqual(
+        result[constants.BETA_GM].dims,
+        (constants.METRIC, constants.GEO, constants.MEDIA_CHANNEL),
+    )
+    self.assertAllClose(
+        result[constants.ALPHA_M].sel(metric=constants.RHAT),
+        rhat[constants.ALPHA_M],
+        rtol=1e-4,
+    )
+
   def test_predictive_accuracy_without_holdout_id_columns_correct(self):
     predictive_accuracy_dataset = (
         self.analyzer_media_and_rf.predictive_accuracy()
@@ -2525,6 +2831,7 @@ class AnalyzerTest(tf.test.TestCase, parameterized.TestCase):
     expected_all_spend = data.get_total_spend() * ratio
 
     self.assertAllClose(expected_all_spend, actual_hist_spends.data)
+    self.assertEqual(actual_hist_spends.dtype, np.float32)
 
   def test_get_aggregated_spend_with_empty_times(self):
     actual = self.analyzer_media_and_rf.get_aggregated_spend(selected_times=[])
@@ -4464,8 +4771,9 @@ class AnalyzerNonMediaTest(tf.test.TestCase, parameterized.TestCase):
       )
 
     # Assert that _compute_incremental_outcome_aggregate was called the right
-    # number of times with the right arguments.
-    self.assertEqual(mock_compute_incremental_outcome_aggregate.call_count, 4)
+    # number of times with the right arguments. The marginal ROI is not
+    # reported for the non-paid channels, so it is not computed.
+    self.assertEqual(mock_compute_incremental_outcome_aggregate.call_count, 2)
 
     # Both calls with include_non_paid_channels=True and given
     # non_media_baseline_values
@@ -5261,6 +5569,18 @@ class AnalyzerNotFittedTest(absltest.TestCase):
     ):
       not_fitted_analyzer.rhat_summary()
 
+  def test_convergence_diagnostics_pre_fitting_raises_exception(self):
+    not_fitted_mmm = mock.create_autospec(model.Meridian, instance=True)
+    type(not_fitted_mmm).inference_data = mock.PropertyMock(
+        return_value=az.InferenceData()
+    )
+    not_fitted_analyzer = analyzer.Analyzer(not_fitted_mmm)
+    with self.assertRaisesWithLiteralMatch(
+        model.NotFittedModelError,
+        "sample_posterior() must be called prior to calling this method.",
+    ):
+      not_fitted_analyzer.convergence_diagnostics()
+
 
 def helper_sample_joint_dist_unpinned_as_posterior(self, n_draws):
   """A helper function to sample joint distribution unpinned as posterior.
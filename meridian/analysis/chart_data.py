@@ -0,0 +1,221 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Functions reducing the data embedded in the Altair charts.
+
+The charts embed their DataFrames in the VegaLite specs, so the size of the
+HTML outputs grows with the number of rows. These functions select the rows to
+embed within a budget of rows per series of a chart, or summarize the samples
+of each series in a fixed number of rows.
+"""
+
+from collections.abc import Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+__all__ = [
+    'density_curves',
+    'downsample_curves',
+    'lttb_indices',
+]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+  """Selects points of a curve with Largest-Triangle-Three-Buckets.
+
+  The first and last points are always selected. The points in between are
+  split into `n_out - 2` buckets, and the point of each bucket forming the
+  largest triangle with the previously selected point and the average of the
+  next bucket is selected. This keeps the visual shape of the curve.
+
+  Args:
+    x: Array of shape `(n,)` of increasing x-coordinates of the curve.
+    y: Array of shape `(n,)` of y-coordinates of the curve.
+    n_out: Number of points to select, at least `3`.
+
+  Returns:
+    The increasing indices of the selected points. All the indices are returned
+    if `n_out` is at least `n`.
+
+  Raises:
+    ValueError: If `n_out` is less than `3` or the shapes of `x` and `y` do not
+      match.
+  """
+  if n_out < 3:
+    raise ValueError(f'n_out must be at least 3, got {n_out}.')
+  x = np.asarray(x, dtype=float)
+  y = np.asarray(y, dtype=float)
+  if x.shape != y.shape or x.ndim != 1:
+    raise ValueError(
+        f'x and y must be 1-D arrays of the same shape, got {x.shape} and'
+        f' {y.shape}.'
+    )
+  n = x.shape[0]
+  if n_out >= n:
+    return np.arange(n)
+
+  # Bucket `i` holds the points `edges[i]:edges[i + 1]`.
+  edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(int) + 1
+  edges[-1] = n - 1
+  selected = np.empty(n_out, dtype=int)
+  selected[0] = 0
+  selected[-1] = n - 1
+  previous = 0
+  for i in range(n_out - 2):
+    start, end = edges[i], edges[i + 1]
+    next_end = edges[i + 2] if i + 2 < n_out - 1 else n
+    next_x = x[end:next_end].mean()
+    next_y = y[end:next_end].mean()
+    areas = np.abs(
+        (x[previous] - next_x) * (y[start:end] - y[previous])
+        - (x[previous] - x[start:end]) * (next_y - y[previous])
+    )
+    previous = start + int(np.argmax(areas))
+    selected[i + 1] = previous
+  return selected
+
+
+def _group_positions(
+    df: pd.DataFrame, group_by: Sequence[str | np.ndarray]
+) -> list[np.ndarray]:
+  """Returns the row positions of each group of `df`."""
+  return list(df.groupby(list(group_by), sort=False).indices.values())
+
+
+def _select_rows(
+    df: pd.DataFrame,
+    group_by: Sequence[str | np.ndarray],
+    select_positions: Callable[[np.ndarray], np.ndarray],
+) -> pd.DataFrame:
+  """Keeps the rows selected in each group, and the rows of no group."""
+  keep = np.ones(len(df), dtype=bool)
+  for positions in _group_positions(df, group_by):
+    keep[positions] = False
+    keep[select_positions(positions)] = True
+  return df.iloc[np.flatnonzero(keep)]
+
+
+def downsample_curves(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    group_by: Sequence[str | np.ndarray],
+    max_points: int | None,
+) -> pd.DataFrame:
+  """Downsamples each curve of a DataFrame with `lttb_indices()`.
+
+  Args:
+    df: DataFrame with a row per point of the curves.
+    x: Column of the x-coordinates of the curves.
+    y: Column of the y-coordinates used to select the points, such as the
+      mean. The other columns, such as the credible interval bounds, are kept
+      for the selected points.
+    group_by: Columns, or arrays of length `len(df)`, identifying the curves.
+      Rows with a missing group key, such as histogram rows stored with the
+      curves, are kept as they are.
+    max_points: Maximum number of points per curve, at least `3`. If `None`,
+      `df` is returned unchanged.
+
+  Returns:
+    The rows of `df` of the selected points, in their original order.
+  """
+  if max_points is None:
+    return df
+
+  x_values = df[x].to_numpy()
+  y_values = df[y].to_numpy()
+
+  def _select(positions: np.ndarray) -> np.ndarray:
+    positions = positions[np.argsort(x_values[positions], kind='stable')]
+    return positions[
+        lttb_indices(x_values[positions], y_values[positions], max_points)
+    ]
+
+  return _select_rows(df, group_by, _select)
+
+
+def density_curves(
+    samples: np.ndarray, n_points: int
+) -> tuple[np.ndarray, np.ndarray]:
+  """Estimates the densities of several series of samples at once.
+
+  The density of each series is a Gaussian kernel density estimate with the
+  bandwidth of Scott's rule, as in VegaLite's density transform, evaluated on
+  `n_points` evenly spaced points between the minimum and maximum samples. The
+  samples are linearly binned on these points and the bins are convolved with
+  the kernel with FFTs, so the cost grows linearly with the number of samples.
+
+  Args:
+    samples: Array of shape `(n_samples, n_series)`.
+    n_points: Number of points of each density curve, at least `2`.
+
+  Returns:
+    The points and the densities of each series, both of shape
+    `(n_points, n_series)`. The densities of constant series are `nan`.
+
+  Raises:
+    ValueError: If `n_points` is less than `2` or `samples` is not 2-D.
+  """
+  if n_points < 2:
+    raise ValueError(f'n_points must be at least 2, got {n_points}.')
+  samples = np.asarray(samples, dtype=float)
+  if samples.ndim != 2:
+    raise ValueError(
+        f'samples must have shape (n_samples, n_series), got {samples.shape}.'
+    )
+  n_samples, n_series = samples.shape
+  low = samples.min(axis=0)
+  high = samples.max(axis=0)
+  points = low + (high - low) * np.linspace(0.0, 1.0, n_points)[:, np.newaxis]
+  sd = samples.std(axis=0, ddof=1) if n_samples > 1 else np.zeros(n_series)
+  q25, q75 = np.percentile(samples, [25, 75], axis=0)
+  spread = np.minimum(sd, (q75 - q25) / 1.34)
+  spread = np.where(spread > 0, spread, sd)
+  degenerate = ~(high > low) | ~(spread > 0)
+  step = np.where(degenerate, 1.0, (high - low) / (n_points - 1))
+  bandwidth = np.where(degenerate, 1.0, 1.06 * spread * n_samples**-0.2)
+
+  # Linear binning, with the weight of each sample split between the two
+  # nearest points.
+  position = (samples - low) / step
+  left = np.clip(np.floor(position), 0, n_points - 2).astype(int)
+  right_weight = np.clip(position - left, 0.0, 1.0)
+  series = np.arange(n_series)
+  counts = np.bincount(
+      (left * n_series + series).ravel(),
+      weights=(1.0 - right_weight).ravel(),
+      minlength=n_points * n_series,
+  ) + np.bincount(
+      ((left + 1) * n_series + series).ravel(),
+      weights=right_weight.ravel(),
+      minlength=n_points * n_series,
+  )
+  counts = counts.reshape(n_points, n_series)
+
+  # Linear convolution of the bins with the kernel, without wrapping around.
+  n_fft = 2 * n_points
+  lag = np.arange(n_fft)
+  lag = np.minimum(lag, n_fft - lag)[:, np.newaxis]
+  kernel = np.exp(-0.5 * np.square(lag * step / bandwidth))
+  smoothed = np.fft.irfft(
+      np.fft.rfft(counts, n=n_fft, axis=0) * np.fft.rfft(kernel, axis=0),
+      n=n_fft,
+      axis=0,
+  )[:n_points]
+  density = np.maximum(smoothed, 0.0) / (
+      n_samples * bandwidth * np.sqrt(2 * np.pi)
+  )
+  return points, np.where(degenerate, np.nan, density)
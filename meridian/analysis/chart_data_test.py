@@ -0,0 +1,125 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+from absl.testing import parameterized
+from meridian.analysis import chart_data
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+class LttbIndicesTest(parameterized.TestCase):
+
+  def test_keeps_endpoints_and_budget(self):
+    x = np.linspace(0, 10, 500)
+    indices = chart_data.lttb_indices(x, 1 - np.exp(-x), 50)
+
+    self.assertLen(indices, 50)
+    self.assertEqual(indices[0], 0)
+    self.assertEqual(indices[-1], 499)
+    self.assertTrue(np.all(np.diff(indices) > 0))
+
+  def test_keeps_peak(self):
+    x = np.arange(100.0)
+    y = np.zeros(100)
+    y[37] = 1.0
+
+    self.assertIn(37, chart_data.lttb_indices(x, y, 10))
+
+  def test_returns_all_indices_within_budget(self):
+    np.testing.assert_array_equal(
+        chart_data.lttb_indices(np.arange(5.0), np.arange(5.0), 10),
+        np.arange(5),
+    )
+
+  @parameterized.named_parameters(
+      ('too_few_points', np.arange(5.0), np.arange(5.0), 2, 'at least 3'),
+      ('mismatched_shapes', np.arange(5.0), np.arange(4.0), 3, 'same shape'),
+  )
+  def test_invalid_arguments_raise_error(self, x, y, n_out, error):
+    with self.assertRaisesRegex(ValueError, error):
+      chart_data.lttb_indices(x, y, n_out)
+
+
+class DownsampleCurvesTest(absltest.TestCase):
+
+  def test_downsamples_each_curve_and_keeps_other_rows(self):
+    x = np.linspace(0, 1, 200)
+    curves = pd.DataFrame({
+        'channel': np.repeat(['a', 'b'], 200),
+        'distribution': 'posterior',
+        'x': np.tile(x, 2),
+        'y': np.tile(x**2, 2),
+    })
+    histogram = pd.DataFrame({'channel': ['a', 'b'], 'count': [1.0, 2.0]})
+    df = pd.concat([curves, histogram])
+
+    result = chart_data.downsample_curves(
+        df, x='x', y='y', group_by=['channel', 'distribution'], max_points=20
+    )
+
+    self.assertLen(result, 42)
+    self.assertEqual(result.groupby('channel')['x'].count().tolist(), [20, 20])
+    self.assertEqual(result['count'].dropna().tolist(), [1.0, 2.0])
+
+  def test_none_budget_returns_dataframe(self):
+    df = pd.DataFrame({'channel': ['a'] * 10, 'x': range(10), 'y': range(10)})
+
+    result = chart_data.downsample_curves(
+        df, x='x', y='y', group_by=['channel'], max_points=None
+    )
+
+    self.assertIs(result, df)
+
+
+class DensityCurvesTest(absltest.TestCase):
+
+  def test_matches_gaussian_kde(self):
+    samples = np.random.default_rng(0).normal(
+        loc=[0.0, 5.0], scale=[1.0, 0.1], size=(4000, 2)
+    )
+
+    points, density = chart_data.density_curves(samples, n_points=200)
+
+    self.assertEqual(points.shape, (200, 2))
+    np.testing.assert_allclose(
+        points[[0, -1]], [samples.min(axis=0), samples.max(axis=0)]
+    )
+    for i in range(2):
+      sd = samples[:, i].std(ddof=1)
+      iqr = np.subtract(*np.percentile(samples[:, i], [75, 25]))
+      bandwidth = 1.06 * min(sd, iqr / 1.34) * 4000**-0.2
+      expected = stats.gaussian_kde(samples[:, i], bw_method=bandwidth / sd)(
+          points[:, i]
+      )
+      np.testing.assert_allclose(
+          density[:, i], expected, rtol=0.05, atol=0.01 * expected.max()
+      )
+
+  def test_constant_series_has_no_density(self):
+    samples = np.stack([np.ones(10), np.arange(10.0)], axis=1)
+
+    _, density = chart_data.density_curves(samples, n_points=5)
+
+    self.assertTrue(np.isnan(density[:, 0]).all())
+    self.assertFalse(np.isnan(density[:, 1]).any())
+
+  def test_invalid_n_points_raises_error(self):
+    with self.assertRaisesRegex(ValueError, 'at least 2'):
+      chart_data.density_curves(np.zeros((3, 1)), n_points=1)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,280 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Precomputed posterior mean contributions of a model for date range queries.
+
+A `ContributionCube` holds the posterior mean incremental outcome of each
+channel, the expected, baseline and actual outcome and the spend, per geo and
+time period. It is computed once with `Analyzer.compute_contribution_cube()`
+and can be saved next to the model. The range totals are then differences of
+prefix sums along the time axis, computed with NumPy without running the model:
+
+```python
+cube = analyzer.Analyzer(mmm).compute_contribution_cube()
+contribution_cube.save_cube(cube, f'{model_path}.cube')
+
+cube = contribution_cube.load_cube(f'{model_path}.cube')
+cube.summary(start_date='2024-01-01', end_date='2024-03-31')
+```
+
+The cube holds posterior means only. The credible intervals require the draws,
+see `Analyzer.summary_metrics()` and `Analyzer.time_resolved_outcome()`.
+"""
+
+from collections.abc import Sequence
+import os
+
+import joblib
+from meridian import constants
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+
+__all__ = [
+    'ContributionCube',
+    'load_cube',
+    'save_cube',
+]
+
+
+_CHANNEL_VARS = (constants.INCREMENTAL_OUTCOME, constants.SPEND)
+_OUTCOME_VARS = (constants.EXPECTED, constants.BASELINE, constants.ACTUAL)
+
+
+def _prefix_sums(values: np.ndarray) -> np.ndarray:
+  """Returns the prefix sums along the time axis `1`, starting with zeros."""
+  values = np.asarray(values, dtype=np.float64)
+  prefix_sums = np.zeros(
+      (values.shape[0], values.shape[1] + 1, *values.shape[2:])
+  )
+  np.cumsum(values, axis=1, out=prefix_sums[:, 1:])
+  return prefix_sums
+
+
+class ContributionCube:
+  """Posterior mean contributions per geo and time with prefix sums.
+
+  The totals of a date range cost `O(n_channels)` for all the geos, and
+  `O(n_selected_geos * n_channels)` for a subset of geos, whatever the number
+  of time periods in the range.
+  """
+
+  def __init__(self, data: xr.Dataset):
+    """Initializes the cube.
+
+    Args:
+      data: Dataset with `geo`, `time` and `channel` coordinates, and the
+        following data variables:
+
+        *   `incremental_outcome`: `(geo, time, channel)` posterior mean
+            incremental outcome.
+        *   `spend`: `(geo, time, channel)` spend, `nan` for the non-paid
+            channels.
+        *   `expected`, `baseline`, `actual`: `(geo, time)` posterior mean
+            expected and baseline outcome, and actual outcome.
+
+    Raises:
+      ValueError: If a data variable is missing or has other dimensions.
+    """
+    for name, dims in [
+        *((name, (constants.GEO, constants.TIME, constants.CHANNEL))
+          for name in _CHANNEL_VARS),
+        *((name, (constants.GEO, constants.TIME)) for name in _OUTCOME_VARS),
+    ]:
+      if name not in data.data_vars:
+        raise ValueError(f'The cube data must have a `{name}` variable.')
+      if set(data[name].dims) != set(dims):
+        raise ValueError(
+            f'The `{name}` variable must have dimensions {dims}, got'
+            f' {data[name].dims}.'
+        )
+    self._data = data.transpose(constants.GEO, constants.TIME, ...)
+    self._times = pd.DatetimeIndex(
+        pd.to_datetime(self._data[constants.TIME].values)
+    )
+    self._geos = list(self._data[constants.GEO].values)
+    self._prefix_sums = {
+        name: _prefix_sums(
+            self._data[name].transpose(constants.GEO, constants.TIME, ...)
+        )
+        for name in _CHANNEL_VARS + _OUTCOME_VARS
+    }
+    self._national_prefix_sums = {
+        name: prefix_sums.sum(axis=0)
+        for name, prefix_sums in self._prefix_sums.items()
+    }
+
+  @property
+  def data(self) -> xr.Dataset:
+    return self._data
+
+  @property
+  def channels(self) -> list[str]:
+    return list(self._data[constants.CHANNEL].values)
+
+  def _range_indices(
+      self, start_date: str | None, end_date: str | None
+  ) -> tuple[int, int]:
+    """Returns the prefix sum indices of the periods within a date range."""
+    # `str` also accepts the `numpy.str_` values of the `time` coordinate, which
+    # `pd.Timestamp` rejects.
+    start = (
+        0
+        if start_date is None
+        else int(
+            self._times.searchsorted(pd.Timestamp(str(start_date)), 'left')
+        )
+    )
+    end = (
+        len(self._times)
+        if end_date is None
+        else int(self._times.searchsorted(pd.Timestamp(str(end_date)), 'right'))
+    )
+    if start >= end:
+      raise ValueError(f'No time period between {start_date} and {end_date}.')
+    return start, end
+
+  def _range_total(
+      self,
+      name: str,
+      start: int,
+      end: int,
+      selected_geos: Sequence[str] | None,
+  ) -> np.ndarray:
+    """Returns the total of a variable over a range of periods and geos."""
+    if selected_geos is None:
+      prefix_sums = self._national_prefix_sums[name]
+      return prefix_sums[end] - prefix_sums[start]
+    geo_indices = [self._geos.index(geo) for geo in selected_geos]
+    prefix_sums = self._prefix_sums[name][geo_indices]
+    return (prefix_sums[:, end] - prefix_sums[:, start]).sum(axis=0)
+
+  def summary(
+      self,
+      start_date: str | None = None,
+      end_date: str | None = None,
+      selected_geos: Sequence[str] | None = None,
+  ) -> pd.DataFrame:
+    """Summarizes the contribution of each channel over a date range.
+
+    The metrics equal the posterior means of `Analyzer.summary_metrics()`
+    with the same times and geos selected.
+
+    Args:
+      start_date: First date of the range. By default, the range starts with
+        the first time period.
+      end_date: Last date of the range, included. By default, the range ends
+        with the last time period.
+      selected_geos: Optional geos to include. By default, all the geos are
+        included.
+
+    Returns:
+      A DataFrame indexed by `channel` with the `incremental_outcome`,
+      `pct_of_contribution`, `spend`, `pct_of_spend` and `roi` columns. The
+      spend metrics and ROI of the non-paid channels are `nan`.
+
+    Raises:
+      ValueError: If no time period is within the date range.
+    """
+    start, end = self._range_indices(start_date, end_date)
+    incremental_outcome = self._range_total(
+        constants.INCREMENTAL_OUTCOME, start, end, selected_geos
+    )
+    spend = self._range_total(constants.SPEND, start, end, selected_geos)
+    expected = self._range_total(constants.EXPECTED, start, end, selected_geos)
+    with np.errstate(divide='ignore', invalid='ignore'):
+      return pd.DataFrame(
+          {
+              constants.INCREMENTAL_OUTCOME: incremental_outcome,
+              constants.PCT_OF_CONTRIBUTION: (
+                  incremental_outcome / expected * 100
+              ),
+              constants.SPEND: spend,
+              constants.PCT_OF_SPEND: spend / np.nansum(spend) * 100,
+              constants.ROI: incremental_outcome / spend,
+          },
+          index=pd.Index(self.channels, name=constants.CHANNEL),
+      )
+
+  def expected_vs_actual(
+      self,
+      start_date: str | None = None,
+      end_date: str | None = None,
+      selected_geos: Sequence[str] | None = None,
+      aggregate_times: bool = False,
+  ) -> xr.Dataset:
+    """Returns the expected, baseline and actual outcome over a date range.
+
+    Args:
+      start_date: First date of the range. By default, the range starts with
+        the first time period.
+      end_date: Last date of the range, included. By default, the range ends
+        with the last time period.
+      selected_geos: Optional geos to aggregate. By default, all the geos are
+        aggregated.
+      aggregate_times: If `True`, the outcomes are summed over the range.
+
+    Returns:
+      A Dataset with the `expected`, `baseline` and `actual` data variables,
+      aggregated over the selected geos, with a `time` dimension of the
+      periods of the range unless `aggregate_times` is `True`.
+
+    Raises:
+      ValueError: If no time period is within the date range.
+    """
+    start, end = self._range_indices(start_date, end_date)
+    if aggregate_times:
+      return xr.Dataset({
+          name: ((), self._range_total(name, start, end, selected_geos))
+          for name in _OUTCOME_VARS
+      })
+    data = self._data[list(_OUTCOME_VARS)].isel(time=slice(start, end))
+    if selected_geos is not None:
+      data = data.sel(geo=list(selected_geos))
+    return data.sum(constants.GEO)
+
+
+def save_cube(cube: ContributionCube, file_path: str):
+  """Saves a contribution cube to a `pickle` file path.
+
+  Args:
+    cube: Cube to save.
+    file_path: File path to save the cube data, for example next to the saved
+      model.
+  """
+  if os.path.dirname(file_path):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+  with open(file_path, 'wb') as f:
+    joblib.dump(cube.data, f)
+
+
+def load_cube(file_path: str) -> ContributionCube:
+  """Loads a contribution cube from a `pickle` file path.
+
+  Args:
+    file_path: File path of a cube saved with `save_cube()`.
+
+  Returns:
+    The contribution cube.
+
+  Raises:
+    FileNotFoundError: If `file_path` does not exist.
+  """
+  try:
+    with open(file_path, 'rb') as f:
+      data = joblib.load(f)
+  except FileNotFoundError:
+    raise FileNotFoundError(f'No such file or directory: {file_path}') from None
+  return ContributionCube(data)
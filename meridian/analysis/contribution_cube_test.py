@@ -0,0 +1,178 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from absl import flags
+from absl.testing import absltest
+from absl.testing import parameterized
+from meridian import constants
+from meridian.analysis import contribution_cube
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+
+_GEOS = ['geo_0', 'geo_1', 'geo_2']
+_TIMES = list(
+    pd.date_range('2024-01-01', periods=20, freq='W-MON').strftime('%Y-%m-%d')
+)
+_CHANNELS = ['tv', 'search', 'organic']
+
+
+def _cube_data() -> xr.Dataset:
+  rng = np.random.default_rng(0)
+  shape = (len(_GEOS), len(_TIMES))
+  spend = rng.gamma(5.0, size=shape + (len(_CHANNELS),))
+  spend[..., -1] = np.nan
+  return xr.Dataset(
+      data_vars={
+          constants.INCREMENTAL_OUTCOME: (
+              [constants.GEO, constants.TIME, constants.CHANNEL],
+              rng.gamma(2.0, size=shape + (len(_CHANNELS),)),
+          ),
+          constants.SPEND: (
+              [constants.GEO, constants.TIME, constants.CHANNEL],
+              spend,
+          ),
+          constants.EXPECTED: (
+              [constants.GEO, constants.TIME],
+              rng.gamma(20.0, size=shape),
+          ),
+          constants.BASELINE: (
+              [constants.GEO, constants.TIME],
+              rng.gamma(10.0, size=shape),
+          ),
+          constants.ACTUAL: (
+              [constants.GEO, constants.TIME],
+              rng.gamma(20.0, size=shape),
+          ),
+      },
+      coords={
+          constants.GEO: _GEOS,
+          constants.TIME: _TIMES,
+          constants.CHANNEL: _CHANNELS,
+      },
+  )
+
+
+class ContributionCubeTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.data = _cube_data()
+    self.cube = contribution_cube.ContributionCube(self.data)
+
+  @parameterized.named_parameters(
+      ('all_geos_and_times', None, None, None, slice(None)),
+      ('exact_dates', '2024-02-05', '2024-03-04', None, slice(5, 10)),
+      (
+          'dates_between_periods',
+          '2024-02-03',
+          '2024-03-06',
+          ['geo_2', 'geo_0'],
+          slice(5, 10),
+      ),
+  )
+  def test_summary_matches_sum_of_periods(
+      self, start_date, end_date, selected_geos, time_slice
+  ):
+    summary = self.cube.summary(
+        start_date=start_date, end_date=end_date, selected_geos=selected_geos
+    )
+
+    data = self.data.isel(time=time_slice)
+    if selected_geos is not None:
+      data = data.sel(geo=selected_geos)
+    data = data.sum([constants.GEO, constants.TIME], skipna=False)
+    incremental_outcome = data[constants.INCREMENTAL_OUTCOME].values
+    spend = data[constants.SPEND].values
+    self.assertEqual(list(summary.index), _CHANNELS)
+    np.testing.assert_allclose(
+        summary[constants.INCREMENTAL_OUTCOME], incremental_outcome
+    )
+    np.testing.assert_allclose(
+        summary[constants.PCT_OF_CONTRIBUTION],
+        incremental_outcome / data[constants.EXPECTED].values * 100,
+    )
+    np.testing.assert_allclose(summary[constants.SPEND], spend)
+    np.testing.assert_allclose(
+        summary[constants.PCT_OF_SPEND], spend / np.nansum(spend) * 100
+    )
+    np.testing.assert_allclose(
+        summary[constants.ROI], incremental_outcome / spend
+    )
+    self.assertTrue(np.isnan(summary[constants.ROI]['organic']))
+
+  def test_expected_vs_actual(self):
+    result = self.cube.expected_vs_actual(
+        start_date='2024-02-05', end_date='2024-03-04', selected_geos=['geo_1']
+    )
+
+    xr.testing.assert_allclose(
+        result,
+        self.data[[constants.EXPECTED, constants.BASELINE, constants.ACTUAL]]
+        .isel(time=slice(5, 10))
+        .sel(geo=['geo_1'])
+        .sum(constants.GEO),
+    )
+
+  def test_expected_vs_actual_aggregate_times(self):
+    result = self.cube.expected_vs_actual(aggregate_times=True)
+
+    for name in [constants.EXPECTED, constants.BASELINE, constants.ACTUAL]:
+      np.testing.assert_allclose(result[name], self.data[name].sum())
+
+  def test_summary_accepts_time_coordinate_values(self):
+    times = self.data[constants.TIME].values
+
+    summary = self.cube.summary(start_date=times[5], end_date=times[9])
+
+    pd.testing.assert_frame_equal(
+        summary,
+        self.cube.summary(start_date='2024-02-05', end_date='2024-03-04'),
+    )
+
+  def test_empty_range_raises_error(self):
+    with self.assertRaisesRegex(ValueError, 'No time period'):
+      self.cube.summary(start_date='2024-01-02', end_date='2024-01-03')
+
+  def test_missing_variable_raises_error(self):
+    with self.assertRaisesRegex(ValueError, '`baseline` variable'):
+      contribution_cube.ContributionCube(
+          self.data.drop_vars(constants.BASELINE)
+      )
+
+  def test_save_and_load_cube(self):
+    # create_tempdir() uses the --test_tmpdir flag, which is not marked as
+    # parsed when running with pytest.
+    flags.FLAGS.mark_as_parsed()
+    file_path = os.path.join(self.create_tempdir().full_path, 'model.cube')
+
+    contribution_cube.save_cube(self.cube, file_path)
+    loaded = contribution_cube.load_cube(file_path)
+
+    xr.testing.assert_identical(loaded.data, self.cube.data)
+    np.testing.assert_allclose(
+        loaded.summary(start_date='2024-02-05').to_numpy(),
+        self.cube.summary(start_date='2024-02-05').to_numpy(),
+    )
+
+  def test_load_missing_cube_raises_error(self):
+    with self.assertRaises(FileNotFoundError):
+      contribution_cube.load_cube('/non/existent/model.cube')
+
+
+if __name__ == '__main__':
+  absltest.main()
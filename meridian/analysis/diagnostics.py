@@ -0,0 +1,493 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Convergence diagnostics of the posterior draws of a model.
+
+The diagnostics are computed with NumPy on chunks of the elements of each
+parameter, so that the memory used is bounded by `max_chunk_elements` draws
+rather than by the size of the largest parameter, such as `beta_gm` or `mu_t`.
+The draws are arrays of shape `(n_chains, n_draws, ...)`, as in the posterior
+group of the inference data.
+
+`RhatAccumulator` computes R-hat from blocks of draws, for example the draws of
+successive `sample_posterior()` runs resumed from the last state, without
+keeping the earlier blocks:
+
+```python
+accumulator = diagnostics.RhatAccumulator()
+for posterior in posterior_blocks:
+  accumulator.update(posterior)
+  print(accumulator.rhat())
+```
+
+References:
+  Andrew Gelman and Donald B. Rubin. Inference from Iterative Simulation Using
+    Multiple Sequences. Statistical Science, 7(4):457-472, 1992.
+  Aki Vehtari, Andrew Gelman, Daniel Simpson, Bob Carpenter and Paul-Christian
+    Bürkner. Rank-Normalization, Folding, and Localization: An Improved R-hat
+    for Assessing Convergence of MCMC. Bayesian Analysis, 16(2):667-718, 2021.
+"""
+
+from collections.abc import Callable, Iterator, Mapping, Sequence
+
+from meridian import constants
+import numpy as np
+from scipy import fft
+from scipy import special
+from scipy import stats
+import xarray as xr
+
+
+__all__ = [
+    'DEFAULT_MAX_CHUNK_ELEMENTS',
+    'RhatAccumulator',
+    'convergence_diagnostics',
+    'ess_bulk',
+    'ess_tail',
+    'mcse_mean',
+    'potential_scale_reduction',
+]
+
+
+# Maximum number of draws of a chunk of parameter elements, about 32 MiB of
+# float64 values.
+DEFAULT_MAX_CHUNK_ELEMENTS = 2**22
+
+_DIAGNOSTICS = (
+    constants.RHAT,
+    constants.ESS_BULK,
+    constants.ESS_TAIL,
+    constants.MCSE_MEAN,
+)
+# R-hat needs two draws per chain, and the ESS four draws per chain, since it
+# is computed on the split chains.
+_MIN_RHAT_DRAWS = 2
+_MIN_ESS_DRAWS = 4
+
+
+def _validate_draws(draws: np.ndarray, min_draws: int) -> np.ndarray:
+  draws = np.asarray(draws)
+  if draws.ndim < 2:
+    raise ValueError(
+        'draws must have shape (n_chains, n_draws, ...), got'
+        f' {draws.shape}.'
+    )
+  if draws.shape[1] < min_draws:
+    raise ValueError(
+        f'draws must have at least {min_draws} draws per chain, got'
+        f' {draws.shape[1]}.'
+    )
+  return draws
+
+
+def _chunks(
+    draws: np.ndarray, max_chunk_elements: int
+) -> Iterator[tuple[slice, np.ndarray]]:
+  """Yields chunks of the flattened parameter elements of `draws`.
+
+  Args:
+    draws: Array of shape `(n_chains, n_draws, ...)`.
+    max_chunk_elements: Maximum number of draws of a chunk.
+
+  Yields:
+    The slice of the flattened parameter elements of each chunk, and the float64
+    draws of the chunk, of shape `(n_chains, n_draws, n_elements)`.
+  """
+  if max_chunk_elements < 1:
+    raise ValueError(
+        f'max_chunk_elements must be positive, got {max_chunk_elements}.'
+    )
+  n_chains, n_draws = draws.shape[:2]
+  flat = draws.reshape(n_chains, n_draws, -1)
+  width = max(1, max_chunk_elements // (n_chains * n_draws))
+  for start in range(0, flat.shape[2], width):
+    elements = slice(start, min(start + width, flat.shape[2]))
+    yield elements, flat[:, :, elements].astype(np.float64)
+
+
+def _chain_moments(
+    draws: np.ndarray,
+) -> tuple[int, np.ndarray, np.ndarray]:
+  """Returns the draws, means and sums of squared deviations of each chain."""
+  means = draws.mean(axis=1)
+  m2s = np.square(draws - means[:, np.newaxis]).sum(axis=1)
+  return draws.shape[1], means, m2s
+
+
+def _rhat_from_moments(
+    n_draws: int, means: np.ndarray, m2s: np.ndarray
+) -> np.ndarray:
+  """Returns R-hat from the moments of each chain.
+
+  This is the potential scale reduction of `tfp.mcmc.potential_scale_reduction`
+  with `split_chains=False`.
+
+  Args:
+    n_draws: Number of draws of each chain.
+    means: Array of shape `(n_chains, ...)` of the means of each chain.
+    m2s: Array of shape `(n_chains, ...)` of the sums of squared deviations of
+      each chain.
+
+  Returns:
+    Array of shape `means.shape[1:]` of the R-hat values.
+  """
+  n_chains = means.shape[0]
+  with np.errstate(divide='ignore', invalid='ignore'):
+    within = np.mean(m2s / (n_draws - 1), axis=0)
+    between_div_n = np.var(means, axis=0, ddof=1)
+    sigma_2_plus = (n_draws - 1) / n_draws * within + between_div_n
+    return (n_chains + 1) / n_chains * sigma_2_plus / within - (
+        n_draws - 1
+    ) / (n_chains * n_draws)
+
+
+def _split_chains(draws: np.ndarray) -> np.ndarray:
+  """Splits each chain in halves, dropping the middle draw of odd chains."""
+  half = draws.shape[1] // 2
+  return np.concatenate([draws[:, :half], draws[:, -half:]], axis=0)
+
+
+def _rank_normalize(draws: np.ndarray) -> np.ndarray:
+  """Replaces the draws with the normal scores of their pooled ranks."""
+  shape = draws.shape
+  n = shape[0] * shape[1]
+  ranks = stats.rankdata(draws.reshape(n, -1), axis=0)
+  return special.ndtri((ranks - 0.375) / (n + 0.25)).reshape(shape)
+
+
+def _ess(draws: np.ndarray) -> np.ndarray:
+  """Returns the effective sample size of each element of a chunk.
+
+  The autocorrelations are estimated with FFTs and summed with Geyer's initial
+  monotone sequence estimator, as in Vehtari et al. (2021) and
+  `arviz.ess()`. The sum stops at the first pair of autocorrelations with a
+  non-positive sum, and the even autocorrelation of that pair is added once if
+  it is positive.
+
+  Args:
+    draws: Array of shape `(n_chains, n_draws, n_elements)`.
+
+  Returns:
+    Array of shape `(n_elements,)`. As in `arviz.ess()`, the effective sample
+    size of constant elements is the number of draws.
+  """
+  n_chains, n_draws = draws.shape[:2]
+  centered = draws - draws.mean(axis=1, keepdims=True)
+  n_fft = fft.next_fast_len(2 * n_draws)
+  spectrum = fft.rfft(centered, n=n_fft, axis=1)
+  acov = (
+      fft.irfft(np.square(np.abs(spectrum)), n=n_fft, axis=1)[:, :n_draws]
+      / n_draws
+  )
+  mean_var = acov[:, 0].mean(axis=0) * n_draws / (n_draws - 1)
+  var_plus = mean_var * (n_draws - 1) / n_draws
+  if n_chains > 1:
+    var_plus = var_plus + np.var(draws.mean(axis=1), axis=0, ddof=1)
+
+  with np.errstate(divide='ignore', invalid='ignore'):
+    rho = 1.0 - (mean_var - acov.mean(axis=0)) / var_plus
+    rho[0] = 1.0
+    # Pairs of autocorrelations at lags (2k, 2k + 1), for the lags below
+    # `n_draws - 2`.
+    max_pair = len(range(1, n_draws - 3, 2))
+    pairs = rho[0 : 2 * max_pair + 2 : 2] + rho[1 : 2 * max_pair + 2 : 2]
+    # Index of the first pair with a non-positive sum, or the last pair.
+    n_positive = np.sum(np.cumprod(pairs[:max_pair] > 0, axis=0), axis=0)
+    monotone = np.minimum.accumulate(pairs, axis=0)
+    positive_sum = np.sum(
+        np.where(
+            np.arange(max_pair + 1)[:, np.newaxis] < n_positive, monotone, 0.0
+        ),
+        axis=0,
+    )
+    last_even = np.take_along_axis(rho, 2 * n_positive[np.newaxis], axis=0)[0]
+    last_pair = np.take_along_axis(pairs, n_positive[np.newaxis], axis=0)[0]
+    tau = (
+        -1.0
+        + 2.0 * positive_sum
+        + np.where((last_even > 0) | (last_pair >= 0), last_even, 0.0)
+    )
+    # Caps the effective sample size of antithetic chains.
+    n = n_chains * n_draws
+    tau = np.maximum(tau, 1.0 / np.log10(n))
+    constant = np.ptp(draws, axis=(0, 1)) < np.finfo(np.float64).resolution
+    return np.where(constant, n, n / tau)
+
+
+def _ess_bulk(draws: np.ndarray) -> np.ndarray:
+  return _ess(_rank_normalize(_split_chains(draws)))
+
+
+def _ess_tail(draws: np.ndarray) -> np.ndarray:
+  pooled = draws.reshape(-1, draws.shape[2])
+  lower, upper = np.quantile(pooled, [0.05, 0.95], axis=0)
+  return np.minimum(
+      _ess(_split_chains(draws <= lower).astype(np.float64)),
+      _ess(_split_chains(draws <= upper).astype(np.float64)),
+  )
+
+
+def _mcse_mean(draws: np.ndarray) -> np.ndarray:
+  pooled = draws.reshape(-1, draws.shape[2])
+  return np.std(pooled, axis=0, ddof=1) / np.sqrt(
+      _ess(_split_chains(draws))
+  )
+
+
+def _chunk_diagnostics(draws: np.ndarray) -> np.ndarray:
+  """Returns the diagnostics of a chunk, of shape `(4, n_elements)`."""
+  return np.stack([
+      _rhat_from_moments(*_chain_moments(draws)),
+      _ess_bulk(draws),
+      _ess_tail(draws),
+      _mcse_mean(draws),
+  ])
+
+
+def _map_chunks(
+    fn: Callable[[np.ndarray], np.ndarray],
+    draws: np.ndarray,
+    max_chunk_elements: int,
+    min_draws: int = _MIN_ESS_DRAWS,
+) -> np.ndarray:
+  """Applies `fn` to the chunks of `draws`.
+
+  Args:
+    fn: Function mapping a chunk of shape `(n_chains, n_draws, n_elements)` to
+      an array of shape `(..., n_elements)`.
+    draws: Array of shape `(n_chains, n_draws, ...)`.
+    max_chunk_elements: Maximum number of draws of a chunk.
+    min_draws: Minimum number of draws per chain.
+
+  Returns:
+    The concatenated results of `fn`, of shape `(...,) + draws.shape[2:]`.
+  """
+  draws = _validate_draws(draws, min_draws)
+  results = [fn(chunk) for _, chunk in _chunks(draws, max_chunk_elements)]
+  return np.concatenate(results, axis=-1).reshape(
+      results[0].shape[:-1] + draws.shape[2:]
+  )
+
+
+def potential_scale_reduction(
+    draws: np.ndarray, max_chunk_elements: int = DEFAULT_MAX_CHUNK_ELEMENTS
+) -> np.ndarray:
+  """Computes the Gelman & Rubin (1992) potential scale reduction (R-hat).
+
+  This matches `tfp.mcmc.potential_scale_reduction` with the draws of each
+  chain as the independent chains, without copying the draws of a parameter.
+
+  Args:
+    draws: Array of shape `(n_chains, n_draws, ...)`.
+    max_chunk_elements: Maximum number of draws processed at once.
+
+  Returns:
+    Array of shape `draws.shape[2:]` of the R-hat values.
+  """
+  return _map_chunks(
+      lambda chunk: _rhat_from_moments(*_chain_moments(chunk)),
+      draws,
+      max_chunk_elements,
+      min_draws=_MIN_RHAT_DRAWS,
+  )
+
+
+def ess_bulk(
+    draws: np.ndarray, max_chunk_elements: int = DEFAULT_MAX_CHUNK_ELEMENTS
+) -> np.ndarray:
+  """Computes the bulk effective sample size of Vehtari et al. (2021).
+
+  Args:
+    draws: Array of shape `(n_chains, n_draws, ...)`.
+    max_chunk_elements: Maximum number of draws processed at once.
+
+  Returns:
+    Array of shape `draws.shape[2:]` of the effective sample sizes of the
+    rank-normalized split chains.
+  """
+  return _map_chunks(_ess_bulk, draws, max_chunk_elements)
+
+
+def ess_tail(
+    draws: np.ndarray, max_chunk_elements: int = DEFAULT_MAX_CHUNK_ELEMENTS
+) -> np.ndarray:
+  """Computes the tail effective sample size of Vehtari et al. (2021).
+
+  Args:
+    draws: Array of shape `(n_chains, n_draws, ...)`.
+    max_chunk_elements: Maximum number of draws processed at once.
+
+  Returns:
+    Array of shape `draws.shape[2:]` of the minimum of the effective sample
+    sizes of the 5% and 95% quantile indicators of the split chains.
+  """
+  return _map_chunks(_ess_tail, draws, max_chunk_elements)
+
+
+def mcse_mean(
+    draws: np.ndarray, max_chunk_elements: int = DEFAULT_MAX_CHUNK_ELEMENTS
+) -> np.ndarray:
+  """Computes the Monte Carlo standard error of the posterior mean.
+
+  Args:
+    draws: Array of shape `(n_chains, n_draws, ...)`.
+    max_chunk_elements: Maximum number of draws processed at once.
+
+  Returns:
+    Array of shape `draws.shape[2:]` of the standard deviations of the draws
+    divided by the square roots of their effective sample sizes.
+  """
+  return _map_chunks(_mcse_mean, draws, max_chunk_elements)
+
+
+def _draws(data_array: xr.DataArray) -> np.ndarray:
+  return data_array.transpose(constants.CHAIN, constants.DRAW, ...).values
+
+
+def convergence_diagnostics(
+    posterior: xr.Dataset,
+    var_names: Sequence[str] | None = None,
+    max_chunk_elements: int = DEFAULT_MAX_CHUNK_ELEMENTS,
+) -> xr.Dataset:
+  """Computes the R-hat, bulk and tail ESS and MCSE of posterior draws.
+
+  Args:
+    posterior: Dataset of draws with `chain` and `draw` dimensions, such as the
+      posterior group of the inference data.
+    var_names: Variables to diagnose. If `None`, all the data variables are
+      diagnosed.
+    max_chunk_elements: Maximum number of draws processed at once.
+
+  Returns:
+    A Dataset with a data variable per diagnosed variable, with a `metric`
+    dimension of `rhat`, `ess_bulk`, `ess_tail` and `mcse_mean` followed by the
+    parameter dimensions of the variable.
+  """
+  names = list(posterior.data_vars) if var_names is None else list(var_names)
+  data_vars = {}
+  for name in names:
+    data_array = posterior[name]
+    param_dims = [
+        dim
+        for dim in data_array.dims
+        if dim not in (constants.CHAIN, constants.DRAW)
+    ]
+    values = _map_chunks(
+        _chunk_diagnostics, _draws(data_array), max_chunk_elements
+    )
+    data_vars[name] = ([constants.METRIC] + param_dims, values)
+  return xr.Dataset(
+      data_vars,
+      coords={constants.METRIC: list(_DIAGNOSTICS)},
+  )
+
+
+class RhatAccumulator:
+  """Accumulates R-hat over successive blocks of draws.
+
+  The accumulator keeps the number of draws, the means and the sums of squared
+  deviations of each chain, merged with the formula of Chan et al. (1979), so
+  its memory does not grow with the number of draws. `rhat()` equals
+  `potential_scale_reduction()` of the concatenated blocks.
+  """
+
+  def __init__(self, max_chunk_elements: int = DEFAULT_MAX_CHUNK_ELEMENTS):
+    """Initializes the accumulator.
+
+    Args:
+      max_chunk_elements: Maximum number of draws processed at once.
+    """
+    self._max_chunk_elements = max_chunk_elements
+    self._n_draws = 0
+    self._means = {}
+    self._m2s = {}
+
+  @property
+  def n_draws(self) -> int:
+    """Number of draws per chain accumulated so far."""
+    return self._n_draws
+
+  def _block_moments(
+      self, name: str, values: np.ndarray
+  ) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the means and sums of squared deviations of a block."""
+    if values.ndim < 2 or not values.shape[1]:
+      raise ValueError(
+          f'draws of {name} must have shape (n_chains, n_draws, ...) with at'
+          f' least one draw, got {values.shape}.'
+      )
+    shape = values.shape[:1] + values.shape[2:]
+    if name in self._means and shape != self._means[name].shape:
+      raise ValueError(
+          f'Expected draws of {name} of shape (n_chains, n_draws) +'
+          f' {self._means[name].shape[1:]} with'
+          f' {self._means[name].shape[0]} chains, got {values.shape}.'
+      )
+    means = np.empty((values.shape[0], int(np.prod(shape[1:], dtype=int))))
+    m2s = np.empty_like(means)
+    for elements, chunk in _chunks(values, self._max_chunk_elements):
+      _, means[:, elements], m2s[:, elements] = _chain_moments(chunk)
+    return means.reshape(shape), m2s.reshape(shape)
+
+  def update(self, draws: xr.Dataset | Mapping[str, np.ndarray]):
+    """Adds a block of draws.
+
+    Args:
+      draws: Dataset with `chain` and `draw` dimensions, or mapping of names
+        to arrays of shape `(n_chains, n_draws, ...)`, of the next draws of
+        each chain. All blocks have the same variables and chains.
+
+    Raises:
+      ValueError: If the variables, chains or numbers of draws of the block do
+        not match.
+    """
+    if isinstance(draws, xr.Dataset):
+      draws = {name: _draws(draws[name]) for name in draws.data_vars}
+    draws = {name: np.asarray(values) for name, values in draws.items()}
+    if self._means and set(draws) != set(self._means):
+      raise ValueError(
+          f'Expected draws of {sorted(self._means)}, got {sorted(draws)}.'
+      )
+    n_block = {values.shape[1] for values in draws.values() if values.ndim > 1}
+    if len(n_block) > 1:
+      raise ValueError(
+          f'All variables must have the same number of draws, got {n_block}.'
+      )
+    block_moments = {
+        name: self._block_moments(name, values)
+        for name, values in draws.items()
+    }
+    if not block_moments:
+      return
+
+    n_a = self._n_draws
+    n_b = n_block.pop()
+    total = n_a + n_b
+    for name, (mean_b, m2_b) in block_moments.items():
+      if not n_a:
+        self._means[name], self._m2s[name] = mean_b, m2_b
+        continue
+      delta = mean_b - self._means[name]
+      self._means[name] = self._means[name] + delta * n_b / total
+      self._m2s[name] = (
+          self._m2s[name] + m2_b + np.square(delta) * n_a * n_b / total
+      )
+    self._n_draws = total
+
+  def rhat(self) -> dict[str, np.ndarray]:
+    """Returns the R-hat of each variable over the draws accumulated so far."""
+    return {
+        name: _rhat_from_moments(self._n_draws, mean, self._m2s[name])
+        for name, mean in self._means.items()
+    }
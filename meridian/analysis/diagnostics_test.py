@@ -0,0 +1,228 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+from absl.testing import parameterized
+import arviz as az
+from meridian import constants
+from meridian.analysis import diagnostics
+import numpy as np
+import tensorflow_probability as tfp
+import xarray as xr
+
+
+_N_CHAINS = 4
+_N_DRAWS = 1000
+
+
+def _ar1_draws(phi: float, shape: tuple[int, ...], seed: int) -> np.ndarray:
+  """Returns AR(1) chains of shape `(n_chains, n_draws, ...)`."""
+  rng = np.random.default_rng(seed)
+  noise = rng.normal(size=shape)
+  draws = np.empty(shape)
+  draws[:, 0] = noise[:, 0]
+  for t in range(1, shape[1]):
+    draws[:, t] = phi * draws[:, t - 1] + np.sqrt(1 - phi**2) * noise[:, t]
+  return draws
+
+
+class PotentialScaleReductionTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('one_element_per_chunk', 1),
+      ('several_elements_per_chunk', 3 * _N_CHAINS * _N_DRAWS),
+      ('single_chunk', diagnostics.DEFAULT_MAX_CHUNK_ELEMENTS),
+  )
+  def test_matches_tfp(self, max_chunk_elements):
+    draws = np.random.default_rng(0).normal(size=(_N_CHAINS, _N_DRAWS, 2, 5))
+    draws[0] += 0.5
+
+    expected = tfp.mcmc.potential_scale_reduction(
+        np.swapaxes(draws, 0, 1)
+    ).numpy()
+
+    np.testing.assert_allclose(
+        diagnostics.potential_scale_reduction(
+            draws, max_chunk_elements=max_chunk_elements
+        ),
+        expected,
+        rtol=1e-6,
+    )
+
+  def test_two_draws_match_tfp(self):
+    draws = np.random.default_rng(0).normal(size=(_N_CHAINS, 2, 3))
+
+    np.testing.assert_allclose(
+        diagnostics.potential_scale_reduction(draws),
+        tfp.mcmc.potential_scale_reduction(np.swapaxes(draws, 0, 1)).numpy(),
+        rtol=1e-6,
+    )
+
+  def test_too_few_draws_raises_error(self):
+    with self.assertRaisesRegex(ValueError, 'at least 2 draws'):
+      diagnostics.potential_scale_reduction(np.zeros((2, 1)))
+
+
+class EffectiveSampleSizeTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('independent', 4, 100, 0.0),
+      ('autocorrelated', 4, 100, 0.9),
+      ('antithetic', 2, 50, -0.7),
+      ('single_chain', 1, 30, 0.5),
+      ('odd_draws', 3, 15, 0.3),
+      ('few_draws', 2, 5, 0.6),
+  )
+  def test_matches_arviz(self, n_chains, n_draws, phi):
+    draws = _ar1_draws(phi, (n_chains, n_draws, 4), seed=4)
+    dataset = az.convert_to_dataset(draws)
+
+    for method, actual in (
+        ('bulk', diagnostics.ess_bulk(draws)),
+        ('tail', diagnostics.ess_tail(draws)),
+    ):
+      np.testing.assert_allclose(
+          actual, az.ess(dataset, method=method)['x'].values, rtol=1e-10
+      )
+    np.testing.assert_allclose(
+        diagnostics.mcse_mean(draws),
+        az.mcse(dataset, method='mean')['x'].values,
+        rtol=1e-10,
+    )
+
+  def test_independent_draws(self):
+    draws = _ar1_draws(0.0, (_N_CHAINS, _N_DRAWS, 3), seed=1)
+    n = _N_CHAINS * _N_DRAWS
+
+    np.testing.assert_allclose(diagnostics.ess_bulk(draws), n, rtol=0.15)
+    np.testing.assert_allclose(diagnostics.ess_tail(draws), n, rtol=0.25)
+    np.testing.assert_allclose(
+        diagnostics.mcse_mean(draws), 1 / np.sqrt(n), rtol=0.15
+    )
+
+  def test_autocorrelated_draws(self):
+    phi = 0.9
+    draws = _ar1_draws(phi, (_N_CHAINS, _N_DRAWS, 3), seed=2)
+    expected = _N_CHAINS * _N_DRAWS * (1 - phi) / (1 + phi)
+
+    np.testing.assert_allclose(diagnostics.ess_bulk(draws), expected, rtol=0.4)
+
+  def test_constant_draws_are_independent(self):
+    draws = np.ones((2, 10))
+
+    self.assertEqual(diagnostics.ess_bulk(draws), 20)
+    self.assertEqual(diagnostics.ess_tail(draws), 20)
+    self.assertEqual(diagnostics.mcse_mean(draws), 0)
+
+  def test_too_few_draws_raises_error(self):
+    with self.assertRaisesRegex(ValueError, 'at least 4 draws'):
+      diagnostics.ess_bulk(np.zeros((2, 3)))
+
+
+class ConvergenceDiagnosticsTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    rng = np.random.default_rng(3)
+    self.posterior = xr.Dataset(
+        {
+            'alpha': (
+                [constants.CHAIN, constants.DRAW],
+                rng.normal(size=(_N_CHAINS, 100)),
+            ),
+            'beta': (
+                [constants.CHAIN, constants.DRAW, 'geo', 'channel'],
+                rng.normal(size=(_N_CHAINS, 100, 3, 2)),
+            ),
+        },
+        coords={'geo': ['a', 'b', 'c'], 'channel': ['x', 'y']},
+    )
+
+  def test_dimensions(self):
+    result = diagnostics.convergence_diagnostics(self.posterior)
+
+    self.assertEqual(
+        list(result[constants.METRIC].values),
+        [
+            constants.RHAT,
+            constants.ESS_BULK,
+            constants.ESS_TAIL,
+            constants.MCSE_MEAN,
+        ],
+    )
+    self.assertEqual(result['alpha'].dims, (constants.METRIC,))
+    self.assertEqual(result['beta'].dims, (constants.METRIC, 'geo', 'channel'))
+    np.testing.assert_allclose(
+        result['beta'].sel(metric=constants.RHAT),
+        diagnostics.potential_scale_reduction(self.posterior['beta'].values),
+    )
+
+  def test_chunks_do_not_change_results(self):
+    xr.testing.assert_allclose(
+        diagnostics.convergence_diagnostics(
+            self.posterior, var_names=['beta'], max_chunk_elements=1
+        ),
+        diagnostics.convergence_diagnostics(self.posterior, var_names=['beta']),
+    )
+
+
+class RhatAccumulatorTest(absltest.TestCase):
+
+  def test_matches_potential_scale_reduction_of_all_draws(self):
+    draws = _ar1_draws(0.5, (_N_CHAINS, 300, 2), seed=4)
+    accumulator = diagnostics.RhatAccumulator(max_chunk_elements=100)
+
+    for start, stop in [(0, 50), (50, 51), (51, 300)]:
+      accumulator.update({'beta': draws[:, start:stop]})
+
+    self.assertEqual(accumulator.n_draws, 300)
+    np.testing.assert_allclose(
+        accumulator.rhat()['beta'],
+        diagnostics.potential_scale_reduction(draws),
+        rtol=1e-10,
+    )
+
+  def test_accepts_datasets(self):
+    posterior = xr.Dataset({
+        'alpha': (
+            [constants.CHAIN, constants.DRAW],
+            np.random.default_rng(5).normal(size=(_N_CHAINS, 20)),
+        )
+    })
+    accumulator = diagnostics.RhatAccumulator()
+
+    accumulator.update(posterior)
+
+    np.testing.assert_allclose(
+        accumulator.rhat()['alpha'],
+        diagnostics.potential_scale_reduction(posterior['alpha'].values),
+    )
+
+  def test_mismatched_chains_raise_error(self):
+    accumulator = diagnostics.RhatAccumulator()
+    accumulator.update({'alpha': np.zeros((4, 10))})
+
+    with self.assertRaisesRegex(ValueError, 'with 4 chains'):
+      accumulator.update({'alpha': np.zeros((2, 10))})
+
+  def test_mismatched_variables_raise_error(self):
+    accumulator = diagnostics.RhatAccumulator()
+    accumulator.update({'alpha': np.zeros((4, 10))})
+
+    with self.assertRaisesRegex(ValueError, 'Expected draws of'):
+      accumulator.update({'beta': np.zeros((4, 10))})
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -1947,8 +1947,7 @@ class BudgetOptimizer:
           start_date=start_date,
           end_date=end_date,
       )
-      expanded_str = [date.strftime(c.DATE_FORMAT) for date in expanded_dates]
-      return [x in expanded_str for x in new_times_str]
+      return time_coordinates.get_selected_mask(expanded_dates).tolist()
 
   def _get_incremental_outcome_tensors(
       self,
@@ -14,12 +14,16 @@
 
 """Summarization module that creates a 2-page HTML report."""
 
-from collections.abc import Sequence
+from collections.abc import Callable, Mapping, Sequence
+import concurrent.futures
 import functools
+import logging
 import os
+import time
 
 import jinja2
 from meridian import constants as c
+from meridian.analysis import analyzer
 from meridian.analysis import formatter
 from meridian.analysis import summary_text
 from meridian.analysis import visualizer
@@ -55,21 +59,55 @@ RESPONSE_CURVES_CARD_SPEC = formatter.CardSpec(
     title=summary_text.RESPONSE_CURVES_CARD_TITLE,
 )
 
+_logger = logging.getLogger(__name__)
+
 
 class Summarizer:
   """Generates HTML summary visualizations from the model fitting."""
 
-  def __init__(self, meridian: model.Meridian):
-    """Initialize the visualizer classes that are not time-dependent."""
+  def __init__(
+      self, meridian: model.Meridian, max_workers: int | None = None
+  ):
+    """Initialize the visualizer classes that are not time-dependent.
+
+    Args:
+      meridian: Media mix model with the raw data from the model fitting.
+      max_workers: Maximum number of threads building the cards of the summary
+        concurrently. The cards share the sweeps of their analyses, so that
+        their chart rendering overlaps with the TensorFlow computations of the
+        other cards. By default, one thread per card is used. `1` builds the
+        cards one after another.
+    """
+    if max_workers is not None and max_workers < 1:
+      raise ValueError(f'max_workers must be positive, got {max_workers}.')
     self._meridian = meridian
+    self._max_workers = max_workers
+    self._card_seconds = {}
+
+  @functools.cached_property
+  def _analyzer(self) -> analyzer.Analyzer:
+    """The `Analyzer` shared by all the visualizers of the summary."""
+    return analyzer.Analyzer(self._meridian)
+
+  @property
+  def card_seconds(self) -> Mapping[str, float]:
+    """Wall time in seconds spent building each card of the last summary.
+
+    The keys are the card IDs, in the order of the cards in the summary. As the
+    cards are built concurrently and share their analyses, the first card
+    needing a shared analysis is charged for it.
+    """
+    return dict(self._card_seconds)
 
   @functools.cached_property
   def _model_fit(self):
-    return visualizer.ModelFit(self._meridian)
+    return visualizer.ModelFit(self._meridian, mmm_analyzer=self._analyzer)
 
   @functools.cached_property
   def _model_diagnostics(self):
-    return visualizer.ModelDiagnostics(self._meridian)
+    return visualizer.ModelDiagnostics(
+        self._meridian, mmm_analyzer=self._analyzer
+    )
 
   def output_model_results_summary(
       self,
@@ -97,7 +135,8 @@ class Summarizer:
       end_date: tc.Date = None,
   ) -> str:
     """Generate HTML results summary output (as sanitized content str)."""
-    all_dates = self._meridian.input_data.time_coordinates.all_dates
+    time_coordinates = self._meridian.input_data.time_coordinates
+    all_dates = time_coordinates.all_dates
     start_date = (
         tc.normalize_date(start_date)
         if start_date is not None
@@ -107,11 +146,11 @@ class Summarizer:
         tc.normalize_date(end_date) if end_date is not None else max(all_dates)
     )
 
-    if start_date not in all_dates:
+    if time_coordinates.get_index(start_date) is None:
       raise ValueError(
           f'start_date ({start_date}) must be in the time coordinates!'
       )
-    if end_date not in all_dates:
+    if time_coordinates.get_index(end_date) is None:
       raise ValueError(
           f'end_date ({end_date}) must be in the time coordinates!'
       )
@@ -129,7 +168,7 @@ class Summarizer:
         f'%b {start_date.day}, %Y'
     )
 
-    interval_days = self._meridian.input_data.time_coordinates.interval_days
+    interval_days = time_coordinates.interval_days
     end_date_adjusted = end_date + pd.Timedelta(days=interval_days)
 
     template_env.globals[c.END_DATE] = end_date_adjusted.strftime(
@@ -137,10 +176,13 @@ class Summarizer:
     )
 
     html_template = template_env.get_template('summary.html.jinja')
-    cards_htmls = self._create_cards_htmls(
-        template_env,
-        selected_times=selected_times,
-    )
+    # The cards share the sweeps over the posterior and prior draws of their
+    # expected and incremental outcomes.
+    with self._analyzer.shared_sweeps():
+      cards_htmls = self._create_cards_htmls(
+          template_env,
+          selected_times=selected_times,
+      )
 
     return html_template.render(
         title=summary_text.MODEL_RESULTS_TITLE, cards=cards_htmls
@@ -153,35 +195,67 @@ class Summarizer:
   ) -> Sequence[str]:
     """Creates the HTML snippets for cards in the summary page."""
     media_summary = visualizer.MediaSummary(
-        self._meridian, selected_times=selected_times
+        self._meridian,
+        selected_times=selected_times,
+        mmm_analyzer=self._analyzer,
+    )
+    media_effects = visualizer.MediaEffects(
+        self._meridian, mmm_analyzer=self._analyzer
     )
-    media_effects = visualizer.MediaEffects(self._meridian)
     reach_frequency = (
         visualizer.ReachAndFrequency(
-            self._meridian, selected_times=selected_times
+            self._meridian,
+            selected_times=selected_times,
+            mmm_analyzer=self._analyzer,
         )
         if self._meridian.n_rf_channels > 0
         else None
     )
-    cards = [
-        self._create_model_fit_card_html(
-            template_env, selected_times=selected_times
+    card_builders = {
+        MODEL_FIT_CARD_SPEC.id: functools.partial(
+            self._create_model_fit_card_html,
+            template_env,
+            selected_times=selected_times,
         ),
-        self._create_outcome_contrib_card_html(
-            template_env, media_summary, selected_times=selected_times
+        CHANNEL_CONTRIB_CARD_SPEC.id: functools.partial(
+            self._create_outcome_contrib_card_html,
+            template_env,
+            media_summary,
+            selected_times=selected_times,
         ),
-        self._create_performance_breakdown_card_html(
-            template_env, media_summary
+        PERFORMANCE_BREAKDOWN_CARD_SPEC.id: functools.partial(
+            self._create_performance_breakdown_card_html,
+            template_env,
+            media_summary,
         ),
-        self._create_response_curves_card_html(
+        RESPONSE_CURVES_CARD_SPEC.id: functools.partial(
+            self._create_response_curves_card_html,
             template_env=template_env,
             selected_times=selected_times,
             media_summary=media_summary,
             media_effects=media_effects,
             reach_frequency=reach_frequency,
         ),
-    ]
-    return cards
+    }
+    self._card_seconds = dict.fromkeys(card_builders, 0.0)
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=self._max_workers or len(card_builders)
+    ) as executor:
+      futures = [
+          executor.submit(self._timed_card_html, card_id, builder)
+          for card_id, builder in card_builders.items()
+      ]
+    return [future.result() for future in futures]
+
+  def _timed_card_html(self, card_id: str, builder: Callable[[], str]) -> str:
+    """Builds the HTML snippet of a card and records its wall time."""
+    start = time.perf_counter()
+    card_html = builder()
+    self._card_seconds[card_id] = time.perf_counter() - start
+    _logger.info(
+        'Built the %s card in %.2fs.', card_id, self._card_seconds[card_id]
+    )
+    return card_html
 
   def _create_model_fit_card_html(
       self, template_env: jinja2.Environment, **kwargs
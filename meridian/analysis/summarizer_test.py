@@ -345,6 +345,44 @@ class SummarizerTest(parameterized.TestCase):
           })
       )
 
+  def test_output_card_order_with_one_worker_matches_concurrent(self):
+    sequential_summarizer = summarizer.Summarizer(
+        self.mock_meridian_revenue, max_workers=1
+    )
+    expected_cards = self._get_output_model_results_summary_html_dom(
+        summarizer_outcome=self.summarizer_revenue,
+    )
+    actual_cards = self._get_output_model_results_summary_html_dom(
+        summarizer_outcome=sequential_summarizer,
+    )
+
+    self.assertEqual(
+        [card.attrib['id'] for card in actual_cards.iter('card')],
+        [card.attrib['id'] for card in expected_cards.iter('card')],
+    )
+
+  def test_card_seconds(self):
+    self._get_output_model_results_summary_html_dom(
+        summarizer_outcome=self.summarizer_revenue,
+    )
+
+    card_seconds = self.summarizer_revenue.card_seconds
+    self.assertSequenceEqual(
+        list(card_seconds),
+        [
+            summarizer.MODEL_FIT_CARD_SPEC.id,
+            summarizer.CHANNEL_CONTRIB_CARD_SPEC.id,
+            summarizer.PERFORMANCE_BREAKDOWN_CARD_SPEC.id,
+            summarizer.RESPONSE_CURVES_CARD_SPEC.id,
+        ],
+    )
+    for seconds in card_seconds.values():
+      self.assertGreaterEqual(seconds, 0.0)
+
+  def test_invalid_max_workers(self):
+    with self.assertRaisesRegex(ValueError, 'max_workers must be positive'):
+      summarizer.Summarizer(self.mock_meridian_revenue, max_workers=0)
+
   @parameterized.parameters(
       summarizer.MODEL_FIT_CARD_SPEC,
       summarizer.CHANNEL_CONTRIB_CARD_SPEC,
@@ -710,6 +748,7 @@ class SummarizerTest(parameterized.TestCase):
             '2022-08-20',
             '2022-08-27',
         ],
+        mmm_analyzer=self.analyzer,
     )
 
   def test_media_effects_with_custom_date_range(self):
@@ -736,7 +775,9 @@ class SummarizerTest(parameterized.TestCase):
           start_date=dt.datetime(2022, 6, 4),
           end_date=dt.datetime(2022, 7, 30),
       )
-      self.media_effects_class.assert_called_with(self.mock_meridian_revenue)
+      self.media_effects_class.assert_called_with(
+          self.mock_meridian_revenue, mmm_analyzer=self.analyzer
+      )
       plot.assert_called_with(
           confidence_level=c.DEFAULT_CONFIDENCE_LEVEL,
           selected_times=frozenset([
@@ -788,6 +829,7 @@ class SummarizerTest(parameterized.TestCase):
             '2022-07-23',
             '2022-07-30',
         ],
+        mmm_analyzer=self.analyzer,
     )
 
   def test_channel_contrib_card_plotters_called(self):
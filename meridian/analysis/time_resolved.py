@@ -0,0 +1,326 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Time-resolved incremental outcome of the channels of a model.
+
+`TimeResolvedOutcome` keeps the prior and posterior draws of the incremental
+outcome of each channel and of the expected outcome, computed once for every
+time period with `Analyzer.time_resolved_outcome()`. The draws are stored as
+prefix sums along the time axis, so the totals of any date range are the
+differences of two prefix sums, whatever the length of the range:
+
+```python
+outcome = analyzer.Analyzer(mmm).time_resolved_outcome()
+outcome.summary(start_date='2024-01-01', end_date='2024-03-31')
+outcome.rollup(constants.QUARTERLY)
+```
+"""
+
+from collections.abc import Mapping, Sequence
+
+from meridian import constants
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+
+__all__ = [
+    'TimeResolvedOutcome',
+]
+
+
+_PERIOD_FREQUENCIES = {
+    constants.WEEKLY: 'W',
+    constants.MONTHLY: 'M',
+    constants.QUARTERLY: 'Q',
+}
+_DISTRIBUTIONS = (constants.PRIOR, constants.POSTERIOR)
+
+
+def _prefix_sums(values: np.ndarray) -> np.ndarray:
+  """Returns the prefix sums along the time axis, starting with zeros.
+
+  Args:
+    values: Array of shape `(n_chains, n_draws, n_times, ...)`.
+
+  Returns:
+    Float64 array of shape `(n_chains * n_draws, n_times + 1, ...)`.
+  """
+  samples = np.asarray(values, dtype=np.float64).reshape(
+      -1, *np.shape(values)[2:]
+  )
+  prefix_sums = np.zeros(
+      (samples.shape[0], samples.shape[1] + 1, *samples.shape[2:])
+  )
+  np.cumsum(samples, axis=1, out=prefix_sums[:, 1:])
+  return prefix_sums
+
+
+def _summarize(samples: np.ndarray, confidence_level: float) -> np.ndarray:
+  """Returns the mean, median and credible interval over the first axis."""
+  return np.stack(
+      [
+          samples.mean(axis=0),
+          np.median(samples, axis=0),
+          np.quantile(samples, (1 - confidence_level) / 2, axis=0),
+          np.quantile(samples, (1 + confidence_level) / 2, axis=0),
+      ],
+      axis=-1,
+  )
+
+
+class TimeResolvedOutcome:
+  """Incremental outcome draws of each channel by time period.
+
+  The totals of a date range are computed from the prefix sums of each draw,
+  so their cost does not depend on the number of time periods in the range.
+  The posterior mean of a range, see `mean_incremental_outcome()`, costs
+  `O(1)` per channel.
+  """
+
+  def __init__(
+      self,
+      times: Sequence[str],
+      channels: Sequence[str],
+      incremental_outcome: Mapping[str, np.ndarray],
+      expected_outcome: Mapping[str, np.ndarray],
+      confidence_level: float = constants.DEFAULT_CONFIDENCE_LEVEL,
+  ):
+    """Initializes the time-resolved outcome.
+
+    Args:
+      times: Time periods, as `YYYY-mm-dd` strings, in increasing order.
+      channels: Channel names, including `All Channels` for the total of the
+        channels if it is a channel of `incremental_outcome`.
+      incremental_outcome: Mapping of `prior` and `posterior` to arrays of
+        shape `(n_chains, n_draws, n_times, n_channels)` of the incremental
+        outcome draws, aggregated over the geos.
+      expected_outcome: Mapping of `prior` and `posterior` to arrays of shape
+        `(n_chains, n_draws, n_times)` of the expected outcome draws,
+        aggregated over the geos.
+      confidence_level: Confidence level of the credible intervals, between
+        zero and one.
+
+    Raises:
+      ValueError: If the shapes of the draws do not match `times` and
+        `channels`.
+    """
+    self._times = pd.DatetimeIndex(pd.to_datetime(list(times)))
+    self._channels = list(channels)
+    self._confidence_level = confidence_level
+    shape = (len(self._times), len(self._channels))
+    for distribution in _DISTRIBUTIONS:
+      if np.shape(incremental_outcome[distribution])[2:] != shape:
+        raise ValueError(
+            f'The {distribution} incremental outcome must have shape'
+            f' (n_chains, n_draws) + {shape}, got'
+            f' {np.shape(incremental_outcome[distribution])}.'
+        )
+      if np.shape(expected_outcome[distribution])[2:] != shape[:1]:
+        raise ValueError(
+            f'The {distribution} expected outcome must have shape'
+            f' (n_chains, n_draws, {shape[0]}), got'
+            f' {np.shape(expected_outcome[distribution])}.'
+        )
+    self._incremental_prefix_sums = {
+        distribution: _prefix_sums(incremental_outcome[distribution])
+        for distribution in _DISTRIBUTIONS
+    }
+    self._expected_prefix_sums = {
+        distribution: _prefix_sums(expected_outcome[distribution])
+        for distribution in _DISTRIBUTIONS
+    }
+    self._mean_incremental_prefix_sums = self._incremental_prefix_sums[
+        constants.POSTERIOR
+    ].mean(axis=0)
+
+  @property
+  def times(self) -> list[str]:
+    return list(self._times.strftime(constants.DATE_FORMAT))
+
+  @property
+  def channels(self) -> list[str]:
+    return self._channels
+
+  def _range_indices(
+      self, start_date: str | None, end_date: str | None
+  ) -> tuple[int, int]:
+    """Returns the prefix sum indices of the periods within a date range."""
+    # `str` also accepts `numpy.str_` dates, which `pd.Timestamp` rejects.
+    start = (
+        0
+        if start_date is None
+        else int(
+            self._times.searchsorted(pd.Timestamp(str(start_date)), 'left')
+        )
+    )
+    end = (
+        len(self._times)
+        if end_date is None
+        else int(self._times.searchsorted(pd.Timestamp(str(end_date)), 'right'))
+    )
+    if start >= end:
+      raise ValueError(
+          f'No time period between {start_date} and {end_date}.'
+      )
+    return start, end
+
+  def mean_incremental_outcome(
+      self, start_date: str | None = None, end_date: str | None = None
+  ) -> np.ndarray:
+    """Returns the posterior mean incremental outcome over a date range.
+
+    Args:
+      start_date: First date of the range. By default, the range starts with
+        the first time period.
+      end_date: Last date of the range, included. By default, the range ends
+        with the last time period.
+
+    Returns:
+      Array of shape `(n_channels,)`.
+    """
+    start, end = self._range_indices(start_date, end_date)
+    return (
+        self._mean_incremental_prefix_sums[end]
+        - self._mean_incremental_prefix_sums[start]
+    )
+
+  def _summary_values(
+      self, starts: np.ndarray, ends: np.ndarray
+  ) -> tuple[np.ndarray, np.ndarray]:
+    """Summarizes the incremental outcome of several ranges of periods.
+
+    Args:
+      starts: Prefix sum indices of the first period of each range.
+      ends: Prefix sum indices after the last period of each range.
+
+    Returns:
+      The incremental outcome and percentage of contribution summaries, both
+      of shape `(n_ranges, n_channels, 4, 2)` for the `mean`, `median`,
+      `ci_lo` and `ci_hi` metrics of the `prior` and `posterior`.
+    """
+    incremental_outcome = []
+    pct_of_contribution = []
+    for distribution in _DISTRIBUTIONS:
+      incremental = self._incremental_prefix_sums[distribution]
+      expected = self._expected_prefix_sums[distribution]
+      range_incremental = incremental[:, ends] - incremental[:, starts]
+      mean_expected = (expected[:, ends] - expected[:, starts]).mean(axis=0)
+      incremental_outcome.append(
+          _summarize(range_incremental, self._confidence_level)
+      )
+      pct_of_contribution.append(
+          _summarize(
+              range_incremental / mean_expected[:, np.newaxis] * 100,
+              self._confidence_level,
+          )
+      )
+    return (
+        np.stack(incremental_outcome, axis=-1),
+        np.stack(pct_of_contribution, axis=-1),
+    )
+
+  def _dataset(
+      self,
+      incremental_outcome: np.ndarray,
+      pct_of_contribution: np.ndarray,
+      dims: Sequence[str],
+      coords: Mapping[str, Sequence[str]],
+  ) -> xr.Dataset:
+    xr_dims = [*dims, constants.METRIC, constants.DISTRIBUTION]
+    return xr.Dataset(
+        {
+            constants.INCREMENTAL_OUTCOME: (xr_dims, incremental_outcome),
+            constants.PCT_OF_CONTRIBUTION: (xr_dims, pct_of_contribution),
+        },
+        coords={
+            **coords,
+            constants.METRIC: [
+                constants.MEAN,
+                constants.MEDIAN,
+                constants.CI_LO,
+                constants.CI_HI,
+            ],
+            constants.DISTRIBUTION: list(_DISTRIBUTIONS),
+        },
+    )
+
+  def summary(
+      self, start_date: str | None = None, end_date: str | None = None
+  ) -> xr.Dataset:
+    """Summarizes the incremental outcome of each channel over a date range.
+
+    Args:
+      start_date: First date of the range. By default, the range starts with
+        the first time period.
+      end_date: Last date of the range, included. By default, the range ends
+        with the last time period.
+
+    Returns:
+      A Dataset with `channel`, `metric` (`mean`, `median`, `ci_lo`, `ci_hi`)
+      and `distribution` (`prior`, `posterior`) coordinates, and the
+      `incremental_outcome` and `pct_of_contribution` data variables, as in
+      `Analyzer.summary_metrics(selected_times=...)`.
+
+    Raises:
+      ValueError: If no time period is within the date range.
+    """
+    start, end = self._range_indices(start_date, end_date)
+    incremental_outcome, pct_of_contribution = self._summary_values(
+        np.array([start]), np.array([end])
+    )
+    return self._dataset(
+        incremental_outcome[0],
+        pct_of_contribution[0],
+        dims=[constants.CHANNEL],
+        coords={constants.CHANNEL: self._channels},
+    )
+
+  def rollup(self, time_granularity: str) -> xr.Dataset:
+    """Summarizes the incremental outcome of each channel by calendar period.
+
+    Args:
+      time_granularity: `weekly`, `monthly` or `quarterly`.
+
+    Returns:
+      A Dataset as in `summary()`, with an additional leading `time` dimension
+      of the first time period of each calendar period.
+
+    Raises:
+      ValueError: If `time_granularity` is not supported.
+    """
+    if time_granularity not in _PERIOD_FREQUENCIES:
+      raise ValueError(
+          'time_granularity must be one of'
+          f' {sorted(_PERIOD_FREQUENCIES)}, got {time_granularity}.'
+      )
+    periods = self._times.to_period(_PERIOD_FREQUENCIES[time_granularity])
+    starts = np.flatnonzero(
+        np.concatenate([[True], periods[1:] != periods[:-1]])
+    )
+    ends = np.append(starts[1:], len(self._times))
+    incremental_outcome, pct_of_contribution = self._summary_values(
+        starts, ends
+    )
+    return self._dataset(
+        incremental_outcome,
+        pct_of_contribution,
+        dims=[constants.TIME, constants.CHANNEL],
+        coords={
+            constants.TIME: list(
+                self._times[starts].strftime(constants.DATE_FORMAT)
+            ),
+            constants.CHANNEL: self._channels,
+        },
+    )
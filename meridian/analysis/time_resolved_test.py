@@ -0,0 +1,151 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+from absl.testing import parameterized
+from meridian import constants
+from meridian.analysis import time_resolved
+import numpy as np
+import pandas as pd
+
+
+_TIMES = list(
+    pd.date_range('2024-01-01', periods=26, freq='W-MON').strftime('%Y-%m-%d')
+)
+_CHANNELS = ['tv', 'search', constants.ALL_CHANNELS]
+
+
+class TimeResolvedOutcomeTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    rng = np.random.default_rng(0)
+    self.incremental_outcome = {
+        constants.PRIOR: rng.gamma(2.0, size=(1, 50, len(_TIMES), 3)),
+        constants.POSTERIOR: rng.gamma(2.0, size=(2, 40, len(_TIMES), 3)),
+    }
+    self.expected_outcome = {
+        constants.PRIOR: rng.gamma(20.0, size=(1, 50, len(_TIMES))),
+        constants.POSTERIOR: rng.gamma(20.0, size=(2, 40, len(_TIMES))),
+    }
+    self.outcome = time_resolved.TimeResolvedOutcome(
+        times=_TIMES,
+        channels=_CHANNELS,
+        incremental_outcome=self.incremental_outcome,
+        expected_outcome=self.expected_outcome,
+        confidence_level=0.9,
+    )
+
+  def _expected_summary(self, distribution, time_slice):
+    incremental = self.incremental_outcome[distribution][:, :, time_slice]
+    incremental = incremental.sum(axis=2).reshape(-1, 3)
+    expected = self.expected_outcome[distribution][:, :, time_slice].sum(2)
+    pct = incremental / expected.mean() * 100
+    return [
+        np.stack(
+            [
+                values.mean(0),
+                np.median(values, 0),
+                np.quantile(values, 0.05, 0),
+                np.quantile(values, 0.95, 0),
+            ],
+            axis=-1,
+        )
+        for values in (incremental, pct)
+    ]
+
+  @parameterized.named_parameters(
+      ('all_times', None, None, slice(None)),
+      ('exact_dates', '2024-02-05', '2024-03-04', slice(5, 10)),
+      ('dates_between_periods', '2024-02-03', '2024-03-06', slice(5, 10)),
+  )
+  def test_summary_matches_sum_of_periods(
+      self, start_date, end_date, time_slice
+  ):
+    summary = self.outcome.summary(start_date=start_date, end_date=end_date)
+
+    for distribution in (constants.PRIOR, constants.POSTERIOR):
+      incremental, pct = self._expected_summary(distribution, time_slice)
+      np.testing.assert_allclose(
+          summary[constants.INCREMENTAL_OUTCOME].sel(distribution=distribution),
+          incremental,
+      )
+      np.testing.assert_allclose(
+          summary[constants.PCT_OF_CONTRIBUTION].sel(distribution=distribution),
+          pct,
+      )
+
+  def test_mean_incremental_outcome(self):
+    np.testing.assert_allclose(
+        self.outcome.mean_incremental_outcome('2024-02-05', '2024-03-04'),
+        self.incremental_outcome[constants.POSTERIOR][:, :, 5:10]
+        .sum(axis=2)
+        .mean(axis=(0, 1)),
+    )
+
+  def test_mean_incremental_outcome_accepts_numpy_dates(self):
+    times = np.array(_TIMES)
+
+    np.testing.assert_allclose(
+        self.outcome.mean_incremental_outcome(times[5], times[9]),
+        self.outcome.mean_incremental_outcome('2024-02-05', '2024-03-04'),
+    )
+
+  def test_monthly_rollup(self):
+    rollup = self.outcome.rollup(constants.MONTHLY)
+
+    self.assertEqual(
+        list(rollup[constants.TIME].values),
+        [
+            '2024-01-01',
+            '2024-02-05',
+            '2024-03-04',
+            '2024-04-01',
+            '2024-05-06',
+            '2024-06-03',
+        ],
+    )
+    incremental, _ = self._expected_summary(constants.POSTERIOR, slice(5, 9))
+    np.testing.assert_allclose(
+        rollup[constants.INCREMENTAL_OUTCOME].sel(
+            time='2024-02-05', distribution=constants.POSTERIOR
+        ),
+        incremental,
+    )
+
+  def test_weekly_rollup_keeps_weekly_periods(self):
+    rollup = self.outcome.rollup(constants.WEEKLY)
+
+    self.assertEqual(list(rollup[constants.TIME].values), _TIMES)
+
+  def test_empty_range_raises_error(self):
+    with self.assertRaisesRegex(ValueError, 'No time period'):
+      self.outcome.summary(start_date='2024-01-02', end_date='2024-01-07')
+
+  def test_invalid_granularity_raises_error(self):
+    with self.assertRaisesRegex(ValueError, 'time_granularity must be one of'):
+      self.outcome.rollup('daily')
+
+  def test_mismatched_shapes_raise_error(self):
+    with self.assertRaisesRegex(ValueError, 'incremental outcome must have'):
+      time_resolved.TimeResolvedOutcome(
+          times=_TIMES[:-1],
+          channels=_CHANNELS,
+          incremental_outcome=self.incremental_outcome,
+          expected_outcome=self.expected_outcome,
+      )
+
+
+if __name__ == '__main__':
+  absltest.main()
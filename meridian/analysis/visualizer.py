@@ -21,6 +21,7 @@ import warnings
 import altair as alt
 from meridian import constants as c
 from meridian.analysis import analyzer
+from meridian.analysis import chart_data
 from meridian.analysis import formatter
 from meridian.analysis import summary_text
 from meridian.model import model
@@ -47,9 +48,13 @@ alt.data_transformers.disable_max_rows()
 class ModelDiagnostics:
   """Generates model diagnostics plots from the Meridian model fitting."""
 
-  def __init__(self, meridian: model.Meridian):
+  def __init__(
+      self,
+      meridian: model.Meridian,
+      mmm_analyzer: analyzer.Analyzer | None = None,
+  ):
     self._meridian = meridian
-    self._analyzer = analyzer.Analyzer(meridian)
+    self._analyzer = mmm_analyzer or analyzer.Analyzer(meridian)
 
   @functools.lru_cache(maxsize=128)
   def _predictive_accuracy_dataset(
@@ -149,11 +154,58 @@ class ModelDiagnostics:
         .rename_axis(None, axis=1)
     )
 
+  def _density_dataframe(
+      self, draws: xr.DataArray, distribution: str, n_points: int
+  ) -> pd.DataFrame:
+    """Estimates the density of each element of a parameter.
+
+    Args:
+      draws: Draws of a parameter, with `chain` and `draw` dimensions.
+      distribution: Distribution of the draws, `prior` or `posterior`.
+      n_points: Number of points of each density curve.
+
+    Returns:
+      A DataFrame with a row per point of the density curve of each element
+      of the parameter, with a column per parameter dimension, the parameter
+      value, the `distribution` and the `density`. The elements with constant
+      draws are dropped, and the DataFrame is empty if no element is selected.
+    """
+    param_dims = [dim for dim in draws.dims if dim not in (c.CHAIN, c.DRAW)]
+    columns = [*param_dims, draws.name, c.DISTRIBUTION, c.DENSITY]
+    samples = draws.transpose(c.CHAIN, c.DRAW, *param_dims).values
+    n_elements = int(np.prod(samples.shape[2:], dtype=int))
+    if not n_elements:
+      return pd.DataFrame(columns=columns)
+    points, density = chart_data.density_curves(
+        samples.reshape(-1, n_elements), n_points
+    )
+    dims = [*param_dims, c.POINT]
+    shape = (n_points, *samples.shape[2:])
+    curves = xr.Dataset(
+        {
+            draws.name: (
+                [c.POINT, *param_dims],
+                points.reshape(shape),
+            ),
+            c.DENSITY: ([c.POINT, *param_dims], density.reshape(shape)),
+        },
+        coords={dim: draws[dim].values for dim in param_dims},
+    ).transpose(*dims)
+    df = (
+        curves.to_dataframe()
+        .reset_index()
+        .drop(columns=[c.POINT])
+        .dropna(subset=[c.DENSITY])
+    )
+    df[c.DISTRIBUTION] = distribution
+    return df[columns]
+
   def plot_prior_and_posterior_distribution(
       self,
       parameter: str = 'roi_m',
       num_geos: int = 3,
       selected_times: list[str] | None = None,
+      n_points: int = c.VEGALITE_DENSITY_POINTS,
   ) -> alt.Chart | alt.FacetChart:
     """Plots prior and posterior distributions for a model parameter.
 
@@ -166,6 +218,9 @@ class ModelDiagnostics:
       selected_times: List of specific time periods to plot for time-level
         parameters. These times must match the time periods from the data. By
         default, the first three time periods are plotted.
+      n_points: Number of points of the density curve of each distribution.
+        The densities are estimated from all the draws before plotting, so the
+        size of the chart does not depend on the number of draws.
 
     Returns:
       An Altair plot showing the parameter distributions.
@@ -209,48 +264,34 @@ class ModelDiagnostics:
 
     prior_dat = self._meridian.inference_data.prior[parameter]
     posterior_dat = self._meridian.inference_data.posterior[parameter]
-    prior_df = (
-        prior_dat.to_dataframe().reset_index().drop(columns=[c.CHAIN, c.DRAW])
-    )
-    posterior_df = (
-        posterior_dat.to_dataframe()
-        .reset_index()
-        .drop(columns=[c.CHAIN, c.DRAW])
-    )
-
-    # Tag the data before combining.
-    prior_df[c.DISTRIBUTION] = c.PRIOR
-    posterior_df[c.DISTRIBUTION] = c.POSTERIOR
-    prior_posterior_df = pd.concat([prior_df, posterior_df])
-
-    if c.GEO in prior_posterior_df.columns:
+    selection = {}
+    if c.GEO in posterior_dat.dims:
       top_geos = self._meridian.input_data.get_n_top_largest_geos(num_geos)
-      prior_posterior_df = prior_posterior_df[
-          prior_posterior_df[c.GEO].isin(top_geos)
-      ]
-
-    if c.TIME in prior_posterior_df.columns:
+      selection[c.GEO] = posterior_dat[c.GEO].isin(top_geos).values
+    if c.TIME in posterior_dat.dims:
       default_num_times = 3
       times = (
           selected_times
           if selected_times
           else prior_dat[c.TIME][:default_num_times].values
       )
-      prior_posterior_df = prior_posterior_df[
-          prior_posterior_df[c.TIME].isin(times)
-      ]
+      selection[c.TIME] = posterior_dat[c.TIME].isin(times).values
 
-    groupby = posterior_df.columns.tolist()
-    groupby.remove(parameter)
+    prior_posterior_df = pd.concat([
+        self._density_dataframe(prior_dat.isel(selection), c.PRIOR, n_points),
+        self._density_dataframe(
+            posterior_dat.isel(selection), c.POSTERIOR, n_points
+        ),
+    ])
+    groupby = [
+        dim for dim in posterior_dat.dims if dim not in (c.CHAIN, c.DRAW)
+    ] + [c.DISTRIBUTION]
     plot = (
         alt.Chart(prior_posterior_df, width=c.VEGALITE_FACET_DEFAULT_WIDTH)
-        .transform_density(
-            parameter, groupby=groupby, as_=[parameter, 'density']
-        )
         .mark_area(opacity=0.7)
         .encode(
             x=f'{parameter}:Q',
-            y=alt.Y(shorthand='density:Q', stack=False),
+            y=alt.Y(shorthand=f'{c.DENSITY}:Q', stack=False),
             color=f'{c.DISTRIBUTION}:N',
         )
     )
@@ -368,6 +409,7 @@ class ModelFit:
       self,
       meridian: model.Meridian,
       confidence_level: float = c.DEFAULT_CONFIDENCE_LEVEL,
+      mmm_analyzer: analyzer.Analyzer | None = None,
   ):
     """Initializes the dataset based on the model and confidence level.
 
@@ -375,9 +417,11 @@ class ModelFit:
       meridian: Media mix model with the raw data from the model fitting.
       confidence_level: Confidence level for expected outcome credible intervals
         represented as a value between zero and one. Default is `0.9`.
+      mmm_analyzer: Optional `Analyzer` of `meridian` to share with other
+        visualizers. By default, a new `Analyzer` is created.
     """
     self._meridian = meridian
-    self._analyzer = analyzer.Analyzer(meridian)
+    self._analyzer = mmm_analyzer or analyzer.Analyzer(meridian)
     self._model_fit_data = self._analyzer.expected_vs_actual_data(
         confidence_level=confidence_level
     )
@@ -640,6 +684,7 @@ class ReachAndFrequency:
       meridian: model.Meridian,
       selected_times: Sequence[str] | None = None,
       use_kpi: bool | None = None,
+      mmm_analyzer: analyzer.Analyzer | None = None,
   ):
     """Initializes the reach and frequency dataset for the model data.
 
@@ -648,9 +693,11 @@ class ReachAndFrequency:
       selected_times: Optional list containing a subset of times to include. By
         default, all time periods are included.
       use_kpi: If `True`, KPI is used instead of revenue.
+      mmm_analyzer: Optional `Analyzer` of `meridian` to share with other
+        visualizers. By default, a new `Analyzer` is created.
     """
     self._meridian = meridian
-    self._analyzer = analyzer.Analyzer(meridian)
+    self._analyzer = mmm_analyzer or analyzer.Analyzer(meridian)
     self._selected_times = selected_times
     # TODO Adapt the mechanisms to choose between KPI and REVENUE
     # from Analyzer.
@@ -845,6 +892,7 @@ class MediaEffects:
       self,
       meridian: model.Meridian,
       by_reach: bool = True,
+      mmm_analyzer: analyzer.Analyzer | None = None,
   ):
     """Initializes the Media Effects based on the model data and params.
 
@@ -853,9 +901,11 @@ class MediaEffects:
       by_reach: For the channel w/ reach and frequency, return the response
         curves by reach given fixed frequency if true; return the response
         curves by frequency given fixed reach if false.
+      mmm_analyzer: Optional `Analyzer` of `meridian` to share with other
+        visualizers. By default, a new `Analyzer` is created.
     """
     self._meridian = meridian
-    self._analyzer = analyzer.Analyzer(meridian)
+    self._analyzer = mmm_analyzer or analyzer.Analyzer(meridian)
     self._by_reach = by_reach
 
   @functools.lru_cache(maxsize=128)
@@ -960,6 +1010,7 @@ class MediaEffects:
       plot_separately: bool = True,
       include_ci: bool = True,
       num_channels_displayed: int | None = None,
+      max_points: int | None = c.VEGALITE_MAX_CURVE_POINTS,
   ) -> alt.Chart:
     """Plots the response curves for each channel.
 
@@ -982,6 +1033,10 @@ class MediaEffects:
       include_ci: If `True`, plots the credible interval. Defaults to `True`.
       num_channels_displayed: Number of channels to show on the layered plot. If
         plotting a faceted chart, this value is ignored.
+      max_points: Maximum number of points embedded in the chart for each of
+        the curve segments below and above the current spend of a channel. The
+        points keeping the shape of the curve are selected. If `None`, all the
+        spend multipliers are plotted.
 
     Returns:
       An Altair plot showing the response curves per channel.
@@ -1013,6 +1068,22 @@ class MediaEffects:
         selected_times=selected_times,
         by_reach=by_reach,
     )
+    is_current_spend = response_curves_df[c.SPEND_MULTIPLIER] == 1.0
+    downsampled_df = chart_data.downsample_curves(
+        response_curves_df,
+        x=c.SPEND,
+        y=c.MEAN,
+        group_by=[
+            c.CHANNEL,
+            response_curves_df[c.SPEND_MULTIPLIER].to_numpy() >= 1.0,
+        ],
+        max_points=max_points,
+    )
+    # The current spend points are marked on the curves, so they are added back
+    # if the downsampling dropped them.
+    response_curves_df = response_curves_df[
+        response_curves_df.index.isin(downsampled_df.index) | is_current_spend
+    ]
     if self._meridian.input_data.revenue_per_kpi is not None:
       y_axis_label = summary_text.INC_OUTCOME_LABEL
     else:
@@ -1176,6 +1247,7 @@ class MediaEffects:
       confidence_level: float = c.DEFAULT_CONFIDENCE_LEVEL,
       include_prior: bool = True,
       include_ci: bool = True,
+      max_points: int | None = c.VEGALITE_MAX_CURVE_POINTS,
   ) -> Mapping[str, alt.Chart]:
     """Plots the Hill curves for each channel.
 
@@ -1185,6 +1257,10 @@ class MediaEffects:
       include_prior: If `True`, plots contain both the prior and posterior.
         Defaults to `True`.
       include_ci: If `True`, plots the credible interval. Defaults to `True`.
+      max_points: Maximum number of points embedded in the chart for each
+        prior and posterior curve. The points keeping the shape of the curve
+        are selected. The histograms are binned before plotting and always
+        embedded. If `None`, all the points of the curves are plotted.
 
     Returns:
       A dictionary mapping channel type constants (`media`, `rf`, and
@@ -1193,8 +1269,12 @@ class MediaEffects:
       corresponding channels exist in the data). Returns an empty dictionary if
       no relevant channels are found.
     """
-    hill_curves_dataframe = self.hill_curves_dataframe(
-        confidence_level=confidence_level
+    hill_curves_dataframe = chart_data.downsample_curves(
+        self.hill_curves_dataframe(confidence_level=confidence_level),
+        x=c.MEDIA_UNITS,
+        y=c.MEAN,
+        group_by=[c.CHANNEL, c.DISTRIBUTION],
+        max_points=max_points,
     )
     channel_types = list(set(hill_curves_dataframe[c.CHANNEL_TYPE]))
     plots: dict[str, alt.Chart] = {}
@@ -1406,6 +1486,7 @@ class MediaSummary:
       selected_times: Sequence[str] | None = None,
       marginal_roi_by_reach: bool = True,
       non_media_baseline_values: Sequence[float] | None = None,
+      mmm_analyzer: analyzer.Analyzer | None = None,
   ):
     """Initializes the media summary metrics based on the model data and params.
 
@@ -1425,9 +1506,11 @@ class MediaSummary:
         value which will be used as baseline for the given channel. If `None`,
         the values defined with `ModelSpec.non_media_baseline_values`
         will be used.
+      mmm_analyzer: Optional `Analyzer` of `meridian` to share with other
+        visualizers. By default, a new `Analyzer` is created.
     """
     self._meridian = meridian
-    self._analyzer = analyzer.Analyzer(meridian)
+    self._analyzer = mmm_analyzer or analyzer.Analyzer(meridian)
     self._confidence_level = confidence_level
     self._selected_times = selected_times
     self._marginal_roi_by_reach = marginal_roi_by_reach
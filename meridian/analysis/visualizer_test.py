@@ -236,7 +236,7 @@ class ModelDiagnosticsTest(parameterized.TestCase):
 
     self.assertEqual(
         list(plot.data.columns),
-        [c.MEDIA_CHANNEL, c.ROI_M, c.DISTRIBUTION],
+        [c.MEDIA_CHANNEL, c.ROI_M, c.DISTRIBUTION, c.DENSITY],
     )
     self.assertIsInstance(plot, alt.FacetChart)
     self.assertIsInstance(plot.facet, alt.Facet)
@@ -250,7 +250,7 @@ class ModelDiagnosticsTest(parameterized.TestCase):
 
     self.assertEqual(
         list(plot.data.columns),
-        [c.CONTROL_VARIABLE, c.GAMMA_C, c.DISTRIBUTION],
+        [c.CONTROL_VARIABLE, c.GAMMA_C, c.DISTRIBUTION, c.DENSITY],
     )
     self.assertIsInstance(plot, alt.FacetChart)
     self.assertIsInstance(plot.facet, alt.Facet)
@@ -268,6 +268,7 @@ class ModelDiagnosticsTest(parameterized.TestCase):
             c.MEDIA_CHANNEL,
             c.BETA_GM,
             c.DISTRIBUTION,
+            c.DENSITY,
         ],
     )
     self.assertIsInstance(plot, alt.FacetChart)
@@ -280,7 +281,7 @@ class ModelDiagnosticsTest(parameterized.TestCase):
 
     self.assertEqual(
         list(plot.data.columns),
-        [c.GEO, c.TAU_G, c.DISTRIBUTION],
+        [c.GEO, c.TAU_G, c.DISTRIBUTION, c.DENSITY],
     )
     self.input_data.get_n_top_largest_geos.assert_called_with(3)
 
@@ -296,6 +297,7 @@ class ModelDiagnosticsTest(parameterized.TestCase):
             c.MEDIA_CHANNEL,
             c.BETA_GM,
             c.DISTRIBUTION,
+            c.DENSITY,
         ],
     )
     self.input_data.get_n_top_largest_geos.assert_called_with(4)
@@ -305,7 +307,7 @@ class ModelDiagnosticsTest(parameterized.TestCase):
 
     self.assertEqual(
         list(plot.data.columns),
-        [c.TIME, c.MU_T, c.DISTRIBUTION],
+        [c.TIME, c.MU_T, c.DISTRIBUTION, c.DENSITY],
     )
     self.assertEqual(plot.data[c.TIME].nunique(), 3)
 
@@ -316,10 +318,24 @@ class ModelDiagnosticsTest(parameterized.TestCase):
 
     self.assertEqual(
         list(plot.data.columns),
-        [c.TIME, c.MU_T, c.DISTRIBUTION],
+        [c.TIME, c.MU_T, c.DISTRIBUTION, c.DENSITY],
     )
     self.assertEqual(plot.data[c.TIME].nunique(), 2)
 
+  def test_distribution_embeds_density_curves(self):
+    plot = self.model_diagnostics.plot_prior_and_posterior_distribution(
+        n_points=5
+    )
+
+    points_per_distribution = plot.data.groupby(
+        [c.MEDIA_CHANNEL, c.DISTRIBUTION]
+    ).size()
+    self.assertTrue((points_per_distribution == 5).all())
+    self.assertSetEqual(
+        set(plot.data[c.DISTRIBUTION]), {c.PRIOR, c.POSTERIOR}
+    )
+    self.assertFalse(plot.to_dict()["spec"].get("transform"))
+
   def test_plot_rhat_boxplot_pre_fitting_raises_exception(self):
     not_fitted_mmm = mock.create_autospec(model.Meridian, instance=True)
     type(not_fitted_mmm).inference_data = mock.PropertyMock(
@@ -1175,6 +1191,20 @@ class MediaEffectsTest(parameterized.TestCase):
         summary_text.RESPONSE_CURVES_CHART_TITLE.format(top_channels="(top 5)"),
     )
 
+  def test_media_effects_plot_response_curves_downsamples_curves(self):
+    plot = self.media_effects_kpi_type_revenue.plot_response_curves(
+        plot_separately=False, num_channels_displayed=5, max_points=5
+    )
+    df = plot.data
+
+    points_per_segment = df.groupby(
+        [df[c.CHANNEL], df[c.SPEND_MULTIPLIER] >= 1.0]
+    ).size()
+    self.assertTrue((points_per_segment <= 5).all())
+    self.assertSetEqual(
+        set(df[df[c.SPEND_MULTIPLIER] == 1.0][c.CHANNEL]), set(df[c.CHANNEL])
+    )
+
   def test_media_effects_plot_response_curves_channels_exceeded_truncated(self):
     plot = self.media_effects_kpi_type_revenue.plot_response_curves(
         plot_separately=False, include_ci=True, num_channels_displayed=20
@@ -1374,6 +1404,16 @@ class MediaEffectsTest(parameterized.TestCase):
     )
     self.assertEqual(facet_chart_layer[1].encoding.y.shorthand, f"{c.MEAN}:Q")
 
+  def test_media_effects_plot_hill_curves_downsamples_curves(self):
+    plot_media = self.media_effects_kpi_type_revenue.plot_hill_curves(
+        max_points=10
+    )[c.MEDIA]
+
+    points_per_curve = plot_media.data.groupby(
+        [c.CHANNEL, c.DISTRIBUTION]
+    ).size()
+    self.assertTrue((points_per_curve <= 10).all())
+
   def test_media_effects_plot_hill_curves_no_prior(self):
     plot_media = self.media_effects_kpi_type_revenue.plot_hill_curves(
         include_prior=False
@@ -504,6 +504,8 @@ DISTRIBUTION = 'distribution'
 DISTRIBUTION_TYPE = 'distribution_type'
 PRIOR = 'prior'
 POSTERIOR = 'posterior'
+DENSITY = 'density'
+POINT = 'point'
 # Prior mean proportion of KPI incremental due to all media.
 P_MEAN = 0.4
 # Prior standard deviation proportion of KPI incremental to all media.
@@ -517,6 +519,9 @@ MEDIAN = 'median'
 CI_LO = 'ci_lo'
 CI_HI = 'ci_hi'
 RHAT = 'rhat'
+ESS_BULK = 'ess_bulk'
+ESS_TAIL = 'ess_tail'
+MCSE_MEAN = 'mcse_mean'
 PCT = 'pct'
 CONFIDENCE_LEVEL = 'confidence_level'
 
@@ -701,9 +706,13 @@ CARD_STATS = 'stats'
 VEGALITE_FACET_DEFAULT_WIDTH = 400
 VEGALITE_FACET_LARGE_WIDTH = 500
 VEGALITE_FACET_EXTRA_LARGE_WIDTH = 700
+# Default budgets of the data embedded in the VegaLite charts.
+VEGALITE_MAX_CURVE_POINTS = 100
+VEGALITE_DENSITY_POINTS = 100
 
 # Time Granularity Constants
 WEEKLY = 'weekly'
+MONTHLY = 'monthly'
 QUARTERLY = 'quarterly'
 TIME_GRANULARITIES = frozenset({WEEKLY, QUARTERLY})
 QUARTERLY_SUMMARY_THRESHOLD_WEEKS = 52
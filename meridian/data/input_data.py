@@ -22,6 +22,9 @@ from collections.abc import Sequence
 import dataclasses
 import datetime as dt
 import functools
+import hashlib
+import os
+from typing import Any
 import warnings
 
 from meridian import constants
@@ -36,6 +39,66 @@ __all__ = [
 ]
 
 
+# Version of the on-disk layout written by `InputData.save()`. Bump this
+# whenever the stored arrays or attributes change so that stale caches are
+# rejected by `InputData.load_cached()`.
+_CACHE_FORMAT_VERSION = 1
+_CACHE_FORMAT_VERSION_ATTR = "cache_format_version"
+_FINGERPRINT_ATTR = "fingerprint"
+_KPI_TYPE_ATTR = "kpi_type"
+
+# Cached properties derived from the input arrays. They are dropped whenever an
+# input array is reassigned so that they are recomputed from the new values.
+_DERIVED_CACHED_PROPERTIES = (
+    "allocated_media_spend",
+    "allocated_rf_spend",
+    "fingerprint",
+    "media_time_coordinates",
+    "time_coordinates",
+    "_aggregated_spend_cache",
+    "_media_spend_by_time",
+    "_rf_spend_by_time",
+)
+# Maximum number of calibration periods whose aggregated spend is memoized.
+_MAX_AGGREGATED_SPEND_CACHE_SIZE = 128
+
+
+def _update_hash_with_array(hasher, values: np.ndarray):
+  """Feeds the dtype, shape and raw bytes of an array into `hasher`."""
+  values = np.asarray(values)
+  if values.dtype == object:
+    values = values.astype(str)
+  hasher.update(str(values.dtype).encode())
+  hasher.update(str(values.shape).encode())
+  hasher.update(np.ascontiguousarray(values).tobytes())
+
+
+def _check_geo_shard_size(geo_shard_size: int):
+  """Verifies that a geo shard or chunk size is positive."""
+  if geo_shard_size <= 0:
+    raise ValueError(
+        f"The geo shard size must be positive, got {geo_shard_size}."
+    )
+
+
+def _open_cached_dataset(path: str) -> xr.Dataset:
+  """Lazily opens a file written by `InputData.save()` and checks its header."""
+  if not os.path.exists(path):
+    raise FileNotFoundError(f"No such file or directory: {path}")
+  dataset = xr.open_dataset(path)
+  version = dataset.attrs.get(_CACHE_FORMAT_VERSION_ATTR)
+  if version != _CACHE_FORMAT_VERSION:
+    dataset.close()
+    raise ValueError(
+        f"Cached input data at {path} has format version {version}, expected"
+        f" {_CACHE_FORMAT_VERSION}."
+    )
+  if _FINGERPRINT_ATTR not in dataset.attrs:
+    dataset.close()
+    raise ValueError(f"Cached input data at {path} has no fingerprint.")
+  return dataset
+
+
 def _check_dim_collection(
     array: xr.DataArray | None, dims: abc.Collection[abc.Collection[str]]
 ):
@@ -83,29 +146,61 @@ def _check_coords_match(dim: str, arrays: Sequence[xr.DataArray]):
       )
 
 
+def _sum_over_geos(spend: xr.DataArray | None) -> np.ndarray | None:
+  """Sums a `(geo, time, channel)` spend array over geos, read-only."""
+  if spend is None:
+    return None
+  spend_by_time = np.sum(spend.values, axis=0)
+  spend_by_time.flags.writeable = False
+  return spend_by_time
+
+
+def _allocate_spend(spend: np.ndarray, media_units: np.ndarray) -> np.ndarray:
+  """Allocates channel spend across geos and times proportionally to units.
+
+  Args:
+    spend: An array with shape `(n_channels,)` of total spend per channel.
+    media_units: An array with shape `(n_geos, n_times, n_channels)` of media
+      units used to derive the allocation proportions.
+
+  Returns:
+    An array with shape `(n_geos, n_times, n_channels)` whose sum over geos and
+    times equals `spend`. Channels with zero total media units are allocated
+    `NaN` spend.
+  """
+  total_media_units = np.sum(media_units, axis=(0, 1))
+  with np.errstate(divide="ignore", invalid="ignore"):
+    return spend * (media_units / total_media_units)
+
+
 def _aggregate_spend(
-    spend: xr.DataArray, calibration_period: np.ndarray | None
+    spend_by_time: np.ndarray | None, calibration_period: np.ndarray | None
 ) -> np.ndarray | None:
   """Aggregates spend for each channel over the calibration period.
 
   Args:
-    spend: An array with shape `(n_geos, n_times, n_channels)` to aggregate.
+    spend_by_time: An array with shape `(n_times, n_channels)` holding the spend
+      already summed over geos.
     calibration_period: An optional boolean array of shape `(n_media_times,
       n_channels)`. If provided, spend is filtered according to this period.
 
   Returns:
-    A 1-D array of aggregated media spend per channel, or `None` if `spend` is
-    `None`.
+    A 1-D array of aggregated media spend per channel, or `None` if
+    `spend_by_time` is `None`.
   """
-  if spend is None:
+  if spend_by_time is None:
     return None
 
   if calibration_period is None:
-    return np.sum(spend, axis=(0, 1))
+    return np.sum(spend_by_time, axis=0)
 
-  # Select the last `n_times` from the `calibration_period`
-  factors = np.where(calibration_period[-spend.shape[1] :, :], 1, 0)
-  return np.einsum("gtm,tm->m", spend, factors)
+  # Select the last `n_times` from the `calibration_period`. The spend is
+  # multiplied by the mask rather than summed with `where=`, so that `NaN` spend
+  # outside of the period still propagates.
+  factors = np.asarray(calibration_period, dtype=bool)[
+      -spend_by_time.shape[0] :
+  ].astype(spend_by_time.dtype)
+  return np.einsum("tm,tm->m", spend_by_time, factors)
 
 
 @dataclasses.dataclass
@@ -299,6 +394,176 @@ class InputData:
     self._validate_times()
     self._validate_geos()
 
+  @classmethod
+  def load_cached(cls, path: str) -> "InputData":
+    """Loads an `InputData` previously written by `save()`.
+
+    The stored arrays have already been validated when they were saved, so the
+    `_validate_*` checks are skipped and the arrays are used as is.
+
+    Args:
+      path: Path of a netCDF file written by `InputData.save()`.
+
+    Returns:
+      An `InputData` object holding the cached arrays.
+
+    Raises:
+      FileNotFoundError: If `path` does not exist.
+      ValueError: If the file was not written by `save()` or was written with
+        an incompatible cache format version.
+    """
+    with _open_cached_dataset(path) as dataset:
+      dataset = dataset.load()
+    data = cls._from_validated_dataset(dataset)
+    data.__dict__["fingerprint"] = str(dataset.attrs[_FINGERPRINT_ATTR])
+    return data
+
+  @classmethod
+  def iter_cached_geo_shards(
+      cls, path: str, geo_shard_size: int
+  ) -> abc.Iterator["InputData"]:
+    """Reads an `InputData` written by `save()` one geo shard at a time.
+
+    Only the arrays of the current shard are read from disk, so panels whose
+    dense `(geo, time, channel)` arrays do not fit in memory can still be
+    scanned. Saving with `geo_chunk_size` equal to `geo_shard_size` makes each
+    shard a contiguous read.
+
+    Args:
+      path: Path of a netCDF file written by `InputData.save()`.
+      geo_shard_size: Maximum number of geos in each yielded shard.
+
+    Yields:
+      `InputData` objects holding consecutive geo slices of the cached arrays.
+
+    Raises:
+      FileNotFoundError: If `path` does not exist.
+      ValueError: If `geo_shard_size` is not positive, or if the file was not
+        written by `save()` or was written with an incompatible cache format
+        version.
+    """
+    _check_geo_shard_size(geo_shard_size)
+    with _open_cached_dataset(path) as dataset:
+      n_geos = dataset.sizes[constants.GEO]
+      for start in range(0, n_geos, geo_shard_size):
+        shard = dataset.isel(
+            {constants.GEO: slice(start, start + geo_shard_size)}
+        ).load()
+        yield cls._from_validated_dataset(shard)
+
+  @classmethod
+  def _from_validated_dataset(cls, dataset: xr.Dataset) -> "InputData":
+    """Builds an `InputData` from already validated arrays, skipping checks."""
+    data = cls.__new__(cls)
+    for field in dataclasses.fields(cls):
+      if field.name == _KPI_TYPE_ATTR:
+        value = str(dataset.attrs[_KPI_TYPE_ATTR])
+      elif field.name in dataset.data_vars:
+        value = dataset[field.name]
+      else:
+        value = None
+      setattr(data, field.name, value)
+    return data
+
+  def save(self, path: str, geo_chunk_size: int | None = None):
+    """Saves the validated arrays to a netCDF file at the given path.
+
+    The file stores every non-empty array together with the `kpi_type` and the
+    content `fingerprint` of this object, and can be read back with
+    `load_cached()` without rerunning validation. The file is written to a
+    temporary location first and then moved into place, so concurrent readers
+    never observe a partially written cache.
+
+    Args:
+      path: File path to save the netCDF file to.
+      geo_chunk_size: Optional number of geos per on-disk chunk. If set, the
+        arrays with a `geo` dimension are stored chunked along `geo` so that
+        `iter_cached_geo_shards()` reads each shard contiguously. Requires a
+        netCDF4 backend (`netCDF4` or `h5netcdf`).
+
+    Raises:
+      ValueError: If `geo_chunk_size` is not positive.
+    """
+    if geo_chunk_size is not None:
+      _check_geo_shard_size(geo_chunk_size)
+    dirname = os.path.dirname(path)
+    if dirname and not os.path.exists(dirname):
+      os.makedirs(dirname)
+
+    arrays = {
+        field.name: getattr(self, field.name)
+        for field in dataclasses.fields(self)
+        if isinstance(getattr(self, field.name), xr.DataArray)
+    }
+    dataset = xr.Dataset(
+        arrays,
+        attrs={
+            _CACHE_FORMAT_VERSION_ATTR: _CACHE_FORMAT_VERSION,
+            _FINGERPRINT_ATTR: self.fingerprint,
+            _KPI_TYPE_ATTR: self.kpi_type,
+        },
+    )
+    encoding = {}
+    if geo_chunk_size is not None:
+      for name, array in arrays.items():
+        if constants.GEO in array.dims:
+          encoding[name] = {
+              "chunksizes": tuple(
+                  min(geo_chunk_size, size) if dim == constants.GEO else size
+                  for dim, size in zip(array.dims, array.shape)
+              )
+          }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    dataset.to_netcdf(tmp_path, encoding=encoding or None)
+    os.replace(tmp_path, path)
+
+  def iter_geo_shards(self, geo_shard_size: int) -> abc.Iterator["InputData"]:
+    """Splits the data into consecutive geo shards.
+
+    The shards are views of the arrays of this object rather than copies, and
+    are not revalidated.
+
+    Args:
+      geo_shard_size: Maximum number of geos in each yielded shard.
+
+    Yields:
+      `InputData` objects holding consecutive geo slices of this data. Arrays
+      without a `geo` dimension are shared by all the shards.
+
+    Raises:
+      ValueError: If `geo_shard_size` is not positive.
+    """
+    _check_geo_shard_size(geo_shard_size)
+    for start in range(0, len(self.geo), geo_shard_size):
+      geo_slice = {constants.GEO: slice(start, start + geo_shard_size)}
+      shard = self.__class__.__new__(self.__class__)
+      for field in dataclasses.fields(self):
+        value = getattr(self, field.name)
+        if isinstance(value, xr.DataArray) and constants.GEO in value.dims:
+          value = value.isel(geo_slice)
+        setattr(shard, field.name, value)
+      yield shard
+
+  @functools.cached_property
+  def fingerprint(self) -> str:
+    """Returns a content hash of the validated input data.
+
+    The hash covers the `kpi_type` and the name, dimensions, coordinates and
+    values of every array, so two `InputData` objects share a fingerprint if
+    and only if they hold the same data.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(f"{_CACHE_FORMAT_VERSION}:{self.kpi_type}".encode())
+    for field in dataclasses.fields(self):
+      array = getattr(self, field.name)
+      if not isinstance(array, xr.DataArray):
+        continue
+      hasher.update(f"{field.name}:{array.name}:{array.dims}".encode())
+      for dim in array.dims:
+        _update_hash_with_array(hasher, array[dim].values)
+      _update_hash_with_array(hasher, array.values)
+    return hasher.hexdigest()
+
   def _convert_geos_to_strings(self):
     """Converts geo coordinates to strings in all relevant DataArrays."""
     for field in dataclasses.fields(self):
@@ -306,40 +571,104 @@ class InputData:
       if isinstance(array, xr.DataArray) and constants.GEO in array.dims:
         array.coords[constants.GEO] = array.coords[constants.GEO].astype(str)
 
+  def __setattr__(self, name, value):
+    super().__setattr__(name, value)
+    if name in self.__dataclass_fields__:
+      for cached_property_name in _DERIVED_CACHED_PROPERTIES:
+        self.__dict__.pop(cached_property_name, None)
+
   # TODO: b/416775065 - Combine with Analyzer._impute_and_aggregate_spend
   @functools.cached_property
   def allocated_media_spend(self) -> xr.DataArray | None:
     """Returns the allocated media spend for each geo and time."""
     if self.media_spend is not None and len(self.media_spend.shape) == 1:
-      return self._allocate_spend(self.media_spend, self.media)
+      n_times = len(self.time)
+      return self._allocate_spend(
+          self.media_spend, self.media.values[:, -n_times:, :]
+      )
     else:
       return self.media_spend
 
-  @property
+  @functools.cached_property
   def allocated_rf_spend(self) -> xr.DataArray | None:
     """Returns the allocated RF spend for each geo and time."""
     if self.rf_spend is not None and len(self.rf_spend.shape) == 1:
-      return self._allocate_spend(self.rf_spend, self.reach * self.frequency)
+      n_times = len(self.time)
+      return self._allocate_spend(
+          self.rf_spend,
+          self.reach.values[:, -n_times:, :]
+          * self.frequency.values[:, -n_times:, :],
+      )
     else:
       return self.rf_spend
 
+  @functools.cached_property
+  def _media_spend_by_time(self) -> np.ndarray | None:
+    """Returns the allocated media spend summed over geos."""
+    return _sum_over_geos(self.allocated_media_spend)
+
+  @functools.cached_property
+  def _rf_spend_by_time(self) -> np.ndarray | None:
+    """Returns the allocated RF spend summed over geos."""
+    return _sum_over_geos(self.allocated_rf_spend)
+
+  @functools.cached_property
+  def _aggregated_spend_cache(self) -> dict[tuple[Any, ...], np.ndarray]:
+    """Returns the memoized results of `aggregate_*_spend()`."""
+    return {}
+
   def aggregate_media_spend(
       self, calibration_period: np.ndarray | None = None
   ) -> np.ndarray | None:
-    """Aggregates media spend by channel over the calibration period."""
-    return _aggregate_spend(
-        spend=self.allocated_media_spend, calibration_period=calibration_period
+    """Aggregates media spend by channel over the calibration period.
+
+    The result is memoized per calibration period, so repeated calls are cheap.
+    The returned array is read-only.
+    """
+    return self._get_aggregated_spend(
+        constants.MEDIA_SPEND, self._media_spend_by_time, calibration_period
     )
 
   def aggregate_rf_spend(
       self, calibration_period: np.ndarray | None = None
   ) -> np.ndarray | None:
-    """Aggregates RF spend by channel over the calibration period."""
-    return _aggregate_spend(
-        spend=self.allocated_rf_spend,
-        calibration_period=calibration_period,
+    """Aggregates RF spend by channel over the calibration period.
+
+    The result is memoized per calibration period, so repeated calls are cheap.
+    The returned array is read-only.
+    """
+    return self._get_aggregated_spend(
+        constants.RF_SPEND, self._rf_spend_by_time, calibration_period
     )
 
+  def _get_aggregated_spend(
+      self,
+      spend_name: str,
+      spend_by_time: np.ndarray | None,
+      calibration_period: np.ndarray | None,
+  ) -> np.ndarray | None:
+    """Returns the memoized spend aggregated over the calibration period."""
+    if spend_by_time is None:
+      return None
+    if calibration_period is None:
+      key = (spend_name, None)
+    else:
+      calibration_period = np.asarray(calibration_period, dtype=bool)
+      key = (
+          spend_name,
+          calibration_period.shape,
+          calibration_period.tobytes(),
+      )
+
+    cache = self._aggregated_spend_cache
+    if key not in cache:
+      if len(cache) >= _MAX_AGGREGATED_SPEND_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+      aggregated_spend = _aggregate_spend(spend_by_time, calibration_period)
+      aggregated_spend.flags.writeable = False
+      cache[key] = aggregated_spend
+    return cache[key]
+
   @property
   def geo(self) -> xr.DataArray:
     """Returns the geo dimension."""
@@ -939,17 +1268,27 @@ class InputData:
       return np.sum(self.kpi.values)
     return np.sum(self.kpi.values * self.revenue_per_kpi.values)
 
-  def _allocate_spend(self, spend: xr.DataArray, media_units: xr.DataArray):
-    """Allocates spend across geo and time proportionally to media units."""
-    n_times = len(self.kpi.coords[constants.TIME])
-    selected_media_units = media_units.isel(media_time=slice(-n_times, None))
-    total_media_units_per_channel = selected_media_units.sum(
-        dim=["geo", "media_time"]
+  def _allocate_spend(
+      self, spend: xr.DataArray, media_units: np.ndarray
+  ) -> xr.DataArray:
+    """Allocates spend across geo and time proportionally to media units.
+
+    Args:
+      spend: A DataArray of dimensions `(n_channels,)` to allocate.
+      media_units: An array with shape `(n_geos, n_times, n_channels)` holding
+        the media units over the KPI time window.
+
+    Returns:
+      A DataArray of dimensions `(geo, time, channel)`.
+    """
+    (channel_dim,) = spend.dims
+    return xr.DataArray(
+        _allocate_spend(spend.values, media_units),
+        dims=[constants.GEO, constants.TIME, channel_dim],
+        coords={
+            constants.GEO: self.geo.values,
+            constants.TIME: self.time.values,
+            channel_dim: spend.coords[channel_dim].values,
+        },
+        name=spend.name,
     )
-    proportions = selected_media_units / total_media_units_per_channel
-    expanded_spend = spend.expand_dims({
-        "geo": selected_media_units["geo"],
-        "media_time": selected_media_units["media_time"],
-    })
-    allocated_spend = expanded_spend * proportions
-    return allocated_spend.rename({"media_time": "time"})
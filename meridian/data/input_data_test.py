@@ -13,7 +13,10 @@
 # limitations under the License.
 
 import datetime
+import os
+from unittest import mock
 
+from absl import flags
 from absl.testing import absltest
 from absl.testing import parameterized
 from meridian import constants
@@ -1574,6 +1577,221 @@ class InputDataTest(parameterized.TestCase):
     expected_sum = np.einsum("gtm,tm->m", self.rf_spend.values, factors)
     np.testing.assert_array_almost_equal(result, expected_sum)
 
+  def test_aggregate_media_spend_is_memoized(self):
+    data = input_data.InputData(
+        kpi=self.not_lagged_kpi,
+        kpi_type=constants.NON_REVENUE,
+        population=self.population,
+        media=self.not_lagged_media,
+        media_spend=self.media_spend,
+    )
+    calibration_period = np.random.choice(
+        [True, False], size=(self.n_times, self.n_media_channels)
+    )
+
+    aggregated = data.aggregate_media_spend()
+    aggregated_cal = data.aggregate_media_spend(calibration_period)
+
+    self.assertIs(data.aggregate_media_spend(), aggregated)
+    self.assertIs(
+        data.aggregate_media_spend(calibration_period.copy()), aggregated_cal
+    )
+    self.assertFalse(aggregated.flags.writeable)
+    np.testing.assert_array_almost_equal(
+        aggregated_cal,
+        np.einsum(
+            "gtm,tm->m", self.media_spend.values, calibration_period
+        ),
+    )
+
+  def test_reassigning_spend_invalidates_cached_spend(self):
+    data = input_data.InputData(
+        kpi=self.lagged_kpi,
+        kpi_type=constants.NON_REVENUE,
+        population=self.population,
+        reach=self.lagged_reach,
+        frequency=self.lagged_frequency,
+        rf_spend=self.rf_spend,
+    )
+    np.testing.assert_array_almost_equal(
+        data.aggregate_rf_spend(), self.rf_spend.values.sum(axis=(0, 1))
+    )
+
+    rf_spend_1d = xr.DataArray(
+        [1000.0, 2000.0],
+        coords=[self.lagged_reach[constants.RF_CHANNEL].rf_channel],
+        dims=[constants.RF_CHANNEL],
+        name=constants.RF_SPEND,
+    )
+    data.rf_spend = rf_spend_1d
+
+    self.assertEqual(
+        data.allocated_rf_spend.dims,
+        (constants.GEO, constants.TIME, constants.RF_CHANNEL),
+    )
+    np.testing.assert_array_almost_equal(
+        data.aggregate_rf_spend(), rf_spend_1d.values
+    )
+
+  def test_save_and_load_cached_round_trip(self):
+    data = input_data.InputData(
+        controls=self.not_lagged_controls,
+        kpi=self.not_lagged_kpi,
+        kpi_type=constants.NON_REVENUE,
+        revenue_per_kpi=self.revenue_per_kpi,
+        population=self.population,
+        media=self.not_lagged_media,
+        media_spend=self.media_spend_1d,
+        reach=self.not_lagged_reach,
+        frequency=self.not_lagged_frequency,
+        rf_spend=self.rf_spend,
+    )
+    # The create_tempdir() method below internally uses command line flag
+    # (--test_tmpdir) and such flags are not marked as parsed by default
+    # when running with pytest. Marking as parsed directly here to make the
+    # pytest run pass.
+    flags.FLAGS.mark_as_parsed()
+    path = os.path.join(self.create_tempdir().full_path, "cache", "data.nc")
+
+    data.save(path)
+    with mock.patch.object(
+        input_data.InputData, "__post_init__", autospec=True
+    ) as mock_post_init:
+      loaded = input_data.InputData.load_cached(path)
+      mock_post_init.assert_not_called()
+
+    self.assertEqual(loaded.kpi_type, constants.NON_REVENUE)
+    self.assertEqual(loaded.fingerprint, data.fingerprint)
+    self.assertIsNone(loaded.organic_media)
+    self.assertIsNone(loaded.non_media_treatments)
+    xr.testing.assert_equal(loaded.kpi, data.kpi)
+    xr.testing.assert_equal(loaded.revenue_per_kpi, data.revenue_per_kpi)
+    xr.testing.assert_equal(loaded.controls, data.controls)
+    xr.testing.assert_equal(loaded.population, data.population)
+    xr.testing.assert_equal(loaded.media, data.media)
+    xr.testing.assert_equal(loaded.media_spend, data.media_spend)
+    xr.testing.assert_equal(loaded.reach, data.reach)
+    xr.testing.assert_equal(loaded.frequency, data.frequency)
+    xr.testing.assert_equal(loaded.rf_spend, data.rf_spend)
+    xr.testing.assert_allclose(
+        loaded.allocated_media_spend, data.allocated_media_spend
+    )
+
+  def test_fingerprint_depends_on_content(self):
+    data = input_data.InputData(
+        kpi=self.not_lagged_kpi,
+        kpi_type=constants.NON_REVENUE,
+        revenue_per_kpi=self.revenue_per_kpi,
+        population=self.population,
+        media=self.not_lagged_media,
+        media_spend=self.media_spend,
+    )
+    same_data = input_data.InputData(
+        kpi=self.not_lagged_kpi.copy(),
+        kpi_type=constants.NON_REVENUE,
+        revenue_per_kpi=self.revenue_per_kpi,
+        population=self.population,
+        media=self.not_lagged_media,
+        media_spend=self.media_spend,
+    )
+    other_data = input_data.InputData(
+        kpi=self.not_lagged_kpi + 1,
+        kpi_type=constants.NON_REVENUE,
+        revenue_per_kpi=self.revenue_per_kpi,
+        population=self.population,
+        media=self.not_lagged_media,
+        media_spend=self.media_spend,
+    )
+
+    self.assertEqual(data.fingerprint, same_data.fingerprint)
+    self.assertNotEqual(data.fingerprint, other_data.fingerprint)
+
+  def test_load_cached_wrong_format_version_fails(self):
+    flags.FLAGS.mark_as_parsed()
+    path = os.path.join(self.create_tempdir().full_path, "data.nc")
+    xr.Dataset(
+        {constants.KPI: self.not_lagged_kpi},
+        attrs={"cache_format_version": 0, "kpi_type": constants.NON_REVENUE},
+    ).to_netcdf(path)
+
+    with self.assertRaisesRegex(ValueError, "format version 0"):
+      input_data.InputData.load_cached(path)
+
+  def test_load_cached_missing_file_fails(self):
+    flags.FLAGS.mark_as_parsed()
+    path = os.path.join(self.create_tempdir().full_path, "missing.nc")
+    with self.assertRaises(FileNotFoundError):
+      input_data.InputData.load_cached(path)
+
+  def test_iter_geo_shards(self):
+    data = input_data.InputData(
+        controls=self.not_lagged_controls,
+        kpi=self.not_lagged_kpi,
+        kpi_type=constants.NON_REVENUE,
+        revenue_per_kpi=self.revenue_per_kpi,
+        population=self.population,
+        media=self.not_lagged_media,
+        media_spend=self.media_spend_1d,
+    )
+
+    shards = list(data.iter_geo_shards(geo_shard_size=4))
+
+    self.assertEqual([len(shard.geo) for shard in shards], [4, 4, 2])
+    xr.testing.assert_equal(
+        xr.concat([shard.media for shard in shards], dim=constants.GEO),
+        data.media,
+    )
+    xr.testing.assert_equal(
+        xr.concat([shard.kpi for shard in shards], dim=constants.GEO),
+        data.kpi,
+    )
+    for shard in shards:
+      self.assertIs(shard.media_spend, data.media_spend)
+
+  def test_save_chunked_and_iter_cached_geo_shards(self):
+    data = input_data.InputData(
+        controls=self.not_lagged_controls,
+        kpi=self.not_lagged_kpi,
+        kpi_type=constants.NON_REVENUE,
+        revenue_per_kpi=self.revenue_per_kpi,
+        population=self.population,
+        media=self.not_lagged_media,
+        media_spend=self.media_spend_1d,
+    )
+    flags.FLAGS.mark_as_parsed()
+    path = os.path.join(self.create_tempdir().full_path, "data.nc")
+
+    data.save(path, geo_chunk_size=3)
+    shards = list(
+        input_data.InputData.iter_cached_geo_shards(path, geo_shard_size=3)
+    )
+
+    self.assertLen(shards, 4)
+    for shard in shards:
+      self.assertEqual(shard.kpi_type, constants.NON_REVENUE)
+    xr.testing.assert_equal(
+        xr.concat([shard.media for shard in shards], dim=constants.GEO),
+        data.media,
+    )
+    xr.testing.assert_equal(
+        xr.concat([shard.population for shard in shards], dim=constants.GEO),
+        data.population,
+    )
+    xr.testing.assert_equal(shards[0].media_spend, data.media_spend)
+
+  def test_iter_geo_shards_not_positive_fails(self):
+    data = input_data.InputData(
+        kpi=self.not_lagged_kpi,
+        kpi_type=constants.NON_REVENUE,
+        population=self.population,
+        media=self.not_lagged_media,
+        media_spend=self.media_spend_1d,
+    )
+    with self.assertRaisesRegex(
+        ValueError, "The geo shard size must be positive, got 0."
+    ):
+      next(data.iter_geo_shards(geo_shard_size=0))
+
 
 class NonpaidInputDataTest(parameterized.TestCase):
   """Tests for non-paid InputData."""
@@ -23,6 +23,8 @@ import abc
 from collections.abc import Mapping, Sequence
 import dataclasses
 import datetime as dt
+import hashlib
+import os
 import warnings
 
 import immutabledict
@@ -40,6 +42,39 @@ __all__ = [
 ]
 
 
+def _get_cache_path(
+    cache_dir: str,
+    content_digest: bytes,
+    coord_to_columns: 'CoordToColumns',
+    kpi_type: str,
+    channel_mappings: Mapping[str, Mapping[str, str] | None],
+) -> str:
+  """Returns the path of the cached `InputData` for the given loader inputs.
+
+  The file name is a hash of the source content and of every loader argument
+  that affects the resulting `InputData`, so any change to either results in a
+  cache miss.
+
+  Args:
+    cache_dir: Directory holding the cached `InputData` files.
+    content_digest: A digest of the raw source data.
+    coord_to_columns: The `CoordToColumns` mapping used by the loader.
+    kpi_type: The KPI type passed to the loader.
+    channel_mappings: The `*_to_channel` mappings passed to the loader, keyed by
+      argument name.
+
+  Returns:
+    The path of a netCDF file inside `cache_dir`.
+  """
+  hasher = hashlib.sha256(content_digest)
+  hasher.update(repr(coord_to_columns).encode())
+  hasher.update(kpi_type.encode())
+  for name, mapping in sorted(channel_mappings.items()):
+    items = sorted(mapping.items()) if mapping is not None else None
+    hasher.update(f'{name}={items}'.encode())
+  return os.path.join(cache_dir, f'{hasher.hexdigest()}.nc')
+
+
 class InputDataLoader(metaclass=abc.ABCMeta):
   """Loads the data from the specified data format."""
 
@@ -788,6 +823,12 @@ class DataFrameDataLoader(InputDataLoader):
           'organic_frequency_newsletter': 'newsletter',
       }
       ```
+
+    cache_dir: An optional directory for caching the loaded `InputData`. If
+      provided, the validated `InputData` is saved there under a hash of the
+      DataFrame content and the loader arguments, and later loaders given the
+      same inputs read it back with `InputData.load_cached()`, skipping
+      DataFrame validation and parsing.
   """  # pyformat: disable
 
   df: pd.DataFrame
@@ -800,6 +841,7 @@ class DataFrameDataLoader(InputDataLoader):
   rf_spend_to_channel: Mapping[str, str] | None = None
   organic_reach_to_channel: Mapping[str, str] | None = None
   organic_frequency_to_channel: Mapping[str, str] | None = None
+  cache_dir: str | None = None
 
   # If [key] in the following dict exists as an attribute in `coord_to_columns`,
   # then the corresponding attribute must exist in this loader instance.
@@ -814,6 +856,22 @@ class DataFrameDataLoader(InputDataLoader):
   })
 
   def __post_init__(self):
+    self._cache_path = None
+    self._cache_hit = False
+    if self.cache_dir is not None:
+      self._cache_path = _get_cache_path(
+          cache_dir=self.cache_dir,
+          content_digest=pd.util.hash_pandas_object(self.df).values.tobytes()
+          + repr(self.df.columns.to_list()).encode(),
+          coord_to_columns=self.coord_to_columns,
+          kpi_type=self.kpi_type,
+          channel_mappings=self._channel_mappings,
+      )
+      if os.path.exists(self._cache_path):
+        # The cached `InputData` was validated when it was saved.
+        self._cache_hit = True
+        return
+
     self._validate_and_normalize_time_values()
     self._expand_if_national()
     self._validate_column_names()
@@ -821,6 +879,14 @@ class DataFrameDataLoader(InputDataLoader):
     self._validate_geo_and_time()
     self._validate_nas()
 
+  @property
+  def _channel_mappings(self) -> dict[str, Mapping[str, str] | None]:
+    """Returns the `*_to_channel` mappings of this loader by argument name."""
+    return {
+        channel_dict: getattr(self, channel_dict)
+        for channel_dict in self._required_mappings.values()
+    }
+
   def _validate_and_normalize_time_values(self):
     """Validates that time values are in the conventional Meridian format.
 
@@ -1023,6 +1089,16 @@ class DataFrameDataLoader(InputDataLoader):
 
   def load(self) -> input_data.InputData:
     """Reads data from a dataframe and returns an InputData object."""
+    if self._cache_hit:
+      return input_data.InputData.load_cached(self._cache_path)
+
+    data = self._load_dataframe()
+    if self._cache_path is not None:
+      data.save(self._cache_path)
+    return data
+
+  def _load_dataframe(self) -> input_data.InputData:
+    """Converts the validated dataframe into an `InputData` object."""
 
     # Change geo strings to numbers to keep the order of geos. The .to_xarray()
     # method from Pandas sorts lexicographically by the key columns, so if the
@@ -1268,6 +1344,7 @@ class CsvDataLoader(InputDataLoader):
       rf_spend_to_channel: Mapping[str, str] | None = None,
       organic_reach_to_channel: Mapping[str, str] | None = None,
       organic_frequency_to_channel: Mapping[str, str] | None = None,
+      cache_dir: str | None = None,
   ):
     """Constructor.
 
@@ -1386,6 +1463,12 @@ class CsvDataLoader(InputDataLoader):
         }
         ```
 
+      cache_dir: An optional directory for caching the loaded `InputData`. If
+        provided, the validated `InputData` is saved there under a hash of the
+        CSV file content and the loader arguments. When a matching cache entry
+        already exists, the CSV file is not parsed at all and `load()` reads
+        the cached `InputData` instead.
+
     Note: In a national model, `geo` and `population` are optional. If
     `population` is provided, it is reset to a default value of `1.0`.
 
@@ -1394,21 +1477,46 @@ class CsvDataLoader(InputDataLoader):
     provided, then `reach_to_channel`, `frequency_to_channel`, and
     `rf_spend_to_channel` are required.
     """  # pyformat: disable
+    channel_mappings = {
+        'media_to_channel': media_to_channel,
+        'media_spend_to_channel': media_spend_to_channel,
+        'reach_to_channel': reach_to_channel,
+        'frequency_to_channel': frequency_to_channel,
+        'rf_spend_to_channel': rf_spend_to_channel,
+        'organic_reach_to_channel': organic_reach_to_channel,
+        'organic_frequency_to_channel': organic_frequency_to_channel,
+    }
+    self._cache_path = None
+    if cache_dir is not None:
+      content_hasher = hashlib.sha256()
+      with open(csv_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+          content_hasher.update(chunk)
+      self._cache_path = _get_cache_path(
+          cache_dir=cache_dir,
+          content_digest=content_hasher.digest(),
+          coord_to_columns=coord_to_columns,
+          kpi_type=kpi_type,
+          channel_mappings=channel_mappings,
+      )
+      if os.path.exists(self._cache_path):
+        self._df_loader = None
+        return
+
     df = pd.read_csv(csv_path)
     self._df_loader = DataFrameDataLoader(
         df=df,
         coord_to_columns=coord_to_columns,
         kpi_type=kpi_type,
-        media_to_channel=media_to_channel,
-        media_spend_to_channel=media_spend_to_channel,
-        reach_to_channel=reach_to_channel,
-        frequency_to_channel=frequency_to_channel,
-        rf_spend_to_channel=rf_spend_to_channel,
-        organic_reach_to_channel=organic_reach_to_channel,
-        organic_frequency_to_channel=organic_frequency_to_channel,
+        **channel_mappings,
     )
 
   def load(self) -> input_data.InputData:
     """Reads data from a CSV file and returns an `InputData` object."""
+    if self._df_loader is None:
+      return input_data.InputData.load_cached(self._cache_path)
 
-    return self._df_loader.load()
+    data = self._df_loader.load()
+    if self._cache_path is not None:
+      data.save(self._cache_path)
+    return data
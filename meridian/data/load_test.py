@@ -17,8 +17,10 @@ import copy
 import dataclasses
 import datetime
 import os
+from unittest import mock
 import warnings
 
+from absl import flags
 from absl.testing import absltest
 from absl.testing import parameterized
 from meridian import constants
@@ -1046,6 +1048,106 @@ class InputDataLoaderTest(parameterized.TestCase):
     self.assertIsNone(data.frequency)
     self.assertIsNone(data.rf_spend)
 
+  def test_dataframe_data_loader_cache_dir_reuses_cached_data(self):
+    dataset = test_utils.random_dataset(
+        n_geos=5,
+        n_times=20,
+        n_media_times=23,
+        n_media_channels=2,
+        n_controls=1,
+    )
+    df = test_utils.dataset_to_dataframe(
+        dataset,
+        controls_column_names=test_utils._sample_names('control_', 1),
+        media_column_names=test_utils._sample_names('media_', 2),
+        media_spend_column_names=test_utils._sample_names('media_spend_', 2),
+    )
+    coord_to_columns = test_utils.sample_coord_to_columns(
+        n_controls=1, n_media_channels=2
+    )
+    loader_kwargs = dict(
+        coord_to_columns=coord_to_columns,
+        kpi_type=constants.NON_REVENUE,
+        media_to_channel={f'media_{x}': f'ch_{x}' for x in range(2)},
+        media_spend_to_channel={
+            f'media_spend_{x}': f'ch_{x}' for x in range(2)
+        },
+    )
+    # The create_tempdir() method below internally uses command line flag
+    # (--test_tmpdir) and such flags are not marked as parsed by default
+    # when running with pytest. Marking as parsed directly here to make the
+    # pytest run pass.
+    flags.FLAGS.mark_as_parsed()
+    cache_dir = self.create_tempdir().full_path
+
+    data = load.DataFrameDataLoader(
+        df=df.copy(), cache_dir=cache_dir, **loader_kwargs
+    ).load()
+    self.assertLen(os.listdir(cache_dir), 1)
+
+    with mock.patch.object(
+        load.DataFrameDataLoader, '_validate_nas', autospec=True
+    ) as mock_validate_nas:
+      cached_data = load.DataFrameDataLoader(
+          df=df.copy(), cache_dir=cache_dir, **loader_kwargs
+      ).load()
+      mock_validate_nas.assert_not_called()
+
+    self.assertLen(os.listdir(cache_dir), 1)
+    self.assertEqual(cached_data.fingerprint, data.fingerprint)
+    xr.testing.assert_equal(cached_data.kpi, data.kpi)
+    xr.testing.assert_equal(cached_data.media, data.media)
+    xr.testing.assert_equal(cached_data.media_spend, data.media_spend)
+
+    modified_df = df.copy()
+    modified_df[coord_to_columns.kpi] += 1
+    load.DataFrameDataLoader(
+        df=modified_df, cache_dir=cache_dir, **loader_kwargs
+    ).load()
+    self.assertLen(os.listdir(cache_dir), 2)
+
+  def test_csv_data_loader_cache_dir_skips_parsing(self):
+    dataset = test_utils.random_dataset(
+        n_geos=5,
+        n_times=20,
+        n_media_times=20,
+        n_media_channels=2,
+        n_controls=1,
+    )
+    df = test_utils.dataset_to_dataframe(
+        dataset,
+        controls_column_names=test_utils._sample_names('control_', 1),
+        media_column_names=test_utils._sample_names('media_', 2),
+        media_spend_column_names=test_utils._sample_names('media_spend_', 2),
+    )
+    flags.FLAGS.mark_as_parsed()
+    tmp_dir = self.create_tempdir().full_path
+    csv_path = os.path.join(tmp_dir, 'data.csv')
+    df.to_csv(csv_path, index=False)
+    cache_dir = os.path.join(tmp_dir, 'cache')
+    loader_kwargs = dict(
+        csv_path=csv_path,
+        coord_to_columns=test_utils.sample_coord_to_columns(
+            n_controls=1, n_media_channels=2
+        ),
+        kpi_type=constants.NON_REVENUE,
+        media_to_channel={f'media_{x}': f'ch_{x}' for x in range(2)},
+        media_spend_to_channel={
+            f'media_spend_{x}': f'ch_{x}' for x in range(2)
+        },
+        cache_dir=cache_dir,
+    )
+
+    data = load.CsvDataLoader(**loader_kwargs).load()
+    with mock.patch.object(pd, 'read_csv', autospec=True) as mock_read_csv:
+      cached_data = load.CsvDataLoader(**loader_kwargs).load()
+      mock_read_csv.assert_not_called()
+
+    self.assertEqual(cached_data.fingerprint, data.fingerprint)
+    xr.testing.assert_equal(cached_data.kpi, data.kpi)
+    xr.testing.assert_equal(cached_data.controls, data.controls)
+    xr.testing.assert_equal(cached_data.media, data.media)
+
   @parameterized.named_parameters(
       ('not_lagged', 50, 200, 200, 2, 5), ('lagged', 50, 200, 203, 2, 5)
   )
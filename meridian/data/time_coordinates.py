@@ -98,8 +98,13 @@ def normalize_date_interval(
   return (start, end)
 
 
-def _to_dates_list(times: pd.DatetimeIndex) -> list[datetime.date]:
-  return [dt.date() for dt in times]
+# Ordinal of the Unix epoch, used to convert `datetime.date`s into epoch days.
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def _to_epoch_day(date: datetime.date) -> int:
+  """Returns the number of days between the Unix epoch and `date`."""
+  return date.toordinal() - _EPOCH_ORDINAL
 
 
 @dataclasses.dataclass(frozen=True)
@@ -114,9 +119,16 @@ class TimeCoordinates:
   extracting values out of these time coordinates which are treated as numeric
   "date" values.
 
+  Internally the coordinates are also held as an int64 array of days since the
+  Unix epoch, together with hash maps from dates and date strings to their
+  position. Membership tests and selections are therefore O(1) per date and
+  never re-parse the date strings.
+
   Attributes:
     datetime_index: The given time coordinates, parsed as indexable
       `DatetimeIndex`.
+    epoch_days: The given time coordinates, as a read-only int64 array of days
+      since the Unix epoch.
     all_dates: The given time coordinates, as a list of Pythonic `datetime.date`
       objects.
     all_dates_str: The given time coordinates, as a list of Meridian-formatted
@@ -153,16 +165,67 @@ class TimeCoordinates:
           "Time coordinates must be strictly monotonically increasing."
       )
 
-  @property
-  def all_dates(self) -> list[datetime.date]:
-    return _to_dates_list(self.datetime_index)
+  @functools.cached_property
+  def epoch_days(self) -> np.ndarray:
+    epoch_days = self.datetime_index.values.astype("datetime64[D]").astype(
+        np.int64
+    )
+    epoch_days.flags.writeable = False
+    return epoch_days
 
-  @property
-  def all_dates_str(self) -> list[str]:
+  @functools.cached_property
+  def all_dates(self) -> list[datetime.date]:
     return [
-        time.strftime(constants.DATE_FORMAT) for time in self.datetime_index
+        datetime.date.fromordinal(day + _EPOCH_ORDINAL)
+        for day in self.epoch_days.tolist()
     ]
 
+  @functools.cached_property
+  def all_dates_str(self) -> list[str]:
+    return np.datetime_as_string(
+        self.epoch_days.astype("datetime64[D]"), unit="D"
+    ).tolist()
+
+  @functools.cached_property
+  def _index_by_epoch_day(self) -> dict[int, int]:
+    """Maps each epoch day in the time coordinates to its position."""
+    return {day: i for i, day in enumerate(self.epoch_days.tolist())}
+
+  @functools.cached_property
+  def _index_by_date_str(self) -> dict[str, int]:
+    """Maps each Meridian-formatted date string to its position."""
+    return {date: i for i, date in enumerate(self.all_dates_str)}
+
+  def get_index(self, date: Date) -> int | None:
+    """Returns the position of `date` in the time coordinates.
+
+    Args:
+      date: A polymorphic date value. Strings are looked up directly and only
+        parsed if they are not a Meridian-formatted time coordinate.
+
+    Returns:
+      The position of `date`, or `None` if it is not in the time coordinates.
+    """
+    if isinstance(date, str) and date in self._index_by_date_str:
+      return self._index_by_date_str[date]
+    return self._index_by_epoch_day.get(_to_epoch_day(normalize_date(date)))
+
+  def get_selected_mask(self, selected_dates: Sequence[Date]) -> np.ndarray:
+    """Returns a boolean mask of the time coordinates in `selected_dates`.
+
+    Dates in `selected_dates` that are not in the time coordinates are ignored.
+
+    Args:
+      selected_dates: A sequence of polymorphic date values.
+
+    Returns:
+      A boolean array with one element per time coordinate.
+    """
+    mask = np.zeros(len(self.epoch_days), dtype=bool)
+    indices = [self.get_index(date) for date in selected_dates]
+    mask[[i for i in indices if i is not None]] = True
+    return mask
+
   @functools.cached_property
   def interval_days(self) -> int:
     """Returns the *mean* interval between two neighboring dates in `all_dates`.
@@ -181,12 +244,12 @@ class TimeCoordinates:
   @property
   def _timedelta_index(self) -> pd.TimedeltaIndex:
     """Returns the timedeltas between consecutive dates in `datetime_index`."""
-    return self.datetime_index.diff().dropna()
+    return pd.to_timedelta(self._interval_days, unit="D")
 
-  @property
-  def _interval_days(self) -> Sequence[int]:
-    """Converts `_timedelta_index` to a sequence of days for easier compute."""
-    return self._timedelta_index.days.to_numpy()
+  @functools.cached_property
+  def _interval_days(self) -> np.ndarray:
+    """Returns the days between consecutive dates in `epoch_days`."""
+    return np.diff(self.epoch_days)
 
   def _is_regular_time_index(self) -> bool:
     """Returns True if the time index is "regularly spaced"."""
@@ -265,30 +328,32 @@ class TimeCoordinates:
       return None
 
     if start_date is None:
-      start_date = min(self.all_dates)
+      start_index = 0
     else:
-      start_date = normalize_date(start_date)
-      if start_date not in self.all_dates:
+      start_index = self.get_index(start_date)
+      if start_index is None:
         raise ValueError(
-            f"start_date ({start_date}) must be in the time coordinates!"
+            f"start_date ({normalize_date(start_date)}) must be in the time"
+            " coordinates!"
         )
 
     if end_date is None:
-      end_date = max(self.all_dates)
+      end_index = len(self.epoch_days) - 1
     else:
-      end_date = normalize_date(end_date)
-      if end_date not in self.all_dates:
+      end_index = self.get_index(end_date)
+      if end_index is None:
         raise ValueError(
-            f"end_date ({end_date}) must be in the time coordinates!"
+            f"end_date ({normalize_date(end_date)}) must be in the time"
+            " coordinates!"
         )
 
-    if start_date > end_date:
+    if start_index > end_index:
       raise ValueError(
-          f"start_date ({start_date}) must be less than or equal to end_date"
-          f" ({end_date})!"
+          f"start_date ({self.all_dates[start_index]}) must be less than or"
+          f" equal to end_date ({self.all_dates[end_index]})!"
       )
 
-    if start_date == min(self.all_dates) and end_date == max(self.all_dates):
+    if start_index == 0 and end_index == len(self.epoch_days) - 1:
       return None
 
-    return [date for date in self.all_dates if start_date <= date <= end_date]
+    return self.all_dates[start_index : end_index + 1]
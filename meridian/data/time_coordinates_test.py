@@ -428,6 +428,51 @@ class TimeCoordinatesTest(parameterized.TestCase):
     with self.assertRaisesRegex(ValueError, expected_error_message):
       self.coordinates.expand_selected_time_dims(start_date, end_date)
 
+  def test_property_epoch_days(self):
+    expected_epoch_days = [
+        (
+            dt.datetime.strptime(date, constants.DATE_FORMAT).date()
+            - dt.date(1970, 1, 1)
+        ).days
+        for date in _ALL_DATES
+    ]
+    self.assertEqual(self.coordinates.epoch_days.dtype, np.int64)
+    np.testing.assert_array_equal(
+        self.coordinates.epoch_days, expected_epoch_days
+    )
+    self.assertFalse(self.coordinates.epoch_days.flags.writeable)
+
+  @parameterized.named_parameters(
+      dict(testcase_name="date_str", date="2024-01-15", expected_index=2),
+      dict(
+          testcase_name="datetime",
+          date=dt.datetime(2024, 2, 19),
+          expected_index=7,
+      ),
+      dict(testcase_name="date", date=dt.date(2024, 1, 1), expected_index=0),
+      dict(
+          testcase_name="np_datetime64",
+          date=np.datetime64("2024-01-08"),
+          expected_index=1,
+      ),
+      dict(testcase_name="missing", date="2024-01-02", expected_index=None),
+  )
+  def test_get_index(self, date, expected_index):
+    self.assertEqual(self.coordinates.get_index(date), expected_index)
+
+  def test_get_selected_mask(self):
+    mask = self.coordinates.get_selected_mask(
+        ["2024-01-08", dt.date(2024, 2, 12), "2023-01-01"]
+    )
+    np.testing.assert_array_equal(
+        mask, [False, True, False, False, False, False, True, False]
+    )
+
+  def test_get_selected_mask_empty(self):
+    np.testing.assert_array_equal(
+        self.coordinates.get_selected_mask([]), [False] * len(_ALL_DATES)
+    )
+
 
 if __name__ == "__main__":
   absltest.main()
@@ -14,12 +14,50 @@
 
 """The Meridian API module that models the data."""
 
-from meridian.model import adstock_hill
-from meridian.model import knots
-from meridian.model import media
-from meridian.model import model
-from meridian.model import posterior_sampler
-from meridian.model import prior_distribution
-from meridian.model import prior_sampler
-from meridian.model import spec
-from meridian.model import transformers
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+  from meridian.model import adstock_hill
+  from meridian.model import compilation
+  from meridian.model import cross_validation
+  from meridian.model import knots
+  from meridian.model import media
+  from meridian.model import model
+  from meridian.model import model_runner
+  from meridian.model import posterior_sampler
+  from meridian.model import prior_distribution
+  from meridian.model import prior_sampler
+  from meridian.model import result_cache
+  from meridian.model import sampling_telemetry
+  from meridian.model import spec
+  from meridian.model import transformers
+
+# The submodules are imported on first access (PEP 562), so that `result_cache`
+# loads without TensorFlow.
+_SUBMODULES = frozenset([
+    "adstock_hill",
+    "compilation",
+    "cross_validation",
+    "knots",
+    "media",
+    "model",
+    "model_runner",
+    "posterior_sampler",
+    "prior_distribution",
+    "prior_sampler",
+    "result_cache",
+    "sampling_telemetry",
+    "spec",
+    "transformers",
+])
+
+
+def __getattr__(name: str):
+  if name in _SUBMODULES:
+    return importlib.import_module(f"{__name__}.{name}")
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+  return sorted(set(globals()) | _SUBMODULES)
@@ -0,0 +1,131 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Caching and instrumentation of the XLA compilation of Meridian functions.
+
+The `tf.function(jit_compile=True)` functions of Meridian, such as the MCMC
+sampler, the data transformers and the `Analyzer` computations, are compiled
+with XLA the first time they are called with a new input signature. A
+persistent compilation cache stores the compiled programs on disk, so that new
+processes that run the same model shapes skip the compilation:
+
+```python
+from meridian.model import compilation
+
+compilation.set_compilation_cache_dir("/tmp/meridian_xla_cache")
+```
+
+The trace counters report how many times each instrumented function has been
+traced. Each trace of a jit-compiled function is followed by one XLA
+compilation, so any count above one is a retrace and a recompilation.
+"""
+
+import collections
+from collections.abc import Callable
+import functools
+import os
+from typing import Any, TypeVar
+
+
+__all__ = [
+    "count_traces",
+    "get_trace_counts",
+    "reset_trace_counts",
+    "set_compilation_cache_dir",
+]
+
+
+_XLA_FLAGS_ENV = "TF_XLA_FLAGS"
+_CACHE_DIR_FLAG = "--tf_xla_persistent_cache_directory"
+_CACHE_READ_ONLY_FLAG = "--tf_xla_persistent_cache_read_only"
+
+_trace_counts: collections.Counter[str] = collections.Counter()
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def set_compilation_cache_dir(
+    cache_dir: str | os.PathLike[str], read_only: bool = False
+):
+  """Sets the directory of the persistent XLA compilation cache.
+
+  XLA reads its flags once, when the first function is compiled. This must
+  therefore be called before any Meridian model is built or sampled in the
+  process.
+
+  Args:
+    cache_dir: Directory in which the compiled XLA programs are stored. It is
+      created if it does not exist.
+    read_only: If `True`, programs are loaded from the cache but new programs
+      are not written to it. This is useful when many processes share a cache
+      that has been populated ahead of time.
+  """
+  cache_dir = os.fspath(cache_dir)
+  os.makedirs(cache_dir, exist_ok=True)
+  flags = [
+      flag
+      for flag in os.environ.get(_XLA_FLAGS_ENV, "").split()
+      if not flag.startswith((_CACHE_DIR_FLAG, _CACHE_READ_ONLY_FLAG))
+  ]
+  flags.append(f"{_CACHE_DIR_FLAG}={cache_dir}")
+  if read_only:
+    flags.append(f"{_CACHE_READ_ONLY_FLAG}=true")
+  os.environ[_XLA_FLAGS_ENV] = " ".join(flags)
+
+
+def count_traces(fn: _F) -> _F:
+  """Counts the traces of a function decorated with `tf.function`.
+
+  Apply this decorator below `tf.function`, so that the count is only
+  incremented when the Python function is traced and not when the compiled
+  function runs:
+
+  ```python
+  @tf.function(jit_compile=True)
+  @compilation.count_traces
+  def f(x):
+    ...
+  ```
+
+  The traces are counted per qualified function name, across all instances
+  for methods.
+
+  Args:
+    fn: The Python function to instrument.
+
+  Returns:
+    The instrumented function.
+  """
+  name = fn.__qualname__
+
+  @functools.wraps(fn)
+  def wrapper(*args, **kwargs):
+    _trace_counts[name] += 1
+    return fn(*args, **kwargs)
+
+  return wrapper  # pytype: disable=bad-return-type
+
+
+def get_trace_counts() -> dict[str, int]:
+  """Returns the number of traces of each instrumented function.
+
+  Only functions that have been traced at least once are included. Each trace
+  of a jit-compiled function triggers one XLA compilation.
+  """
+  return dict(_trace_counts)
+
+
+def reset_trace_counts():
+  """Resets the trace counters of all instrumented functions."""
+  _trace_counts.clear()
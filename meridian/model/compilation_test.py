@@ -0,0 +1,96 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from unittest import mock
+
+from absl import flags
+from absl.testing import absltest
+from meridian.model import compilation
+import tensorflow as tf
+
+
+@tf.function(jit_compile=True)
+@compilation.count_traces
+def _double(x):
+  return 2.0 * x
+
+
+class CompilationTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    compilation.reset_trace_counts()
+    # create_tempdir() uses the --test_tmpdir flag, which is not marked as
+    # parsed when running with pytest.
+    flags.FLAGS.mark_as_parsed()
+
+  def test_count_traces_counts_retraces_only(self):
+    _double(tf.ones(2))
+    _double(tf.zeros(2))
+    self.assertEqual(
+        compilation.get_trace_counts(), {"_double": 1}
+    )
+
+    _double(tf.ones(3))
+    self.assertEqual(
+        compilation.get_trace_counts(), {"_double": 2}
+    )
+
+  def test_count_traces_preserves_signature(self):
+    self.assertEqual(_double.python_function.__name__, "_double")
+    self.assertEqual(_double.python_function(3.0), 6.0)
+
+  def test_reset_trace_counts(self):
+    _double(tf.ones(4))
+    compilation.reset_trace_counts()
+    self.assertEmpty(compilation.get_trace_counts())
+
+  def test_set_compilation_cache_dir(self):
+    cache_dir = os.path.join(self.create_tempdir().full_path, "cache")
+    with mock.patch.dict(
+        os.environ, {"TF_XLA_FLAGS": "--tf_xla_auto_jit=2"}, clear=True
+    ):
+      compilation.set_compilation_cache_dir(cache_dir)
+      self.assertTrue(os.path.isdir(cache_dir))
+      self.assertEqual(
+          os.environ["TF_XLA_FLAGS"],
+          "--tf_xla_auto_jit=2"
+          f" --tf_xla_persistent_cache_directory={cache_dir}",
+      )
+
+  def test_set_compilation_cache_dir_replaces_previous_dir(self):
+    first_dir = self.create_tempdir().full_path
+    second_dir = self.create_tempdir().full_path
+    with mock.patch.dict(os.environ, {}, clear=True):
+      compilation.set_compilation_cache_dir(first_dir, read_only=True)
+      compilation.set_compilation_cache_dir(second_dir)
+      self.assertEqual(
+          os.environ["TF_XLA_FLAGS"],
+          f"--tf_xla_persistent_cache_directory={second_dir}",
+      )
+
+  def test_set_compilation_cache_dir_read_only(self):
+    cache_dir = self.create_tempdir().full_path
+    with mock.patch.dict(os.environ, {}, clear=True):
+      compilation.set_compilation_cache_dir(cache_dir, read_only=True)
+      self.assertEqual(
+          os.environ["TF_XLA_FLAGS"],
+          f"--tf_xla_persistent_cache_directory={cache_dir}"
+          " --tf_xla_persistent_cache_read_only=true",
+      )
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -0,0 +1,326 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cross-validation of a Meridian model with `ModelSpec.holdout_id`.
+
+Each fold holds out part of the KPI data with a `holdout_id` mask, and the
+models of all the folds are fit in parallel with `model_runner.fit_models()`:
+
+```python
+from meridian.model import cross_validation
+
+folds = cross_validation.rolling_origin_folds(data, n_folds=4, horizon=8)
+result = cross_validation.cross_validate(
+    data,
+    folds,
+    "/tmp/cross_validation",
+    sample_posterior_kwargs=dict(
+        n_chains=4, n_adapt=500, n_burnin=500, n_keep=1000, seed=1
+    ),
+    max_workers=4,
+    threads_per_worker=2,
+)
+result.metrics
+```
+
+With `warm_start=True`, the model is first fit to all the data, and the chains
+of every fold start from its posterior, see `cross_validate()`.
+"""
+
+from collections.abc import Mapping, Sequence
+import dataclasses
+import os
+from typing import Any
+import warnings
+
+from meridian.data import input_data as data
+from meridian.model import model_runner
+from meridian.model import spec
+import numpy as np
+import pandas as pd
+
+
+__all__ = [
+    "CrossValidationResult",
+    "Fold",
+    "cross_validate",
+    "geo_group_folds",
+    "rolling_origin_folds",
+]
+
+
+_FULL_DATA_DIR = "full_data"
+_FULL_DATA_NAME = "full_data"
+_FOLDS_DIR = "folds"
+_METRICS = ("r_squared", "mape", "wmape")
+
+
+@dataclasses.dataclass(frozen=True)
+class Fold:
+  """A cross-validation fold.
+
+  Attributes:
+    name: Unique name of the fold.
+    holdout_id: Boolean array of dimensions `(n_geos, n_times)` for a geo model
+      or `(n_times,)` for a national model, indicating the observations that
+      are excluded from the training sample of the fold.
+    test_geos: Optional geos on which the fold is evaluated. By default, all
+      geos are used.
+    test_times: Optional time periods on which the fold is evaluated. By
+      default, all time periods are used.
+  """
+
+  name: str
+  holdout_id: np.ndarray
+  test_geos: Sequence[str] | None = None
+  test_times: Sequence[str] | None = None
+
+
+@dataclasses.dataclass(frozen=True)
+class CrossValidationResult:
+  """The outcome of `cross_validate()`.
+
+  Attributes:
+    folds: The `model_runner.fit_models()` summary table of the folds, with one
+      row per fold. The predictive accuracy metrics are out-of-sample.
+    metrics: The mean and standard deviation across the folds that did not fail
+      of the out-of-sample `r_squared`, `mape` and `wmape`, with one row per
+      metric.
+  """
+
+  folds: pd.DataFrame
+  metrics: pd.DataFrame
+
+
+def _is_national(input_data: data.InputData) -> bool:
+  return len(input_data.geo) == 1
+
+
+def rolling_origin_folds(
+    input_data: data.InputData, n_folds: int, horizon: int
+) -> list[Fold]:
+  """Returns rolling-origin folds over the last time periods.
+
+  The test periods of the folds are the last `n_folds` consecutive blocks of
+  `horizon` time periods. Each fold is trained on all the time periods before
+  its test block and holds out its test block and all the later time periods,
+  in all geos.
+
+  Args:
+    input_data: The input data of the model.
+    n_folds: Number of folds.
+    horizon: Number of time periods of each test block.
+
+  Returns:
+    The folds, from the earliest to the latest test block.
+
+  Raises:
+    ValueError: If `n_folds` or `horizon` is not positive, or if the test
+      blocks leave no time period for training.
+  """
+  n_times = len(input_data.time)
+  if n_folds < 1 or horizon < 1:
+    raise ValueError(
+        "`n_folds` and `horizon` must be positive, got"
+        f" n_folds={n_folds} and horizon={horizon}."
+    )
+  if n_folds * horizon >= n_times:
+    raise ValueError(
+        f"{n_folds} folds of {horizon} time periods leave no time period for"
+        f" training out of {n_times}."
+    )
+  times = input_data.time.values
+  folds = []
+  for k in range(n_folds):
+    origin = n_times - (n_folds - k) * horizon
+    holdout_id = np.arange(n_times) >= origin
+    if not _is_national(input_data):
+      holdout_id = np.broadcast_to(
+          holdout_id, (len(input_data.geo), n_times)
+      ).copy()
+    folds.append(
+        Fold(
+            name=f"fold_{k}",
+            holdout_id=holdout_id,
+            test_times=list(times[origin : origin + horizon]),
+        )
+    )
+  return folds
+
+
+def geo_group_folds(
+    input_data: data.InputData, n_folds: int, seed: int | None = None
+) -> list[Fold]:
+  """Returns folds that each hold out a group of geos.
+
+  The geos are randomly split into `n_folds` groups of nearly equal size. Each
+  fold holds out all the time periods of one group and is evaluated on it.
+
+  As no KPI of the held-out geos is observed, their geo-level parameters, such
+  as `tau_g` and `beta_gm`, are informed only by the hierarchical prior, and by
+  the full-data posterior with `warm_start` in `cross_validate()`. The metrics
+  of these folds therefore measure how well the model predicts new geos, not
+  the held-out periods of known geos.
+
+  Args:
+    input_data: The input data of a geo model.
+    n_folds: Number of folds.
+    seed: Optional seed of the random split of the geos.
+
+  Returns:
+    The folds, one per group of geos.
+
+  Raises:
+    ValueError: If the model is national, or if `n_folds` is not between 2 and
+      the number of geos.
+  """
+  n_geos = len(input_data.geo)
+  if _is_national(input_data):
+    raise ValueError("Geo group folds are not supported for national models.")
+  if not 2 <= n_folds <= n_geos:
+    raise ValueError(
+        f"`n_folds` must be between 2 and the number of geos {n_geos}, got"
+        f" {n_folds}."
+    )
+  geos = input_data.geo.values
+  groups = np.array_split(
+      np.random.default_rng(seed).permutation(n_geos), n_folds
+  )
+  folds = []
+  for k, group in enumerate(groups):
+    holdout_id = np.zeros((n_geos, len(input_data.time)), dtype=bool)
+    holdout_id[group] = True
+    folds.append(
+        Fold(
+            name=f"fold_{k}",
+            holdout_id=holdout_id,
+            test_geos=list(geos[np.sort(group)]),
+        )
+    )
+  return folds
+
+
+def cross_validate(
+    input_data: data.InputData,
+    folds: Sequence[Fold],
+    output_dir: str,
+    model_spec: spec.ModelSpec | None = None,
+    sample_posterior_kwargs: Mapping[str, Any] | None = None,
+    fold_sample_posterior_kwargs: Mapping[str, Any] | None = None,
+    warm_start: bool = False,
+    max_workers: int | None = None,
+    threads_per_worker: int = 1,
+) -> CrossValidationResult:
+  """Fits and evaluates a model on each cross-validation fold in parallel.
+
+  The model of each fold uses `model_spec` with the `holdout_id` of the fold,
+  and its predictive accuracy is evaluated on the held-out observations of the
+  test geos and times of the fold. The fold models are fit with
+  `model_runner.fit_models()` and saved in `<output_dir>/folds`.
+
+  With `warm_start`, the model is first fit to all the data in the current
+  process and saved in `<output_dir>/full_data`. The chains of each fold then
+  start from its last posterior draws, so the folds need fewer adaptation
+  steps, which can be set with `fold_sample_posterior_kwargs`. If the full-data
+  fit fails, the folds are fit without warm start. As the full-data fit has
+  seen the held-out observations, its draws can bias the out-of-sample metrics
+  when the folds are not sampled long enough to forget their initial state.
+
+  Args:
+    input_data: The input data of the model.
+    folds: The folds, for example from `rolling_origin_folds()` or
+      `geo_group_folds()`.
+    output_dir: Directory of the saved models and summary tables.
+    model_spec: The model specification, without a `holdout_id`. Defaults to
+      `ModelSpec()`.
+    sample_posterior_kwargs: Keyword arguments of `Meridian.sample_posterior()`,
+      such as `n_chains`, `n_adapt`, `n_burnin`, `n_keep` and `seed`.
+    fold_sample_posterior_kwargs: Optional keyword arguments of
+      `Meridian.sample_posterior()` of the folds that override
+      `sample_posterior_kwargs`, such as a smaller `n_adapt` for warm-started
+      folds.
+    warm_start: Whether the folds start from the posterior of the model fit to
+      all the data. Defaults to `False`.
+    max_workers: Maximum number of worker processes, see
+      `model_runner.fit_models()`.
+    threads_per_worker: Number of TensorFlow threads of each worker, see
+      `model_runner.fit_models()`.
+
+  Returns:
+    A `CrossValidationResult` with the summary table of the folds and the
+    out-of-sample metrics aggregated across the folds.
+
+  Raises:
+    ValueError: If `model_spec` has a `holdout_id`, or if there are no folds.
+  """
+  model_spec = model_spec or spec.ModelSpec()
+  if model_spec.holdout_id is not None:
+    raise ValueError(
+        "The `model_spec` of the cross-validation must not have a"
+        " `holdout_id`."
+    )
+  if not folds:
+    raise ValueError("At least one fold is required.")
+  sample_posterior_kwargs = dict(sample_posterior_kwargs or {})
+  fold_sample_posterior_kwargs = {
+      **sample_posterior_kwargs,
+      **(fold_sample_posterior_kwargs or {}),
+  }
+
+  warm_start_path = None
+  if warm_start:
+    full_data = model_runner.fit_models(
+        [
+            model_runner.ModelRun(
+                name=_FULL_DATA_NAME,
+                input_data=input_data,
+                model_spec=model_spec,
+                sample_posterior_kwargs=sample_posterior_kwargs,
+            )
+        ],
+        os.path.join(output_dir, _FULL_DATA_DIR),
+        max_workers=1,
+    )
+    warm_start_path = full_data["path"][0]
+    if pd.isna(warm_start_path):
+      warnings.warn(
+          "The model fit to all the data failed with"
+          f" {full_data['error'][0]}. The folds are fit without warm start."
+      )
+      warm_start_path = None
+
+  runs = [
+      model_runner.ModelRun(
+          name=fold.name,
+          input_data=input_data,
+          model_spec=dataclasses.replace(
+              model_spec, holdout_id=fold.holdout_id
+          ),
+          sample_posterior_kwargs=fold_sample_posterior_kwargs,
+          warm_start_path=warm_start_path,
+          evaluation_geos=fold.test_geos,
+          evaluation_times=fold.test_times,
+      )
+      for fold in folds
+  ]
+  summary = model_runner.fit_models(
+      runs,
+      os.path.join(output_dir, _FOLDS_DIR),
+      max_workers=max_workers,
+      threads_per_worker=threads_per_worker,
+  )
+  metrics = summary.loc[summary["error"].isna(), list(_METRICS)].agg(
+      ["mean", "std"]
+  ).T
+  return CrossValidationResult(folds=summary, metrics=metrics)
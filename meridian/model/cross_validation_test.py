@@ -0,0 +1,183 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from absl import flags
+from absl.testing import absltest
+from meridian import constants
+from meridian.data import test_utils
+from meridian.model import cross_validation
+from meridian.model import model
+from meridian.model import spec
+import numpy as np
+
+
+_N_GEOS = 4
+_N_TIMES = 12
+_SAMPLE_POSTERIOR_KWARGS = dict(
+    n_chains=2, n_adapt=2, n_burnin=1, n_keep=2, seed=1
+)
+
+
+class CrossValidationTest(absltest.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    cls.input_data = test_utils.sample_input_data_non_revenue_revenue_per_kpi(
+        n_geos=_N_GEOS,
+        n_times=_N_TIMES,
+        n_media_times=_N_TIMES,
+        n_controls=1,
+        n_media_channels=2,
+        seed=0,
+    )
+    cls.national_input_data = (
+        test_utils.sample_input_data_non_revenue_revenue_per_kpi(
+            n_geos=1,
+            n_times=_N_TIMES,
+            n_media_times=_N_TIMES,
+            n_controls=1,
+            n_media_channels=2,
+            seed=0,
+        )
+    )
+
+  def setUp(self):
+    super().setUp()
+    # create_tempdir() uses the --test_tmpdir flag, which is not marked as
+    # parsed when running with pytest.
+    flags.FLAGS.mark_as_parsed()
+    self.output_dir = self.create_tempdir().full_path
+
+  def test_rolling_origin_folds_hold_out_test_block_and_later_times(self):
+    folds = cross_validation.rolling_origin_folds(
+        self.input_data, n_folds=2, horizon=3
+    )
+
+    times = self.input_data.time.values
+    self.assertEqual([fold.name for fold in folds], ["fold_0", "fold_1"])
+    self.assertEqual(folds[0].test_times, list(times[6:9]))
+    self.assertEqual(folds[1].test_times, list(times[9:12]))
+    expected_holdout = np.zeros((_N_GEOS, _N_TIMES), dtype=bool)
+    expected_holdout[:, 6:] = True
+    np.testing.assert_array_equal(folds[0].holdout_id, expected_holdout)
+    self.assertIsNone(folds[0].test_geos)
+
+  def test_rolling_origin_folds_national_holdout_shape(self):
+    folds = cross_validation.rolling_origin_folds(
+        self.national_input_data, n_folds=3, horizon=2
+    )
+
+    for fold in folds:
+      self.assertEqual(fold.holdout_id.shape, (_N_TIMES,))
+    np.testing.assert_array_equal(
+        folds[0].holdout_id, np.arange(_N_TIMES) >= 6
+    )
+
+  def test_rolling_origin_folds_without_training_times_raises_error(self):
+    with self.assertRaisesRegex(ValueError, "leave no time period"):
+      cross_validation.rolling_origin_folds(
+          self.input_data, n_folds=4, horizon=3
+      )
+
+  def test_geo_group_folds_partition_geos(self):
+    folds = cross_validation.geo_group_folds(
+        self.input_data, n_folds=3, seed=1
+    )
+
+    self.assertCountEqual(
+        [geo for fold in folds for geo in fold.test_geos],
+        self.input_data.geo.values,
+    )
+    np.testing.assert_array_equal(
+        np.sum([fold.holdout_id for fold in folds], axis=0),
+        np.ones((_N_GEOS, _N_TIMES)),
+    )
+    for fold in folds:
+      held_out_geos = self.input_data.geo.values[fold.holdout_id.all(axis=1)]
+      self.assertEqual(list(held_out_geos), fold.test_geos)
+
+  def test_geo_group_folds_national_raises_error(self):
+    with self.assertRaisesRegex(ValueError, "not supported for national"):
+      cross_validation.geo_group_folds(self.national_input_data, n_folds=2)
+
+  def test_cross_validate_warm_starts_folds_from_full_data_fit(self):
+    folds = cross_validation.rolling_origin_folds(
+        self.input_data, n_folds=2, horizon=2
+    )
+
+    result = cross_validation.cross_validate(
+        self.input_data,
+        folds,
+        self.output_dir,
+        model_spec=spec.ModelSpec(knots=2),
+        sample_posterior_kwargs=_SAMPLE_POSTERIOR_KWARGS,
+        fold_sample_posterior_kwargs=dict(n_adapt=1),
+        warm_start=True,
+        max_workers=1,
+    )
+
+    self.assertEqual(list(result.folds["name"]), ["fold_0", "fold_1"])
+    self.assertTrue(result.folds["error"].isna().all())
+    self.assertEqual(
+        list(result.folds["evaluation_set"]), [constants.TEST] * 2
+    )
+    self.assertEqual(list(result.metrics.index), ["r_squared", "mape", "wmape"])
+    self.assertEqual(list(result.metrics.columns), ["mean", "std"])
+    self.assertTrue(np.isfinite(result.metrics["mean"]).all())
+    self.assertTrue(
+        os.path.exists(
+            os.path.join(self.output_dir, "full_data", "summary.csv")
+        )
+    )
+    mmm = model.load_mmm(result.folds["path"][1])
+    np.testing.assert_array_equal(
+        mmm.model_spec.holdout_id, folds[1].holdout_id
+    )
+
+  def test_cross_validate_does_not_warm_start_by_default(self):
+    folds = cross_validation.geo_group_folds(self.input_data, n_folds=2, seed=0)
+
+    result = cross_validation.cross_validate(
+        self.input_data,
+        folds,
+        self.output_dir,
+        model_spec=spec.ModelSpec(knots=2),
+        sample_posterior_kwargs=_SAMPLE_POSTERIOR_KWARGS,
+        max_workers=1,
+    )
+
+    self.assertTrue(result.folds["error"].isna().all())
+    self.assertFalse(
+        os.path.exists(os.path.join(self.output_dir, "full_data"))
+    )
+
+  def test_cross_validate_with_holdout_id_raises_error(self):
+    with self.assertRaisesRegex(ValueError, "must not have a `holdout_id`"):
+      cross_validation.cross_validate(
+          self.input_data,
+          cross_validation.rolling_origin_folds(
+              self.input_data, n_folds=2, horizon=2
+          ),
+          self.output_dir,
+          model_spec=spec.ModelSpec(
+              holdout_id=np.zeros((_N_GEOS, _N_TIMES), dtype=bool)
+          ),
+      )
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -14,53 +14,65 @@
 
 """Auxiliary functions for knots calculations."""
 
-import bisect
-from collections.abc import Collection, Sequence
+from collections.abc import Collection
 import dataclasses
+import functools
 import numpy as np
+import tensorflow as tf
 
 
 __all__ = [
     'KnotInfo',
     'get_knot_info',
+    'get_mu_t',
     'l1_distance_weights',
 ]
 
 
-# TODO: Reimplement with a more readable method.
-def _find_neighboring_knots_indices(
-    times: np.ndarray,
+def _get_neighboring_knots(
+    n_times: int,
     knot_locations: np.ndarray,
-) -> Sequence[Sequence[int] | None]:
-  """Return indices of neighboring knot locations.
+) -> tuple[np.ndarray, np.ndarray]:
+  """Returns the two neighboring knots of every time period and their weights.
 
-  Returns indices in `knot_locations` that correspond to the neighboring knot
-  locations for each time period. If a time point is at or before the first
-  knot, the first knot is the only neighboring knot. If a time point is after
-  the last knot, the last knot is the only neighboring knot.
+  If a time point is at or before the first knot, the first knot is the only
+  neighboring knot. If a time point is at or after the last knot, the last knot
+  is the only neighboring knot. In both cases the single knot is repeated and
+  given weights `(1, 0)`. Otherwise the weights of the two neighboring knots are
+  inversely proportional to their L1 distance from the time point.
 
   Args:
-    times: Times `0, 1, 2,..., (n_times-1)`.
-    knot_locations: The location of knots within `0, 1, 2,..., (n_times-1)`.
+    n_times: The number of time points.
+    knot_locations: The sorted location of knots within `0, 1, 2,...,
+      (n_times-1)`.
 
   Returns:
-    List of length `n_times`. Each element is the indices of the neighboring
-    knot locations for the respective time period. If a time point is at or
-    before the first knot, the first knot is the only neighboring knot. If a
-    time point is after the last knot, the last knot is the only neighboring
-    knot.
+    A tuple of an integer array of knot indices and a float array of weights,
+    both with dimensions `(n_times, 2)`. The weights sum up to 1 for each time
+    period.
   """
-  neighboring_knots_indices = [None] * len(times)
-  for t in times:
-    # knot_locations assumed to be sorted.
-    if t <= knot_locations[0]:
-      neighboring_knots_indices[t] = [0]
-    elif t >= knot_locations[-1]:
-      neighboring_knots_indices[t] = [len(knot_locations) - 1]
-    else:
-      bisect_index = bisect.bisect_left(knot_locations, t)
-      neighboring_knots_indices[t] = [bisect_index - 1, bisect_index]
-  return neighboring_knots_indices
+  times = np.arange(n_times)
+  right = np.searchsorted(knot_locations, times, side='left')
+  right = np.clip(right, 1, max(len(knot_locations) - 1, 1))
+  left = right - 1
+
+  before_first = times <= knot_locations[0]
+  after_last = times >= knot_locations[-1]
+  left = np.where(after_last, len(knot_locations) - 1, left)
+  right = np.where(before_first | after_last, left, right)
+
+  left_distance = np.abs(times - knot_locations[left])
+  right_distance = np.abs(knot_locations[right] - times)
+  total_distance = left_distance + right_distance
+  single = left == right
+  # Weight is in proportion to how close the two neighboring knots are.
+  with np.errstate(divide='ignore', invalid='ignore'):
+    left_weight = np.where(single, 1.0, 1 - left_distance / total_distance)
+    right_weight = np.where(single, 0.0, 1 - right_distance / total_distance)
+
+  indices = np.stack([left, right], axis=-1).astype(np.int32)
+  weights = np.stack([left_weight, right_weight], axis=-1).astype(np.float32)
+  return indices, weights
 
 
 def l1_distance_weights(
@@ -102,21 +114,12 @@ def l1_distance_weights(
   if np.any(knot_locations >= n_times):
     raise ValueError('knot_locations must be less than `n_times`.')
 
+  indices, weights = _get_neighboring_knots(n_times, knot_locations)
+  w = np.zeros((len(knot_locations), n_times), dtype=np.float32)
   times = np.arange(n_times)
-  time_minus_knot = abs(knot_locations[:, np.newaxis] - times[np.newaxis, :])
-
-  w = np.zeros(time_minus_knot.shape, dtype=np.float32)
-  neighboring_knots_indices = _find_neighboring_knots_indices(
-      times, knot_locations
-  )
-  for t in times:
-    idx = neighboring_knots_indices[t]
-    if len(idx) == 1:
-      w[idx, t] = 1
-    else:
-      # Weight is in proportion to how close the two neighboring knots are.
-      w[idx, t] = 1 - (time_minus_knot[idx, t] / time_minus_knot[idx, t].sum())
-
+  # The repeated knot of single-neighbor time periods has zero weight.
+  np.add.at(w, (indices[:, 0], times), weights[:, 0])
+  np.add.at(w, (indices[:, 1], times), weights[:, 1])
   return w
 
 
@@ -134,12 +137,55 @@ class KnotInfo:
     knot_locations: The location of knots
     weights: The weights used to multiply with the knot values to get time-
       varying coefficients.
+    neighbor_indices: An integer array with dimensions `(n_times, 2)` holding
+      the indices of the two knots that each time period is interpolated from.
+    neighbor_weights: A float array with dimensions `(n_times, 2)` holding the
+      weights of the knots in `neighbor_indices`. Together they are a sparse
+      form of `weights`, which has at most two non-zero entries per time
+      period, so `knot_values[..., neighbor_indices]` multiplied by
+      `neighbor_weights` and summed over the last axis equals
+      `knot_values @ weights` at O(n_times) cost.
   """
 
   n_knots: int
   knot_locations: np.ndarray[int, np.dtype[int]]
   weights: np.ndarray[int, np.dtype[float]]
 
+  @functools.cached_property
+  def _neighbors(self) -> tuple[np.ndarray, np.ndarray]:
+    return _get_neighboring_knots(
+        self.weights.shape[-1], np.asarray(self.knot_locations)
+    )
+
+  @property
+  def neighbor_indices(self) -> np.ndarray:
+    return self._neighbors[0]
+
+  @property
+  def neighbor_weights(self) -> np.ndarray:
+    return self._neighbors[1]
+
+
+def get_mu_t(knot_values: tf.Tensor, knot_info: KnotInfo) -> tf.Tensor:
+  """Interpolates the time effects `mu_t` from `knot_values`.
+
+  Every time period depends on at most two neighboring knots, so `mu_t` is
+  gathered from those knots using the sparse form of the knot weights rather
+  than multiplied with the dense `(n_knots, n_times)` weights matrix.
+
+  Args:
+    knot_values: A tensor of shape `[..., n_knots]` with the knot values.
+    knot_info: The `KnotInfo` of the model.
+
+  Returns:
+    A tensor of shape `[..., n_times]` with the time effects.
+  """
+  neighbor_values = tf.gather(knot_values, knot_info.neighbor_indices, axis=-1)
+  return tf.reduce_sum(
+      neighbor_values * tf.cast(knot_info.neighbor_weights, knot_values.dtype),
+      axis=-1,
+  )
+
 
 def get_knot_info(
     n_times: int,
@@ -17,6 +17,7 @@ from absl.testing import absltest
 from absl.testing import parameterized
 from meridian.model import knots
 import numpy as np
+import tensorflow as tf
 
 
 class L1DistanceWeightsTest(parameterized.TestCase):
@@ -254,6 +255,52 @@ class GetKnotInfoTest(parameterized.TestCase):
     ):
       knots.get_knot_info(n_times=200, knots=knots_arg, is_national=is_national)
 
+  def test_neighbor_indices_and_weights(self):
+    knot_info = knots.get_knot_info(n_times=6, knots=[1, 4])
+    np.testing.assert_array_equal(
+        knot_info.neighbor_indices,
+        [[0, 0], [0, 0], [0, 1], [0, 1], [1, 1], [1, 1]],
+    )
+    np.testing.assert_allclose(
+        knot_info.neighbor_weights,
+        [[1, 0], [1, 0], [2 / 3, 1 / 3], [1 / 3, 2 / 3], [1, 0], [1, 0]],
+        atol=1e-6,
+    )
+
+  @parameterized.named_parameters(
+      ("none", 10, None, False),
+      ("none_and_national", 10, None, True),
+      ("int", 52, 7, False),
+      ("list", 30, [0, 3, 4, 17, 29], False),
+      ("list_inside_range", 30, [5, 12, 20], False),
+      ("single", 30, [12], False),
+  )
+  def test_neighbors_match_dense_weights(
+      self, n_times, knots_arg, is_national
+  ):
+    knot_info = knots.get_knot_info(
+        n_times=n_times, knots=knots_arg, is_national=is_national
+    )
+    knot_values = np.random.default_rng(0).normal(size=knot_info.n_knots)
+    sparse_mu_t = np.sum(
+        knot_values[knot_info.neighbor_indices] * knot_info.neighbor_weights,
+        axis=-1,
+    )
+    np.testing.assert_allclose(
+        sparse_mu_t, knot_values @ knot_info.weights, rtol=1e-6
+    )
+
+  def test_get_mu_t_matches_dense_weights(self):
+    knot_info = knots.get_knot_info(n_times=30, knots=[0, 3, 4, 17, 29])
+    knot_values = np.random.default_rng(0).normal(
+        size=(2, 3, knot_info.n_knots)
+    )
+    mu_t = knots.get_mu_t(tf.constant(knot_values), knot_info)
+    self.assertEqual(mu_t.shape, (2, 3, 30))
+    np.testing.assert_allclose(
+        mu_t, knot_values @ knot_info.weights, rtol=1e-6
+    )
+
 
 if __name__ == "__main__":
   absltest.main()
@@ -31,6 +31,8 @@ from meridian.model import media
 from meridian.model import posterior_sampler
 from meridian.model import prior_distribution
 from meridian.model import prior_sampler
+from meridian.model import result_cache
+from meridian.model import sampling_telemetry
 from meridian.model import spec
 from meridian.model import transformers
 import numpy as np
@@ -84,6 +86,57 @@ def _check_for_negative_effect(
     )
 
 
+# Data whose geo and time variation is validated: the `InputData` field, which
+# also names the data in the error messages, the cached property of the scaled
+# data, the attribute of the scaled tensor in that property (if any), and the
+# channel coordinate.
+_INVARIANT_DATA = (
+    (constants.CONTROLS, "controls_scaled", None, constants.CONTROL_VARIABLE),
+    (
+        constants.NON_MEDIA_TREATMENTS,
+        "non_media_treatments_normalized",
+        None,
+        constants.NON_MEDIA_CHANNEL,
+    ),
+    (constants.MEDIA, "media_tensors", "media_scaled", constants.MEDIA_CHANNEL),
+    (constants.REACH, "rf_tensors", "reach_scaled", constants.RF_CHANNEL),
+    (
+        constants.ORGANIC_MEDIA,
+        "organic_media_tensors",
+        "organic_media_scaled",
+        constants.ORGANIC_MEDIA_CHANNEL,
+    ),
+    (
+        constants.ORGANIC_REACH,
+        "organic_rf_tensors",
+        "organic_reach_scaled",
+        constants.ORGANIC_RF_CHANNEL,
+    ),
+)
+
+
+class _cached_property(functools.cached_property):  # pylint: disable=invalid-name
+  """A `cached_property` of `Meridian` with deferred validations.
+
+  For a lazily constructed model, the value is computed outside of any
+  `tf.function` graph being traced, so that a property first accessed while
+  tracing caches an eager tensor, and the validations that depend on the
+  property run when it is first computed.
+  """
+
+  def __get__(self, instance, owner=None):
+    if (
+        instance is None
+        or self.attrname in instance.__dict__
+        or not instance.is_lazy
+    ):
+      return super().__get__(instance, owner)
+    with tf.init_scope():
+      value = super().__get__(instance, owner)
+      instance._run_deferred_validations(self.attrname)  # pylint: disable=protected-access
+    return value
+
+
 class Meridian:
   """Contains the main functionality for fitting the Meridian MMM model.
 
@@ -149,12 +202,33 @@ class Meridian:
       inference_data: (
           az.InferenceData | None
       ) = None,  # for deserializer use only
+      lazy: bool = False,
   ):
+    """Initializes the model.
+
+    Args:
+      input_data: An `InputData` object containing the input data for the
+        model.
+      model_spec: A `ModelSpec` object containing the model specification.
+        Defaults to `ModelSpec()`.
+      inference_data: An `arviz.InferenceData` object of a fitted model, for
+        deserializer use only.
+      lazy: If `True`, the scaled data tensors are only built when they are
+        first used, for example by an `Analyzer` query on a fitted model. The
+        validations of the scaled data, such as the geo and time variation of
+        the media, then run when the respective tensors are built, rather than
+        in the constructor. All pending validations run before sampling, or
+        when `validate()` is called. A lazy model is also saved without its
+        derived tensors, which are rebuilt on first use after loading.
+    """
     self._input_data = input_data
     self._model_spec = model_spec if model_spec else spec.ModelSpec()
     self._inference_data = (
         inference_data if inference_data else az.InferenceData()
     )
+    self._lazy = lazy
+    # Cached properties whose dependent validations have not run yet.
+    self._pending_validations = []
 
     self._validate_data_dependent_model_spec()
     self._validate_injected_inference_data()
@@ -169,14 +243,69 @@ class Meridian:
     self._validate_mroi_priors_non_revenue()
     self._validate_roi_priors_non_revenue()
     self._check_for_negative_effects()
-    self._validate_geo_invariants()
-    self._validate_time_invariants()
-    self._validate_kpi_transformer()
+    if lazy:
+      self._pending_validations = [
+          cached_property
+          for data_name, cached_property, _, _ in _INVARIANT_DATA
+          if getattr(self.input_data, data_name) is not None
+      ] + ["kpi_transformer"]
+    else:
+      self._validate_geo_invariants()
+      self._validate_time_invariants()
+      self._validate_kpi_transformer()
+
+  def __getstate__(self):
+    state = self.__dict__.copy()
+    # The cached analysis results are not saved with the model.
+    state.pop("result_cache", None)
+    if state.get("_lazy"):
+      # The derived tensors of a lazy model are rebuilt on first use.
+      cls = self.__class__
+      for attr in list(state):
+        if isinstance(getattr(cls, attr, None), functools.cached_property):
+          del state[attr]
+    return state
 
   @property
   def input_data(self) -> data.InputData:
     return self._input_data
 
+  @property
+  def is_lazy(self) -> bool:
+    """Whether the scaled data tensors and their validations are deferred."""
+    return self.__dict__.get("_lazy", False)
+
+  @property
+  def pending_validations(self) -> tuple[str, ...]:
+    """Names of the properties whose validations have not run yet."""
+    return tuple(self.__dict__.get("_pending_validations", ()))
+
+  def validate(self):
+    """Runs the pending validations of a lazily constructed model.
+
+    Raises:
+      ValueError: If the data or the model specification is invalid.
+    """
+    for cached_property in self.pending_validations:
+      getattr(self, cached_property)
+      self._run_deferred_validations(cached_property)
+
+  def _run_deferred_validations(self, cached_property: str):
+    """Runs the pending validations that depend on a cached property."""
+    if cached_property not in self.pending_validations:
+      return
+    try:
+      if cached_property == "kpi_transformer":
+        self._validate_kpi_transformer()
+      else:
+        self._validate_geo_invariants(cached_property)
+        self._validate_time_invariants(cached_property)
+    except ValueError:
+      # The invalid value is not cached, so that it raises again on next use.
+      self.__dict__.pop(cached_property, None)
+      raise
+    self._pending_validations.remove(cached_property)
+
   @property
   def model_spec(self) -> spec.ModelSpec:
     return self._model_spec
@@ -186,26 +315,41 @@ class Meridian:
     return self._inference_data
 
   @functools.cached_property
+  def result_cache(self) -> result_cache.ResultCache:
+    """Cache of the `Analyzer` results of this model, disabled by default.
+
+    The cache is shared by all the `Analyzer`s of the model, and cleared when
+    the groups of `inference_data` change. Enable it with
+    `result_cache.resize(maxsize)`.
+    """
+    return result_cache.ResultCache(
+        lambda: tuple(
+            getattr(self.inference_data, group)
+            for group in self.inference_data.groups()
+        )
+    )
+
+  @_cached_property
   def media_tensors(self) -> media.MediaTensors:
     return media.build_media_tensors(self.input_data, self.model_spec)
 
-  @functools.cached_property
+  @_cached_property
   def rf_tensors(self) -> media.RfTensors:
     return media.build_rf_tensors(self.input_data, self.model_spec)
 
-  @functools.cached_property
+  @_cached_property
   def organic_media_tensors(self) -> media.OrganicMediaTensors:
     return media.build_organic_media_tensors(self.input_data)
 
-  @functools.cached_property
+  @_cached_property
   def organic_rf_tensors(self) -> media.OrganicRfTensors:
     return media.build_organic_rf_tensors(self.input_data)
 
-  @functools.cached_property
+  @_cached_property
   def kpi(self) -> tf.Tensor:
     return tf.convert_to_tensor(self.input_data.kpi, dtype=tf.float32)
 
-  @functools.cached_property
+  @_cached_property
   def revenue_per_kpi(self) -> tf.Tensor | None:
     if self.input_data.revenue_per_kpi is None:
       return None
@@ -213,13 +357,13 @@ class Meridian:
         self.input_data.revenue_per_kpi, dtype=tf.float32
     )
 
-  @functools.cached_property
+  @_cached_property
   def controls(self) -> tf.Tensor | None:
     if self.input_data.controls is None:
       return None
     return tf.convert_to_tensor(self.input_data.controls, dtype=tf.float32)
 
-  @functools.cached_property
+  @_cached_property
   def non_media_treatments(self) -> tf.Tensor | None:
     if self.input_data.non_media_treatments is None:
       return None
@@ -227,17 +371,17 @@ class Meridian:
         self.input_data.non_media_treatments, dtype=tf.float32
     )
 
-  @functools.cached_property
+  @_cached_property
   def population(self) -> tf.Tensor:
     return tf.convert_to_tensor(self.input_data.population, dtype=tf.float32)
 
-  @functools.cached_property
+  @_cached_property
   def total_spend(self) -> tf.Tensor:
     return tf.convert_to_tensor(
         self.input_data.get_total_spend(), dtype=tf.float32
     )
 
-  @functools.cached_property
+  @_cached_property
   def total_outcome(self) -> tf.Tensor:
     return tf.convert_to_tensor(
         self.input_data.get_total_outcome(), dtype=tf.float32
@@ -299,7 +443,7 @@ class Meridian:
   def _sigma_shape(self) -> int:
     return len(self.input_data.geo) if self.unique_sigma_for_each_geo else 1
 
-  @functools.cached_property
+  @_cached_property
   def knot_info(self) -> knots.KnotInfo:
     return knots.get_knot_info(
         n_times=self.n_times,
@@ -307,7 +451,7 @@ class Meridian:
         is_national=self.is_national,
     )
 
-  @functools.cached_property
+  @_cached_property
   def controls_transformer(
       self,
   ) -> transformers.CenteringAndScalingTransformer | None:
@@ -328,7 +472,7 @@ class Meridian:
         population_scaling_id=controls_population_scaling_id,
     )
 
-  @functools.cached_property
+  @_cached_property
   def non_media_transformer(
       self,
   ) -> transformers.CenteringAndScalingTransformer | None:
@@ -348,11 +492,11 @@ class Meridian:
         population_scaling_id=non_media_population_scaling_id,
     )
 
-  @functools.cached_property
+  @_cached_property
   def kpi_transformer(self) -> transformers.KpiTransformer:
     return transformers.KpiTransformer(self.kpi, self.population)
 
-  @functools.cached_property
+  @_cached_property
   def controls_scaled(self) -> tf.Tensor | None:
     if self.controls is not None:
       # If `controls` is defined, then `controls_transformer` is also defined.
@@ -360,7 +504,7 @@ class Meridian:
     else:
       return None
 
-  @functools.cached_property
+  @_cached_property
   def non_media_treatments_normalized(self) -> tf.Tensor | None:
     """Normalized non-media treatments.
 
@@ -375,18 +519,18 @@ class Meridian:
     else:
       return None
 
-  @functools.cached_property
+  @_cached_property
   def kpi_scaled(self) -> tf.Tensor:
     return self.kpi_transformer.forward(self.kpi)
 
-  @functools.cached_property
+  @_cached_property
   def media_effects_dist(self) -> str:
     if self.is_national:
       return constants.NATIONAL_MODEL_SPEC_ARGS[constants.MEDIA_EFFECTS_DIST]
     else:
       return self.model_spec.media_effects_dist
 
-  @functools.cached_property
+  @_cached_property
   def unique_sigma_for_each_geo(self) -> bool:
     if self.is_national:
       return constants.NATIONAL_MODEL_SPEC_ARGS[
@@ -395,7 +539,7 @@ class Meridian:
     else:
       return self.model_spec.unique_sigma_for_each_geo
 
-  @functools.cached_property
+  @_cached_property
   def baseline_geo_idx(self) -> int:
     """Returns the index of the baseline geo."""
     if isinstance(self.model_spec.baseline_geo, int):
@@ -421,14 +565,14 @@ class Meridian:
     else:
       return tf.argmax(self.population)
 
-  @functools.cached_property
+  @_cached_property
   def holdout_id(self) -> tf.Tensor | None:
     if self.model_spec.holdout_id is None:
       return None
     tensor = tf.convert_to_tensor(self.model_spec.holdout_id, dtype=bool)
     return tensor[tf.newaxis, ...] if self.is_national else tensor
 
-  @functools.cached_property
+  @_cached_property
   def prior_broadcast(self) -> prior_distribution.PriorDistribution:
     """Returns broadcasted `PriorDistribution` object."""
     total_spend = self.input_data.get_total_spend()
@@ -457,12 +601,12 @@ class Meridian:
         total_spend=agg_total_spend,
     )
 
-  @functools.cached_property
+  @_cached_property
   def prior_sampler_callable(self) -> prior_sampler.PriorDistributionSampler:
     """A `PriorDistributionSampler` callable bound to this model."""
     return prior_sampler.PriorDistributionSampler(self)
 
-  @functools.cached_property
+  @_cached_property
   def posterior_sampler_callable(
       self,
   ) -> posterior_sampler.PosteriorMCMCSampler:
@@ -903,53 +1047,40 @@ class Meridian:
       _check_for_negative_effect(prior.roi_rf, self.media_effects_dist)
       _check_for_negative_effect(prior.mroi_rf, self.media_effects_dist)
 
-  def _validate_geo_invariants(self):
+  def _get_invariant_data(
+      self, cached_property: str | None = None
+  ) -> list[tuple[tf.Tensor, str, Sequence[str]]]:
+    """Returns the scaled data whose geo and time variation is validated.
+
+    Args:
+      cached_property: Optional name of the cached property of the scaled data.
+        By default, all the scaled data is returned.
+
+    Returns:
+      A list of `(scaled_data, data_name, data_dims)` tuples.
+    """
+    invariant_data = []
+    for data_name, scaled_property, scaled_attr, coord in _INVARIANT_DATA:
+      data_array = getattr(self.input_data, data_name)
+      if data_array is None or cached_property not in (None, scaled_property):
+        continue
+      scaled_data = getattr(self, scaled_property)
+      if scaled_attr is not None:
+        scaled_data = getattr(scaled_data, scaled_attr)
+      invariant_data.append(
+          (scaled_data, data_name, data_array.coords[coord].values)
+      )
+    return invariant_data
+
+  def _validate_geo_invariants(self, cached_property: str | None = None):
     """Validates non-national model invariants."""
     if self.is_national:
       return
 
-    if self.input_data.controls is not None:
-      self._check_if_no_geo_variation(
-          self.controls_scaled,
-          constants.CONTROLS,
-          self.input_data.controls.coords[constants.CONTROL_VARIABLE].values,
-      )
-    if self.input_data.non_media_treatments is not None:
-      self._check_if_no_geo_variation(
-          self.non_media_treatments_normalized,
-          constants.NON_MEDIA_TREATMENTS,
-          self.input_data.non_media_treatments.coords[
-              constants.NON_MEDIA_CHANNEL
-          ].values,
-      )
-    if self.input_data.media is not None:
-      self._check_if_no_geo_variation(
-          self.media_tensors.media_scaled,
-          constants.MEDIA,
-          self.input_data.media.coords[constants.MEDIA_CHANNEL].values,
-      )
-    if self.input_data.reach is not None:
-      self._check_if_no_geo_variation(
-          self.rf_tensors.reach_scaled,
-          constants.REACH,
-          self.input_data.reach.coords[constants.RF_CHANNEL].values,
-      )
-    if self.input_data.organic_media is not None:
-      self._check_if_no_geo_variation(
-          self.organic_media_tensors.organic_media_scaled,
-          "organic_media",
-          self.input_data.organic_media.coords[
-              constants.ORGANIC_MEDIA_CHANNEL
-          ].values,
-      )
-    if self.input_data.organic_reach is not None:
-      self._check_if_no_geo_variation(
-          self.organic_rf_tensors.organic_reach_scaled,
-          "organic_reach",
-          self.input_data.organic_reach.coords[
-              constants.ORGANIC_RF_CHANNEL
-          ].values,
-      )
+    for scaled_data, data_name, data_dims in self._get_invariant_data(
+        cached_property
+    ):
+      self._check_if_no_geo_variation(scaled_data, data_name, data_dims)
 
   def _check_if_no_geo_variation(
       self,
@@ -984,50 +1115,12 @@ class Meridian:
           " vary across geos."
       )
 
-  def _validate_time_invariants(self):
+  def _validate_time_invariants(self, cached_property: str | None = None):
     """Validates model time invariants."""
-    if self.input_data.controls is not None:
-      self._check_if_no_time_variation(
-          self.controls_scaled,
-          constants.CONTROLS,
-          self.input_data.controls.coords[constants.CONTROL_VARIABLE].values,
-      )
-    if self.input_data.non_media_treatments is not None:
-      self._check_if_no_time_variation(
-          self.non_media_treatments_normalized,
-          constants.NON_MEDIA_TREATMENTS,
-          self.input_data.non_media_treatments.coords[
-              constants.NON_MEDIA_CHANNEL
-          ].values,
-      )
-    if self.input_data.media is not None:
-      self._check_if_no_time_variation(
-          self.media_tensors.media_scaled,
-          constants.MEDIA,
-          self.input_data.media.coords[constants.MEDIA_CHANNEL].values,
-      )
-    if self.input_data.reach is not None:
-      self._check_if_no_time_variation(
-          self.rf_tensors.reach_scaled,
-          constants.REACH,
-          self.input_data.reach.coords[constants.RF_CHANNEL].values,
-      )
-    if self.input_data.organic_media is not None:
-      self._check_if_no_time_variation(
-          self.organic_media_tensors.organic_media_scaled,
-          constants.ORGANIC_MEDIA,
-          self.input_data.organic_media.coords[
-              constants.ORGANIC_MEDIA_CHANNEL
-          ].values,
-      )
-    if self.input_data.organic_reach is not None:
-      self._check_if_no_time_variation(
-          self.organic_rf_tensors.organic_reach_scaled,
-          constants.ORGANIC_REACH,
-          self.input_data.organic_reach.coords[
-              constants.ORGANIC_RF_CHANNEL
-          ].values,
-      )
+    for scaled_data, data_name, data_dims in self._get_invariant_data(
+        cached_property
+    ):
+      self._check_if_no_time_variation(scaled_data, data_name, data_dims)
 
   def _check_if_no_time_variation(
       self,
@@ -1367,6 +1460,31 @@ class Meridian:
     for attr in cached_properties:
       _ = getattr(self, attr)
 
+  def warmup(self, shapes: Sequence[Sequence[int]] = ((),)):
+    """Traces and compiles the data transformers of this model ahead of time.
+
+    The cached properties are populated first, which compiles the `forward`
+    method of every transformer for the shapes of the input data. The KPI
+    transformer is then compiled for each of the given batch shapes, so that
+    analyses that transform batches of KPI draws back to the KPI scale do not
+    compile it on their first call.
+
+    Combined with `compilation.set_compilation_cache_dir()`, this can be called
+    once to populate the persistent compilation cache for new processes. The
+    MCMC sampler is not compiled by this method, since XLA only compiles it
+    when it runs: its compiled program is reused from the persistent cache.
+
+    Args:
+      shapes: Batch shapes of the KPI tensors to compile the KPI transformer
+        for, excluding the trailing `(n_geos, n_times)` dimensions. For example,
+        `[(n_chains, n_draws)]` for the expected outcome draws of the
+        `Analyzer`. Defaults to a single unbatched `(n_geos, n_times)` tensor.
+    """
+    self.populate_cached_properties()
+    for shape in shapes:
+      kpi = tf.zeros((*shape, self.n_geos, self.n_times))
+      self.kpi_transformer.inverse(self.kpi_transformer.forward(kpi))
+
   def create_inference_data_coords(
       self, n_chains: int, n_draws: int
   ) -> Mapping[str, np.ndarray | Sequence[str]]:
@@ -1428,7 +1546,12 @@ class Meridian:
         for param, dims in inference_dims.items()
     }
 
-  def sample_prior(self, n_draws: int, seed: int | None = None):
+  def sample_prior(
+      self,
+      n_draws: int,
+      seed: int | None = None,
+      batch_size: int | None = None,
+  ):
     """Draws samples from the prior distributions.
 
     Drawn samples are merged into this model's Arviz `inference_data` property.
@@ -1438,8 +1561,16 @@ class Meridian:
       seed: Used to set the seed for reproducible results. For more information,
         see [PRNGS and seeds]
         (https://github.com/tensorflow/probability/blob/main/PRNGS.md).
+      batch_size: Optional maximum number of draws sampled at once. Sampling
+        the prior of ROI, mROI or contribution parameters transforms the media
+        of every draw, so this bounds the memory used for large `n_draws`. The
+        samples are reproducible for a given `seed` and `batch_size`. By
+        default, all draws are sampled at once.
     """
-    prior_inference_data = self.prior_sampler_callable(n_draws, seed)
+    self.validate()
+    prior_inference_data = self.prior_sampler_callable(
+        n_draws, seed, batch_size
+    )
     self.inference_data.extend(prior_inference_data, join="right")
 
   def sample_posterior(
@@ -1456,6 +1587,10 @@ class Meridian:
       unrolled_leapfrog_steps: int = 1,
       parallel_iterations: int = 10,
       seed: Sequence[int] | int | None = None,
+      use_fused_log_density: bool = False,
+      n_geo_shards: int | None = None,
+      callbacks: Sequence[sampling_telemetry.SamplingCallback] | None = None,
+      report_every: int = 100,
       **pins,
   ):
     """Runs Markov Chain Monte Carlo (MCMC) sampling of posterior distributions.
@@ -1509,6 +1644,22 @@ class Meridian:
         will be treated as stateless seeds; or a Python `int` or `None`, which
         will be treated as stateful seeds. See [tfp.random.sanitize_seed]
         (https://www.tensorflow.org/probability/api_docs/python/tfp/random/sanitize_seed).
+      use_fused_log_density: If `True`, NUTS targets a fused log-density of the
+        sampled parameters, and the derived parameters are only computed for
+        the kept draws. This makes each gradient evaluation cheaper, but the
+        draws differ from the default sampler for a given seed. `pins` are not
+        supported in this case.
+      n_geo_shards: Optional number of geo shards of the log-likelihood. If
+        set, the fused log-density is used and each shard is evaluated on its
+        own logical CPU device, see
+        `posterior_sampler.configure_logical_cpu_devices`.
+      callbacks: Optional sequence of `sampling_telemetry.SamplingCallback`
+        that receive progress reports while the sampler runs, such as the
+        draws per second, leapfrog steps, divergences, step size and phase.
+        The sampler then runs as a `tf.function` graph with host callbacks
+        rather than as a single XLA program, which is slower.
+      report_every: Number of steps between two progress reports, if
+        `callbacks` are given.
       **pins: These are used to condition the provided joint distribution, and
         are passed directly to `joint_dist.experimental_pin(**pins)`.
 
@@ -1519,6 +1670,7 @@ class Meridian:
         [ResourceExhaustedError when running Meridian.sample_posterior]
         (https://developers.google.com/meridian/docs/advanced-modeling/model-debugging#gpu-oom-error).
     """
+    self.validate()
     posterior_inference_data = self.posterior_sampler_callable(
         n_chains,
         n_adapt,
@@ -1532,6 +1684,10 @@ class Meridian:
         unrolled_leapfrog_steps,
         parallel_iterations,
         seed,
+        use_fused_log_density,
+        n_geo_shards,
+        callbacks,
+        report_every,
         **pins,
     )
     self.inference_data.extend(posterior_inference_data, join="right")
@@ -0,0 +1,382 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parallel fitting of several Meridian models, such as a model spec search.
+
+Each model is fit in its own worker process, so that a sweep over model
+specifications uses all the CPU cores of the host:
+
+```python
+from meridian.model import model_runner
+from meridian.model import spec
+
+runs = [
+    model_runner.ModelRun(
+        name=f"knots_{n_knots}",
+        input_data=data,
+        model_spec=spec.ModelSpec(knots=n_knots),
+        sample_posterior_kwargs=dict(
+            n_chains=4, n_adapt=500, n_burnin=500, n_keep=1000, seed=1
+        ),
+    )
+    for n_knots in (10, 20, 40)
+]
+summary = model_runner.fit_models(
+    runs, "/tmp/knots_sweep", max_workers=3, threads_per_worker=4
+)
+```
+
+Every fitted model is saved with `model.save_mmm()` and the returned summary
+table reports its fitting time, R-hat and predictive accuracy.
+"""
+
+from collections.abc import Mapping, Sequence
+import concurrent.futures
+import contextlib
+import dataclasses
+import multiprocessing
+import os
+import time
+from typing import Any
+
+import joblib
+from meridian import constants
+from meridian.data import input_data as data
+from meridian.model import model
+from meridian.model import spec
+import numpy as np
+import pandas as pd
+
+
+__all__ = [
+    "ModelRun",
+    "ModelRunResult",
+    "fit_models",
+]
+
+
+_INPUTS_DIR = "inputs"
+_MODELS_DIR = "models"
+_SUMMARY_FILE = "summary.csv"
+
+
+@dataclasses.dataclass(frozen=True)
+class ModelRun:
+  """A model to fit with `fit_models()`.
+
+  Attributes:
+    name: Unique name of the model, used as the file name of the saved model.
+    input_data: The input data of the model. Runs can share the same
+      `InputData` object, which is then serialized once for all the workers.
+    model_spec: The model specification. Defaults to `ModelSpec()`.
+    sample_posterior_kwargs: Keyword arguments of
+      `Meridian.sample_posterior()`, such as `n_chains`, `n_adapt`, `n_burnin`,
+      `n_keep` and `seed`.
+    sample_prior_kwargs: Optional keyword arguments of
+      `Meridian.sample_prior()`, such as `n_draws`. By default, the prior is not
+      sampled.
+    warm_start_path: Optional path of a model saved with `save_mmm()` whose
+      posterior has the same parameters as this model, such as the same model
+      fit to all the data. If set, the chains start from its last posterior
+      draws with the fused log-density, see
+      `PosteriorMCMCSampler.get_warm_start_state()`, and `n_chains` must be an
+      integer.
+    evaluation_geos: Optional geos on which the predictive accuracy is
+      evaluated. By default, all geos are used.
+    evaluation_times: Optional time periods on which the predictive accuracy is
+      evaluated. By default, all time periods are used.
+  """
+
+  name: str
+  input_data: data.InputData
+  model_spec: spec.ModelSpec = dataclasses.field(
+      default_factory=spec.ModelSpec
+  )
+  sample_posterior_kwargs: Mapping[str, Any] = dataclasses.field(
+      default_factory=dict
+  )
+  sample_prior_kwargs: Mapping[str, Any] | None = None
+  warm_start_path: str | None = None
+  evaluation_geos: Sequence[str] | None = None
+  evaluation_times: Sequence[str] | None = None
+
+
+@dataclasses.dataclass(frozen=True)
+class ModelRunResult:
+  """The outcome of fitting a `ModelRun`.
+
+  Attributes:
+    name: Name of the model.
+    path: Path of the saved model, or `None` if the fitting failed.
+    runtime_seconds: Time taken to fit the model, including the prior
+      sampling.
+    max_rhat: Maximum R-hat of the non-deterministic model parameters.
+    evaluation_set: Evaluation set of the predictive accuracy metrics: `'Test'`
+      if the model has a `holdout_id`, otherwise `'All Data'`.
+    r_squared: R-squared of the expected outcome on the evaluation set.
+    mape: MAPE of the expected outcome on the evaluation set.
+    wmape: wMAPE of the expected outcome on the evaluation set.
+    error: The error message if the fitting failed, otherwise `None`.
+  """
+
+  name: str
+  path: str | None
+  runtime_seconds: float
+  max_rhat: float = np.nan
+  evaluation_set: str | None = None
+  r_squared: float = np.nan
+  mape: float = np.nan
+  wmape: float = np.nan
+  error: str | None = None
+
+
+_THREAD_ENV_VARS = (
+    "TF_NUM_INTRAOP_THREADS",
+    "TF_NUM_INTEROP_THREADS",
+    "OMP_NUM_THREADS",
+)
+
+
+@contextlib.contextmanager
+def _worker_thread_env(threads_per_worker: int):
+  """Sets the thread limits inherited by the worker processes.
+
+  The workers import TensorFlow before they run any initializer, so the limits
+  are passed through the environment, which TensorFlow reads when its runtime
+  starts.
+
+  Args:
+    threads_per_worker: Number of threads of each worker.
+
+  Yields:
+    None.
+  """
+  previous = {name: os.environ.get(name) for name in _THREAD_ENV_VARS}
+  os.environ.update({name: str(threads_per_worker) for name in previous})
+  try:
+    yield
+  finally:
+    for name, value in previous.items():
+      if value is None:
+        del os.environ[name]
+      else:
+        os.environ[name] = value
+
+
+def _evaluate(mmm: model.Meridian, run: ModelRun) -> dict[str, Any]:
+  """Returns the R-hat and predictive accuracy of a fitted model."""
+  # `meridian.analysis` depends on `meridian.model`.
+  from meridian.analysis import analyzer  # pylint: disable=g-import-not-at-top
+
+  mmm_analyzer = analyzer.Analyzer(mmm)
+  rhat = mmm_analyzer.rhat_summary()
+  accuracy = mmm_analyzer.predictive_accuracy(
+      selected_geos=run.evaluation_geos,
+      selected_times=run.evaluation_times,
+  )[constants.VALUE].sel(
+      geo_granularity=(
+          constants.NATIONAL if mmm.is_national else constants.GEO
+      )
+  )
+  evaluation_set = (
+      constants.ALL_DATA
+      if mmm.model_spec.holdout_id is None
+      else constants.TEST
+  )
+  if constants.EVALUATION_SET_VAR in accuracy.dims:
+    accuracy = accuracy.sel(evaluation_set=evaluation_set)
+  return dict(
+      max_rhat=float(rhat[constants.MAX_RHAT].max()),
+      evaluation_set=evaluation_set,
+      r_squared=float(accuracy.sel(metric=constants.R_SQUARED)),
+      mape=float(accuracy.sel(metric=constants.MAPE)),
+      wmape=float(accuracy.sel(metric=constants.WMAPE)),
+  )
+
+
+def _fit_model(
+    run: ModelRun, input_data_path: str | None, model_path: str
+) -> ModelRunResult:
+  """Fits, saves and evaluates a model in the current process."""
+  start = time.perf_counter()
+  try:
+    if input_data_path is None:
+      input_data = run.input_data
+    else:
+      # The arrays are memory-mapped read-only, so the workers share the pages
+      # of the input data instead of copying it.
+      input_data = joblib.load(input_data_path, mmap_mode="r")
+    mmm = model.Meridian(input_data=input_data, model_spec=run.model_spec)
+    if run.sample_prior_kwargs is not None:
+      mmm.sample_prior(**run.sample_prior_kwargs)
+    sample_posterior_kwargs = dict(run.sample_posterior_kwargs)
+    if run.warm_start_path is not None:
+      sample_posterior_kwargs.update(
+          current_state=mmm.posterior_sampler_callable.get_warm_start_state(
+              model.load_mmm(run.warm_start_path).inference_data,
+              n_chains=sample_posterior_kwargs["n_chains"],
+          ),
+          use_fused_log_density=True,
+      )
+    mmm.sample_posterior(**sample_posterior_kwargs)
+    runtime_seconds = time.perf_counter() - start
+    model.save_mmm(mmm, model_path)
+    metrics = _evaluate(mmm, run)
+  except Exception as e:  # pylint: disable=broad-exception-caught
+    return ModelRunResult(
+        name=run.name,
+        path=None,
+        runtime_seconds=time.perf_counter() - start,
+        error=f"{type(e).__name__}: {e}",
+    )
+  return ModelRunResult(
+      name=run.name,
+      path=model_path,
+      runtime_seconds=runtime_seconds,
+      **metrics,
+  )
+
+
+def _get_worker_result(
+    future: concurrent.futures.Future[ModelRunResult], run: ModelRun
+) -> ModelRunResult:
+  """Returns the result of a worker, or its error if the worker failed.
+
+  `_fit_model()` catches the errors of the fitting itself, so this only reports
+  the errors of the worker process, such as a `BrokenProcessPool` after a
+  worker is killed for running out of memory.
+
+  Args:
+    future: The future of the `_fit_model()` call of `run`.
+    run: The run fit by the worker.
+
+  Returns:
+    The result of the worker, or a result with the error of the worker.
+  """
+  try:
+    return future.result()
+  except Exception as e:  # pylint: disable=broad-exception-caught
+    return ModelRunResult(
+        name=run.name,
+        path=None,
+        runtime_seconds=np.nan,
+        error=f"{type(e).__name__}: {e}",
+    )
+
+
+def _save_shared_input_data(
+    runs: Sequence[ModelRun], inputs_dir: str
+) -> list[str]:
+  """Saves each distinct `InputData` object once and returns the run paths."""
+  os.makedirs(inputs_dir, exist_ok=True)
+  paths = {}
+  run_paths = []
+  for run in runs:
+    key = id(run.input_data)
+    if key not in paths:
+      paths[key] = os.path.join(inputs_dir, f"input_data_{len(paths)}.joblib")
+      joblib.dump(run.input_data, paths[key])
+    run_paths.append(paths[key])
+  return run_paths
+
+
+def fit_models(
+    runs: Sequence[ModelRun],
+    output_dir: str,
+    max_workers: int | None = None,
+    threads_per_worker: int = 1,
+) -> pd.DataFrame:
+  """Fits several models in parallel worker processes.
+
+  Each model is fit in a separate process started with the `spawn` method, with
+  at most `threads_per_worker` TensorFlow threads, and saved to
+  `<output_dir>/models/<name>.joblib`. The input data of the runs is saved once
+  per distinct `InputData` object and memory-mapped read-only by the workers.
+  A model that fails to fit, or whose worker process dies, does not stop the
+  other runs: its error is reported in the summary table instead.
+
+  With `max_workers=1`, the models are fit sequentially in the current process
+  and the thread limits are not applied.
+
+  Args:
+    runs: The models to fit.
+    output_dir: Directory of the saved models and of the `summary.csv` table.
+    max_workers: Maximum number of worker processes. Defaults to the number of
+      CPUs divided by `threads_per_worker`.
+    threads_per_worker: Number of intra-op and inter-op TensorFlow threads of
+      each worker.
+
+  Returns:
+    A DataFrame with one row per run, in the order of `runs`, and the fields of
+    `ModelRunResult` as columns.
+
+  Raises:
+    ValueError: If the run names are not unique, or if `max_workers` or
+      `threads_per_worker` is not positive.
+  """
+  names = [run.name for run in runs]
+  if len(set(names)) != len(names):
+    raise ValueError(f"The run names must be unique, got {names}.")
+  if threads_per_worker < 1:
+    raise ValueError(
+        f"`threads_per_worker` must be positive, got {threads_per_worker}."
+    )
+  if max_workers is None:
+    max_workers = max(1, (os.cpu_count() or 1) // threads_per_worker)
+  if max_workers < 1:
+    raise ValueError(f"`max_workers` must be positive, got {max_workers}.")
+
+  model_paths = [
+      os.path.join(output_dir, _MODELS_DIR, f"{run.name}.joblib")
+      for run in runs
+  ]
+  if max_workers == 1:
+    results = [
+        _fit_model(run, None, model_path)
+        for run, model_path in zip(runs, model_paths)
+    ]
+  else:
+    input_data_paths = _save_shared_input_data(
+        runs, os.path.join(output_dir, _INPUTS_DIR)
+    )
+    with _worker_thread_env(
+        threads_per_worker
+    ), concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(max_workers, len(runs)),
+        # Forking a process that has initialized TensorFlow is unsafe.
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+      futures = [
+          # The workers load the input data from `input_data_path`.
+          executor.submit(
+              _fit_model,
+              dataclasses.replace(run, input_data=None),
+              input_data_path,
+              model_path,
+          )
+          for run, input_data_path, model_path in zip(
+              runs, input_data_paths, model_paths
+          )
+      ]
+      results = [
+          _get_worker_result(future, run) for future, run in zip(futures, runs)
+      ]
+
+  summary = pd.DataFrame(
+      [dataclasses.asdict(result) for result in results],
+      columns=[field.name for field in dataclasses.fields(ModelRunResult)],
+  )
+  os.makedirs(output_dir, exist_ok=True)
+  summary.to_csv(os.path.join(output_dir, _SUMMARY_FILE), index=False)
+  return summary
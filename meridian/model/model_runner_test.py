@@ -0,0 +1,152 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import concurrent.futures
+from concurrent.futures import process
+import dataclasses
+import os
+from unittest import mock
+
+from absl import flags
+from absl.testing import absltest
+from meridian import constants
+from meridian.data import test_utils
+from meridian.model import model
+from meridian.model import model_runner
+from meridian.model import spec
+import numpy as np
+
+
+_N_GEOS = 3
+_N_TIMES = 12
+_SAMPLE_POSTERIOR_KWARGS = dict(
+    n_chains=2, n_adapt=2, n_burnin=1, n_keep=2, seed=1
+)
+
+
+class _BrokenPoolExecutor(concurrent.futures.Executor):
+  """An executor whose workers die before returning their results."""
+
+  def __init__(self, *args, **kwargs):
+    del args, kwargs
+
+  def submit(self, fn, /, *args, **kwargs):
+    del fn, args, kwargs
+    future = concurrent.futures.Future()
+    future.set_exception(process.BrokenProcessPool("A worker died."))
+    return future
+
+
+class FitModelsTest(absltest.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    cls.input_data = test_utils.sample_input_data_non_revenue_revenue_per_kpi(
+        n_geos=_N_GEOS,
+        n_times=_N_TIMES,
+        n_media_times=_N_TIMES,
+        n_controls=1,
+        n_media_channels=2,
+        seed=0,
+    )
+
+  def setUp(self):
+    super().setUp()
+    # create_tempdir() uses the --test_tmpdir flag, which is not marked as
+    # parsed when running with pytest.
+    flags.FLAGS.mark_as_parsed()
+    self.output_dir = self.create_tempdir().full_path
+
+  def _run(self, name: str, **kwargs) -> model_runner.ModelRun:
+    return model_runner.ModelRun(
+        name=name,
+        input_data=self.input_data,
+        sample_posterior_kwargs=_SAMPLE_POSTERIOR_KWARGS,
+        **kwargs,
+    )
+
+  def test_fit_models_in_process_saves_models_and_summary(self):
+    holdout_id = np.zeros((_N_GEOS, _N_TIMES), dtype=bool)
+    holdout_id[:, -2:] = True
+    runs = [
+        self._run(
+            "holdout",
+            model_spec=spec.ModelSpec(knots=2, holdout_id=holdout_id),
+            sample_prior_kwargs=dict(n_draws=2, seed=1),
+        ),
+    ]
+
+    summary = model_runner.fit_models(runs, self.output_dir, max_workers=1)
+
+    result_fields = dataclasses.fields(model_runner.ModelRunResult)
+    self.assertEqual(
+        list(summary.columns), [field.name for field in result_fields]
+    )
+    self.assertEqual(list(summary["name"]), ["holdout"])
+    self.assertEqual(list(summary["evaluation_set"]), [constants.TEST])
+    self.assertTrue(summary["error"].isna().all())
+    self.assertTrue((summary["runtime_seconds"] > 0).all())
+    self.assertTrue(np.isfinite(summary["wmape"]).all())
+    self.assertTrue(
+        os.path.exists(os.path.join(self.output_dir, "summary.csv"))
+    )
+    mmm = model.load_mmm(summary["path"][0])
+    self.assertIn(constants.PRIOR, mmm.inference_data.groups())
+    self.assertIn(constants.POSTERIOR, mmm.inference_data.groups())
+
+  def test_fit_models_in_worker_processes_reports_errors(self):
+    # Invalid models fail fast, before the sampler is compiled in the workers.
+    runs = [
+        self._run("too_many_knots", model_spec=spec.ModelSpec(knots=100)),
+        self._run(
+            "wrong_holdout_id",
+            model_spec=spec.ModelSpec(holdout_id=np.ones((1, 1), dtype=bool)),
+        ),
+    ]
+
+    summary = model_runner.fit_models(runs, self.output_dir, max_workers=2)
+
+    self.assertEqual(
+        list(summary["name"]), ["too_many_knots", "wrong_holdout_id"]
+    )
+    self.assertTrue(summary["path"].isna().all())
+    for error in summary["error"]:
+      self.assertStartsWith(error, "ValueError")
+    self.assertLen(
+        os.listdir(os.path.join(self.output_dir, "inputs")), 1
+    )
+
+  def test_fit_models_reports_broken_worker_processes(self):
+    runs = [self._run("a"), self._run("b")]
+
+    with mock.patch.object(
+        concurrent.futures, "ProcessPoolExecutor", _BrokenPoolExecutor
+    ):
+      summary = model_runner.fit_models(runs, self.output_dir, max_workers=2)
+
+    self.assertEqual(list(summary["name"]), ["a", "b"])
+    self.assertTrue(summary["path"].isna().all())
+    for error in summary["error"]:
+      self.assertStartsWith(error, "BrokenProcessPool")
+
+  def test_fit_models_duplicate_names_raises_error(self):
+    with self.assertRaisesRegex(ValueError, "The run names must be unique"):
+      model_runner.fit_models(
+          [self._run("a"), self._run("a")], self.output_dir
+      )
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -25,6 +25,7 @@ from meridian import constants
 from meridian.data import input_data
 from meridian.data import test_utils
 from meridian.model import adstock_hill
+from meridian.model import compilation
 from meridian.model import knots as knots_module
 from meridian.model import model
 from meridian.model import model_test_data
@@ -859,6 +860,58 @@ class ModelTest(
           )
       )
 
+  def test_init_lazy_defers_scaled_data_and_validations(self):
+    meridian = model.Meridian(
+        input_data=self.input_data_with_media_and_rf, lazy=True
+    )
+
+    self.assertTrue(meridian.is_lazy)
+    self.assertNotIn("media_tensors", meridian.__dict__)
+    self.assertCountEqual(
+        meridian.pending_validations,
+        ["controls_scaled", "media_tensors", "rf_tensors", "kpi_transformer"],
+    )
+    _ = meridian.media_tensors
+    self.assertNotIn("media_tensors", meridian.pending_validations)
+    meridian.validate()
+    self.assertEmpty(meridian.pending_validations)
+
+  def test_init_lazy_without_time_variation_fails_on_first_use(self):
+    meridian = model.Meridian(
+        input_data=test_utils.sample_input_data_from_dataset(
+            test_utils.DATASET_WITHOUT_TIME_VARIATION_IN_MEDIA,
+            kpi_type=constants.NON_REVENUE,
+        ),
+        lazy=True,
+    )
+
+    for _ in range(2):
+      with self.assertRaisesRegex(
+          ValueError, "media variables do not vary across time"
+      ):
+        _ = meridian.media_tensors
+    self.assertIn("media_tensors", meridian.pending_validations)
+    with self.assertRaisesRegex(
+        ValueError, "media variables do not vary across time"
+    ):
+      meridian.sample_prior(1)
+
+  def test_lazy_cached_property_in_tf_function_is_eager(self):
+    meridian = model.Meridian(
+        input_data=self.input_data_with_media_and_rf, lazy=True
+    )
+
+    @tf.function
+    def scaled_media_sum():
+      return tf.reduce_sum(meridian.media_tensors.media_scaled)
+
+    self.assertAllClose(
+        scaled_media_sum(), tf.reduce_sum(meridian.media_tensors.media_scaled)
+    )
+    self.assertTrue(tf.executing_eagerly())
+    self.assertIsInstance(meridian.media_tensors.media_scaled, tf.Tensor)
+    self.assertTrue(hasattr(meridian.media_tensors.media_scaled, "numpy"))
+
   @parameterized.named_parameters(
       dict(
           testcase_name="rf_prior_type_roi",
@@ -1156,6 +1209,17 @@ class ModelTest(
         ),
     )
 
+  def test_warmup_compiles_kpi_transformer_for_shapes(self):
+    meridian = model.Meridian(input_data=self.input_data_with_media_and_rf)
+    meridian.warmup(shapes=[(2, 3)])
+    compilation.reset_trace_counts()
+
+    kpi = tf.ones((2, 3, meridian.n_geos, meridian.n_times))
+    meridian.kpi_transformer.inverse(meridian.kpi_transformer.forward(kpi))
+    meridian.kpi_transformer.forward(meridian.kpi)
+
+    self.assertEmpty(compilation.get_trace_counts())
+
   def test_scaled_data_inverse_is_identity(self):
     meridian = model.Meridian(input_data=self.input_data_with_media_and_rf)
 
@@ -1418,6 +1482,21 @@ class ModelTest(
         with self.subTest(name=attr):
           self.assertAllClose(getattr(mmm, attr), getattr(new_mmm, attr))
 
+  def test_save_and_load_lazy_model_drops_cached_tensors(self):
+    flags.FLAGS.mark_as_parsed()
+    file_path = os.path.join(self.create_tempdir().full_path, "joblib")
+    mmm = model.Meridian(
+        input_data=self.input_data_with_media_and_rf, lazy=True
+    )
+    media_scaled = mmm.media_tensors.media_scaled
+    model.save_mmm(mmm, str(file_path))
+    new_mmm = model.load_mmm(file_path)
+
+    self.assertTrue(new_mmm.is_lazy)
+    self.assertNotIn("media_tensors", new_mmm.__dict__)
+    self.assertNotIn("media_tensors", new_mmm.pending_validations)
+    self.assertAllClose(new_mmm.media_tensors.media_scaled, media_scaled)
+
   def test_load_error(self):
     with self.assertRaisesWithLiteralMatch(
         FileNotFoundError, "No such file or directory: this/path/does/not/exist"
@@ -14,11 +14,14 @@
 
 """Module for MCMC sampling of posterior distributions in a Meridian model."""
 
-from collections.abc import Mapping, Sequence
-from typing import TYPE_CHECKING
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any, TYPE_CHECKING
 
 import arviz as az
 from meridian import constants
+from meridian.model import compilation
+from meridian.model import knots
+from meridian.model import sampling_telemetry
 import numpy as np
 import tensorflow as tf
 import tensorflow_probability as tfp
@@ -31,6 +34,7 @@ __all__ = [
     "MCMCSamplingError",
     "MCMCOOMError",
     "PosteriorMCMCSampler",
+    "configure_logical_cpu_devices",
 ]
 
 
@@ -73,12 +77,92 @@ def _get_tau_g(
   return tfp.distributions.Deterministic(tau_g, name="tau_g")
 
 
+# Number of kept draws for which the derived parameters are computed at once
+# after sampling with the fused log-density.
+_FUSED_DERIVED_DRAWS_PER_CHUNK = 100
+
+
+class _FusedJointDistribution(
+    tfp.distributions.JointDistributionCoroutineAutoBatched
+):
+  """Joint distribution of the sampled parameters with a fused log-density.
+
+  The coroutine only yields the prior distributions of the sampled parameters,
+  which provides the event shapes and the default event space bijector used by
+  `windowed_adaptive_nuts`. The unnormalized log-density is computed by
+  `log_prob_fn` in a single pass over the parameter tensors, without the
+  vectorized map and the `Deterministic` nodes of the coroutine model.
+  """
+
+  def __init__(
+      self,
+      model: Callable[[], Any],
+      log_prob_fn: Callable[[Mapping[str, tf.Tensor]], tf.Tensor],
+      name: str | None = None,
+  ):
+    parameters = dict(locals())
+    super().__init__(model, name=name or "FusedJointDistribution")
+    self._log_prob_fn = log_prob_fn
+    self._parameters = self._no_dependency(parameters)
+
+  def _named_values(self, value) -> dict[str, tf.Tensor]:
+    return dict(zip(self._flat_resolve_names(), self._model_flatten(value)))
+
+  def _unnormalized_log_prob(self, value):
+    return self._log_prob_fn(self._named_values(value))
+
+  def _log_prob(self, value):
+    return self._log_prob_fn(self._named_values(value))
+
+
 @tf.function(autograph=False, jit_compile=True)
+@compilation.count_traces
 def _xla_windowed_adaptive_nuts(**kwargs):
   """XLA wrapper for windowed_adaptive_nuts."""
   return tfp.experimental.mcmc.windowed_adaptive_nuts(**kwargs)
 
 
+@tf.function(autograph=False)
+@compilation.count_traces
+def _graph_windowed_adaptive_nuts(**kwargs):
+  """Graph wrapper for windowed_adaptive_nuts.
+
+  Unlike `_xla_windowed_adaptive_nuts`, the sampler is not compiled into a
+  single XLA program, which would run on one device and cannot call back to
+  the host. This is used for a geo-sharded likelihood, whose per-shard
+  computations are compiled separately and placed on their own devices, and for
+  the host callbacks of the sampling telemetry.
+  """
+  return tfp.experimental.mcmc.windowed_adaptive_nuts(**kwargs)
+
+
+def configure_logical_cpu_devices(n_devices: int) -> list[str]:
+  """Splits the physical CPU into logical CPU devices for geo sharding.
+
+  This must be called before TensorFlow initializes its devices, i.e. before
+  any tensor is created.
+
+  Args:
+    n_devices: Number of logical CPU devices.
+
+  Returns:
+    The names of the logical CPU devices.
+
+  Raises:
+    ValueError: If `n_devices` is not positive.
+    RuntimeError: If TensorFlow has already initialized its devices.
+  """
+  if n_devices < 1:
+    raise ValueError(
+        f"The number of logical CPU devices must be positive, got {n_devices}."
+    )
+  cpu = tf.config.list_physical_devices("CPU")[0]
+  tf.config.set_logical_device_configuration(
+      cpu, [tf.config.LogicalDeviceConfiguration()] * n_devices
+  )
+  return [device.name for device in tf.config.list_logical_devices("CPU")]
+
+
 class PosteriorMCMCSampler:
   """A callable that samples from posterior distributions using MCMC."""
 
@@ -131,11 +215,7 @@ class PosteriorMCMCSampler:
           baseline_geo_idx=baseline_geo_idx,
       )
       mu_t = yield tfp.distributions.Deterministic(
-          tf.einsum(
-              "k,kt->t",
-              knot_values,
-              tf.convert_to_tensor(knot_info.weights),
-          ),
+          knots.get_mu_t(knot_values, knot_info),
           name=constants.MU_T,
       )
 
@@ -461,6 +541,650 @@ class PosteriorMCMCSampler:
     )
     return self._get_joint_dist_unpinned().experimental_pin(y=y)
 
+  def _get_fused_prior_nodes(
+      self,
+  ) -> list[tuple[str, tfp.distributions.Distribution]]:
+    """Returns the prior distributions of the parameters sampled by MCMC.
+
+    The parameters are listed in the order in which `_get_joint_dist_unpinned`
+    yields them, without the `Deterministic` nodes and the outcome `y`.
+    """
+    mmm = self._meridian
+    prior = mmm.prior_broadcast
+    model_spec = mmm.model_spec
+
+    def _dev(name: str, n_channels: int) -> tfp.distributions.Distribution:
+      return tfp.distributions.Sample(
+          tfp.distributions.Normal(0, 1), [mmm.n_geos, n_channels], name=name
+      )
+
+    def _treatment_parameter(
+        prior_type: str, names: Mapping[str, str]
+    ) -> tuple[str, tfp.distributions.Distribution]:
+      if prior_type not in names:
+        raise ValueError(f"Unsupported prior type: {prior_type}")
+      return names[prior_type], getattr(prior, names[prior_type])
+
+    nodes = [
+        (constants.KNOT_VALUES, prior.knot_values),
+        (constants.SIGMA, prior.sigma),
+        (
+            constants.TAU_G_EXCL_BASELINE,
+            tfp.distributions.Sample(
+                prior.tau_g_excl_baseline,
+                name=constants.TAU_G_EXCL_BASELINE,
+            ),
+        ),
+    ]
+    if mmm.media_tensors.media is not None:
+      nodes += [
+          (constants.ALPHA_M, prior.alpha_m),
+          (constants.EC_M, prior.ec_m),
+          (constants.ETA_M, prior.eta_m),
+          (constants.SLOPE_M, prior.slope_m),
+          (
+              constants.BETA_GM_DEV,
+              _dev(constants.BETA_GM_DEV, mmm.n_media_channels),
+          ),
+          _treatment_parameter(
+              model_spec.effective_media_prior_type,
+              {
+                  constants.TREATMENT_PRIOR_TYPE_COEFFICIENT: constants.BETA_M,
+                  constants.TREATMENT_PRIOR_TYPE_ROI: constants.ROI_M,
+                  constants.TREATMENT_PRIOR_TYPE_MROI: constants.MROI_M,
+                  constants.TREATMENT_PRIOR_TYPE_CONTRIBUTION: (
+                      constants.CONTRIBUTION_M
+                  ),
+              },
+          ),
+      ]
+    if mmm.rf_tensors.reach is not None:
+      nodes += [
+          (constants.ALPHA_RF, prior.alpha_rf),
+          (constants.EC_RF, prior.ec_rf),
+          (constants.ETA_RF, prior.eta_rf),
+          (constants.SLOPE_RF, prior.slope_rf),
+          (
+              constants.BETA_GRF_DEV,
+              _dev(constants.BETA_GRF_DEV, mmm.n_rf_channels),
+          ),
+          _treatment_parameter(
+              model_spec.effective_rf_prior_type,
+              {
+                  constants.TREATMENT_PRIOR_TYPE_COEFFICIENT: constants.BETA_RF,
+                  constants.TREATMENT_PRIOR_TYPE_ROI: constants.ROI_RF,
+                  constants.TREATMENT_PRIOR_TYPE_MROI: constants.MROI_RF,
+                  constants.TREATMENT_PRIOR_TYPE_CONTRIBUTION: (
+                      constants.CONTRIBUTION_RF
+                  ),
+              },
+          ),
+      ]
+    if mmm.organic_media_tensors.organic_media is not None:
+      nodes += [
+          (constants.ALPHA_OM, prior.alpha_om),
+          (constants.EC_OM, prior.ec_om),
+          (constants.ETA_OM, prior.eta_om),
+          (constants.SLOPE_OM, prior.slope_om),
+          (
+              constants.BETA_GOM_DEV,
+              _dev(constants.BETA_GOM_DEV, mmm.n_organic_media_channels),
+          ),
+          _treatment_parameter(
+              model_spec.organic_media_prior_type,
+              {
+                  constants.TREATMENT_PRIOR_TYPE_COEFFICIENT: constants.BETA_OM,
+                  constants.TREATMENT_PRIOR_TYPE_CONTRIBUTION: (
+                      constants.CONTRIBUTION_OM
+                  ),
+              },
+          ),
+      ]
+    if mmm.organic_rf_tensors.organic_reach is not None:
+      nodes += [
+          (constants.ALPHA_ORF, prior.alpha_orf),
+          (constants.EC_ORF, prior.ec_orf),
+          (constants.ETA_ORF, prior.eta_orf),
+          (constants.SLOPE_ORF, prior.slope_orf),
+          (
+              constants.BETA_GORF_DEV,
+              _dev(constants.BETA_GORF_DEV, mmm.n_organic_rf_channels),
+          ),
+          _treatment_parameter(
+              model_spec.organic_rf_prior_type,
+              {
+                  constants.TREATMENT_PRIOR_TYPE_COEFFICIENT: (
+                      constants.BETA_ORF
+                  ),
+                  constants.TREATMENT_PRIOR_TYPE_CONTRIBUTION: (
+                      constants.CONTRIBUTION_ORF
+                  ),
+              },
+          ),
+      ]
+    if mmm.n_controls:
+      nodes += [
+          (constants.GAMMA_C, prior.gamma_c),
+          (constants.XI_C, prior.xi_c),
+          (
+              constants.GAMMA_GC_DEV,
+              _dev(constants.GAMMA_GC_DEV, mmm.n_controls),
+          ),
+      ]
+    if mmm.non_media_treatments is not None:
+      nodes += [
+          (constants.XI_N, prior.xi_n),
+          (
+              constants.GAMMA_GN_DEV,
+              _dev(constants.GAMMA_GN_DEV, mmm.n_non_media_channels),
+          ),
+          _treatment_parameter(
+              model_spec.non_media_treatments_prior_type,
+              {
+                  constants.TREATMENT_PRIOR_TYPE_COEFFICIENT: constants.GAMMA_N,
+                  constants.TREATMENT_PRIOR_TYPE_CONTRIBUTION: (
+                      constants.CONTRIBUTION_N
+                  ),
+              },
+          ),
+      ]
+    return nodes
+
+  def _get_fused_transformed_treatments(
+      self, params: Mapping[str, tf.Tensor], geos: slice = slice(None)
+  ) -> dict[str, tf.Tensor]:
+    """Returns the transformed treatments of a range of geos.
+
+    Args:
+      params: A mapping from the names of the sampled parameters to tensors
+        with arbitrary leading batch dimensions, such as chains and draws.
+      geos: The range of geos to transform. Defaults to all geos.
+
+    Returns:
+      A dictionary from the names of the geo-level coefficients, such as
+      `beta_gm`, to the transformed treatments they multiply, with dimensions
+      `[..., n_geos, n_times, n_channels]`.
+    """
+    mmm = self._meridian
+    transformed = {}
+    if mmm.media_tensors.media is not None:
+      transformed[constants.BETA_GM] = mmm.adstock_hill_media(
+          media=mmm.media_tensors.media_scaled[geos],
+          alpha=params[constants.ALPHA_M],
+          ec=params[constants.EC_M],
+          slope=params[constants.SLOPE_M],
+      )
+    if mmm.rf_tensors.reach is not None:
+      transformed[constants.BETA_GRF] = mmm.adstock_hill_rf(
+          reach=mmm.rf_tensors.reach_scaled[geos],
+          frequency=mmm.rf_tensors.frequency[geos],
+          alpha=params[constants.ALPHA_RF],
+          ec=params[constants.EC_RF],
+          slope=params[constants.SLOPE_RF],
+      )
+    if mmm.organic_media_tensors.organic_media is not None:
+      transformed[constants.BETA_GOM] = mmm.adstock_hill_media(
+          media=mmm.organic_media_tensors.organic_media_scaled[geos],
+          alpha=params[constants.ALPHA_OM],
+          ec=params[constants.EC_OM],
+          slope=params[constants.SLOPE_OM],
+      )
+    if mmm.organic_rf_tensors.organic_reach is not None:
+      transformed[constants.BETA_GORF] = mmm.adstock_hill_rf(
+          reach=mmm.organic_rf_tensors.organic_reach_scaled[geos],
+          frequency=mmm.organic_rf_tensors.organic_frequency[geos],
+          alpha=params[constants.ALPHA_ORF],
+          ec=params[constants.EC_ORF],
+          slope=params[constants.SLOPE_ORF],
+      )
+    if mmm.non_media_treatments is not None:
+      transformed[constants.GAMMA_GN] = mmm.non_media_treatments_normalized[
+          geos
+      ]
+    return transformed
+
+  def _get_fused_coefficients(
+      self,
+      params: Mapping[str, tf.Tensor],
+      transformed: Mapping[str, tf.Tensor],
+  ) -> dict[str, tf.Tensor]:
+    """Computes the derived parameters of a draw.
+
+    This is the batched counterpart of the `Deterministic` nodes of
+    `_get_joint_dist_unpinned`.
+
+    Args:
+      params: A mapping from the names of the sampled parameters to tensors
+        with arbitrary leading batch dimensions, such as chains and draws.
+      transformed: The transformed treatments of all geos, as returned by
+        `_get_fused_transformed_treatments`.
+
+    Returns:
+      A dictionary of the derived parameters.
+    """
+    mmm = self._meridian
+    derived = {}
+
+    derived[constants.MU_T] = knots.get_mu_t(
+        params[constants.KNOT_VALUES], mmm.knot_info
+    )
+    derived[constants.TAU_G] = _get_tau_g(
+        tau_g_excl_baseline=params[constants.TAU_G_EXCL_BASELINE],
+        baseline_geo_idx=mmm.baseline_geo_idx,
+    ).loc
+
+    def _add_coefficients(
+        beta_name: str,
+        beta_g_name: str,
+        treatment_names: Sequence[str],
+        prior_denominator: tf.Tensor,
+        counterfactual_difference_fn: Callable[[], tf.Tensor],
+        eta: tf.Tensor,
+        beta_dev: tf.Tensor,
+        is_non_media: bool = False,
+    ):
+      if beta_name in params:
+        beta = params[beta_name]
+      else:
+        name = next(name for name in treatment_names if name in params)
+        beta = mmm.calculate_beta_x(
+            is_non_media=is_non_media,
+            incremental_outcome_x=params[name] * prior_denominator,
+            linear_predictor_counterfactual_difference=(
+                counterfactual_difference_fn()
+            ),
+            eta_x=eta,
+            beta_gx_dev=beta_dev,
+        )
+        derived[beta_name] = beta
+      beta_combined = beta[..., tf.newaxis, :] + (
+          eta[..., tf.newaxis, :] * beta_dev
+      )
+      if (
+          is_non_media
+          or mmm.media_effects_dist == constants.MEDIA_EFFECTS_NORMAL
+      ):
+        derived[beta_g_name] = beta_combined
+      else:
+        derived[beta_g_name] = tf.math.exp(beta_combined)
+
+    if constants.BETA_GM in transformed:
+      _add_coefficients(
+          constants.BETA_M,
+          constants.BETA_GM,
+          (constants.ROI_M, constants.MROI_M, constants.CONTRIBUTION_M),
+          mmm.media_tensors.prior_denominator,
+          lambda: mmm.linear_predictor_counterfactual_difference_media(
+              media_transformed=transformed[constants.BETA_GM],
+              alpha_m=params[constants.ALPHA_M],
+              ec_m=params[constants.EC_M],
+              slope_m=params[constants.SLOPE_M],
+          ),
+          params[constants.ETA_M],
+          params[constants.BETA_GM_DEV],
+      )
+    if constants.BETA_GRF in transformed:
+      _add_coefficients(
+          constants.BETA_RF,
+          constants.BETA_GRF,
+          (constants.ROI_RF, constants.MROI_RF, constants.CONTRIBUTION_RF),
+          mmm.rf_tensors.prior_denominator,
+          lambda: mmm.linear_predictor_counterfactual_difference_rf(
+              rf_transformed=transformed[constants.BETA_GRF],
+              alpha_rf=params[constants.ALPHA_RF],
+              ec_rf=params[constants.EC_RF],
+              slope_rf=params[constants.SLOPE_RF],
+          ),
+          params[constants.ETA_RF],
+          params[constants.BETA_GRF_DEV],
+      )
+    if constants.BETA_GOM in transformed:
+      _add_coefficients(
+          constants.BETA_OM,
+          constants.BETA_GOM,
+          (constants.CONTRIBUTION_OM,),
+          mmm.total_outcome,
+          lambda: transformed[constants.BETA_GOM],
+          params[constants.ETA_OM],
+          params[constants.BETA_GOM_DEV],
+      )
+    if constants.BETA_GORF in transformed:
+      _add_coefficients(
+          constants.BETA_ORF,
+          constants.BETA_GORF,
+          (constants.CONTRIBUTION_ORF,),
+          mmm.total_outcome,
+          lambda: transformed[constants.BETA_GORF],
+          params[constants.ETA_ORF],
+          params[constants.BETA_GORF_DEV],
+      )
+    if mmm.n_controls:
+      derived[constants.GAMMA_GC] = params[constants.GAMMA_C][
+          ..., tf.newaxis, :
+      ] + (
+          params[constants.XI_C][..., tf.newaxis, :]
+          * params[constants.GAMMA_GC_DEV]
+      )
+    if constants.GAMMA_GN in transformed:
+      _add_coefficients(
+          constants.GAMMA_N,
+          constants.GAMMA_GN,
+          (constants.CONTRIBUTION_N,),
+          mmm.total_outcome,
+          lambda: transformed[constants.GAMMA_GN]
+          - mmm.non_media_transformer.forward(  # pytype: disable=attribute-error
+              mmm.compute_non_media_treatments_baseline()
+          ),
+          params[constants.XI_N],
+          params[constants.GAMMA_GN_DEV],
+          is_non_media=True,
+      )
+    return derived
+
+  def _get_fused_expected_outcome(
+      self,
+      derived: Mapping[str, tf.Tensor],
+      transformed: Mapping[str, tf.Tensor],
+      geos: slice = slice(None),
+  ) -> tf.Tensor:
+    """Returns the expected scaled outcome of a range of geos.
+
+    Args:
+      derived: The derived parameters, as returned by `_get_fused_coefficients`.
+      transformed: The transformed treatments of the same range of geos, as
+        returned by `_get_fused_transformed_treatments`.
+      geos: The range of geos. Defaults to all geos.
+
+    Returns:
+      A tensor with dimensions `[..., n_geos, n_times]`.
+    """
+    mmm = self._meridian
+    # Each treatment group is added to `tau_gt` separately, which avoids
+    # concatenating the transformed treatments and coefficients.
+    y_pred = (
+        derived[constants.TAU_G][..., geos, tf.newaxis]
+        + derived[constants.MU_T][..., tf.newaxis, :]
+    )
+    for beta_g_name, treatment in transformed.items():
+      y_pred += tf.einsum(
+          "...gtx,...gx->...gt", treatment, derived[beta_g_name][..., geos, :]
+      )
+    if mmm.n_controls:
+      y_pred += tf.einsum(
+          "gtc,...gc->...gt",
+          mmm.controls_scaled[geos],
+          derived[constants.GAMMA_GC][..., geos, :],
+      )
+    return y_pred
+
+  def _get_fused_log_likelihood(
+      self,
+      params: Mapping[str, tf.Tensor],
+      derived: Mapping[str, tf.Tensor],
+      transformed: Mapping[str, tf.Tensor],
+      geos: slice = slice(None),
+  ) -> tf.Tensor:
+    """Returns the log-likelihood of the observed outcome of a range of geos."""
+    mmm = self._meridian
+    y_pred = self._get_fused_expected_outcome(derived, transformed, geos)
+    sigma = params[constants.SIGMA]
+    if mmm.unique_sigma_for_each_geo:
+      sigma = sigma[..., geos]
+    log_likelihood = tfp.distributions.Normal(
+        y_pred, sigma[..., tf.newaxis]
+    ).log_prob(mmm.kpi_scaled[geos])
+    # Holdout observations do not contribute to the log-density, as in
+    # `_get_joint_dist_unpinned`.
+    if mmm.holdout_id is not None:
+      log_likelihood = tf.where(mmm.holdout_id[geos], 0.0, log_likelihood)
+    return tf.reduce_sum(log_likelihood, axis=[-2, -1])
+
+  def _get_fused_derived_parameters(
+      self, params: Mapping[str, tf.Tensor]
+  ) -> tuple[tf.Tensor, dict[str, tf.Tensor]]:
+    """Computes the expected outcome and the derived parameters of a draw.
+
+    The transformed media, the geo-level coefficients and `tau_gt` are computed
+    once and shared between the derived parameters and the expected outcome.
+
+    Args:
+      params: A mapping from the names of the sampled parameters to tensors
+        with arbitrary leading batch dimensions, such as chains and draws.
+
+    Returns:
+      A tuple of the expected scaled outcome with dimensions
+      `[..., n_geos, n_times]` and a dictionary of the derived parameters.
+    """
+    transformed = self._get_fused_transformed_treatments(params)
+    derived = self._get_fused_coefficients(params, transformed)
+    return self._get_fused_expected_outcome(derived, transformed), derived
+
+  def _get_fused_derived_states(
+      self, states: Mapping[str, tf.Tensor]
+  ) -> dict[str, tf.Tensor]:
+    """Computes the derived parameters of MCMC draws in chunks of draws.
+
+    Args:
+      states: A mapping from the names of the sampled parameters to tensors
+        with dimensions `[n_draws, n_chains, ...]`.
+
+    Returns:
+      A dictionary of the derived parameters with dimensions
+      `[n_draws, n_chains, ...]`.
+    """
+    n_draws = next(iter(states.values())).shape[0]
+    chunks = []
+    for start in range(0, n_draws, _FUSED_DERIVED_DRAWS_PER_CHUNK):
+      stop = start + _FUSED_DERIVED_DRAWS_PER_CHUNK
+      _, derived = self._get_fused_derived_parameters(
+          {k: v[start:stop] for k, v in states.items()}
+      )
+      chunks.append(derived)
+    return {k: tf.concat([c[k] for c in chunks], axis=0) for k in chunks[0]}
+
+  def _get_geo_shards(self, n_geo_shards: int) -> list[tuple[slice, str]]:
+    """Splits the geos into contiguous shards placed on logical CPU devices.
+
+    Args:
+      n_geo_shards: Number of geo shards.
+
+    Returns:
+      A list of the geo range and the device name of each shard. Shards are
+      assigned to the logical CPU devices in a round-robin fashion.
+    """
+    n_geos = self._meridian.n_geos
+    if not 1 <= n_geo_shards <= n_geos:
+      raise ValueError(
+          "`n_geo_shards` must be between 1 and the number of geos"
+          f" ({n_geos}), got {n_geo_shards}."
+      )
+    devices = [d.name for d in tf.config.list_logical_devices("CPU")]
+    bounds = np.linspace(0, n_geos, n_geo_shards + 1).round().astype(int)
+    return [
+        (slice(start, stop), devices[i % len(devices)])
+        for i, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:]))
+    ]
+
+  def _get_fused_joint_dist(
+      self, n_geo_shards: int | None = None
+  ) -> tfp.distributions.Distribution:
+    """Returns the joint distribution with the fused log-density for MCMC.
+
+    The log-density is the sum of the prior log-densities of the sampled
+    parameters and the log-likelihood of the observed outcome. It equals the
+    unnormalized log-density of `_get_joint_dist()` evaluated at the same
+    sampled parameters.
+
+    Args:
+      n_geo_shards: Optional number of geo shards. If set, the transformed
+        media and the log-likelihood of each shard are computed on its own
+        logical CPU device, and the per-shard log-likelihoods are summed on the
+        default device. The coefficient means, e.g. `beta_m` under ROI priors,
+        are computed once from the transformed media of all geos.
+    """
+    mmm = self._meridian
+    mmm.populate_cached_properties()
+    prior_nodes = self._get_fused_prior_nodes()
+    geo_shards = (
+        self._get_geo_shards(n_geo_shards) if n_geo_shards is not None else None
+    )
+
+    def model():
+      for _, distribution in prior_nodes:
+        yield distribution
+
+    def compile_shard_fns(geos: slice):
+      # Each shard computation is compiled as its own XLA cluster, which is
+      # placed on the device of the shard.
+      @tf.function(autograph=False, jit_compile=True)
+      def transform_fn(params):
+        return self._get_fused_transformed_treatments(params, geos)
+
+      @tf.function(autograph=False, jit_compile=True)
+      def log_likelihood_shard_fn(params, derived, transformed):
+        return self._get_fused_log_likelihood(
+            params, derived, transformed, geos
+        )
+
+      return transform_fn, log_likelihood_shard_fn
+
+    if geo_shards is not None:
+      shard_fns = [
+          (device, *compile_shard_fns(geos)) for geos, device in geo_shards
+      ]
+
+    def log_likelihood_fn(params: Mapping[str, tf.Tensor]) -> tf.Tensor:
+      if geo_shards is None:
+        transformed = self._get_fused_transformed_treatments(params)
+        derived = self._get_fused_coefficients(params, transformed)
+        return self._get_fused_log_likelihood(params, derived, transformed)
+
+      shard_transformed = []
+      for device, transform_fn, _ in shard_fns:
+        with tf.device(device):
+          shard_transformed.append(transform_fn(params))
+      derived = self._get_fused_coefficients(
+          params,
+          {
+              k: tf.concat([t[k] for t in shard_transformed], axis=-3)
+              for k in shard_transformed[0]
+          },
+      )
+      shard_log_likelihoods = []
+      for (device, _, log_likelihood_shard_fn), transformed in zip(
+          shard_fns, shard_transformed
+      ):
+        with tf.device(device):
+          shard_log_likelihoods.append(
+              log_likelihood_shard_fn(params, derived, transformed)
+          )
+      return tf.add_n(shard_log_likelihoods)
+
+    def log_prob_fn(params: Mapping[str, tf.Tensor]) -> tf.Tensor:
+      log_prob = 0.0
+      for name, distribution in prior_nodes:
+        batch_axes = list(range(-len(distribution.batch_shape), 0))
+        log_prob += tf.reduce_sum(
+            distribution.log_prob(params[name]), axis=batch_axes
+        )
+      return log_prob + log_likelihood_fn(params)
+
+    return _FusedJointDistribution(model, log_prob_fn)
+
+  def get_warm_start_state(
+      self,
+      inference_data: az.InferenceData,
+      n_chains: int,
+      draw: int = -1,
+  ) -> dict[str, tf.Tensor]:
+    """Returns the sampled parameters at a posterior draw of a fitted model.
+
+    The state can be passed as `current_state` together with
+    `use_fused_log_density=True`, so that the chains of this model start from
+    the posterior of a related model with the same parameters, for example the
+    same model fit to more data. The parameters that are not saved in the
+    posterior, such as `beta_gm_dev`, are recovered from the saved ones.
+
+    Args:
+      inference_data: Inference data with a `posterior` group, e.g.
+        `Meridian.inference_data` of a fitted model.
+      n_chains: Number of chains of the state. Chain `i` starts from the draw
+        of the posterior chain `i % n_posterior_chains`.
+      draw: Index of the posterior draw of each chain.
+
+    Returns:
+      A mapping from the names of the sampled parameters of the fused
+      log-density to tensors of shape `(n_chains, ...)`.
+    """
+    mmm = self._meridian
+    posterior = inference_data.posterior
+    chains = np.arange(n_chains) % posterior.sizes[constants.CHAIN]
+
+    def _values(name: str) -> np.ndarray:
+      return posterior[name].values[chains, draw]
+
+    # The geo-level parameter, its mean and its scale across geos.
+    dev_params = {
+        constants.BETA_GM_DEV: (
+            constants.BETA_GM,
+            constants.BETA_M,
+            constants.ETA_M,
+        ),
+        constants.BETA_GRF_DEV: (
+            constants.BETA_GRF,
+            constants.BETA_RF,
+            constants.ETA_RF,
+        ),
+        constants.BETA_GOM_DEV: (
+            constants.BETA_GOM,
+            constants.BETA_OM,
+            constants.ETA_OM,
+        ),
+        constants.BETA_GORF_DEV: (
+            constants.BETA_GORF,
+            constants.BETA_ORF,
+            constants.ETA_ORF,
+        ),
+        constants.GAMMA_GC_DEV: (
+            constants.GAMMA_GC,
+            constants.GAMMA_C,
+            constants.XI_C,
+        ),
+        constants.GAMMA_GN_DEV: (
+            constants.GAMMA_GN,
+            constants.GAMMA_N,
+            constants.XI_N,
+        ),
+    }
+    log_normal = mmm.media_effects_dist == constants.MEDIA_EFFECTS_LOG_NORMAL
+    state = {}
+    for name, _ in self._get_fused_prior_nodes():
+      if name == constants.TAU_G_EXCL_BASELINE:
+        value = np.delete(
+            _values(constants.TAU_G), int(mmm.baseline_geo_idx), axis=-1
+        )
+      elif name in dev_params:
+        geo_name, mean_name, scale_name = dev_params[name]
+        geo_value = _values(geo_name)
+        if log_normal and name not in (
+            constants.GAMMA_GC_DEV,
+            constants.GAMMA_GN_DEV,
+        ):
+          geo_value = np.log(geo_value)
+        mean = _values(mean_name)[..., np.newaxis, :]
+        scale = _values(scale_name)[..., np.newaxis, :]
+        # A zero scale makes the deviations unidentified.
+        value = np.divide(
+            geo_value - mean,
+            scale,
+            out=np.zeros_like(geo_value),
+            where=scale != 0,
+        )
+      else:
+        value = _values(name)
+      state[name] = tf.convert_to_tensor(value, dtype=tf.float32)
+    return state
+
   def __call__(
       self,
       n_chains: Sequence[int] | int,
@@ -475,6 +1199,10 @@ class PosteriorMCMCSampler:
       unrolled_leapfrog_steps: int = 1,
       parallel_iterations: int = 10,
       seed: Sequence[int] | int | None = None,
+      use_fused_log_density: bool = False,
+      n_geo_shards: int | None = None,
+      callbacks: Sequence[sampling_telemetry.SamplingCallback] | None = None,
+      report_every: int = 100,
       **pins,
   ) -> az.InferenceData:
     """Runs Markov Chain Monte Carlo (MCMC) sampling of posterior distributions.
@@ -526,6 +1254,33 @@ class PosteriorMCMCSampler:
         will be treated as stateless seeds; or a Python `int` or `None`, which
         will be treated as stateful seeds. See [tfp.random.sanitize_seed]
         (https://www.tensorflow.org/probability/api_docs/python/tfp/random/sanitize_seed).
+      use_fused_log_density: If `True`, NUTS targets a fused log-density that
+        only contains the sampled parameters. The expected outcome and the
+        derived parameters, such as `beta_gm` or `mu_t`, are computed once per
+        log-density evaluation without the `Deterministic` nodes of the joint
+        distribution, and are recomputed for the kept draws only. The posterior
+        is the same, but the draws differ from the default sampler for a given
+        seed. `current_state` may only contain the sampled parameters, and
+        `pins` are not supported.
+      n_geo_shards: Optional number of contiguous geo shards of the
+        log-likelihood. If set, the fused log-density is used, and the
+        transformed media and log-likelihood of each shard, together with their
+        gradients, are computed on their own logical CPU device and summed. The
+        shards are assigned round-robin to the devices returned by
+        `tf.config.list_logical_devices("CPU")`, see
+        `configure_logical_cpu_devices`. The sampler is then compiled as a
+        `tf.function` graph with an XLA cluster per shard computation rather
+        than as a single XLA program, so that the shards run concurrently.
+      callbacks: Optional sequence of `sampling_telemetry.SamplingCallback`
+        that receive progress reports, such as the draws per second, leapfrog
+        steps, divergences, step size and phase, while the sampler runs. XLA
+        programs cannot call back to the host, so the sampler is then compiled
+        as a `tf.function` graph rather than as a single XLA program, which is
+        slower. With `use_fused_log_density`, the log-likelihood is still
+        compiled with XLA, as a single geo shard by default.
+      report_every: Number of steps between two progress reports of each batch
+        of chains, if `callbacks` are given. A report is also made at the end
+        of each phase.
       **pins: These are used to condition the provided joint distribution, and
         are passed directly to `joint_dist.experimental_pin(**pins)`.
 
@@ -546,17 +1301,54 @@ class PosteriorMCMCSampler:
           " [tfp.random.sanitize_seed](https://www.tensorflow.org/probability/api_docs/python/tfp/random/sanitize_seed)"
           " for details."
       )
+    use_fused_log_density = use_fused_log_density or n_geo_shards is not None
+    if use_fused_log_density and pins:
+      raise ValueError(
+          "`pins` are not supported with `use_fused_log_density=True` or"
+          " `n_geo_shards`."
+      )
     seed = tfp.random.sanitize_seed(seed) if seed is not None else None
+    telemetry_kwargs = {}
+    if callbacks:
+      recorder = sampling_telemetry.SamplingRecorder(
+          callbacks,
+          n_adapt=n_adapt,
+          n_burnin=n_burnin,
+          n_keep=n_keep,
+          report_every=report_every,
+          unrolled_leapfrog_steps=unrolled_leapfrog_steps,
+      )
+      # The adaptation steps are traced too, so that they are reported.
+      telemetry_kwargs = {
+          "trace_fn": recorder.trace_fn,
+          "discard_tuning": False,
+      }
+      if use_fused_log_density and n_geo_shards is None:
+        # Compiles the log-likelihood with XLA within the sampler graph.
+        n_geo_shards = 1
+    if n_geo_shards is not None:
+      windowed_adaptive_nuts = _graph_windowed_adaptive_nuts
+      joint_dist = self._get_fused_joint_dist(n_geo_shards)
+    elif use_fused_log_density:
+      windowed_adaptive_nuts = _xla_windowed_adaptive_nuts
+      joint_dist = self._get_fused_joint_dist()
+    else:
+      windowed_adaptive_nuts = _xla_windowed_adaptive_nuts
+      joint_dist = self._get_joint_dist()
+    if callbacks:
+      windowed_adaptive_nuts = _graph_windowed_adaptive_nuts
     n_chains_list = [n_chains] if isinstance(n_chains, int) else n_chains
     total_chains = np.sum(n_chains_list)
 
     states = []
     traces = []
     for n_chains_batch in n_chains_list:
+      if callbacks:
+        recorder.start_batch(n_chains_batch)
       try:
-        mcmc = _xla_windowed_adaptive_nuts(
+        mcmc = windowed_adaptive_nuts(
             n_draws=n_burnin + n_keep,
-            joint_dist=self._get_joint_dist(),
+            joint_dist=joint_dist,
             n_chains=n_chains_batch,
             num_adaptation_steps=n_adapt,
             current_state=current_state,
@@ -567,6 +1359,7 @@ class PosteriorMCMCSampler:
             unrolled_leapfrog_steps=unrolled_leapfrog_steps,
             parallel_iterations=parallel_iterations,
             seed=seed,
+            **telemetry_kwargs,
             **pins,
         )
       except tf.errors.ResourceExhaustedError as error:
@@ -577,15 +1370,25 @@ class PosteriorMCMCSampler:
         ) from error
       if seed is not None:
         seed += 1
-      states.append(mcmc.all_states._asdict())
-      traces.append(mcmc.trace)
-
-    mcmc_states = {
-        k: tf.einsum(
-            "ij...->ji...",
-            tf.concat([state[k] for state in states], axis=1)[n_burnin:, ...],
+      batch_states = mcmc.all_states._asdict()
+      batch_trace = mcmc.trace
+      if callbacks:
+        # Drops the adaptation steps, which were only traced to be reported.
+        batch_states, batch_trace = tf.nest.map_structure(
+            lambda x: x[n_adapt:, ...], (batch_states, batch_trace)
         )
+      states.append(batch_states)
+      traces.append(batch_trace)
+
+    kept_states = {
+        k: tf.concat([state[k] for state in states], axis=1)[n_burnin:, ...]
         for k in states[0].keys()
+    }
+    if use_fused_log_density:
+      kept_states.update(self._get_fused_derived_states(kept_states))
+    mcmc_states = {
+        k: tf.einsum("ij...->ji...", v)
+        for k, v in kept_states.items()
         if k not in constants.UNSAVED_PARAMETERS
     }
     # Create Arviz InferenceData for posterior draws.
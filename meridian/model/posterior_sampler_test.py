@@ -23,6 +23,7 @@ from meridian.model import model
 from meridian.model import model_test_data
 from meridian.model import posterior_sampler
 from meridian.model import prior_distribution
+from meridian.model import sampling_telemetry
 from meridian.model import spec
 import numpy as np
 import tensorflow as tf
@@ -1615,6 +1616,376 @@ class PosteriorMCMCSamplerTest(
       sanitized_seed1 = kwargs1["seed"]
       self.assertAllEqual(sanitized_seed1, [x + 1 for x in sanitized_seed0])
 
+  @parameterized.named_parameters(
+      dict(
+          testcase_name="roi_mroi_log_normal",
+          input_data="short_input_data_with_media_and_rf",
+          media_prior_type=constants.TREATMENT_PRIOR_TYPE_ROI,
+          rf_prior_type=constants.TREATMENT_PRIOR_TYPE_MROI,
+          media_effects_dist=constants.MEDIA_EFFECTS_LOG_NORMAL,
+      ),
+      dict(
+          testcase_name="coefficient_contribution_normal",
+          input_data="short_input_data_with_media_and_rf",
+          media_prior_type=constants.TREATMENT_PRIOR_TYPE_COEFFICIENT,
+          rf_prior_type=constants.TREATMENT_PRIOR_TYPE_CONTRIBUTION,
+          media_effects_dist=constants.MEDIA_EFFECTS_NORMAL,
+      ),
+      dict(
+          testcase_name="non_media_and_organic_contribution",
+          input_data="short_input_data_non_media_and_organic",
+          media_prior_type=constants.TREATMENT_PRIOR_TYPE_CONTRIBUTION,
+          rf_prior_type=constants.TREATMENT_PRIOR_TYPE_ROI,
+          media_effects_dist=constants.MEDIA_EFFECTS_LOG_NORMAL,
+          organic_media_prior_type=constants.TREATMENT_PRIOR_TYPE_CONTRIBUTION,
+          non_media_treatments_prior_type=(
+              constants.TREATMENT_PRIOR_TYPE_CONTRIBUTION
+          ),
+          unique_sigma_for_each_geo=True,
+      ),
+  )
+  def test_get_fused_joint_dist_matches_joint_dist(
+      self,
+      input_data: str,
+      media_prior_type: str,
+      rf_prior_type: str,
+      media_effects_dist: str,
+      **spec_kwargs,
+  ):
+    meridian = model.Meridian(
+        input_data=getattr(self, input_data),
+        model_spec=spec.ModelSpec(
+            media_prior_type=media_prior_type,
+            rf_prior_type=rf_prior_type,
+            media_effects_dist=media_effects_dist,
+            **spec_kwargs,
+        ),
+    )
+    sampler = meridian.posterior_sampler_callable
+    par = sampler._get_joint_dist_unpinned().sample(3, seed=[1, 2])._asdict()
+    del par["y"]
+    sampled = {
+        name: par[name] for name, _ in sampler._get_fused_prior_nodes()
+    }
+
+    fused_log_prob = sampler._get_fused_joint_dist().unnormalized_log_prob(
+        **sampled
+    )
+    _, derived = sampler._get_fused_derived_parameters(sampled)
+
+    self.assertAllClose(
+        fused_log_prob,
+        sampler._get_joint_dist().log_prob(par),
+        rtol=1e-5,
+    )
+    self.assertSameElements(list(sampled) + list(derived), par)
+    for name, value in derived.items():
+      self.assertAllClose(value, par[name], rtol=1e-4, atol=1e-4, msg=name)
+
+  def test_sample_posterior_fused_log_density_computes_derived_parameters(
+      self,
+  ):
+    meridian = model.Meridian(
+        input_data=self.short_input_data_with_media_and_rf,
+        model_spec=spec.ModelSpec(),
+    )
+    sampler = meridian.posterior_sampler_callable
+    states = sampler._get_fused_joint_dist().sample(
+        [self._N_BURNIN + self._N_KEEP, self._N_CHAINS], seed=[1, 2]
+    )
+    mock_sample_posterior = self.enter_context(
+        mock.patch.object(
+            posterior_sampler,
+            "_xla_windowed_adaptive_nuts",
+            autospec=True,
+            return_value=collections.namedtuple(
+                "StatesAndTrace", ["all_states", "trace"]
+            )(
+                all_states=states,
+                trace=self.test_trace,
+            ),
+        )
+    )
+
+    meridian.sample_posterior(
+        n_chains=self._N_CHAINS,
+        n_adapt=self._N_ADAPT,
+        n_burnin=self._N_BURNIN,
+        n_keep=self._N_KEEP,
+        use_fused_log_density=True,
+    )
+
+    _, kwargs = mock_sample_posterior.call_args
+    self.assertIsInstance(
+        kwargs["joint_dist"], posterior_sampler._FusedJointDistribution
+    )
+    posterior = meridian.inference_data.posterior
+    self.assertEqual(
+        posterior.beta_gm.shape,
+        (self._N_CHAINS, self._N_KEEP, self._N_GEOS, self._N_MEDIA_CHANNELS),
+    )
+    _, derived = sampler._get_fused_derived_parameters(
+        {k: v[self._N_BURNIN :] for k, v in states._asdict().items()}
+    )
+    for name in (constants.MU_T, constants.BETA_M, constants.BETA_GRF):
+      self.assertAllClose(
+          getattr(posterior, name), tf.einsum("ij...->ji...", derived[name])
+      )
+
+  def test_sample_posterior_fused_log_density_with_pins_raises_error(self):
+    meridian = model.Meridian(
+        input_data=self.short_input_data_with_media_and_rf,
+        model_spec=spec.ModelSpec(),
+    )
+    with self.assertRaisesRegex(ValueError, "`pins` are not supported"):
+      meridian.sample_posterior(
+          n_chains=self._N_CHAINS,
+          n_adapt=self._N_ADAPT,
+          n_burnin=self._N_BURNIN,
+          n_keep=self._N_KEEP,
+          use_fused_log_density=True,
+          sigma=tf.ones(1),
+      )
+
+  @parameterized.named_parameters(
+      dict(
+          testcase_name="log_normal",
+          media_effects_dist=constants.MEDIA_EFFECTS_LOG_NORMAL,
+      ),
+      dict(
+          testcase_name="normal",
+          media_effects_dist=constants.MEDIA_EFFECTS_NORMAL,
+      ),
+  )
+  def test_get_warm_start_state_recovers_sampled_parameters(
+      self, media_effects_dist: str
+  ):
+    meridian = model.Meridian(
+        input_data=self.short_input_data_non_media_and_organic,
+        model_spec=spec.ModelSpec(media_effects_dist=media_effects_dist),
+    )
+    sampler = meridian.posterior_sampler_callable
+    par = sampler._get_joint_dist_unpinned().sample(2, seed=[1, 2])._asdict()
+    del par["y"]
+    # One posterior draw per chain.
+    posterior = az.convert_to_inference_data(
+        {
+            name: value[:, tf.newaxis]
+            for name, value in par.items()
+            if name not in constants.UNSAVED_PARAMETERS
+        },
+        coords=meridian.create_inference_data_coords(2, 1),
+        dims=meridian.create_inference_data_dims(),
+    )
+
+    state = sampler.get_warm_start_state(posterior, n_chains=3)
+
+    self.assertSameElements(
+        state, [name for name, _ in sampler._get_fused_prior_nodes()]
+    )
+    for name, value in state.items():
+      self.assertAllClose(
+          value,
+          tf.gather(par[name], [0, 1, 0]),
+          rtol=1e-3,
+          atol=1e-3,
+          msg=name,
+      )
+
+  @parameterized.named_parameters(
+      dict(testcase_name="one_shard", n_geo_shards=1),
+      dict(testcase_name="uneven_shards", n_geo_shards=3),
+      dict(testcase_name="one_geo_per_shard", n_geo_shards=5),
+  )
+  def test_get_fused_joint_dist_geo_shards_matches_unsharded(
+      self, n_geo_shards: int
+  ):
+    meridian = model.Meridian(
+        input_data=self.short_input_data_non_media_and_organic,
+        model_spec=spec.ModelSpec(
+            organic_media_prior_type=(
+                constants.TREATMENT_PRIOR_TYPE_CONTRIBUTION
+            ),
+            unique_sigma_for_each_geo=True,
+        ),
+    )
+    sampler = meridian.posterior_sampler_callable
+    fused_joint_dist = sampler._get_fused_joint_dist()
+    params = fused_joint_dist.sample(2, seed=[1, 2])
+
+    self.assertAllClose(
+        sampler._get_fused_joint_dist(n_geo_shards).unnormalized_log_prob(
+            params
+        ),
+        fused_joint_dist.unnormalized_log_prob(params),
+        rtol=1e-5,
+    )
+
+  def test_get_geo_shards_covers_all_geos(self):
+    meridian = model.Meridian(
+        input_data=self.short_input_data_with_media_and_rf,
+        model_spec=spec.ModelSpec(),
+    )
+    geo_shards = meridian.posterior_sampler_callable._get_geo_shards(2)
+    self.assertEqual(
+        [geos for geos, _ in geo_shards],
+        [slice(0, 2), slice(2, self._N_GEOS)],
+    )
+
+  @parameterized.named_parameters(
+      dict(testcase_name="zero", n_geo_shards=0),
+      dict(testcase_name="more_than_geos", n_geo_shards=6),
+  )
+  def test_get_geo_shards_invalid_number_raises_error(self, n_geo_shards: int):
+    meridian = model.Meridian(
+        input_data=self.short_input_data_with_media_and_rf,
+        model_spec=spec.ModelSpec(),
+    )
+    with self.assertRaisesRegex(
+        ValueError, "`n_geo_shards` must be between 1 and the number of geos"
+    ):
+      meridian.posterior_sampler_callable._get_geo_shards(n_geo_shards)
+
+  def test_sample_posterior_geo_shards_uses_graph_sampler(self):
+    meridian = model.Meridian(
+        input_data=self.short_input_data_with_media_and_rf,
+        model_spec=spec.ModelSpec(),
+    )
+    states = meridian.posterior_sampler_callable._get_fused_joint_dist().sample(
+        [self._N_BURNIN + self._N_KEEP, self._N_CHAINS], seed=[1, 2]
+    )
+    mcmc = collections.namedtuple("StatesAndTrace", ["all_states", "trace"])(
+        all_states=states, trace=self.test_trace
+    )
+    mock_xla_sample_posterior = self.enter_context(
+        mock.patch.object(
+            posterior_sampler,
+            "_xla_windowed_adaptive_nuts",
+            autospec=True,
+            return_value=mcmc,
+        )
+    )
+    mock_sharded_sample_posterior = self.enter_context(
+        mock.patch.object(
+            posterior_sampler,
+            "_graph_windowed_adaptive_nuts",
+            autospec=True,
+            return_value=mcmc,
+        )
+    )
+
+    meridian.sample_posterior(
+        n_chains=self._N_CHAINS,
+        n_adapt=self._N_ADAPT,
+        n_burnin=self._N_BURNIN,
+        n_keep=self._N_KEEP,
+        n_geo_shards=2,
+    )
+
+    mock_xla_sample_posterior.assert_not_called()
+    _, kwargs = mock_sharded_sample_posterior.call_args
+    self.assertIsInstance(
+        kwargs["joint_dist"], posterior_sampler._FusedJointDistribution
+    )
+    self.assertEqual(
+        meridian.inference_data.posterior.beta_gm.shape,
+        (self._N_CHAINS, self._N_KEEP, self._N_GEOS, self._N_MEDIA_CHANNELS),
+    )
+
+  def test_sample_posterior_callbacks_report_from_graph_sampler(self):
+    meridian = model.Meridian(
+        input_data=self.short_input_data_with_media_and_rf,
+        model_spec=spec.ModelSpec(),
+    )
+    n_draws = self._N_ADAPT + self._N_BURNIN + self._N_KEEP
+    states = meridian.posterior_sampler_callable._get_fused_joint_dist().sample(
+        [n_draws, self._N_CHAINS], seed=[1, 2]
+    )
+    trace = tf.nest.map_structure(
+        lambda x: tf.concat([x[: self._N_ADAPT], x], axis=0), self.test_trace
+    )
+    mcmc = collections.namedtuple("StatesAndTrace", ["all_states", "trace"])(
+        all_states=states, trace=trace
+    )
+    mock_xla_sample_posterior = self.enter_context(
+        mock.patch.object(
+            posterior_sampler,
+            "_xla_windowed_adaptive_nuts",
+            autospec=True,
+            return_value=mcmc,
+        )
+    )
+    mock_graph_sample_posterior = self.enter_context(
+        mock.patch.object(
+            posterior_sampler,
+            "_graph_windowed_adaptive_nuts",
+            autospec=True,
+            return_value=mcmc,
+        )
+    )
+    callback = mock.create_autospec(
+        sampling_telemetry.SamplingCallback, instance=True
+    )
+
+    meridian.sample_posterior(
+        n_chains=self._N_CHAINS,
+        n_adapt=self._N_ADAPT,
+        n_burnin=self._N_BURNIN,
+        n_keep=self._N_KEEP,
+        callbacks=[callback],
+    )
+
+    mock_xla_sample_posterior.assert_not_called()
+    _, kwargs = mock_graph_sample_posterior.call_args
+    self.assertFalse(kwargs["discard_tuning"])
+    self.assertIsInstance(
+        kwargs["trace_fn"].__self__, sampling_telemetry.SamplingRecorder
+    )
+    self.assertNotIsInstance(
+        kwargs["joint_dist"], posterior_sampler._FusedJointDistribution
+    )
+    self.assertAllClose(
+        meridian.inference_data.posterior.knot_values,
+        tf.einsum("ij...->ji...", states.knot_values[-self._N_KEEP :]),
+    )
+    self.assertEqual(
+        meridian.inference_data.trace.target_log_prob.shape,
+        (self._N_CHAINS, self._N_KEEP),
+    )
+
+  def test_sample_posterior_callbacks_with_fused_log_density_uses_one_shard(
+      self,
+  ):
+    meridian = model.Meridian(
+        input_data=self.short_input_data_with_media_and_rf,
+        model_spec=spec.ModelSpec(),
+    )
+    mock_get_fused_joint_dist = self.enter_context(
+        mock.patch.object(
+            posterior_sampler.PosteriorMCMCSampler,
+            "_get_fused_joint_dist",
+            autospec=True,
+            side_effect=ValueError("stop"),
+        )
+    )
+
+    with self.assertRaisesRegex(ValueError, "stop"):
+      meridian.sample_posterior(
+          n_chains=self._N_CHAINS,
+          n_adapt=self._N_ADAPT,
+          n_burnin=self._N_BURNIN,
+          n_keep=self._N_KEEP,
+          use_fused_log_density=True,
+          callbacks=[mock.create_autospec(sampling_telemetry.SamplingCallback)],
+      )
+    mock_get_fused_joint_dist.assert_called_once_with(mock.ANY, 1)
+
+  def test_configure_logical_cpu_devices_invalid_number_raises_error(self):
+    with self.assertRaisesRegex(
+        ValueError, "number of logical CPU devices must be positive"
+    ):
+      posterior_sampler.configure_logical_cpu_devices(0)
+
 
 if __name__ == "__main__":
   absltest.main()
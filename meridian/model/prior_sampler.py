@@ -19,6 +19,8 @@ from typing import TYPE_CHECKING
 
 import arviz as az
 from meridian import constants
+from meridian.model import knots
+import numpy as np
 import tensorflow as tf
 import tensorflow_probability as tfp
 
@@ -526,11 +528,7 @@ class PriorDistributionSampler:
     }
 
     base_vars[constants.MU_T] = tfp.distributions.Deterministic(
-        tf.einsum(
-            "...k,kt->...t",
-            base_vars[constants.KNOT_VALUES],
-            tf.convert_to_tensor(mmm.knot_info.weights),
-        ),
+        knots.get_mu_t(base_vars[constants.KNOT_VALUES], mmm.knot_info),
         name=constants.MU_T,
     ).sample()
 
@@ -588,7 +586,38 @@ class PriorDistributionSampler:
         | non_media_treatments_vars
     )
 
-  def __call__(self, n_draws: int, seed: int | None = None) -> az.InferenceData:
+  def _sample_prior_in_batches(
+      self,
+      n_draws: int,
+      batch_size: int,
+      seed: int | None = None,
+  ) -> Mapping[str, np.ndarray]:
+    """Returns the prior samples, drawn in batches of at most `batch_size`.
+
+    The batch `i` is drawn with the seed `seed + i`, so that the samples only
+    depend on `seed` and `batch_size`. The samples of each batch are copied to
+    host memory before the next batch is drawn, which bounds the memory used by
+    the intermediate tensors, such as the transformed media used to compute
+    `beta_m` from ROI, mROI or contribution priors.
+    """
+    batches = []
+    for i, start in enumerate(range(0, n_draws, batch_size)):
+      batch_draws = self._sample_prior(
+          min(batch_size, n_draws - start),
+          seed=seed + i if seed is not None else None,
+      )
+      batches.append({k: v.numpy() for k, v in batch_draws.items()})
+    return {
+        k: np.concatenate([batch[k] for batch in batches], axis=1)
+        for k in batches[0]
+    }
+
+  def __call__(
+      self,
+      n_draws: int,
+      seed: int | None = None,
+      batch_size: int | None = None,
+  ) -> az.InferenceData:
     """Draws samples from prior distributions.
 
     Returns:
@@ -599,8 +628,24 @@ class PriorDistributionSampler:
       seed: Used to set the seed for reproducible results. For more information,
         see [PRNGS and seeds]
         (https://github.com/tensorflow/probability/blob/main/PRNGS.md).
+      batch_size: Optional maximum number of draws sampled at once. If
+        `n_draws` is larger, the draws are sampled in batches that are
+        concatenated, which bounds the memory used by the prior sampling.
+        Batch `i` is seeded with `seed + i`, so the samples are reproducible
+        for a given `seed` and `batch_size`, but differ from the samples drawn
+        at once. By default, all draws are sampled at once.
+
+    Raises:
+      ValueError: If `batch_size` is not positive.
     """
-    prior_draws = self._sample_prior(n_draws, seed=seed)
+    if batch_size is not None and batch_size < 1:
+      raise ValueError(f"`batch_size` must be positive, got {batch_size}.")
+    if batch_size is None or n_draws <= batch_size:
+      prior_draws = self._sample_prior(n_draws, seed=seed)
+    else:
+      prior_draws = self._sample_prior_in_batches(
+          n_draws, batch_size=batch_size, seed=seed
+      )
     # Create Arviz InferenceData for prior draws.
     prior_coords = self._meridian.create_inference_data_coords(1, n_draws)
     prior_dims = self._meridian.create_inference_data_dims()
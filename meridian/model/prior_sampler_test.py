@@ -71,6 +71,55 @@ class PriorDistributionSamplerTest(
         meridian.inference_data.prior, meridian2.inference_data.prior
     )
 
+  def test_sample_prior_in_batches_seeds_each_batch(self):
+    meridian = model.Meridian(
+        input_data=self.short_input_data_with_media_and_rf,
+        model_spec=spec.ModelSpec(),
+    )
+    meridian.sample_prior(n_draws=self._N_DRAWS, seed=1, batch_size=4)
+
+    prior = meridian.inference_data.prior
+    self.assertEqual(prior.sizes[constants.DRAW], self._N_DRAWS)
+    for i, start in enumerate(range(0, self._N_DRAWS, 4)):
+      batch = meridian.prior_sampler_callable._sample_prior(
+          min(4, self._N_DRAWS - start), seed=1 + i
+      )
+      for param in (constants.ROI_M, constants.BETA_GM, constants.MU_T):
+        self.assertAllClose(
+            prior[param].values[:, start : start + 4], batch[param]
+        )
+
+  def test_sample_prior_in_batches_same_seed(self):
+    meridians = [
+        model.Meridian(input_data=self.short_input_data_with_media_and_rf)
+        for _ in range(2)
+    ]
+    for meridian in meridians:
+      meridian.sample_prior(n_draws=self._N_DRAWS, seed=1, batch_size=3)
+    self.assertEqual(
+        meridians[0].inference_data.prior, meridians[1].inference_data.prior
+    )
+
+  def test_sample_prior_batch_size_at_least_n_draws_samples_at_once(self):
+    meridians = [
+        model.Meridian(input_data=self.short_input_data_with_media_and_rf)
+        for _ in range(2)
+    ]
+    meridians[0].sample_prior(n_draws=self._N_DRAWS, seed=1)
+    meridians[1].sample_prior(
+        n_draws=self._N_DRAWS, seed=1, batch_size=self._N_DRAWS
+    )
+    self.assertEqual(
+        meridians[0].inference_data.prior, meridians[1].inference_data.prior
+    )
+
+  def test_sample_prior_invalid_batch_size_raises_error(self):
+    meridian = model.Meridian(
+        input_data=self.short_input_data_with_media_and_rf
+    )
+    with self.assertRaisesRegex(ValueError, "`batch_size` must be positive"):
+      meridian.sample_prior(n_draws=self._N_DRAWS, batch_size=0)
+
   def test_sample_prior_media_and_rf_returns_correct_shape(self):
     self.enter_context(
         mock.patch.object(
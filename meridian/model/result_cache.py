@@ -0,0 +1,173 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cache of the analysis results of a model.
+
+Each `Meridian` model has a `ResultCache`, shared by all the `Analyzer`s of the
+model and the visualizers and optimizers built on them. The cache is disabled
+until it is given a size, for example in a notebook or a dashboard querying the
+same results repeatedly:
+
+```python
+mmm.result_cache.resize(64)
+analyzer.Analyzer(mmm).summary_metrics()  # Computed.
+visualizer.MediaSummary(mmm).summary_table()  # Reused.
+mmm.result_cache.info()
+```
+"""
+
+import collections
+from collections.abc import Callable, Hashable
+import dataclasses
+import threading
+from typing import Any
+
+
+__all__ = [
+    "CacheInfo",
+    "ResultCache",
+]
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheInfo:
+  """Statistics of a `ResultCache`.
+
+  Attributes:
+    hits: Number of results returned from the cache.
+    misses: Number of results computed while the cache was enabled.
+    invalidations: Number of times the cache was cleared because the
+      inference data of the model changed.
+    maxsize: Maximum number of cached results.
+    currsize: Number of cached results.
+  """
+
+  hits: int
+  misses: int
+  invalidations: int
+  maxsize: int
+  currsize: int
+
+
+class ResultCache:
+  """Least-recently-used cache of results computed from a model's draws.
+
+  The results are cached by key until the inference data of the model changes,
+  for example when the model is sampled again. The cache is then cleared on its
+  next use.
+  """
+
+  def __init__(
+      self, fingerprint: Callable[[], tuple[Any, ...]], maxsize: int = 0
+  ):
+    """Initializes the cache.
+
+    Args:
+      fingerprint: Function returning the objects the cached results are
+        computed from, such as the groups of the inference data. The cache is
+        cleared when any of these objects is replaced.
+      maxsize: Maximum number of cached results. `0` disables the cache.
+    """
+    self._fingerprint = fingerprint
+    self._cached_fingerprint = None
+    self._maxsize = 0
+    self._results = collections.OrderedDict()
+    self._hits = 0
+    self._misses = 0
+    self._invalidations = 0
+    self._lock = threading.Lock()
+    self.resize(maxsize)
+
+  @property
+  def maxsize(self) -> int:
+    return self._maxsize
+
+  def resize(self, maxsize: int):
+    """Sets the maximum number of cached results.
+
+    Args:
+      maxsize: Maximum number of cached results. `0` disables the cache. The
+        least recently used results beyond `maxsize` are dropped.
+
+    Raises:
+      ValueError: If `maxsize` is negative.
+    """
+    if maxsize < 0:
+      raise ValueError(f"maxsize must be non-negative, got {maxsize}.")
+    with self._lock:
+      self._maxsize = maxsize
+      while len(self._results) > maxsize:
+        self._results.popitem(last=False)
+
+  def clear(self):
+    """Drops the cached results and resets the statistics."""
+    with self._lock:
+      self._results.clear()
+      self._cached_fingerprint = None
+      self._hits = self._misses = self._invalidations = 0
+
+  def info(self) -> CacheInfo:
+    """Returns the statistics of the cache."""
+    with self._lock:
+      return CacheInfo(
+          hits=self._hits,
+          misses=self._misses,
+          invalidations=self._invalidations,
+          maxsize=self._maxsize,
+          currsize=len(self._results),
+      )
+
+  def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+    """Returns the cached result of `key`, computing it on a miss.
+
+    Args:
+      key: Key of the result, such as the canonicalized arguments of the call
+        computing it.
+      compute: Function computing the result on a miss.
+
+    Returns:
+      The result of `compute()`, possibly from an earlier call with the same
+      key. Callers must not modify it.
+    """
+    if not self._maxsize:
+      return compute()
+    fingerprint = self._fingerprint()
+    with self._lock:
+      if not self._is_current(fingerprint):
+        if self._results:
+          self._invalidations += 1
+        self._results.clear()
+        self._cached_fingerprint = fingerprint
+      if key in self._results:
+        self._hits += 1
+        self._results.move_to_end(key)
+        return self._results[key]
+      self._misses += 1
+
+    result = compute()
+    with self._lock:
+      if self._maxsize and self._is_current(fingerprint):
+        self._results[key] = result
+        while len(self._results) > self._maxsize:
+          self._results.popitem(last=False)
+    return result
+
+  def _is_current(self, fingerprint: tuple[Any, ...]) -> bool:
+    """Returns whether `fingerprint` is that of the cached results."""
+    cached = self._cached_fingerprint
+    return (
+        cached is not None
+        and len(cached) == len(fingerprint)
+        and all(a is b for a, b in zip(cached, fingerprint))
+    )
@@ -0,0 +1,84 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+from absl.testing import absltest
+from meridian.model import result_cache
+
+
+class ResultCacheTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.groups = (object(),)
+    self.cache = result_cache.ResultCache(lambda: self.groups, maxsize=2)
+
+  def test_returns_cached_result(self):
+    compute = mock.Mock(return_value="result")
+
+    self.assertEqual(self.cache.get_or_compute("key", compute), "result")
+    self.assertEqual(self.cache.get_or_compute("key", compute), "result")
+
+    compute.assert_called_once()
+    self.assertEqual(
+        self.cache.info(),
+        result_cache.CacheInfo(
+            hits=1, misses=1, invalidations=0, maxsize=2, currsize=1
+        ),
+    )
+
+  def test_evicts_least_recently_used_result(self):
+    self.cache.get_or_compute("a", lambda: 1)
+    self.cache.get_or_compute("b", lambda: 2)
+    self.cache.get_or_compute("a", lambda: 1)
+    self.cache.get_or_compute("c", lambda: 3)
+
+    compute = mock.Mock(return_value=2)
+    self.cache.get_or_compute("b", compute)
+    compute.assert_called_once()
+    self.assertEqual(self.cache.info().currsize, 2)
+
+  def test_invalidates_when_fingerprint_changes(self):
+    self.cache.get_or_compute("key", lambda: "old")
+    self.groups = (object(),)
+
+    self.assertEqual(self.cache.get_or_compute("key", lambda: "new"), "new")
+    self.assertEqual(self.cache.info().invalidations, 1)
+
+  def test_disabled_cache_always_computes(self):
+    self.cache.resize(0)
+    compute = mock.Mock(return_value="result")
+
+    self.cache.get_or_compute("key", compute)
+    self.cache.get_or_compute("key", compute)
+
+    self.assertEqual(compute.call_count, 2)
+    self.assertEqual(self.cache.info().currsize, 0)
+
+  def test_resize_drops_results_beyond_maxsize(self):
+    self.cache.get_or_compute("a", lambda: 1)
+    self.cache.get_or_compute("b", lambda: 2)
+
+    self.cache.resize(1)
+
+    self.assertEqual(self.cache.info().currsize, 1)
+
+  def test_negative_maxsize_raises_error(self):
+    with self.assertRaisesRegex(ValueError, "must be non-negative"):
+      self.cache.resize(-1)
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -0,0 +1,372 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Progress and throughput telemetry of the posterior MCMC sampling.
+
+Callbacks passed to `Meridian.sample_posterior(callbacks=...)` receive a
+`SamplingProgress` report at regular intervals while NUTS runs, for example:
+
+```python
+from meridian.model import sampling_telemetry
+
+mmm.sample_posterior(
+    n_chains=4,
+    n_adapt=500,
+    n_burnin=500,
+    n_keep=1000,
+    callbacks=[
+        sampling_telemetry.LoggingCallback(),
+        sampling_telemetry.JsonLinesCallback("/tmp/sampling.jsonl"),
+    ],
+)
+```
+"""
+
+import abc
+from collections.abc import Sequence
+import dataclasses
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any
+
+import numpy as np
+import tensorflow as tf
+import tensorflow_probability as tfp
+
+
+__all__ = [
+    "ADAPT",
+    "BURNIN",
+    "KEEP",
+    "JsonLinesCallback",
+    "LoggingCallback",
+    "PrometheusTextfileCallback",
+    "SamplingCallback",
+    "SamplingProgress",
+    "SamplingRecorder",
+]
+
+
+ADAPT = "adapt"
+BURNIN = "burnin"
+KEEP = "keep"
+
+
+@dataclasses.dataclass(frozen=True)
+class SamplingProgress:
+  """Progress report of a batch of chains sampled by NUTS.
+
+  The statistics other than the totals are computed over the steps since the
+  previous report of the same batch of chains.
+
+  Attributes:
+    chain_batch: Index of the batch of chains, see the `n_chains` argument of
+      `Meridian.sample_posterior`.
+    n_chains: Number of chains sampled in this batch.
+    phase: Sampling phase of the last step: `ADAPT`, `BURNIN` or `KEEP`.
+    step: Number of steps completed by each chain in this batch, including the
+      adaptation steps.
+    n_steps: Total number of steps of each chain in this batch.
+    elapsed_seconds: Time since the first step of this batch.
+    draws_per_second: Number of draws of all chains per second.
+    mean_leapfrog_steps: Mean number of leapfrog steps per draw.
+    mean_tree_depth: Mean depth of the NUTS trees, estimated from the number of
+      leapfrog steps per draw.
+    mean_accept_ratio: Mean acceptance probability of the proposals.
+    step_size: Mean leapfrog step size of the last step.
+    divergences: Number of divergent draws of all chains.
+    total_divergences: Number of divergent draws of all chains since the first
+      step of this batch.
+  """
+
+  chain_batch: int
+  n_chains: int
+  phase: str
+  step: int
+  n_steps: int
+  elapsed_seconds: float
+  draws_per_second: float
+  mean_leapfrog_steps: float
+  mean_tree_depth: float
+  mean_accept_ratio: float
+  step_size: float
+  divergences: int
+  total_divergences: int
+
+  def to_dict(self) -> dict[str, Any]:
+    """Returns the report as a dictionary of JSON-serializable values."""
+    return dataclasses.asdict(self)
+
+
+class SamplingCallback(abc.ABC):
+  """Receives the progress reports of the posterior sampling."""
+
+  @abc.abstractmethod
+  def on_progress(self, progress: SamplingProgress):
+    """Called with each progress report while the sampler runs."""
+    raise NotImplementedError("`on_progress` must be implemented.")
+
+
+class LoggingCallback(SamplingCallback):
+  """Logs the progress reports with the standard `logging` module."""
+
+  def __init__(
+      self, logger: logging.Logger | None = None, level: int = logging.INFO
+  ):
+    """Initializes the callback.
+
+    Args:
+      logger: Logger of the reports. Defaults to the logger of this module.
+      level: Logging level of the reports.
+    """
+    self._logger = logger or logging.getLogger(__name__)
+    self._level = level
+
+  def on_progress(self, progress: SamplingProgress):
+    self._logger.log(
+        self._level,
+        "Chain batch %d [%s] step %d/%d: %.1f draws/s, %.1f leapfrog steps"
+        " per draw, tree depth %.1f, accept ratio %.2f, step size %.3g,"
+        " %d divergences (%d total).",
+        progress.chain_batch,
+        progress.phase,
+        progress.step,
+        progress.n_steps,
+        progress.draws_per_second,
+        progress.mean_leapfrog_steps,
+        progress.mean_tree_depth,
+        progress.mean_accept_ratio,
+        progress.step_size,
+        progress.divergences,
+        progress.total_divergences,
+    )
+
+
+class JsonLinesCallback(SamplingCallback):
+  """Appends each progress report to a JSON-lines file."""
+
+  def __init__(self, path: str | os.PathLike[str]):
+    """Initializes the callback.
+
+    Args:
+      path: Path of the file. Reports are appended to it if it exists.
+    """
+    self._path = os.fspath(path)
+
+  def on_progress(self, progress: SamplingProgress):
+    with open(self._path, "a") as f:
+      f.write(json.dumps(progress.to_dict()) + "\n")
+
+
+class PrometheusTextfileCallback(SamplingCallback):
+  """Writes the last progress report in the Prometheus text format.
+
+  The file is meant for the textfile collector of the Prometheus node exporter.
+  It is replaced atomically with each report, and contains one gauge per
+  numeric statistic, labeled by chain batch and phase.
+  """
+
+  def __init__(
+      self, path: str | os.PathLike[str], prefix: str = "meridian_sampling"
+  ):
+    """Initializes the callback.
+
+    Args:
+      path: Path of the `.prom` file.
+      prefix: Prefix of the metric names.
+    """
+    self._path = os.fspath(path)
+    self._prefix = prefix
+
+  def on_progress(self, progress: SamplingProgress):
+    labels = (
+        f'chain_batch="{progress.chain_batch}",phase="{progress.phase}"'
+    )
+    lines = []
+    for name, value in progress.to_dict().items():
+      if name in ("chain_batch", "phase"):
+        continue
+      metric = f"{self._prefix}_{name}"
+      lines.append(f"# TYPE {metric} gauge")
+      lines.append(f"{metric}{{{labels}}} {value}")
+    directory = os.path.dirname(os.path.abspath(self._path))
+    with tempfile.NamedTemporaryFile(
+        "w", dir=directory, suffix=".tmp", delete=False
+    ) as f:
+      f.write("\n".join(lines) + "\n")
+    os.replace(f.name, self._path)
+
+
+class SamplingRecorder:
+  """Collects the statistics of the NUTS steps and reports them to callbacks.
+
+  `trace_fn` is passed to `windowed_adaptive_nuts` with `discard_tuning=False`,
+  so that it is called at every step, including the adaptation steps. It
+  returns the default trace of `windowed_adaptive_nuts` and sends the step
+  statistics to the host. XLA programs cannot call back to the host, so the
+  sampler must run as a `tf.function` graph rather than as an XLA program.
+  """
+
+  def __init__(
+      self,
+      callbacks: Sequence[SamplingCallback],
+      n_adapt: int,
+      n_burnin: int,
+      n_keep: int,
+      report_every: int,
+      unrolled_leapfrog_steps: int = 1,
+  ):
+    """Initializes the recorder.
+
+    Args:
+      callbacks: Callbacks that receive the progress reports.
+      n_adapt: Number of adaptation steps per chain.
+      n_burnin: Number of burn-in steps per chain.
+      n_keep: Number of kept steps per chain.
+      report_every: Number of steps between two reports. A report is also made
+        at the last step of each phase.
+      unrolled_leapfrog_steps: Number of leapfrog steps per tree node, used to
+        estimate the tree depth.
+
+    Raises:
+      ValueError: If `report_every` is not positive.
+    """
+    if report_every < 1:
+      raise ValueError(
+          f"`report_every` must be positive, got {report_every}."
+      )
+    self._callbacks = list(callbacks)
+    self._n_adapt = n_adapt
+    self._n_burnin = n_burnin
+    self._n_steps = n_adapt + n_burnin + n_keep
+    self._report_every = report_every
+    self._unrolled_leapfrog_steps = unrolled_leapfrog_steps
+    self._chain_batch = -1
+    self._n_chains = 0
+
+  def start_batch(self, n_chains: int):
+    """Resets the statistics before sampling the next batch of chains."""
+    self._chain_batch += 1
+    self._n_chains = n_chains
+    self._step = 0
+    self._start_time = None
+    self._interval_start_time = None
+    self._total_divergences = 0
+    # `windowed_adaptive_nuts` evaluates the trace function once on the initial
+    # state to allocate the trace, before the first step.
+    self._skip_next_record = True
+    self._reset_interval()
+
+  def _reset_interval(self):
+    self._interval_steps = 0
+    self._leapfrog_steps = []
+    self._accept_ratios = []
+    self._divergences = 0
+
+  def _phase(self, step: int) -> str:
+    if step <= self._n_adapt:
+      return ADAPT
+    if step <= self._n_adapt + self._n_burnin:
+      return BURNIN
+    return KEEP
+
+  def record_step(
+      self,
+      leapfrog_steps: np.ndarray,
+      accept_ratio: np.ndarray,
+      diverging: np.ndarray,
+      step_size: np.ndarray,
+  ) -> np.ndarray:
+    """Records the statistics of one step of all chains of the batch."""
+    if self._skip_next_record:
+      self._skip_next_record = False
+      return np.array(True)
+    now = time.perf_counter()
+    if self._start_time is None:
+      # The first step also includes the setup of the sampler.
+      self._start_time = now
+      self._interval_start_time = now
+    self._step += 1
+    self._interval_steps += 1
+    self._leapfrog_steps.append(np.ravel(leapfrog_steps))
+    self._accept_ratios.append(np.ravel(accept_ratio))
+    divergences = int(np.sum(diverging))
+    self._divergences += divergences
+    self._total_divergences += divergences
+
+    phase = self._phase(self._step)
+    if (
+        self._step % self._report_every == 0
+        or self._step == self._n_steps
+        or self._phase(self._step + 1) != phase
+    ):
+      self._report(phase, float(np.mean(step_size)), now)
+    return np.array(True)
+
+  def _report(self, phase: str, step_size: float, now: float):
+    leapfrog_steps = np.concatenate(self._leapfrog_steps).astype(np.float64)
+    interval_seconds = now - self._interval_start_time
+    draws = self._interval_steps * self._n_chains
+    progress = SamplingProgress(
+        chain_batch=self._chain_batch,
+        n_chains=self._n_chains,
+        phase=phase,
+        step=self._step,
+        n_steps=self._n_steps,
+        elapsed_seconds=now - self._start_time,
+        draws_per_second=(
+            draws / interval_seconds if interval_seconds > 0 else float("nan")
+        ),
+        mean_leapfrog_steps=float(np.mean(leapfrog_steps)),
+        mean_tree_depth=float(
+            np.mean(
+                np.log2(leapfrog_steps / self._unrolled_leapfrog_steps + 1)
+            )
+        ),
+        mean_accept_ratio=float(np.mean(np.concatenate(self._accept_ratios))),
+        step_size=step_size,
+        divergences=self._divergences,
+        total_divergences=self._total_divergences,
+    )
+    for callback in self._callbacks:
+      callback.on_progress(progress)
+    self._interval_start_time = now
+    self._reset_interval()
+
+  def trace_fn(self, state, bijector, is_adapting, pkr):
+    """Trace function of `windowed_adaptive_nuts` reporting to the host."""
+    trace = tfp.experimental.mcmc.windowed_sampling.default_nuts_trace_fn(
+        state, bijector, is_adapting, pkr
+    )
+    step_size = tf.reduce_mean(
+        tf.stack(
+            [tf.reduce_mean(s) for s in tf.nest.flatten(trace["step_size"])]
+        )
+    )
+    recorded = tf.numpy_function(
+        self.record_step,
+        [
+            trace["n_steps"],
+            trace["accept_ratio"],
+            trace["diverging"],
+            step_size,
+        ],
+        Tout=tf.bool,
+        stateful=True,
+    )
+    with tf.control_dependencies([recorded]):
+      return tf.nest.map_structure(tf.identity, trace)
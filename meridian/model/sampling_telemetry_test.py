@@ -0,0 +1,225 @@
+# Copyright 2024 The Meridian Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+
+from absl import flags
+from absl.testing import absltest
+from meridian.model import sampling_telemetry
+import numpy as np
+import tensorflow as tf
+import tensorflow_probability as tfp
+
+
+tfd = tfp.distributions
+
+_N_ADAPT = 6
+_N_BURNIN = 3
+_N_KEEP = 5
+_N_CHAINS = 2
+
+
+class _RecordingCallback(sampling_telemetry.SamplingCallback):
+
+  def __init__(self):
+    self.reports = []
+
+  def on_progress(self, progress: sampling_telemetry.SamplingProgress):
+    self.reports.append(progress)
+
+
+def _progress(**kwargs) -> sampling_telemetry.SamplingProgress:
+  values = dict(
+      chain_batch=0,
+      n_chains=_N_CHAINS,
+      phase=sampling_telemetry.KEEP,
+      step=10,
+      n_steps=14,
+      elapsed_seconds=2.0,
+      draws_per_second=10.0,
+      mean_leapfrog_steps=7.0,
+      mean_tree_depth=3.0,
+      mean_accept_ratio=0.8,
+      step_size=0.1,
+      divergences=1,
+      total_divergences=2,
+  )
+  values.update(kwargs)
+  return sampling_telemetry.SamplingProgress(**values)
+
+
+class SamplingRecorderTest(absltest.TestCase):
+
+  def _record_steps(self, recorder, n_steps, diverging=False):
+    # The first record is the allocation of the trace on the initial state.
+    for _ in range(n_steps + 1):
+      recorder.record_step(
+          leapfrog_steps=np.array([3, 7]),
+          accept_ratio=np.array([0.5, 1.0]),
+          diverging=np.array([diverging, False]),
+          step_size=np.array(0.25),
+      )
+
+  def test_record_step_reports_at_interval_and_phase_ends(self):
+    callback = _RecordingCallback()
+    recorder = sampling_telemetry.SamplingRecorder(
+        [callback], _N_ADAPT, _N_BURNIN, _N_KEEP, report_every=4
+    )
+    recorder.start_batch(_N_CHAINS)
+    self._record_steps(recorder, _N_ADAPT + _N_BURNIN + _N_KEEP)
+
+    self.assertEqual(
+        [(report.phase, report.step) for report in callback.reports],
+        [
+            (sampling_telemetry.ADAPT, 4),
+            (sampling_telemetry.ADAPT, 6),
+            (sampling_telemetry.BURNIN, 8),
+            (sampling_telemetry.BURNIN, 9),
+            (sampling_telemetry.KEEP, 12),
+            (sampling_telemetry.KEEP, 14),
+        ],
+    )
+    report = callback.reports[0]
+    self.assertEqual(report.n_steps, 14)
+    self.assertEqual(report.n_chains, _N_CHAINS)
+    self.assertEqual(report.mean_leapfrog_steps, 5.0)
+    self.assertEqual(report.mean_tree_depth, 2.5)
+    self.assertEqual(report.mean_accept_ratio, 0.75)
+    self.assertEqual(report.step_size, 0.25)
+    self.assertGreater(report.draws_per_second, 0.0)
+
+  def test_record_step_counts_divergences(self):
+    callback = _RecordingCallback()
+    recorder = sampling_telemetry.SamplingRecorder(
+        [callback], _N_ADAPT, _N_BURNIN, _N_KEEP, report_every=4
+    )
+    recorder.start_batch(_N_CHAINS)
+    self._record_steps(recorder, 6, diverging=True)
+
+    self.assertEqual(
+        [report.divergences for report in callback.reports], [4, 2]
+    )
+    self.assertEqual(
+        [report.total_divergences for report in callback.reports], [4, 6]
+    )
+
+  def test_start_batch_resets_statistics(self):
+    callback = _RecordingCallback()
+    recorder = sampling_telemetry.SamplingRecorder(
+        [callback], _N_ADAPT, _N_BURNIN, _N_KEEP, report_every=100
+    )
+    for n_chains in (1, 3):
+      recorder.start_batch(n_chains)
+      self._record_steps(recorder, _N_ADAPT + _N_BURNIN + _N_KEEP)
+
+    self.assertEqual(
+        [(report.chain_batch, report.n_chains) for report in callback.reports],
+        [(0, 1)] * 3 + [(1, 3)] * 3,
+    )
+    self.assertEqual(
+        [report.step for report in callback.reports], [6, 9, 14] * 2
+    )
+
+  def test_invalid_report_every_raises_error(self):
+    with self.assertRaisesRegex(ValueError, "`report_every` must be positive"):
+      sampling_telemetry.SamplingRecorder(
+          [], _N_ADAPT, _N_BURNIN, _N_KEEP, report_every=0
+      )
+
+  def test_trace_fn_reports_from_windowed_adaptive_nuts(self):
+    callback = _RecordingCallback()
+    recorder = sampling_telemetry.SamplingRecorder(
+        [callback], _N_ADAPT, _N_BURNIN, _N_KEEP, report_every=4
+    )
+    joint_dist = tfd.JointDistributionNamed(
+        dict(a=tfd.Normal(0.0, 1.0), b=tfd.Sample(tfd.Normal(0.0, 2.0), 3))
+    )
+    recorder.start_batch(_N_CHAINS)
+    mcmc = tf.function(
+        tfp.experimental.mcmc.windowed_adaptive_nuts, autograph=False
+    )(
+        n_draws=_N_BURNIN + _N_KEEP,
+        joint_dist=joint_dist,
+        n_chains=_N_CHAINS,
+        num_adaptation_steps=_N_ADAPT,
+        trace_fn=recorder.trace_fn,
+        discard_tuning=False,
+        seed=[1, 2],
+    )
+
+    self.assertEqual(
+        mcmc.trace["n_steps"].shape,
+        (_N_ADAPT + _N_BURNIN + _N_KEEP, _N_CHAINS),
+    )
+    self.assertEqual(
+        [report.step for report in callback.reports], [4, 6, 8, 9, 12, 14]
+    )
+    self.assertEqual(
+        [report.phase for report in callback.reports],
+        [sampling_telemetry.ADAPT] * 2
+        + [sampling_telemetry.BURNIN] * 2
+        + [sampling_telemetry.KEEP] * 2,
+    )
+
+
+class CallbacksTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    # create_tempdir() uses the --test_tmpdir flag, which is not marked as
+    # parsed when running with pytest.
+    flags.FLAGS.mark_as_parsed()
+
+  def test_logging_callback(self):
+    with self.assertLogs(sampling_telemetry.__name__, level="INFO") as logs:
+      sampling_telemetry.LoggingCallback().on_progress(_progress())
+    self.assertLen(logs.output, 1)
+    self.assertIn(
+        "Chain batch 0 [keep] step 10/14: 10.0 draws/s", logs.output[0]
+    )
+
+  def test_json_lines_callback_appends_reports(self):
+    path = os.path.join(self.create_tempdir().full_path, "sampling.jsonl")
+    callback = sampling_telemetry.JsonLinesCallback(path)
+    callback.on_progress(_progress(step=4))
+    callback.on_progress(_progress(step=8))
+
+    with open(path) as f:
+      reports = [json.loads(line) for line in f]
+    self.assertEqual([report["step"] for report in reports], [4, 8])
+    self.assertEqual(reports[0], _progress(step=4).to_dict())
+
+  def test_prometheus_textfile_callback_replaces_file(self):
+    path = os.path.join(self.create_tempdir().full_path, "sampling.prom")
+    callback = sampling_telemetry.PrometheusTextfileCallback(path)
+    callback.on_progress(_progress(step=4))
+    callback.on_progress(_progress(step=8))
+
+    with open(path) as f:
+      lines = f.read().splitlines()
+    self.assertIn("# TYPE meridian_sampling_step gauge", lines)
+    self.assertIn(
+        'meridian_sampling_step{chain_batch="0",phase="keep"} 8', lines
+    )
+    self.assertNotIn(
+        'meridian_sampling_step{chain_batch="0",phase="keep"} 4', lines
+    )
+    self.assertEqual(
+        os.listdir(os.path.dirname(path)), [os.path.basename(path)]
+    )
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -15,6 +15,9 @@
 """Contains data transformers for various inputs of the Meridian model."""
 
 import abc
+import collections
+from collections.abc import Iterable, Iterator
+from meridian.model import compilation
 import numpy as np
 import tensorflow as tf
 
@@ -27,6 +30,151 @@ __all__ = [
 ]
 
 
+# Default relative accuracy of the media medians estimated from geo shards.
+DEFAULT_MEDIAN_RELATIVE_ACCURACY = 1e-3
+
+
+def _population_scaled_shards(
+    shards: Iterable[np.ndarray], population: tf.Tensor
+) -> Iterator[np.ndarray]:
+  """Yields each geo shard divided by the population of its geos.
+
+  Args:
+    shards: Consecutive geo slices, in geo order, of an array whose first
+      dimension is `n_geos`.
+    population: A tensor of dimension `(n_geos,)`.
+
+  Yields:
+    Float64 arrays of the population-scaled shards, with zeros for the geos of
+    zero population.
+
+  Raises:
+    ValueError: If the shards do not cover the `n_geos` geos.
+  """
+  population = np.asarray(population, dtype=np.float64)
+  start = 0
+  for shard in shards:
+    shard = np.asarray(shard, dtype=np.float64)
+    stop = start + shard.shape[0]
+    if stop > len(population):
+      raise ValueError(
+          f"The geo shards have more geos than the {len(population)} of the"
+          " population."
+      )
+    shard_population = population[start:stop].reshape(
+        (-1,) + (1,) * (shard.ndim - 1)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+      scaled = np.where(shard_population == 0, 0.0, shard / shard_population)
+    yield scaled
+    start = stop
+  if start != len(population):
+    raise ValueError(
+        f"The geo shards have {start} geos, expected {len(population)}."
+    )
+
+
+def _sketch_median(bucket_counts: collections.Counter, gamma: float) -> float:
+  """Returns the median of the values counted in logarithmic buckets."""
+  if not bucket_counts:
+    return np.nan
+  buckets = np.array(sorted(bucket_counts))
+  cumulative_counts = np.cumsum([bucket_counts[b] for b in buckets])
+  n = cumulative_counts[-1]
+  # The two middle ranks, averaged as in `np.median`.
+  ranks = np.array([(n - 1) // 2, n // 2])
+  middle_buckets = buckets[np.searchsorted(cumulative_counts, ranks, "right")]
+  return float(np.mean(2 * gamma**middle_buckets / (gamma + 1)))
+
+
+def _sketched_population_scaled_median(
+    media_shards: Iterable[np.ndarray],
+    population: tf.Tensor,
+    relative_accuracy: float,
+) -> tf.Tensor:
+  """Estimates per-channel medians of positive population-scaled media.
+
+  The positive scaled values of each shard are counted in logarithmic buckets
+  `(gamma**(i - 1), gamma**i]`, with `gamma = (1 + a) / (1 - a)` for the
+  relative accuracy `a`, as in DDSketch. Each bucket is represented by the
+  value within a relative error `a` of all of its values, so the estimated
+  medians are within a relative error `a` of the exact `np.nanmedian` of the
+  nonzero values. Only the bucket counts are kept between shards: their number
+  is at most `log(max / min) / log(gamma)` per channel, for the range of the
+  scaled values, whatever the number of geos.
+
+  Args:
+    media_shards: Consecutive geo slices, in geo order, of the non-negative
+      media of dimension `(n_geos, n_media_times, n_media_channels)`.
+    population: A tensor of dimension `(n_geos,)`.
+    relative_accuracy: Relative accuracy `a` of the medians, between zero and
+      one.
+
+  Returns:
+    A tensor of dimension `(n_media_channels,)` with the medians, `nan` for the
+    channels without positive values.
+  """
+  if not 0 < relative_accuracy < 1:
+    raise ValueError(
+        "The relative accuracy must be between zero and one, got"
+        f" {relative_accuracy}."
+    )
+  gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+  log_gamma = np.log(gamma)
+  channel_bucket_counts = None
+  for scaled in _population_scaled_shards(media_shards, population):
+    if channel_bucket_counts is None:
+      channel_bucket_counts = [
+          collections.Counter() for _ in range(scaled.shape[-1])
+      ]
+    for channel, bucket_counts in enumerate(channel_bucket_counts):
+      values = scaled[..., channel]
+      buckets, counts = np.unique(
+          np.ceil(np.log(values[values > 0]) / log_gamma).astype(np.int64),
+          return_counts=True,
+      )
+      bucket_counts.update(dict(zip(buckets.tolist(), counts.tolist())))
+  return tf.convert_to_tensor(
+      [_sketch_median(counts, gamma) for counts in channel_bucket_counts or []],
+      dtype=tf.float32,
+  )
+
+
+def _population_scaled_moments(
+    kpi_shards: Iterable[np.ndarray], population: tf.Tensor
+) -> tuple[tf.Tensor, tf.Tensor]:
+  """Computes the mean and stdev of population-scaled KPI shard by shard.
+
+  The per-shard counts, means and sums of squared deviations are combined with
+  the parallel variance update of Chan et al., which is numerically stable for
+  any number of shards. Only one shard is held at a time.
+
+  Args:
+    kpi_shards: Consecutive geo slices, in geo order, of the KPI of dimension
+      `(n_geos, n_times)`.
+    population: A tensor of dimension `(n_geos,)`.
+
+  Returns:
+    A tuple of the mean and the population standard deviation.
+  """
+  count, mean, m2 = 0, 0.0, 0.0
+  for scaled in _population_scaled_shards(kpi_shards, population):
+    if not scaled.size:
+      continue
+    shard_count = scaled.size
+    shard_mean = scaled.mean()
+    shard_m2 = np.sum(np.square(scaled - shard_mean))
+    total = count + shard_count
+    delta = shard_mean - mean
+    mean += delta * shard_count / total
+    m2 += shard_m2 + np.square(delta) * count * shard_count / total
+    count = total
+  return (
+      tf.constant(mean, dtype=tf.float32),
+      tf.constant(np.sqrt(m2 / count), dtype=tf.float32),
+  )
+
+
 class TensorTransformer(abc.ABC):
   """Abstract class for data transformers."""
 
@@ -50,11 +198,7 @@ class MediaTransformer(TensorTransformer):
   data, normalized by the geo population.
   """
 
-  def __init__(
-      self,
-      media: tf.Tensor,
-      population: tf.Tensor,
-  ):
+  def __init__(self, media: tf.Tensor, population: tf.Tensor):
     """`MediaTransformer` constructor.
 
     Args:
@@ -82,16 +226,59 @@ class MediaTransformer(TensorTransformer):
         "g,m->gm", population, self._population_scaled_median_m
     )
 
+  @classmethod
+  def from_geo_shards(
+      cls,
+      media_shards: Iterable[np.ndarray],
+      population: tf.Tensor,
+      relative_accuracy: float = DEFAULT_MEDIAN_RELATIVE_ACCURACY,
+  ) -> "MediaTransformer":
+    """Builds a `MediaTransformer` from consecutive geo shards of the media.
+
+    The shards are read one at a time, for example from
+    `InputData.iter_cached_geo_shards()`, and the medians are estimated in
+    memory that does not grow with the number of geos. Unlike the constructor,
+    which computes the exact medians, the medians are within
+    `relative_accuracy` of the exact ones.
+
+    Args:
+      media_shards: Consecutive geo slices, in geo order, of the media data of
+        dimension `(n_geos, n_media_times, n_media_channels)`.
+      population: A tensor of dimension `(n_geos,)` containing the population
+        of each geo.
+      relative_accuracy: Maximum relative error of the estimated medians.
+
+    Returns:
+      The `MediaTransformer`.
+
+    Raises:
+      ValueError: If the shards do not cover the geos of `population`, or if
+        `relative_accuracy` is not between zero and one.
+    """
+    population = tf.convert_to_tensor(population, dtype=tf.float32)
+    transformer = cls.__new__(cls)
+    transformer._population_scaled_median_m = (
+        _sketched_population_scaled_median(
+            media_shards, population, relative_accuracy
+        )
+    )
+    transformer._scale_factors_gm = tf.einsum(
+        "g,m->gm", population, transformer._population_scaled_median_m
+    )
+    return transformer
+
   @property
   def population_scaled_median_m(self):
     return self._population_scaled_median_m
 
   @tf.function(jit_compile=True)
+  @compilation.count_traces
   def forward(self, tensor: tf.Tensor) -> tf.Tensor:
     """Scales a given tensor using the stored scale factors."""
     return tensor / self._scale_factors_gm[:, tf.newaxis, :]
 
   @tf.function(jit_compile=True)
+  @compilation.count_traces
   def inverse(self, tensor: tf.Tensor) -> tf.Tensor:
     """Scales a given tensor using the inversed stored scale factors."""
     return tensor * self._scale_factors_gm[:, tf.newaxis, :]
@@ -140,6 +327,7 @@ class CenteringAndScalingTransformer(TensorTransformer):
       self._stdevs = tf.math.reduce_std(tensor, axis=(0, 1))
 
   @tf.function(jit_compile=True)
+  @compilation.count_traces
   def forward(
       self, tensor: tf.Tensor, apply_population_scaling: bool = True
   ) -> tf.Tensor:
@@ -159,6 +347,7 @@ class CenteringAndScalingTransformer(TensorTransformer):
     return tf.math.divide_no_nan(tensor - self._means, self._stdevs)
 
   @tf.function(jit_compile=True)
+  @compilation.count_traces
   def inverse(self, tensor: tf.Tensor) -> tf.Tensor:
     """Scales back a given tensor using the stored coefficients."""
     scaled_tensor = tensor * self._stdevs + self._means
@@ -176,11 +365,7 @@ class KpiTransformer(TensorTransformer):
   by mean and standard deviation of KPI.
   """
 
-  def __init__(
-      self,
-      kpi: tf.Tensor,
-      population: tf.Tensor,
-  ):
+  def __init__(self, kpi: tf.Tensor, population: tf.Tensor):
     """`KpiTransformer` constructor.
 
     Args:
@@ -196,6 +381,36 @@ class KpiTransformer(TensorTransformer):
     self._population_scaled_mean = tf.reduce_mean(population_scaled_kpi)
     self._population_scaled_stdev = tf.math.reduce_std(population_scaled_kpi)
 
+  @classmethod
+  def from_geo_shards(
+      cls, kpi_shards: Iterable[np.ndarray], population: tf.Tensor
+  ) -> "KpiTransformer":
+    """Builds a `KpiTransformer` from consecutive geo shards of the KPI.
+
+    The shards are read one at a time, for example from
+    `InputData.iter_cached_geo_shards()`, and the mean and stddev are merged
+    across shards, so the memory does not grow with the number of geos.
+
+    Args:
+      kpi_shards: Consecutive geo slices, in geo order, of the KPI data of
+        dimension `(n_geos, n_times)`.
+      population: A tensor of dimension `(n_geos,)` containing the population
+        of each geo.
+
+    Returns:
+      The `KpiTransformer`.
+
+    Raises:
+      ValueError: If the shards do not cover the geos of `population`.
+    """
+    transformer = cls.__new__(cls)
+    transformer._population = tf.convert_to_tensor(population, dtype=tf.float32)
+    (
+        transformer._population_scaled_mean,
+        transformer._population_scaled_stdev,
+    ) = _population_scaled_moments(kpi_shards, population)
+    return transformer
+
   @property
   def population_scaled_mean(self):
     return self._population_scaled_mean
@@ -205,6 +420,7 @@ class KpiTransformer(TensorTransformer):
     return self._population_scaled_stdev
 
   @tf.function(jit_compile=True)
+  @compilation.count_traces
   def forward(self, tensor: tf.Tensor) -> tf.Tensor:
     """Scales a given tensor using the stored coefficients."""
     return tf.math.divide_no_nan(
@@ -214,6 +430,7 @@ class KpiTransformer(TensorTransformer):
     )
 
   @tf.function(jit_compile=True)
+  @compilation.count_traces
   def inverse(self, tensor: tf.Tensor) -> tf.Tensor:
     """Scales back a given tensor using the stored coefficients."""
     return (
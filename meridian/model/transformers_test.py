@@ -12,7 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import tracemalloc
+
+from absl import flags
 from absl.testing import absltest
+from meridian.data import input_data
+from meridian.data import test_utils
 from meridian.model import transformers
 import numpy as np
 import tensorflow as tf
@@ -79,6 +85,92 @@ class MediaTransformerTest(absltest.TestCase):
     )
     tf.debugging.assert_near(median, np.ones(self._n_media_channels))
 
+  def test_from_geo_shards_matches_exact_median(self):
+    media = tf.tensor_scatter_nd_update(
+        self._media1, [[0, 0, 0], [1, 2, 1]], [0.0, 0.0]
+    )
+    transformer = transformers.MediaTransformer(
+        media=media, population=self._population
+    )
+
+    sharded_transformer = transformers.MediaTransformer.from_geo_shards(
+        (media[start : start + 3] for start in range(0, self._n_geos, 3)),
+        population=self._population,
+        relative_accuracy=1e-4,
+    )
+
+    np.testing.assert_allclose(
+        sharded_transformer.population_scaled_median_m,
+        transformer.population_scaled_median_m,
+        rtol=1e-4,
+    )
+    np.testing.assert_allclose(
+        sharded_transformer.forward(self._media2),
+        transformer.forward(self._media2),
+        rtol=1e-4,
+    )
+
+  def test_from_geo_shards_of_cached_input_data(self):
+    data = test_utils.sample_input_data_revenue(
+        n_geos=5, n_times=8, n_media_times=10, n_media_channels=2
+    )
+    # create_tempdir() uses the --test_tmpdir flag, which is not marked as
+    # parsed when running with pytest.
+    flags.FLAGS.mark_as_parsed()
+    path = os.path.join(self.create_tempdir().full_path, "data.nc")
+    data.save(path, geo_chunk_size=2)
+    population = tf.convert_to_tensor(data.population, dtype=tf.float32)
+    transformer = transformers.MediaTransformer(
+        media=tf.convert_to_tensor(data.media, dtype=tf.float32),
+        population=population,
+    )
+
+    sharded_transformer = transformers.MediaTransformer.from_geo_shards(
+        (
+            shard.media.values
+            for shard in input_data.InputData.iter_cached_geo_shards(path, 2)
+        ),
+        population=population,
+    )
+
+    np.testing.assert_allclose(
+        sharded_transformer.population_scaled_median_m,
+        transformer.population_scaled_median_m,
+        rtol=transformers.DEFAULT_MEDIAN_RELATIVE_ACCURACY,
+    )
+
+  def test_from_geo_shards_memory_does_not_grow_with_n_geos(self):
+    shard_shape = (10, 100, self._n_media_channels)
+
+    def _peak_memory(n_geos: int) -> int:
+      rng = np.random.default_rng(0)
+      shards = (
+          rng.uniform(1.0, 2.0, size=shard_shape)
+          for _ in range(n_geos // shard_shape[0])
+      )
+      population = np.ones(n_geos, dtype=np.float32)
+      tracemalloc.start()
+      try:
+        transformers.MediaTransformer.from_geo_shards(shards, population)
+        return tracemalloc.get_traced_memory()[1]
+      finally:
+        tracemalloc.stop()
+
+    small = _peak_memory(100)
+    large = _peak_memory(2000)
+
+    # Only the population grows with the number of geos. The dense media of
+    # 2000 geos alone would take 20 times the media of 100 geos.
+    self.assertLess(large, 1.5 * small)
+
+  def test_from_geo_shards_missing_geos_fails(self):
+    with self.assertRaisesRegex(
+        ValueError, "The geo shards have 3 geos, expected 4."
+    ):
+      transformers.MediaTransformer.from_geo_shards(
+          [self._media1[:3]], population=self._population
+      )
+
 
 class CenteringAndScalingTransformerTest(absltest.TestCase):
 
@@ -254,6 +346,27 @@ class KpiTransformerTest(absltest.TestCase):
         message="`inverse(forward(kpi))` not equal to `kpi`.",
     )
 
+  def test_from_geo_shards_matches_unsharded(self):
+    transformer = transformers.KpiTransformer(
+        kpi=self._kpi1, population=self._population
+    )
+
+    sharded_transformer = transformers.KpiTransformer.from_geo_shards(
+        (self._kpi1[start : start + 2] for start in range(0, self._n_geos, 2)),
+        population=self._population,
+    )
+
+    tf.debugging.assert_near(
+        sharded_transformer.population_scaled_mean,
+        transformer.population_scaled_mean,
+    )
+    tf.debugging.assert_near(
+        sharded_transformer.population_scaled_stdev,
+        transformer.population_scaled_stdev,
+    )
+    tf.debugging.assert_near(
+        sharded_transformer.forward(self._kpi2), transformer.forward(self._kpi2)
+    )
 
 if __name__ == "__main__":
   absltest.main()
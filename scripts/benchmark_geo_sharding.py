@@ -0,0 +1,98 @@
+"""Benchmarks the geo-sharded log-likelihood of ``Meridian.sample_posterior``.
+
+Splits the CPU into logical devices and reports the fastest value-and-gradient
+evaluation of the NUTS target for each number of geo shards
+(``n_geo_shards``), as evaluated by the graph-mode sampler:
+
+    python scripts/benchmark_geo_sharding.py --n-geos 64 --shards 1,2,4,8,16,32
+"""
+
+import argparse
+import time
+
+from meridian.model import posterior_sampler
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the geo-sharded Meridian log-likelihood"
+    )
+    parser.add_argument("--n-geos", type=int, default=64)
+    parser.add_argument("--n-times", type=int, default=104)
+    parser.add_argument("--n-media-channels", type=int, default=5)
+    parser.add_argument("--n-rf-channels", type=int, default=2)
+    parser.add_argument("--n-chains", type=int, default=4)
+    parser.add_argument(
+        "--shards",
+        default="1,2,4,8,16,32",
+        help="Comma-separated numbers of geo shards (default 1,2,4,8,16,32)",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=10,
+        help="Number of timed evaluations; the fastest is reported",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    shard_counts = [int(n) for n in args.shards.split(",")]
+    # Logical devices must be configured before TensorFlow creates any tensor.
+    devices = posterior_sampler.configure_logical_cpu_devices(max(shard_counts))
+
+    # pylint: disable=g-import-not-at-top
+    import tensorflow as tf
+    import tensorflow_probability as tfp
+    from meridian.data import test_utils
+    from meridian.model import model
+    from meridian.model import spec
+
+    # pylint: enable=g-import-not-at-top
+
+    data = test_utils.sample_input_data_revenue(
+        n_geos=args.n_geos,
+        n_times=args.n_times,
+        n_media_times=args.n_times,
+        n_media_channels=args.n_media_channels,
+        n_rf_channels=args.n_rf_channels,
+    )
+    mmm = model.Meridian(input_data=data, model_spec=spec.ModelSpec())
+    sampler = mmm.posterior_sampler_callable
+    params = sampler._get_fused_joint_dist().sample(args.n_chains, seed=[0, 0])
+
+    print(
+        f"n_geos={args.n_geos} n_times={args.n_times}"
+        f" n_media_channels={args.n_media_channels}"
+        f" n_rf_channels={args.n_rf_channels} n_chains={args.n_chains}"
+        f" logical_cpus={len(devices)}"
+    )
+    print(f"{'shards':>6} {'grad (ms)':>10} {'speedup':>8}")
+    baseline = None
+    for n_geo_shards in shard_counts:
+        joint_dist = sampler._get_fused_joint_dist(n_geo_shards)
+        bijector = joint_dist.experimental_default_event_space_bijector()
+
+        def target_log_prob(*unconstrained, joint_dist=joint_dist, bijector=bijector):
+            return joint_dist.unnormalized_log_prob(
+                bijector.forward(unconstrained)
+            ) + bijector.forward_log_det_jacobian(unconstrained)
+
+        fn = tf.function(
+            lambda x, f=target_log_prob: tfp.math.value_and_gradient(f, x),
+            autograph=False,
+        )
+        unconstrained = bijector.inverse(params)
+        tf.nest.map_structure(lambda x: x.numpy(), fn(unconstrained))
+        best = float("inf")
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            tf.nest.map_structure(lambda x: x.numpy(), fn(unconstrained))
+            best = min(best, time.perf_counter() - start)
+        baseline = baseline or best
+        print(f"{n_geo_shards:>6} {best * 1e3:10.3f} {baseline / best:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
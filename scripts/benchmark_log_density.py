@@ -0,0 +1,114 @@
+"""Benchmarks the posterior log-density used by ``Meridian.sample_posterior``.
+
+Reports the XLA compile time and the fastest value-and-gradient evaluation of
+the NUTS target for the coroutine joint distribution and for the fused
+log-density (``use_fused_log_density=True``) on synthetic revenue data:
+
+    python scripts/benchmark_log_density.py --n-geos 50 --n-times 104
+"""
+
+import argparse
+import time
+
+import tensorflow as tf
+import tensorflow_probability as tfp
+
+from meridian.data import test_utils
+from meridian.model import model
+from meridian.model import spec
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Meridian posterior log-density gradient"
+    )
+    parser.add_argument("--n-geos", type=int, default=50)
+    parser.add_argument("--n-times", type=int, default=104)
+    parser.add_argument("--n-media-channels", type=int, default=5)
+    parser.add_argument("--n-rf-channels", type=int, default=2)
+    parser.add_argument(
+        "--n-chains",
+        type=int,
+        default=4,
+        help="Number of chains evaluated in one call (default 4)",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=20,
+        help="Number of timed evaluations; the fastest is reported",
+    )
+    return parser.parse_args()
+
+
+def _value_and_gradient_fn(joint_dist):
+    """Returns the compiled target of NUTS and its gradient.
+
+    As in ``windowed_adaptive_nuts``, the target is the unnormalized
+    log-density of the constrained parameters plus the log-determinant of the
+    Jacobian of the default event space bijector.
+    """
+
+    bijector = joint_dist.experimental_default_event_space_bijector()
+
+    def target_log_prob(*unconstrained):
+        return joint_dist.unnormalized_log_prob(
+            bijector.forward(unconstrained)
+        ) + bijector.forward_log_det_jacobian(unconstrained)
+
+    @tf.function(autograph=False, jit_compile=True)
+    def fn(unconstrained):
+        return tfp.math.value_and_gradient(target_log_prob, unconstrained)
+
+    return fn, bijector
+
+
+def _time(joint_dist, params, repeats: int) -> tuple[float, float]:
+    """Returns the compile time and the fastest evaluation time in seconds."""
+
+    fn, bijector = _value_and_gradient_fn(joint_dist)
+    unconstrained = bijector.inverse(params)
+    start = time.perf_counter()
+    tf.nest.map_structure(lambda x: x.numpy(), fn(unconstrained))
+    compile_time = time.perf_counter() - start
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        tf.nest.map_structure(lambda x: x.numpy(), fn(unconstrained))
+        best = min(best, time.perf_counter() - start)
+    return compile_time, best
+
+
+def main() -> None:
+    args = parse_args()
+    data = test_utils.sample_input_data_revenue(
+        n_geos=args.n_geos,
+        n_times=args.n_times,
+        n_media_times=args.n_times,
+        n_media_channels=args.n_media_channels,
+        n_rf_channels=args.n_rf_channels,
+    )
+    mmm = model.Meridian(input_data=data, model_spec=spec.ModelSpec())
+    sampler = mmm.posterior_sampler_callable
+
+    joint_dist = sampler._get_joint_dist()
+    fused_joint_dist = sampler._get_fused_joint_dist()
+    params = joint_dist.sample_unpinned(args.n_chains, seed=[0, 0])
+    fused_params = fused_joint_dist.sample(args.n_chains, seed=[0, 0])
+
+    print(
+        f"n_geos={args.n_geos} n_times={args.n_times}"
+        f" n_media_channels={args.n_media_channels}"
+        f" n_rf_channels={args.n_rf_channels} n_chains={args.n_chains}"
+    )
+    print(f"{'backend':<10} {'compile (s)':>12} {'grad (ms)':>10}")
+    for name, dist, value in (
+        ("coroutine", joint_dist, params),
+        ("fused", fused_joint_dist, fused_params),
+    ):
+        compile_time, seconds = _time(dist, value, args.repeats)
+        print(f"{name:<10} {compile_time:12.2f} {seconds * 1e3:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmarks the ``merge_inputs`` pipeline on scaled-up ``haceb/total`` data.
+
+The media and extra feature exports are replicated once per synthetic geo, so
+a scale of 100 turns the national ``haceb/total`` files into a 100-geo panel.
+Each stage of the merge pipeline is timed separately:
+
+    python scripts/benchmark_merge_inputs.py --scale 100
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from scripts import merge_inputs
+
+
+_DATA_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "haceb", "total")
+_DATE_COLUMN = "fecha"
+_DATE_FORMAT = "%d/%m/%y"
+_SEP = ";"
+_DECIMAL = ","
+_THOUSANDS = "."
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark merge_inputs on scaled-up haceb/total inputs"
+    )
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=100,
+        help="Number of synthetic geos the inputs are replicated to (default 100)",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Number of timed runs per stage; the fastest is reported",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Rows read at a time by load_table (default: one pass)",
+    )
+    return parser.parse_args()
+
+
+def _write_scaled_copy(name: str, scale: int, output_dir: str) -> str:
+    """Writes ``scale`` copies of an input file, one per numeric geo id."""
+
+    df = pd.read_csv(
+        os.path.join(_DATA_DIR, name),
+        sep=_SEP,
+        dtype=str,
+        encoding="utf-8-sig",
+    )
+    scaled = pd.concat(
+        [df.assign(geo=str(geo)) for geo in range(scale)], ignore_index=True
+    )
+    path = os.path.join(output_dir, name)
+    scaled.to_csv(path, sep=_SEP, index=False)
+    return path
+
+
+def _best_time(fn, repeats: int):
+    """Returns the result of ``fn`` and its fastest wall time in seconds."""
+
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main() -> None:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        media_path = _write_scaled_copy("media_consolidada.csv", args.scale, tmp_dir)
+        extra_path = _write_scaled_copy("extra_data.csv", args.scale, tmp_dir)
+
+        def _load(path):
+            df = merge_inputs.load_table(
+                path,
+                _SEP,
+                _DECIMAL,
+                _DATE_COLUMN,
+                _THOUSANDS,
+                chunksize=args.chunksize,
+            )
+            df[_DATE_COLUMN] = pd.to_datetime(
+                df[_DATE_COLUMN], format=_DATE_FORMAT
+            ).dt.strftime("%Y-%m-%d")
+            return df.drop_duplicates(subset=[_DATE_COLUMN, "geo"])
+
+        media_df, load_media = _best_time(lambda: _load(media_path), args.repeats)
+        extra_df, load_extra = _best_time(lambda: _load(extra_path), args.repeats)
+        merged = pd.merge(media_df, extra_df, on=[_DATE_COLUMN, "geo"], how="inner")
+        weekly, aggregate = _best_time(
+            lambda: merge_inputs._aggregate_weekly(
+                merged.copy(), _DATE_COLUMN, "geo"
+            ),
+            args.repeats,
+        )
+        regular, reindex = _best_time(
+            lambda: merge_inputs._ensure_regular_time_index(
+                weekly.copy(), _DATE_COLUMN, "geo"
+            ),
+            args.repeats,
+        )
+
+    print(f"scale={args.scale} merged_rows={len(merged)} output_rows={len(regular)}")
+    for stage, seconds in (
+        ("load_table(media)", load_media),
+        ("load_table(extra)", load_extra),
+        ("_aggregate_weekly", aggregate),
+        ("_ensure_regular_time_index", reindex),
+    ):
+        print(f"{stage:<28} {seconds:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
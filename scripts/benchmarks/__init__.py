@@ -0,0 +1,6 @@
+"""Reproducible benchmarks of the Meridian fitting and analysis hot paths.
+
+Run ``python -m scripts.benchmarks.run --help`` for the available presets and
+scenarios, and ``python -m scripts.benchmarks.import_time --help`` for the
+import time of the Meridian modules.
+"""
@@ -0,0 +1,125 @@
+"""Times the import of Meridian modules in fresh Python processes.
+
+Each module is imported ``--repeats`` times, each time in a new interpreter so
+that nothing is already imported. The fastest time is reported, together with
+the heavy dependencies, such as TensorFlow or Altair, that the import loaded:
+
+    python -m scripts.benchmarks.import_time --output imports.json
+"""
+
+import argparse
+from collections.abc import Sequence
+import json
+import subprocess
+import sys
+from typing import Any
+
+# The modules timed by default, from the lightest to the heaviest.
+MODULES = (
+    "meridian",
+    "meridian.constants",
+    "meridian.data.load",
+    "meridian.analysis.diagnostics",
+    "meridian.model.model",
+    "meridian.analysis.analyzer",
+    "meridian.analysis.visualizer",
+)
+
+# The dependencies whose import is reported.
+HEAVY_DEPENDENCIES = (
+    "tensorflow",
+    "tensorflow_probability",
+    "arviz",
+    "altair",
+    "jinja2",
+)
+
+_IMPORT_SCRIPT = """
+import importlib
+import json
+import sys
+import time
+
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+seconds = time.perf_counter() - start
+print(json.dumps({
+    "seconds": seconds,
+    "loaded": [name for name in sys.argv[2:] if name in sys.modules],
+}))
+"""
+
+
+def time_import(module: str) -> dict[str, Any]:
+    """Imports a module in a new interpreter and returns its import time."""
+
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SCRIPT, module, *HEAVY_DEPENDENCIES],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def run_benchmarks(
+    modules: Sequence[str] = MODULES, repeats: int = 3
+) -> dict[str, Any]:
+    """Times the import of each module and returns the results.
+
+    Args:
+      modules: Names of the modules to import.
+      repeats: Number of imports of each module, each in a new interpreter.
+
+    Returns:
+      A JSON-serializable dictionary with the import times of each module and
+      the heavy dependencies it loaded.
+    """
+
+    results = {}
+    for module in modules:
+        runs = [time_import(module) for _ in range(repeats)]
+        seconds = [run["seconds"] for run in runs]
+        results[module] = {
+            "seconds": seconds,
+            "min_seconds": min(seconds),
+            "loaded": runs[0]["loaded"],
+        }
+    return {
+        "python": sys.version.split()[0],
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the import time of Meridian modules"
+    )
+    parser.add_argument(
+        "--modules",
+        default=",".join(MODULES),
+        help="Comma-separated modules to import (default all)",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Path of the JSON results")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    results = run_benchmarks(args.modules.split(","), args.repeats)
+
+    print(f"{'module':<32} {'min (s)':>8}  loaded")
+    for module, result in results["results"].items():
+        print(
+            f"{module:<32} {result['min_seconds']:8.2f}"
+            f"  {', '.join(result['loaded']) or '-'}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""Runs the Meridian benchmark scenarios and writes the results as JSON.
+
+Each scenario is timed ``--repeats`` times on the same synthetic model. The
+first run includes the tracing and XLA compilation of the functions it calls,
+so both the first and the fastest times are reported, together with the peak
+resident memory of the process while the scenario runs and the number of
+traces of the instrumented functions. The results of two versions of Meridian
+can be compared with ``--baseline``:
+
+    python -m scripts.benchmarks.run --preset medium --output new.json \
+        --baseline old.json
+"""
+
+import argparse
+from collections.abc import Callable, Sequence
+import dataclasses
+import datetime
+import json
+import platform
+import threading
+import time
+from typing import Any
+
+import meridian
+from meridian.analysis import analyzer
+from meridian.analysis import optimizer
+from meridian.model import compilation
+from meridian.model import model
+from meridian.model import spec
+import numpy as np
+import psutil
+from scripts.benchmarks import synthetic_data
+import tensorflow as tf
+import tensorflow_probability as tfp
+
+
+@dataclasses.dataclass(frozen=True)
+class SamplingConfig:
+    """Sizes of the prior and posterior sampling of the benchmarked model."""
+
+    n_prior_draws: int = 100
+    n_chains: int = 2
+    n_adapt: int = 50
+    n_burnin: int = 10
+    n_keep: int = 50
+    seed: int = 1
+
+
+@dataclasses.dataclass
+class _Context:
+    """The model and analyzers shared by the scenarios, built once."""
+
+    mmm: model.Meridian
+    sampling: SamplingConfig
+    mmm_analyzer: analyzer.Analyzer | None = None
+
+
+def _sample_prior(context: _Context):
+    context.mmm.sample_prior(
+        n_draws=context.sampling.n_prior_draws, seed=context.sampling.seed
+    )
+
+
+def _sample_posterior(context: _Context):
+    context.mmm.sample_posterior(
+        n_chains=context.sampling.n_chains,
+        n_adapt=context.sampling.n_adapt,
+        n_burnin=context.sampling.n_burnin,
+        n_keep=context.sampling.n_keep,
+        seed=context.sampling.seed,
+    )
+    context.mmm_analyzer = analyzer.Analyzer(context.mmm)
+
+
+def _summary_metrics(context: _Context):
+    context.mmm_analyzer.summary_metrics()
+
+
+def _response_curves(context: _Context):
+    context.mmm_analyzer.response_curves()
+
+
+def _hill_curves(context: _Context):
+    context.mmm_analyzer.hill_curves()
+
+
+def _optimal_freq(context: _Context):
+    context.mmm_analyzer.optimal_freq()
+
+
+def _optimize(context: _Context):
+    optimizer.BudgetOptimizer(context.mmm).optimize()
+
+
+# The scenarios in the order in which they run. The analysis scenarios need the
+# posterior of `sample_posterior`.
+SCENARIOS: dict[str, Callable[[_Context], None]] = {
+    "sample_prior": _sample_prior,
+    "sample_posterior": _sample_posterior,
+    "summary_metrics": _summary_metrics,
+    "response_curves": _response_curves,
+    "hill_curves": _hill_curves,
+    "optimal_freq": _optimal_freq,
+    "budget_optimizer_optimize": _optimize,
+}
+_POSTERIOR_SCENARIOS = frozenset(SCENARIOS) - {"sample_prior"}
+
+
+class _PeakRssSampler:
+    """Samples the resident memory of the process in a background thread.
+
+    ``ru_maxrss`` is the peak of the whole lifetime of the process, so a
+    scenario that runs after a larger one would report no memory increase. The
+    sampler instead reports the peak of the current resident memory while it
+    is entered.
+    """
+
+    def __init__(self, interval_seconds: float = 0.01):
+        self._process = psutil.Process()
+        self._interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self.start_mb = self.peak_mb = 0.0
+
+    def _rss_mb(self) -> float:
+        return self._process.memory_info().rss / 2**20
+
+    def _sample(self):
+        while not self._stop.wait(self._interval_seconds):
+            self.peak_mb = max(self.peak_mb, self._rss_mb())
+
+    def __enter__(self) -> "_PeakRssSampler":
+        self.start_mb = self.peak_mb = self._rss_mb()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, self._rss_mb())
+
+
+def _time_scenario(
+    fn: Callable[[_Context], None], context: _Context, repeats: int
+) -> dict[str, Any]:
+    """Runs a scenario and returns its timings and memory."""
+
+    traces_before = sum(compilation.get_trace_counts().values())
+    seconds = []
+    with _PeakRssSampler() as rss:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn(context)
+            seconds.append(time.perf_counter() - start)
+    return {
+        "seconds": seconds,
+        "first_seconds": seconds[0],
+        "min_seconds": min(seconds),
+        "peak_rss_mb": rss.peak_mb,
+        "peak_rss_increase_mb": rss.peak_mb - rss.start_mb,
+        "traces": sum(compilation.get_trace_counts().values()) - traces_before,
+    }
+
+
+def run_benchmarks(
+    data_config: synthetic_data.SyntheticDataConfig,
+    sampling: SamplingConfig = SamplingConfig(),
+    scenarios: Sequence[str] | None = None,
+    repeats: int = 3,
+) -> dict[str, Any]:
+    """Runs the benchmark scenarios and returns the results.
+
+    Args:
+      data_config: Dimensions of the synthetic data of the model.
+      sampling: Sizes of the prior and posterior sampling.
+      scenarios: Names of the scenarios to run, in the order of ``SCENARIOS``.
+        The analysis scenarios also run ``sample_posterior`` first, untimed if
+        it is not selected. Defaults to all the scenarios.
+      repeats: Number of timed runs of each scenario. Each run of
+        ``sample_prior`` or ``sample_posterior`` replaces the previous draws.
+
+    Returns:
+      A JSON-serializable dictionary with the environment, the configuration
+      and the results of each scenario. Scenarios that do not apply to the
+      model, such as ``optimal_freq`` without RF channels, are reported as
+      skipped.
+    """
+
+    scenarios = list(SCENARIOS) if scenarios is None else list(scenarios)
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {sorted(unknown)}")
+    input_data = synthetic_data.generate(data_config)
+    mmm = model.Meridian(
+        input_data=input_data,
+        model_spec=spec.ModelSpec(max_lag=data_config.max_lag),
+    )
+    context = _Context(mmm=mmm, sampling=sampling)
+    if _POSTERIOR_SCENARIOS.intersection(scenarios) and (
+        "sample_posterior" not in scenarios
+    ):
+        _sample_posterior(context)
+
+    results = {}
+    for name in SCENARIOS:
+        if name not in scenarios:
+            continue
+        if name == "optimal_freq" and not data_config.n_rf_channels:
+            results[name] = {"skipped": "The model has no RF channels."}
+            continue
+        results[name] = _time_scenario(SCENARIOS[name], context, repeats)
+
+    return {
+        "environment": _environment(),
+        "data_config": dataclasses.asdict(data_config),
+        "sampling": dataclasses.asdict(sampling),
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def _environment() -> dict[str, str]:
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "meridian": meridian.__version__,
+        "tensorflow": tf.__version__,
+        "tensorflow_probability": tfp.__version__,
+        "numpy": np.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """Returns the change of each scenario from ``baseline`` to ``current``.
+
+    The ratios are ``current / baseline``, so a ratio below one is a speedup.
+    Only the scenarios timed in both results are compared.
+    """
+
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or "skipped" in base or "skipped" in result:
+            continue
+        rows.append({
+            "scenario": name,
+            "min_seconds_ratio": result["min_seconds"] / base["min_seconds"],
+            "first_seconds_ratio": (
+                result["first_seconds"] / base["first_seconds"]
+            ),
+            "peak_rss_increase_mb_diff": (
+                result["peak_rss_increase_mb"] - base["peak_rss_increase_mb"]
+            ),
+        })
+    return rows
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Meridian fitting and analysis hot paths"
+    )
+    parser.add_argument(
+        "--preset",
+        choices=sorted(synthetic_data.PRESETS),
+        default="small",
+        help="Synthetic data dimensions (default small)",
+    )
+    for field in dataclasses.fields(synthetic_data.SyntheticDataConfig):
+        if field.type is bool:
+            continue
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            type=int,
+            default=None,
+            help=f"Overrides the {field.name} of the preset",
+        )
+    parser.add_argument(
+        "--non-revenue",
+        action="store_true",
+        help="Use a non-revenue KPI with a revenue_per_kpi",
+    )
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help="Comma-separated scenarios to run (default all)",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--n-prior-draws", type=int, default=100)
+    parser.add_argument("--n-chains", type=int, default=2)
+    parser.add_argument("--n-adapt", type=int, default=50)
+    parser.add_argument("--n-burnin", type=int, default=10)
+    parser.add_argument("--n-keep", type=int, default=50)
+    parser.add_argument("--output", help="Path of the JSON results")
+    parser.add_argument(
+        "--baseline", help="Path of JSON results to compare the results with"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    overrides = {
+        field.name: getattr(args, field.name)
+        for field in dataclasses.fields(synthetic_data.SyntheticDataConfig)
+        if getattr(args, field.name, None) is not None
+    }
+    if args.non_revenue:
+        overrides["revenue"] = False
+    data_config = dataclasses.replace(
+        synthetic_data.PRESETS[args.preset], **overrides
+    )
+    sampling = SamplingConfig(
+        n_prior_draws=args.n_prior_draws,
+        n_chains=args.n_chains,
+        n_adapt=args.n_adapt,
+        n_burnin=args.n_burnin,
+        n_keep=args.n_keep,
+    )
+    results = run_benchmarks(
+        data_config,
+        sampling,
+        scenarios=args.scenarios.split(","),
+        repeats=args.repeats,
+    )
+    results["preset"] = args.preset
+
+    print(json.dumps(results["data_config"]))
+    print(
+        f"{'scenario':<26} {'first (s)':>10} {'min (s)':>10}"
+        f" {'peak RSS (MiB)':>15} {'traces':>7}"
+    )
+    for name, result in results["results"].items():
+        if "skipped" in result:
+            print(f"{name:<26} skipped: {result['skipped']}")
+            continue
+        print(
+            f"{name:<26} {result['first_seconds']:10.2f}"
+            f" {result['min_seconds']:10.2f}"
+            f" {result['peak_rss_mb']:15.0f} {result['traces']:7d}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.baseline} (ratio < 1 is faster):")
+        for row in compare(baseline, results):
+            print(
+                f"{row['scenario']:<26} min x{row['min_seconds_ratio']:.2f}"
+                f" first x{row['first_seconds_ratio']:.2f}"
+                f" peak RSS {row['peak_rss_increase_mb_diff']:+.0f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
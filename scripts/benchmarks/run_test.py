@@ -0,0 +1,156 @@
+import json
+import time
+
+from absl.testing import absltest
+from meridian import constants
+from scripts.benchmarks import import_time
+from scripts.benchmarks import run
+from scripts.benchmarks import synthetic_data
+
+
+class SyntheticDataTest(absltest.TestCase):
+
+  def test_generate_has_configured_dimensions(self):
+    config = synthetic_data.SyntheticDataConfig(
+        n_geos=3,
+        n_times=10,
+        max_lag=2,
+        n_media_channels=2,
+        n_rf_channels=1,
+        n_organic_media_channels=1,
+        n_non_media_channels=1,
+        n_controls=0,
+        revenue=False,
+    )
+
+    data = synthetic_data.generate(config)
+
+    self.assertLen(data.geo, 3)
+    self.assertLen(data.time, 10)
+    self.assertLen(data.media_time, 12)
+    self.assertLen(data.media_channel, 2)
+    self.assertLen(data.rf_channel, 1)
+    self.assertLen(data.organic_media_channel, 1)
+    self.assertLen(data.non_media_channel, 1)
+    self.assertIsNone(data.controls)
+    self.assertEqual(data.kpi_type, constants.NON_REVENUE)
+    self.assertIsNotNone(data.revenue_per_kpi)
+
+  def test_generate_is_reproducible(self):
+    config = synthetic_data.SyntheticDataConfig(n_geos=2, n_times=8)
+
+    first = synthetic_data.generate(config)
+    second = synthetic_data.generate(config)
+
+    self.assertTrue(first.kpi.equals(second.kpi))
+    self.assertTrue(first.media.equals(second.media))
+
+  def test_generate_without_paid_channels_raises_error(self):
+    with self.assertRaisesRegex(ValueError, "At least one paid media"):
+      synthetic_data.generate(
+          synthetic_data.SyntheticDataConfig(n_media_channels=0)
+      )
+
+
+class RunBenchmarksTest(absltest.TestCase):
+
+  def test_run_benchmarks_reports_selected_scenarios(self):
+    results = run.run_benchmarks(
+        synthetic_data.SyntheticDataConfig(
+            n_geos=2, n_times=8, max_lag=1, n_media_channels=1
+        ),
+        run.SamplingConfig(n_prior_draws=2),
+        scenarios=["sample_prior", "optimal_freq"],
+        repeats=2,
+    )
+
+    self.assertEqual(
+        list(results["results"]), ["sample_prior", "optimal_freq"]
+    )
+    prior = results["results"]["sample_prior"]
+    self.assertLen(prior["seconds"], 2)
+    self.assertEqual(prior["min_seconds"], min(prior["seconds"]))
+    self.assertIn("skipped", results["results"]["optimal_freq"])
+    # The results can be written as JSON.
+    json.dumps(results)
+
+  def test_run_benchmarks_unknown_scenario_raises_error(self):
+    with self.assertRaisesRegex(ValueError, "Unknown scenarios"):
+      run.run_benchmarks(
+          synthetic_data.SyntheticDataConfig(), scenarios=["fit"]
+      )
+
+  def test_peak_rss_sampler_measures_each_block(self):
+    with run._PeakRssSampler() as large:
+      data = b"\x01" * 2**28
+      time.sleep(0.1)
+      del data
+    with run._PeakRssSampler() as small:
+      time.sleep(0.1)
+
+    self.assertGreater(large.peak_mb - large.start_mb, 128)
+    self.assertLess(small.peak_mb - small.start_mb, 128)
+
+  def test_compare_returns_ratios_of_common_scenarios(self):
+    baseline = {
+        "results": {
+            "sample_prior": {
+                "first_seconds": 4.0,
+                "min_seconds": 2.0,
+                "peak_rss_increase_mb": 100.0,
+            },
+        }
+    }
+    current = {
+        "results": {
+            "sample_prior": {
+                "first_seconds": 2.0,
+                "min_seconds": 1.0,
+                "peak_rss_increase_mb": 50.0,
+            },
+            "optimal_freq": {"skipped": "The model has no RF channels."},
+        }
+    }
+
+    self.assertEqual(
+        run.compare(baseline, current),
+        [{
+            "scenario": "sample_prior",
+            "min_seconds_ratio": 0.5,
+            "first_seconds_ratio": 0.5,
+            "peak_rss_increase_mb_diff": -50.0,
+        }],
+    )
+
+
+class ImportTimeTest(absltest.TestCase):
+
+  def test_data_and_numpy_modules_do_not_load_tensorflow(self):
+    modules = [
+        "meridian",
+        "meridian.constants",
+        "meridian.data.load",
+        "meridian.analysis.diagnostics",
+        "meridian.analysis.contribution_cube",
+    ]
+
+    results = import_time.run_benchmarks(modules, repeats=1)
+
+    self.assertEqual(list(results["results"]), modules)
+    for module, result in results["results"].items():
+      with self.subTest(module):
+        self.assertLen(result["seconds"], 1)
+        self.assertEmpty(result["loaded"])
+
+  def test_analyzer_loads_tensorflow(self):
+    results = import_time.run_benchmarks(
+        ["meridian.analysis.analyzer"], repeats=1
+    )
+
+    self.assertIn(
+        "tensorflow", results["results"]["meridian.analysis.analyzer"]["loaded"]
+    )
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -0,0 +1,117 @@
+"""Synthetic ``InputData`` of configurable size for the benchmarks.
+
+The data is generated with the ``meridian.data.test_utils`` random fixtures, so
+a given ``SyntheticDataConfig`` always produces the same ``InputData``.
+"""
+
+import dataclasses
+
+from meridian import constants
+from meridian.data import input_data
+from meridian.data import test_utils
+
+
+@dataclasses.dataclass(frozen=True)
+class SyntheticDataConfig:
+    """Dimensions of a synthetic dataset.
+
+    Attributes:
+      n_geos: Number of geos. A single geo gives a national model.
+      n_times: Number of KPI time periods.
+      max_lag: Number of media time periods before the first KPI time period,
+        also used as the ``max_lag`` of the model.
+      n_media_channels: Number of paid media channels.
+      n_rf_channels: Number of paid reach and frequency channels.
+      n_organic_media_channels: Number of organic media channels.
+      n_organic_rf_channels: Number of organic reach and frequency channels.
+      n_non_media_channels: Number of non-media treatments.
+      n_controls: Number of control variables.
+      revenue: Whether the KPI is revenue. Otherwise, the KPI is a non-revenue
+        KPI with a constant ``revenue_per_kpi``.
+      seed: Seed of the random data.
+    """
+
+    n_geos: int = 10
+    n_times: int = 52
+    max_lag: int = 8
+    n_media_channels: int = 3
+    n_rf_channels: int = 0
+    n_organic_media_channels: int = 0
+    n_organic_rf_channels: int = 0
+    n_non_media_channels: int = 0
+    n_controls: int = 2
+    revenue: bool = True
+    seed: int = 0
+
+    @property
+    def n_media_times(self) -> int:
+        return self.n_times + self.max_lag
+
+
+PRESETS = {
+    "small": SyntheticDataConfig(n_geos=5, n_times=52, n_media_channels=3),
+    "medium": SyntheticDataConfig(
+        n_geos=50,
+        n_times=104,
+        n_media_channels=5,
+        n_rf_channels=2,
+        n_organic_media_channels=1,
+        n_non_media_channels=1,
+    ),
+    "large": SyntheticDataConfig(
+        n_geos=200,
+        n_times=156,
+        max_lag=13,
+        n_media_channels=10,
+        n_rf_channels=4,
+        n_organic_media_channels=2,
+        n_organic_rf_channels=1,
+        n_non_media_channels=2,
+        n_controls=5,
+    ),
+    "national": SyntheticDataConfig(
+        n_geos=1, n_times=156, n_media_channels=5, n_rf_channels=2
+    ),
+}
+
+
+def generate(config: SyntheticDataConfig) -> input_data.InputData:
+    """Returns the synthetic ``InputData`` described by ``config``."""
+
+    if not config.n_media_channels and not config.n_rf_channels:
+        raise ValueError("At least one paid media or RF channel is required.")
+    dataset = test_utils.random_dataset(
+        n_geos=config.n_geos,
+        n_times=config.n_times,
+        n_media_times=config.n_media_times,
+        n_controls=config.n_controls or None,
+        n_non_media_channels=config.n_non_media_channels or None,
+        n_organic_media_channels=config.n_organic_media_channels or None,
+        n_organic_rf_channels=config.n_organic_rf_channels or None,
+        n_media_channels=config.n_media_channels or None,
+        n_rf_channels=config.n_rf_channels or None,
+        revenue_per_kpi_value=None if config.revenue else 3.14,
+        seed=config.seed,
+    )
+
+    def _get(name: str):
+        return dataset[name] if name in dataset.data_vars else None
+
+    return input_data.InputData(
+        kpi=dataset.kpi,
+        kpi_type=(
+            constants.REVENUE if config.revenue else constants.NON_REVENUE
+        ),
+        revenue_per_kpi=_get(constants.REVENUE_PER_KPI),
+        population=dataset.population,
+        controls=_get(constants.CONTROLS),
+        media=_get(constants.MEDIA),
+        media_spend=_get(constants.MEDIA_SPEND),
+        reach=_get(constants.REACH),
+        frequency=_get(constants.FREQUENCY),
+        rf_spend=_get(constants.RF_SPEND),
+        organic_media=_get(constants.ORGANIC_MEDIA),
+        organic_reach=_get(constants.ORGANIC_REACH),
+        organic_frequency=_get(constants.ORGANIC_FREQUENCY),
+        non_media_treatments=_get(constants.NON_MEDIA_TREATMENTS),
+    )
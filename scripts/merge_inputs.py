@@ -1,47 +1,79 @@
 import argparse
+
+import numpy as np
 import pandas as pd
 
 
+# Survey metrics that are averaged, rather than summed, over each week.
+_AVERAGED_COLUMNS = frozenset({
+    "nps",
+    "ins",
+    "ces",
+    "gqv",
+    "haceb_marca_proximas_comprar",
+    "haceb_marca_top_of_heart",
+    "haceb_recordacion_top_of_mind",
+})
+_AVERAGED_COLUMN_PREFIX = "descuento"
+
+
+def _most_common_interval(days: pd.Series, keys: pd.Series) -> pd.Series:
+    """Returns the most common step in days for each key.
+
+    Ties are broken by the smallest step, matching ``Series.mode().iloc[0]``.
+    """
+
+    counts = (
+        pd.DataFrame({"key": keys.loc[days.index], "days": days})
+        .value_counts()
+        .rename("count")
+        .reset_index()
+        .sort_values(["key", "count", "days"], ascending=[True, False, True])
+    )
+    return counts.drop_duplicates("key").set_index("key")["days"].astype(int)
+
+
 def _ensure_regular_time_index(
     df: pd.DataFrame, date_column: str, geo_column: str | None = None
 ) -> pd.DataFrame:
     """Ensures that the time column is regularly spaced.
 
     Missing time periods are inserted with NA values so that Meridian's
-    input validator does not fail on irregular intervals.
+    input validator does not fail on irregular intervals. The most common
+    interval of each geo is computed with a single ``groupby`` and the whole
+    frame is reindexed onto the regular calendar in one pass.
     """
 
     df[date_column] = pd.to_datetime(df[date_column])
-    if geo_column is not None and geo_column in df.columns:
-        geos = df[geo_column].unique()
-    else:
-        geos = [None]
-
-    frames = []
-    for geo in geos:
-        geo_df = df if geo is None else df[df[geo_column] == geo]
-        times = geo_df[date_column].sort_values()
-        if len(times) < 2:
-            frames.append(geo_df)
-            continue
-        diffs = times.diff().dropna().dt.days
-        freq = (
-            int(diffs.mode().iloc[0]) if not diffs.mode().empty else int(diffs.iloc[0])
+    has_geo = geo_column is not None and geo_column in df.columns
+    keys = df[geo_column] if has_geo else pd.Series(0, index=df.index)
+
+    # Geos keep their order of first appearance, as with ``Series.unique()``.
+    bounds = df[date_column].groupby(keys, sort=False).agg(["min", "max"])
+    sorted_dates = df[date_column].sort_values(kind="stable")
+    sorted_keys = keys.loc[sorted_dates.index]
+    diffs = sorted_dates.groupby(sorted_keys, sort=False).diff().dt.days
+    freqs = _most_common_interval(diffs[diffs > 0], sorted_keys)
+    # Geos with a single date have no interval and keep that date only.
+    freqs = freqs.reindex(bounds.index, fill_value=1).to_numpy()
+    starts = bounds["min"].to_numpy(dtype="datetime64[D]").astype(np.int64)
+    ends = bounds["max"].to_numpy(dtype="datetime64[D]").astype(np.int64)
+    lengths = (ends - starts) // freqs + 1
+    offsets = np.arange(lengths.sum()) - np.repeat(
+        np.cumsum(lengths) - lengths, lengths
+    )
+    days = np.repeat(starts, lengths) + offsets * np.repeat(freqs, lengths)
+    calendar = pd.DatetimeIndex(days.astype("datetime64[D]"), name=date_column)
+
+    if has_geo:
+        index = pd.MultiIndex.from_arrays(
+            [np.repeat(bounds.index.to_numpy(), lengths), calendar],
+            names=[geo_column, date_column],
         )
-        full_range = pd.date_range(times.min(), times.max(), freq=f"{freq}D")
-        if geo is None:
-            reindexed = geo_df.set_index(date_column).reindex(full_range)
-            reindexed = reindexed.reset_index().rename(columns={"index": date_column})
-        else:
-            idx = pd.MultiIndex.from_product(
-                [[geo], full_range], names=[geo_column, date_column]
-            )
-            reindexed = (
-                geo_df.set_index([geo_column, date_column]).reindex(idx).reset_index()
-            )
-        frames.append(reindexed)
-
-    result = pd.concat(frames, ignore_index=True)
+        result = df.set_index([geo_column, date_column]).reindex(index)
+    else:
+        result = df.set_index(date_column).reindex(calendar)
+    result = result.reset_index()
     result[date_column] = result[date_column].dt.strftime("%Y-%m-%d")
     return result
 
@@ -52,7 +84,8 @@ def _aggregate_weekly(
     """Aggregates daily data to weekly using sums or averages as required.
 
     The week starts on Monday. Some survey metrics should be averaged over the
-    week while all other numeric columns are summed.
+    week while all other numeric columns are summed. The summed and averaged
+    column sets are reduced as two blocks over a single ``groupby``.
     """
 
     df[date_column] = pd.to_datetime(df[date_column])
@@ -64,26 +97,19 @@ def _aggregate_weekly(
     if geo_column is not None and geo_column in df.columns:
         group_cols.insert(0, geo_column)
 
-    numeric_cols = df.select_dtypes(include="number").columns
-
-    avg_cols = {
-        "nps",
-        "ins",
-        "ces",
-        "gqv",
-        "haceb_marca_proximas_comprar",
-        "haceb_marca_top_of_heart",
-        "haceb_recordacion_top_of_mind",
-    }
-
-    agg_dict: dict[str, str] = {}
-    for col in numeric_cols:
-        if col in avg_cols or col.startswith("descuento"):
-            agg_dict[col] = "mean"
-        else:
-            agg_dict[col] = "sum"
+    numeric_cols = df.select_dtypes(include="number").columns.difference(
+        group_cols, sort=False
+    )
+    is_averaged = numeric_cols.isin(_AVERAGED_COLUMNS) | numeric_cols.str.startswith(
+        _AVERAGED_COLUMN_PREFIX
+    )
+    mean_cols = numeric_cols[is_averaged]
+    sum_cols = numeric_cols[~is_averaged]
 
-    aggregated = df.groupby(group_cols, as_index=False).agg(agg_dict)
+    grouped = df.groupby(group_cols)
+    aggregated = pd.concat(
+        [grouped[sum_cols].sum(), grouped[mean_cols].mean()], axis=1
+    )[numeric_cols].reset_index()
 
     aggregated[date_column] = aggregated[date_column].dt.strftime("%Y-%m-%d")
     return aggregated
@@ -168,33 +194,22 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Thousands separator used in CSV files (default: None)",
     )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help=(
+            "Number of rows read at a time from CSV files. By default each "
+            "file is read in one pass."
+        ),
+    )
     return parser.parse_args()
 
 
-def load_table(
-    path: str, sep: str, decimal: str, date_column: str, thousands: str | None
+def _clean_table(
+    df: pd.DataFrame, decimal: str, date_column: str, thousands: str | None
 ) -> pd.DataFrame:
-    """Loads a CSV or Excel file into a DataFrame.
-
-    The function tries to cast numeric-like columns to proper numeric types
-    while leaving the date column untouched. Percent signs are stripped and
-    decimal as well as thousands separators are normalized so that values like
-    ``"5,3%"`` are correctly interpreted. This avoids accidental conversion of
-    date strings to ``NaN`` values which would later cause type errors when
-    loading the data with ``CsvDataLoader``.
-    """
-
-    if path.lower().endswith((".xlsx", ".xls")):
-        df = pd.read_excel(path)
-    else:
-        df = pd.read_csv(
-            path,
-            sep=sep,
-            decimal=decimal,
-            thousands=thousands,
-            encoding="utf-8-sig",
-            skipinitialspace=True,
-        )
+    """Drops index columns and casts every column but the date to numeric."""
 
     # Drop common index columns written by pandas.to_csv
     df = df.loc[:, ~df.columns.str.contains("^Unnamed")]
@@ -221,6 +236,50 @@ def load_table(
     return df
 
 
+def load_table(
+    path: str,
+    sep: str,
+    decimal: str,
+    date_column: str,
+    thousands: str | None,
+    chunksize: int | None = None,
+) -> pd.DataFrame:
+    """Loads a CSV or Excel file into a DataFrame.
+
+    The function tries to cast numeric-like columns to proper numeric types
+    while leaving the date column untouched. Percent signs are stripped and
+    decimal as well as thousands separators are normalized so that values like
+    ``"5,3%"`` are correctly interpreted. This avoids accidental conversion of
+    date strings to ``NaN`` values which would later cause type errors when
+    loading the data with ``CsvDataLoader``.
+
+    When ``chunksize`` is given, CSV files are read and cleaned ``chunksize``
+    rows at a time, so only one chunk of raw string columns is held in memory.
+    Excel files are always read in one pass, since ``pandas.read_excel`` does
+    not support chunked reading.
+    """
+
+    if path.lower().endswith((".xlsx", ".xls")):
+        return _clean_table(pd.read_excel(path), decimal, date_column, thousands)
+
+    reader = pd.read_csv(
+        path,
+        sep=sep,
+        decimal=decimal,
+        thousands=thousands,
+        encoding="utf-8-sig",
+        skipinitialspace=True,
+        chunksize=chunksize,
+    )
+    if chunksize is None:
+        return _clean_table(reader, decimal, date_column, thousands)
+    with reader:
+        chunks = [
+            _clean_table(chunk, decimal, date_column, thousands) for chunk in reader
+        ]
+    return pd.concat(chunks, ignore_index=True)
+
+
 def rename_kpi_columns(
     df: pd.DataFrame,
     kpi_col: str,
@@ -272,10 +331,20 @@ def rename_kpi_columns(
 def main() -> None:
     args = parse_args()
     media_df = load_table(
-        args.media, args.sep, args.decimal, args.date_column, args.thousands
+        args.media,
+        args.sep,
+        args.decimal,
+        args.date_column,
+        args.thousands,
+        chunksize=args.chunksize,
     )
     extra_df = load_table(
-        args.extra, args.sep, args.decimal, args.date_column, args.thousands
+        args.extra,
+        args.sep,
+        args.decimal,
+        args.date_column,
+        args.thousands,
+        chunksize=args.chunksize,
     )
 
     merge_cols = [args.date_column]
@@ -6,6 +6,8 @@ import os
 import tempfile
 
 from absl.testing import absltest
+import numpy as np
+import pandas as pd
 
 from scripts import merge_inputs
 
@@ -29,6 +31,114 @@ class LoadTableTest(absltest.TestCase):
       os.remove(path)
       os.rmdir(tmp_dir)
 
+  def test_load_table_in_chunks_matches_single_pass(self):
+    csv_content = "fecha;descuento_cocinas;ventas\n" + "".join(
+        f"{day:02d}/08/23;{day},5%;{day}.000\n" for day in range(1, 30)
+    )
+    tmp_dir = tempfile.mkdtemp()
+    path = os.path.join(tmp_dir, "data.csv")
+    try:
+      with open(path, "w", encoding="utf-8") as f:
+        f.write(csv_content)
+
+      expected = merge_inputs.load_table(
+          path, sep=";", decimal=",", date_column="fecha", thousands="."
+      )
+      chunked = merge_inputs.load_table(
+          path,
+          sep=";",
+          decimal=",",
+          date_column="fecha",
+          thousands=".",
+          chunksize=4,
+      )
+
+      pd.testing.assert_frame_equal(chunked, expected)
+      self.assertListEqual(expected["ventas"].tolist()[:2], [1000, 2000])
+    finally:
+      os.remove(path)
+      os.rmdir(tmp_dir)
+
+
+class EnsureRegularTimeIndexTest(absltest.TestCase):
+
+  def test_inserts_missing_periods_per_geo(self):
+    df = pd.DataFrame({
+        "geo": ["b", "b", "b", "a", "a", "a", "c"],
+        "time": [
+            "2023-01-02",
+            "2023-01-23",
+            "2023-01-09",
+            "2023-01-02",
+            "2023-01-03",
+            "2023-01-05",
+            "2023-01-02",
+        ],
+        "x": [1.0, 3.0, 2.0, 4.0, 5.0, 6.0, 7.0],
+    })
+
+    result = merge_inputs._ensure_regular_time_index(df, "time", "geo")
+
+    self.assertListEqual(
+        result["geo"].tolist(), ["b"] * 4 + ["a"] * 4 + ["c"]
+    )
+    self.assertListEqual(
+        result["time"].tolist(),
+        [
+            "2023-01-02",
+            "2023-01-09",
+            "2023-01-16",
+            "2023-01-23",
+            "2023-01-02",
+            "2023-01-03",
+            "2023-01-04",
+            "2023-01-05",
+            "2023-01-02",
+        ],
+    )
+    np.testing.assert_array_equal(
+        result["x"], [1.0, 2.0, np.nan, 3.0, 4.0, 5.0, np.nan, 6.0, 7.0]
+    )
+
+  def test_without_geo(self):
+    df = pd.DataFrame({
+        "time": ["2023-01-16", "2023-01-02", "2023-01-09", "2023-01-30"],
+        "x": [3.0, 1.0, 2.0, 4.0],
+    })
+
+    result = merge_inputs._ensure_regular_time_index(df, "time")
+
+    self.assertListEqual(
+        result["time"].tolist(),
+        ["2023-01-02", "2023-01-09", "2023-01-16", "2023-01-23", "2023-01-30"],
+    )
+    np.testing.assert_array_equal(result["x"], [1.0, 2.0, 3.0, np.nan, 4.0])
+
+
+class AggregateWeeklyTest(absltest.TestCase):
+
+  def test_sums_and_averages_by_geo_and_week(self):
+    df = pd.DataFrame({
+        "geo": [1, 1, 1, 2],
+        "time": ["2023-01-02", "2023-01-04", "2023-01-09", "2023-01-03"],
+        "spend": [1.0, 2.0, 3.0, 4.0],
+        "nps": [10.0, 20.0, 30.0, 40.0],
+        "descuento_cocinas": [1.0, 3.0, 5.0, 7.0],
+    })
+
+    result = merge_inputs._aggregate_weekly(df, "time", "geo")
+
+    pd.testing.assert_frame_equal(
+        result,
+        pd.DataFrame({
+            "geo": [1, 1, 2],
+            "time": ["2023-01-02", "2023-01-09", "2023-01-02"],
+            "spend": [3.0, 3.0, 4.0],
+            "nps": [15.0, 30.0, 40.0],
+            "descuento_cocinas": [2.0, 5.0, 7.0],
+        }),
+    )
+
 
 if __name__ == "__main__":
   absltest.main()